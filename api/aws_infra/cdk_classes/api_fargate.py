@@ -125,17 +125,31 @@ class ApiFargateStack(Stack):
                 actions=[
                     'states:StartExecution',
                     'states:DescribeExecution',
-                    'states:GetExecutionHistory'
+                    'states:GetExecutionHistory',
+                    'states:ListExecutions'
                 ],
                 resources=['*']  # Will be scoped to specific state machine
             )
         )
 
+        # Add SQS permissions to consume execution status change events (job status poller)
+        self.task_role.add_to_policy(
+            iam.PolicyStatement(
+                actions=[
+                    'sqs:ReceiveMessage',
+                    'sqs:DeleteMessage',
+                    'sqs:GetQueueAttributes'
+                ],
+                resources=[f'arn:aws:sqs:{self.region}:{self.account}:pavi-execution-events-*']
+            )
+        )
+
         # Add DynamoDB permissions
         self.task_role.add_to_policy(
             iam.PolicyStatement(
                 actions=[
                     'dynamodb:GetItem',
+                    'dynamodb:BatchGetItem',
                     'dynamodb:PutItem',
                     'dynamodb:UpdateItem',
                     'dynamodb:Query'
@@ -190,7 +204,10 @@ class ApiFargateStack(Stack):
             'API_EXECUTION_ENV': 'aws',
             # These will be set via CDK outputs from Step Functions stack
             'DYNAMODB_JOBS_TABLE': f'pavi-jobs-{env_suffix}',
-            'PAVI_RESULTS_BUCKET': f'agr-pavi-pipeline-{env_suffix}'
+            'PAVI_RESULTS_BUCKET': f'agr-pavi-pipeline-{env_suffix}',
+            # Keep job statuses up to date in the background, from execution events and periodic reconciliation
+            'JOB_STATUS_POLLER_ENABLED': 'true',
+            'JOB_STATUS_EVENTS_QUEUE_URL': f'https://sqs.{self.region}.amazonaws.com/{self.account}/pavi-execution-events-{env_suffix}'
         }
 
         # Create Fargate Service with ALB
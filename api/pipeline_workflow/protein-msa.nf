@@ -0,0 +1,97 @@
+params.image_registry = ''
+params.image_tag = 'latest'
+params.input_seq_regions_str = ''
+params.input_seq_regions_file = ''
+params.publish_dir = 'pipeline-results/'
+params.publish_dir_prefix = ''
+params.retrieval_group_size = 10
+
+process sequence_retrieval {
+    memory '500 MB'
+
+    container "${params.image_registry}agr_pavi/pipeline_seq_retrieval:${params.image_tag}"
+
+    input:
+        val request_maps
+
+    output:
+        path "*-protein.fa", emit: output_sequences
+        path "*-seqinfo.json", emit: seq_info
+
+    script:
+        // Retrieve a group of entries in one task, producing the same per-entry output files.
+        // Entries are passed through a file (written by a quoted heredoc), so no value needs shell escaping.
+        def encoded_entries = groovy.json.JsonOutput.toJson(request_maps)
+        """
+        cat > entries.json <<'END_OF_ENTRIES'
+        ${encoded_entries}
+        END_OF_ENTRIES
+        seq_retrieval_batch.py --output_type protein --entries_file entries.json
+        """
+}
+
+process alignment {
+    memory '2 GB'
+
+    container "${params.image_registry}agr_pavi/pipeline_alignment:${params.image_tag}"
+
+    publishDir "${params.publish_dir_prefix}${params.publish_dir}", mode: 'copy'
+
+    input:
+        path 'alignment-input.fa'
+
+    output:
+        path 'alignment-output.aln'
+
+    script:
+        """
+        clustalo -i alignment-input.fa --outfmt=clustal --resno -o alignment-output.aln
+        """
+}
+
+process collectAndAlignSeqInfo {
+    debug true
+    memory '500 MB'
+
+    container "${params.image_registry}agr_pavi/pipeline_seq_retrieval:${params.image_tag}"
+
+    publishDir "${params.publish_dir_prefix}${params.publish_dir}", mode: 'copy'
+
+    input:
+        path seq_info_files
+        path alignment_output_file
+
+    output:
+        stdout
+        path 'aligned_seq_info.json'
+
+    script:
+        """
+        seq_info_align.py --sequence-info-files '${seq_info_files.collect{it.name}.sort{it}.join(' ')}' --alignment-result-file '${alignment_output_file}'
+        """
+}
+
+workflow {
+    def seq_regions_json = '[]'
+    if (params.input_seq_regions_str) {
+        print('Reading input seq_regions argument from string.')
+        seq_regions_json = params.input_seq_regions_str
+    }
+    else if (params.input_seq_regions_file) {
+        print("Reading input seq_regions argument from file '${params.input_seq_regions_file}'.")
+        def in_file = file(params.input_seq_regions_file)
+        seq_regions_json = in_file.text
+    }
+
+    // Group entries to retrieve multiple entries per sequence_retrieval task
+    def seq_regions_channel = Channel.of(seq_regions_json).splitJson().buffer(size: params.retrieval_group_size, remainder: true)
+
+    // Retrieve sequences (w embedded variants)
+    sequence_retrieval(seq_regions_channel)
+
+    // Collect all sequences and align
+    alignment(sequence_retrieval.out.output_sequences.flatten().collectFile(name: 'alignment-input.fa', sort: { file -> file.name }))
+
+    // Merge seqinfo and add alignment positions
+    collectAndAlignSeqInfo(sequence_retrieval.out.seq_info.flatten().collect(), alignment.out)
+}
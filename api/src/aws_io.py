@@ -0,0 +1,35 @@
+"""
+Bounded thread pool for blocking AWS I/O from async API handlers.
+
+boto3 is synchronous, so calling it from an `async def` handler blocks the event loop
+(and with it every other request being served). Handlers should instead await `run_aws_io`,
+which runs the blocking call on a dedicated thread pool of `AWS_IO_WORKERS` threads.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar('T')
+
+AWS_IO_WORKERS = int(os.environ.get('AWS_IO_WORKERS', '32'))
+
+_executor = ThreadPoolExecutor(max_workers=AWS_IO_WORKERS, thread_name_prefix='aws-io')
+
+
+async def run_aws_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking (AWS) call on the AWS I/O thread pool, without blocking the event loop.
+
+    Args:
+        func: Blocking callable to run
+        *args: Positional arguments to call `func` with
+        **kwargs: Keyword arguments to call `func` with
+
+    Returns:
+        The return value of `func`
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
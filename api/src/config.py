@@ -40,6 +40,11 @@ class PipelineConfig:
     enable_step_functions_rollout: bool
     step_functions_rollout_percentage: int  # 0-100
 
+    # Background job status synchronization
+    job_status_poller_enabled: bool
+    job_status_poll_interval: float  # seconds
+    job_status_events_queue_url: Optional[str]
+
 
 @dataclass
 class APIConfig:
@@ -55,6 +60,8 @@ class APIConfig:
     # Nextflow settings (legacy)
     nextflow_out_dir: str
     pipeline_image_tag: str
+    nextflow_max_concurrent_jobs: int
+    nextflow_max_queued_jobs: int
 
 
 def get_environment() -> Environment:
@@ -127,6 +134,9 @@ def get_config() -> APIConfig:
         job_queue_arn=os.environ.get('BATCH_JOB_QUEUE_ARN', defaults['job_queue_arn']),
         enable_step_functions_rollout=enable_rollout,
         step_functions_rollout_percentage=rollout_percentage,
+        job_status_poller_enabled=os.environ.get('JOB_STATUS_POLLER_ENABLED', 'false').lower() == 'true',
+        job_status_poll_interval=float(os.environ.get('JOB_STATUS_POLL_INTERVAL_SECONDS', '15')),
+        job_status_events_queue_url=os.environ.get('JOB_STATUS_EVENTS_QUEUE_URL'),
     )
 
     return APIConfig(
@@ -137,6 +147,8 @@ def get_config() -> APIConfig:
         api_port=int(os.environ.get('API_PORT', '8080')),
         nextflow_out_dir=os.environ.get('API_NEXTFLOW_OUT_DIR', './'),
         pipeline_image_tag=os.environ.get('API_PIPELINE_IMAGE_TAG', 'latest'),
+        nextflow_max_concurrent_jobs=int(os.environ.get('NEXTFLOW_MAX_CONCURRENT_JOBS', '2')),
+        nextflow_max_queued_jobs=int(os.environ.get('NEXTFLOW_MAX_QUEUED_JOBS', '20')),
     )
 
 
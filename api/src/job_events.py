@@ -0,0 +1,144 @@
+"""
+Job progress event broker for PAVI API.
+
+Pushes job state changes (status, stage, progress counters) to subscribers,
+such as Server-Sent Events clients. A single watcher task per job polls the job state
+and fans every change out to all subscribers of that job, so the upstream
+polling load scales with the number of watched jobs rather than the number of clients.
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
+
+from log_mgmt.log_manager import get_logger
+
+log = get_logger(__name__)
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Sentinel marking the end of a job's event stream
+_END_OF_STREAM: dict[str, Any] = {}
+
+
+class _JobWatcher:
+    """Watcher state of a single job: its subscribers and the last known job state."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.subscribers: set[asyncio.Queue[dict[str, Any]]] = set()
+        self.last_state: Optional[dict[str, Any]] = None
+        self.finished = False
+        self.task: Optional[asyncio.Task[None]] = None
+
+    def publish(self, state: dict[str, Any]) -> None:
+        """Push a state to all subscribers, dropping their oldest pending state when they fall behind."""
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(state)
+
+
+class JobEventBroker:
+    """
+    Fan out job state changes from one watcher per job to all of its subscribers.
+
+    Job states are dicts with (at least) a `status` key, as returned by `fetch_job`.
+    Watchers start with the first subscriber of a job and stop when the last
+    subscriber leaves, or once the job reached a terminal status.
+    """
+
+    def __init__(
+        self,
+        fetch_job: Callable[[str], Awaitable[Optional[dict[str, Any]]]],
+        poll_interval: float = 2.0,
+        heartbeat_interval: float = 15.0,
+        max_pending_events: int = 16
+    ):
+        """
+        Initialize the job event broker.
+
+        Args:
+            fetch_job: Async callable returning the current state of a job (or None if not found)
+            poll_interval: Seconds between job state polls (per watched job)
+            heartbeat_interval: Seconds without state changes after which subscribers receive a heartbeat
+            max_pending_events: Maximum number of unconsumed states kept per subscriber
+        """
+        self.fetch_job = fetch_job
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_pending_events = max_pending_events
+        self._watchers: dict[str, _JobWatcher] = {}
+
+    def watched_job_count(self) -> int:
+        """Get the number of jobs currently being watched."""
+        return len(self._watchers)
+
+    async def subscribe(self, job_id: str) -> AsyncGenerator[Optional[dict[str, Any]], None]:
+        """
+        Subscribe to the state changes of a job.
+
+        Yields the current job state first, then every state change until the job
+        reaches a terminal status (or is no longer found). `None` is yielded as heartbeat
+        when no state change happened for `heartbeat_interval` seconds.
+
+        Args:
+            job_id: ID of the job to subscribe to
+        """
+        watcher = self._watchers.get(job_id)
+        if watcher is None or watcher.finished:
+            watcher = _JobWatcher(job_id)
+            self._watchers[job_id] = watcher
+            watcher.task = asyncio.create_task(self._watch(watcher), name=f'job-watcher-{job_id}')
+
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=self.max_pending_events)
+        watcher.subscribers.add(queue)
+        if watcher.last_state is not None:
+            queue.put_nowait(watcher.last_state)
+
+        try:
+            while True:
+                try:
+                    state = await asyncio.wait_for(queue.get(), timeout=self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield None
+                else:
+                    if state is _END_OF_STREAM:
+                        return
+                    yield state
+        finally:
+            watcher.subscribers.discard(queue)
+            if not watcher.subscribers:
+                self._stop_watcher(watcher)
+
+    def _stop_watcher(self, watcher: _JobWatcher) -> None:
+        if self._watchers.get(watcher.job_id) is watcher:
+            del self._watchers[watcher.job_id]
+        if watcher.task and not watcher.task.done():
+            watcher.task.cancel()
+
+    async def _watch(self, watcher: _JobWatcher) -> None:
+        """Poll the state of a job, publishing every change to the job's subscribers."""
+        try:
+            while True:
+                state = await self.fetch_job(watcher.job_id)
+                if state is None:
+                    log.warning(f"Job {watcher.job_id} not found, closing its event stream")
+                    break
+
+                if state != watcher.last_state:
+                    watcher.last_state = state
+                    watcher.publish(state)
+
+                if state.get('status') in TERMINAL_STATUSES:
+                    break
+
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Error watching job {watcher.job_id}: {e}")
+
+        watcher.finished = True
+        watcher.publish(_END_OF_STREAM)
+        if self._watchers.get(watcher.job_id) is watcher:
+            del self._watchers[watcher.job_id]
@@ -0,0 +1,170 @@
+"""
+Job scheduler for PAVI API.
+
+Runs jobs on a bounded pool of worker threads, taking them from a bounded priority queue
+(first in, first out within a priority). Used to limit the number of concurrently running
+Nextflow pipelines (each a separate JVM) in legacy mode, rejecting submissions once the queue is full.
+"""
+
+import heapq
+import itertools
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from log_mgmt.log_manager import get_logger
+
+log = get_logger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """Exception raised when a job is submitted to a scheduler whose queue is full."""
+
+    def __init__(self, max_queued: int):
+        super().__init__(f"Job queue is full ({max_queued} jobs waiting)")
+        self.max_queued = max_queued
+
+
+class JobScheduler:
+    """
+    Bounded worker pool with a bounded priority queue.
+
+    Jobs with a lower priority value are started first, jobs of equal priority in
+    order of submission. Worker threads are started on first submission.
+    """
+
+    # Number of most recent queue wait times kept for wait time metrics
+    WAIT_TIME_SAMPLES = 1000
+
+    def __init__(self, max_workers: int, max_queued: int, name: str = 'job-scheduler'):
+        """
+        Initialize the job scheduler.
+
+        Args:
+            max_workers: Maximum number of jobs running concurrently
+            max_queued: Maximum number of jobs waiting for a free worker, beyond which submissions are rejected
+                (0 to only accept jobs that can be started right away)
+            name: Name of the scheduler (used as worker thread name prefix)
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max(0, max_queued)
+        self.name = name
+
+        # Queue entries: (priority, sequence number, job ID, job function, time queued)
+        self._queue: list[tuple[int, int, str, Callable[[], None], float]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._workers: list[threading.Thread] = []
+        self._running: set[str] = set()
+        self._shutdown = False
+
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._wait_times: deque[float] = deque(maxlen=self.WAIT_TIME_SAMPLES)
+
+    def submit(self, job_id: str, func: Callable[[], None], priority: int = 0) -> int:
+        """
+        Queue a job to be run.
+
+        Args:
+            job_id: ID of the job
+            func: Callable running the job
+            priority: Job priority, jobs with lower values are started first
+
+        Returns:
+            Queue position of the job (1-based) at submission
+
+        Raises:
+            JobQueueFullError: If all workers are busy and the maximum number of jobs is already waiting
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError(f"Scheduler {self.name} is shut down")
+            # Queued jobs that idle workers are about to start are not waiting for a worker
+            if len(self._running) + len(self._queue) >= self.max_workers + self.max_queued:
+                self._rejected += 1
+                raise JobQueueFullError(self.max_queued)
+
+            entry = (priority, next(self._sequence), job_id, func, time.monotonic())
+            heapq.heappush(self._queue, entry)
+            self._submitted += 1
+            self._start_workers()
+            self._condition.notify()
+
+            return sorted(self._queue).index(entry) + 1
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """
+        Get the current queue position of a job.
+
+        Returns:
+            Queue position (1-based) of the job, or None if the job is not waiting (anymore)
+        """
+        with self._condition:
+            for position, entry in enumerate(sorted(self._queue), start=1):
+                if entry[2] == job_id:
+                    return position
+        return None
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Get the scheduler's queue and worker metrics.
+
+        Wait times (in seconds, from submission until start) cover the most recently started jobs.
+        """
+        with self._condition:
+            wait_times = sorted(self._wait_times)
+            return {
+                'max_workers': self.max_workers,
+                'max_queued': self.max_queued,
+                'running': len(self._running),
+                'queue_depth': len(self._queue),
+                'submitted': self._submitted,
+                'rejected': self._rejected,
+                'completed': self._completed,
+                'wait_time_seconds': {
+                    'mean': round(statistics.fmean(wait_times), 3) if wait_times else 0.0,
+                    'p95': round(wait_times[int(0.95 * (len(wait_times) - 1))], 3) if wait_times else 0.0,
+                    'max': round(wait_times[-1], 3) if wait_times else 0.0
+                }
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads once the running jobs completed, discarding all waiting jobs."""
+        with self._condition:
+            self._shutdown = True
+            self._queue.clear()
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _start_workers(self) -> None:
+        """Start worker threads, up to `max_workers` (must be called holding the condition lock)."""
+        while len(self._workers) < min(self.max_workers, self._submitted):
+            worker = threading.Thread(target=self._work, name=f'{self.name}-{len(self._workers)}', daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._shutdown:
+                    self._condition.wait()
+                if self._shutdown:
+                    return
+                _, _, job_id, func, queued_at = heapq.heappop(self._queue)
+                self._wait_times.append(time.monotonic() - queued_at)
+                self._running.add(job_id)
+
+            try:
+                func()
+            except Exception as e:
+                log.error(f"Job {job_id} failed in scheduler {self.name}: {e}")
+            finally:
+                with self._condition:
+                    self._running.discard(job_id)
+                    self._completed += 1
@@ -5,11 +5,22 @@ This module provides job management functionality using AWS Step Functions
 and DynamoDB, replacing the previous in-memory Nextflow-based execution.
 """
 
+import copy
+import hashlib
 import json
+import math
 import os
+import re
+import socket
+import tempfile
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
 from enum import Enum
 
 import boto3
@@ -47,6 +58,15 @@ class JobResultNotReadyError(JobServiceError):
         self.status = status
 
 
+class JobResultRangeError(JobServiceError):
+    """Exception raised when a requested byte range of a job result cannot be satisfied."""
+
+    def __init__(self, range_header: str, content_length: Optional[int] = None):
+        super().__init__(f"Range {range_header} not satisfiable")
+        self.range_header = range_header
+        self.content_length = content_length
+
+
 class JobStatus(str, Enum):
     """Job status enum matching DynamoDB values."""
     PENDING = "PENDING"
@@ -65,6 +85,12 @@ class JobStage(str, Enum):
     ERROR = "ERROR"
 
 
+class ExecutionPath(str, Enum):
+    """Path a job's pipeline is executed through."""
+    STEP_FUNCTIONS = "STEP_FUNCTIONS"
+    IN_PROCESS = "IN_PROCESS"
+
+
 class JobInfo:
     """Job information container."""
 
@@ -79,7 +105,14 @@ class JobInfo:
         sequences_processed: int = 0,
         result_s3_uri: Optional[str] = None,
         error_message: Optional[str] = None,
-        execution_arn: Optional[str] = None
+        execution_arn: Optional[str] = None,
+        parent_job_id: Optional[str] = None,
+        input_fingerprint: Optional[str] = None,
+        source_job_id: Optional[str] = None,
+        execution_path: Optional[ExecutionPath] = None,
+        parent_result_s3_uri: Optional[str] = None,
+        lease_owner: Optional[str] = None,
+        lease_renewed_at: Optional[str] = None
     ):
         self.job_id = job_id
         self.status = status
@@ -91,6 +124,16 @@ class JobInfo:
         self.result_s3_uri = result_s3_uri
         self.error_message = error_message
         self.execution_arn = execution_arn
+        self.parent_job_id = parent_job_id
+        # Alignment result of the parent job (recorded at creation, to start the job without reading the parent again)
+        self.parent_result_s3_uri = parent_result_s3_uri
+        # Fingerprint of the job input, and the job whose execution and results this job reuses (if any)
+        self.input_fingerprint = input_fingerprint
+        self.source_job_id = source_job_id
+        self.execution_path = execution_path
+        # API instance running the job in-process, and when it last renewed its lease on the job
+        self.lease_owner = lease_owner
+        self.lease_renewed_at = lease_renewed_at
 
     def to_dict(self) -> dict:
         """Convert to dictionary for API response."""
@@ -104,9 +147,177 @@ class JobInfo:
             "input_count": self.input_count,
             "sequences_processed": self.sequences_processed,
             "result_s3_uri": self.result_s3_uri,
-            "error_message": self.error_message
+            "error_message": self.error_message,
+            "parent_job_id": self.parent_job_id,
+            "source_job_id": self.source_job_id,
+            "execution_path": self.execution_path.value.lower() if self.execution_path else None
         }
 
+    @classmethod
+    def from_dynamodb_item(cls, item: dict[str, Any]) -> 'JobInfo':
+        """Create JobInfo from a DynamoDB jobs table item."""
+        return cls(
+            job_id=item['job_id'],
+            status=JobStatus(item['status']),
+            stage=JobStage(item.get('stage')) if item.get('stage') else None,
+            created_at=item.get('created_at'),
+            completed_at=item.get('completed_at'),
+            input_count=int(item.get('input_count', 0)),
+            sequences_processed=int(item.get('sequences_processed', 0)),
+            result_s3_uri=item.get('result_s3_uri'),
+            error_message=item.get('error_message'),
+            execution_arn=item.get('execution_arn'),
+            parent_job_id=item.get('parent_job_id'),
+            input_fingerprint=item.get('input_fingerprint'),
+            source_job_id=item.get('source_job_id'),
+            execution_path=ExecutionPath(item['execution_path']) if item.get('execution_path') else None,
+            parent_result_s3_uri=item.get('parent_result_s3_uri'),
+            lease_owner=item.get('lease_owner'),
+            lease_renewed_at=item.get('lease_renewed_at')
+        )
+
+
+class JobResultStream:
+    """
+    (Partial) job result file content, to be streamed in chunks.
+
+    When `not_modified` is set, the result matched the requested ETag and
+    no content is returned (`chunks` is empty).
+
+    `close` releases the underlying stream, and must be called
+    when not all chunks get consumed (e.g. when the client disconnects).
+    """
+
+    def __init__(
+        self,
+        etag: Optional[str],
+        chunks: Optional[Iterator[bytes]] = None,
+        content_length: int = 0,
+        content_range: Optional[str] = None,
+        not_modified: bool = False,
+        close: Optional[Callable[[], None]] = None
+    ):
+        self.etag = etag
+        self.chunks: Iterator[bytes] = chunks if chunks is not None else iter(())
+        self.content_length = content_length
+        self.content_range = content_range
+        self.not_modified = not_modified
+        self._close = close
+
+    def close(self) -> None:
+        """Release the underlying stream (no further chunks can be read)."""
+        if self._close is not None:
+            self._close()
+        else:
+            close_chunks = getattr(self.chunks, 'close', None)
+            if close_chunks is not None:
+                close_chunks()
+
+
+def compute_input_fingerprint(
+    seq_regions: list[dict[str, Any]],
+    pipeline_version: str,
+    parent_job_id: Optional[str] = None
+) -> str:
+    """
+    Compute a canonical fingerprint of a job's input.
+
+    Jobs with equal fingerprints produce identical results: the fingerprint covers
+    all seq region properties (regions, variant IDs, FASTA file URLs, ...),
+    the pipeline version and the parent job (for incremental alignments).
+    Region order is preserved, as it determines the order of the alignment output,
+    while variant ID order, key order and unset (None) properties are ignored.
+
+    Args:
+        seq_regions: List of sequence region definitions
+        pipeline_version: Version of the pipeline the job would run
+        parent_job_id: Optional ID of the job whose alignment the new sequences are added to
+
+    Returns:
+        Hex-encoded SHA-256 fingerprint
+    """
+    canonical_regions = []
+    for seq_region in seq_regions:
+        canonical_region = {key: value for key, value in seq_region.items() if value is not None}
+        if 'variant_ids' in canonical_region:
+            canonical_region['variant_ids'] = sorted(set(canonical_region['variant_ids']))
+        canonical_regions.append(canonical_region)
+
+    canonical_input = json.dumps({
+        'pipeline_version': pipeline_version,
+        'parent_job_id': parent_job_id,
+        'seq_regions': canonical_regions
+    }, sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(canonical_input.encode('utf-8')).hexdigest()
+
+
+def seq_region_length(seq_region: dict[str, Any]) -> int:
+    """
+    Get the total length (in bases) of the exon regions of a seq region.
+
+    Exon regions can be defined as dicts (with `start` and `end`) or as '`start`..`end`' strings.
+
+    Raises:
+        ValueError: If any of the exon regions could not be parsed
+    """
+    length = 0
+    for region in seq_region.get('exon_seq_regions') or []:
+        if isinstance(region, dict):
+            start, end = int(region['start']), int(region['end'])
+        else:
+            match = re.fullmatch(r'(\d+)\.\.(\d+)', str(region))
+            if match is None:
+                raise ValueError(f"Invalid seq region {region}")
+            start, end = int(match.group(1)), int(match.group(2))
+        length += abs(end - start) + 1
+    return length
+
+
+def parse_byte_range(range_header: str, size: int) -> tuple[int, int]:
+    """
+    Parse a (single) HTTP byte range header into an inclusive (start, end) byte range.
+
+    Args:
+        range_header: Range header value (e.g. "bytes=0-499", "bytes=500-" or "bytes=-500")
+        size: Total size of the file the range applies to
+
+    Returns:
+        Tuple of the first and last byte position of the range
+
+    Raises:
+        JobResultRangeError: If the range is invalid or not satisfiable
+    """
+    unit, _, byte_range = range_header.partition('=')
+    start_str, _, end_str = byte_range.strip().partition('-')
+    if unit.strip() != 'bytes' or ',' in byte_range or not (start_str or end_str):
+        raise JobResultRangeError(range_header, size)
+
+    try:
+        if not start_str:
+            # Suffix range (last N bytes)
+            start, end = max(0, size - int(end_str)), size - 1
+        else:
+            start = int(start_str)
+            end = min(int(end_str), size - 1) if end_str else size - 1
+    except ValueError:
+        raise JobResultRangeError(range_header, size)
+
+    if start < 0 or start > end:
+        raise JobResultRangeError(range_header, size)
+
+    return start, end
+
+
+def etag_matches(if_none_match: str, etag: Optional[str]) -> bool:
+    """Check whether an If-None-Match header value matches an ETag (weak comparison)."""
+    if not etag:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag.removeprefix('W/')
+               for tag in if_none_match.split(','))
+
 
 class JobService:
     """
@@ -116,6 +327,10 @@ class JobService:
     and Step Functions orchestration.
     """
 
+    # Maximum number of keys per DynamoDB BatchGetItem request
+    BATCH_GET_MAX_KEYS = 100
+    BATCH_GET_MAX_ATTEMPTS = 5
+
     def __init__(
         self,
         dynamodb_table_name: Optional[str] = None,
@@ -148,61 +363,166 @@ class JobService:
             'BATCH_JOB_QUEUE_ARN',
             'arn:aws:batch:us-east-1:123456789012:job-queue/pavi-pipeline-queue'
         )
-
-        # AWS clients - lazily initialized
+        # Pipeline version, part of the job input fingerprint
+        self.pipeline_version = os.environ.get('API_PIPELINE_IMAGE_TAG', 'latest')
+        # Reuse the execution (and results) of running or completed jobs with identical input
+        self.job_reuse_enabled = os.environ.get('JOB_REUSE_ENABLED', 'true').lower() == 'true'
+        # Size of the chunks job result files are streamed in (bytes)
+        self.result_chunk_size = int(os.environ.get('RESULT_STREAM_CHUNK_SIZE', str(64 * 1024)))
+        # Number of parallel seq retrieval jobs to aim for (input regions are chunked accordingly)
+        self.retrieval_target_parallelism = int(os.environ.get(
+            'RETRIEVAL_TARGET_PARALLELISM', '40'
+        ))
+
+        # Small jobs (at most `in_process_max_seq_regions` regions, spanning at most `in_process_max_seq_length` bases)
+        # can be run in-process (see local_pipeline) rather than through Step Functions and Batch,
+        # on a pool of `in_process_workers` threads with at most `in_process_max_queued_jobs` jobs waiting.
+        self.in_process_enabled = os.environ.get('IN_PROCESS_JOBS_ENABLED', 'false').lower() == 'true'
+        self.in_process_max_seq_regions = int(os.environ.get('IN_PROCESS_MAX_SEQ_REGIONS', '4'))
+        self.in_process_max_seq_length = int(os.environ.get('IN_PROCESS_MAX_SEQ_LENGTH', '200000'))
+        self.in_process_workers = int(os.environ.get('IN_PROCESS_WORKERS', '2'))
+        self.in_process_max_queued_jobs = int(os.environ.get('IN_PROCESS_MAX_QUEUED_JOBS', '8'))
+        self.in_process_aligner = os.environ.get('IN_PROCESS_ALIGNER', 'clustalo')
+        # Number of processes to retrieve sequences with in local mode (in-process jobs retrieve in their worker thread)
+        self.local_retrieval_workers = int(os.environ.get('LOCAL_RETRIEVAL_WORKERS', str(os.cpu_count() or 1)))
+        self._in_process_available: Optional[bool] = None
+        self._in_process_executor: Optional[ThreadPoolExecutor] = None
+        self._in_process_job_count = 0
+        self._in_process_lock = threading.Lock()
+        # In Step Functions mode, in-process jobs are leased by the API instance running them. Leases of all jobs
+        # queued or running on this instance are renewed in the background, jobs whose lease expired
+        # (as their API instance stopped) are failed when reconciled or synced.
+        self.in_process_lease_seconds = float(os.environ.get('IN_PROCESS_JOB_LEASE_SECONDS', '120'))
+        self.instance_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._in_process_jobs: set[str] = set()
+        self._lease_renewer: Optional[threading.Thread] = None
+
+        # AWS clients - lazily initialized (guarded by a lock, as API handlers call the service from multiple threads)
         self._dynamodb = None
         self._sfn = None
         self._s3 = None
+        self._clients_lock = threading.Lock()
 
         # Local mode fallback (in-memory storage)
         self._local_jobs: dict[str, JobInfo] = {}
 
+        # Job status cache for get_job_with_sync (job_id -> (cached at, JobInfo)).
+        # Non-terminal statuses expire after the TTL, terminal statuses never change and are kept
+        # until evicted (least recently used first) when exceeding the max number of entries.
+        self.status_cache_ttl = float(os.environ.get('JOB_STATUS_CACHE_TTL_SECONDS', '2'))
+        self.status_cache_max_entries = int(os.environ.get('JOB_STATUS_CACHE_MAX_ENTRIES', '10000'))
+        self._status_cache: OrderedDict[str, tuple[float, JobInfo]] = OrderedDict()
+        self._status_cache_lock = threading.Lock()
+        # Per-job locks (with their number of users) to coalesce concurrent status syncs
+        self._sync_locks: dict[str, list[Any]] = {}
+        # ETags of (immutable) job result objects by S3 URI, to answer conditional requests without S3 calls
+        # (evicted least recently used first when exceeding the max number of entries)
+        self.result_etag_cache_max_entries = int(os.environ.get('RESULT_ETAG_CACHE_MAX_ENTRIES', '10000'))
+        self._result_etags: OrderedDict[str, str] = OrderedDict()
+        self._result_etags_lock = threading.Lock()
+
+        # When enabled, job statuses are kept up to date by a background poller (see job_status_poller)
+        # and get_job_with_sync answers from the stored job state.
+        self.background_sync = False
+
     @property
     def dynamodb(self):
         """Lazy initialization of DynamoDB client."""
         if self._dynamodb is None:
-            self._dynamodb = boto3.resource('dynamodb')
+            with self._clients_lock:
+                if self._dynamodb is None:
+                    self._dynamodb = boto3.resource('dynamodb')
         return self._dynamodb
 
     @property
     def sfn(self):
         """Lazy initialization of Step Functions client."""
         if self._sfn is None:
-            endpoint_url = os.environ.get('STEP_FUNCTIONS_ENDPOINT')
-            if endpoint_url:
-                self._sfn = boto3.client('stepfunctions', endpoint_url=endpoint_url)
-            else:
-                self._sfn = boto3.client('stepfunctions')
+            with self._clients_lock:
+                if self._sfn is None:
+                    endpoint_url = os.environ.get('STEP_FUNCTIONS_ENDPOINT')
+                    if endpoint_url:
+                        self._sfn = boto3.client('stepfunctions', endpoint_url=endpoint_url)
+                    else:
+                        self._sfn = boto3.client('stepfunctions')
         return self._sfn
 
     @property
     def s3(self):
         """Lazy initialization of S3 client."""
         if self._s3 is None:
-            self._s3 = boto3.client('s3')
+            with self._clients_lock:
+                if self._s3 is None:
+                    self._s3 = boto3.client('s3')
         return self._s3
 
-    def create_job(self, seq_regions: list[dict]) -> JobInfo:
+    def create_job(self, seq_regions: list[dict], parent_job_id: Optional[str] = None) -> JobInfo:
         """
         Create a new pipeline job.
 
         Args:
             seq_regions: List of sequence region definitions
+            parent_job_id: Optional ID of a completed job whose alignment
+                the new sequences should be added to (incremental alignment)
+
+        When job reuse is enabled and a completed, running or pending job with identical input
+        (see `compute_input_fingerprint`) exists, the new job references that job's
+        execution and results (`source_job_id`) and must not be started.
+
+        The path the job must be executed through is recorded as `execution_path`
+        (see `select_execution_path`). Jobs to be run in-process must be started
+        through `submit_in_process_job` rather than `start_job`.
 
         Returns:
             JobInfo object with job details
+
+        Raises:
+            JobNotFoundError: If the parent job does not exist
+            JobResultNotReadyError: If the parent job has not completed
         """
+        parent_job: Optional[JobInfo] = None
+        if parent_job_id:
+            parent_job = self.get_job(parent_job_id)
+            if not parent_job:
+                raise JobNotFoundError(f"Parent job {parent_job_id} not found")
+            if parent_job.status != JobStatus.COMPLETED:
+                raise JobResultNotReadyError(parent_job_id, parent_job.status.value)
+
         job_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat() + 'Z'
 
+        input_fingerprint = compute_input_fingerprint(seq_regions, self.pipeline_version, parent_job_id)
+
         job = JobInfo(
             job_id=job_id,
             status=JobStatus.PENDING,
             stage=JobStage.INITIALIZING,
             created_at=now,
-            input_count=len(seq_regions)
+            input_count=len(seq_regions),
+            parent_job_id=parent_job_id,
+            parent_result_s3_uri=parent_job.result_s3_uri if parent_job else None,
+            input_fingerprint=input_fingerprint,
+            execution_path=(self.select_execution_path(seq_regions, parent_job_id) if self.use_step_functions
+                            else ExecutionPath.IN_PROCESS)
         )
 
+        source_job = self.find_reusable_job(input_fingerprint) if self.job_reuse_enabled else None
+        if source_job:
+            # Reference the source job's execution and results rather than running the pipeline again
+            job.source_job_id = source_job.job_id
+            job.status = source_job.status
+            job.stage = source_job.stage
+            job.execution_arn = source_job.execution_arn
+            job.result_s3_uri = source_job.result_s3_uri
+            job.sequences_processed = source_job.sequences_processed
+            job.execution_path = source_job.execution_path
+            if source_job.status == JobStatus.COMPLETED:
+                job.completed_at = now
+            log.info(f"Job {job_id} reuses {source_job.status.value.lower()} job {source_job.job_id} (identical input)")
+        elif self.use_step_functions and job.execution_path == ExecutionPath.IN_PROCESS:
+            job.lease_owner = self.instance_id
+            job.lease_renewed_at = now
+
         if self.use_step_functions:
             self._store_job_dynamodb(job)
         else:
@@ -211,6 +531,53 @@ class JobService:
         log.info(f"Created job {job_id} with {len(seq_regions)} sequences")
         return job
 
+    def find_reusable_job(self, input_fingerprint: str) -> Optional[JobInfo]:
+        """
+        Find the most recent job with a given input fingerprint whose execution can be reused.
+
+        Completed jobs are preferred over running or pending jobs, failed jobs are never reused.
+
+        Args:
+            input_fingerprint: Job input fingerprint
+
+        Returns:
+            JobInfo of the job to reuse (never itself a reusing job), or None if no reusable job was found
+        """
+        if self.use_step_functions:
+            try:
+                table = self.dynamodb.Table(self.table_name)
+                response = table.query(
+                    IndexName='input_fingerprint-created_at-index',
+                    KeyConditionExpression='input_fingerprint = :fingerprint',
+                    ExpressionAttributeValues={':fingerprint': input_fingerprint},
+                    ScanIndexForward=False,  # Most recent first
+                    Limit=25
+                )
+            except ClientError as e:
+                log.error(f"Failed to query jobs by input fingerprint: {e}")
+                return None
+            candidates = [JobInfo.from_dynamodb_item(item) for item in response.get('Items', [])]
+        else:
+            candidates = sorted(
+                (job for job in self._local_jobs.values() if job.input_fingerprint == input_fingerprint),
+                key=lambda job: job.created_at or '', reverse=True
+            )
+
+        completed = [job for job in candidates if job.status == JobStatus.COMPLETED
+                     and (job.result_s3_uri or not self.use_step_functions)]
+        active = [job for job in candidates if job.status in [JobStatus.RUNNING, JobStatus.PENDING]]
+        if not (completed or active):
+            return None
+        match = (completed or active)[0]
+
+        # Always reference the job that actually ran the pipeline
+        if match.source_job_id:
+            source_job = self.get_job(match.source_job_id)
+            if source_job and source_job.status != JobStatus.FAILED:
+                return source_job
+            return None
+        return match
+
     def start_job(self, job_id: str, seq_regions: list[dict]) -> JobInfo:
         """
         Start a pipeline job execution.
@@ -227,6 +594,203 @@ class JobService:
         else:
             return self._start_local_execution(job_id, seq_regions)
 
+    def in_process_available(self) -> bool:
+        """Check (once) whether in-process execution is enabled and its dependencies are installed."""
+        if self._in_process_available is None:
+            available = False
+            if self.in_process_enabled:
+                from local_pipeline import local_pipeline_available
+                available = local_pipeline_available(self.in_process_aligner)
+                if not available:
+                    log.warning("In-process job execution is enabled but unavailable: the seq_retrieval library"
+                                f" or aligner '{self.in_process_aligner}' is not installed")
+            self._in_process_available = available
+        return self._in_process_available
+
+    def select_execution_path(self, seq_regions: list[dict[str, Any]], parent_job_id: Optional[str] = None) -> ExecutionPath:
+        """
+        Select the path to execute a job's pipeline through.
+
+        Jobs are run in-process when in-process execution is available, the job input is
+        within the configured size thresholds, it is not an incremental alignment
+        and the in-process worker pool has capacity left. All other jobs run through Step Functions.
+
+        Args:
+            seq_regions: List of sequence region definitions
+            parent_job_id: Optional ID of the job whose alignment the new sequences are added to
+
+        Returns:
+            The execution path for the job
+        """
+        if parent_job_id or not seq_regions or len(seq_regions) > self.in_process_max_seq_regions:
+            return ExecutionPath.STEP_FUNCTIONS
+
+        try:
+            seq_length = sum(seq_region_length(seq_region) for seq_region in seq_regions)
+        except (KeyError, TypeError, ValueError):
+            return ExecutionPath.STEP_FUNCTIONS
+        if seq_length > self.in_process_max_seq_length:
+            return ExecutionPath.STEP_FUNCTIONS
+
+        if not self.in_process_available():
+            return ExecutionPath.STEP_FUNCTIONS
+
+        with self._in_process_lock:
+            if self._in_process_job_count >= self.in_process_workers + self.in_process_max_queued_jobs:
+                log.info("In-process worker pool at capacity, running job through Step Functions")
+                return ExecutionPath.STEP_FUNCTIONS
+
+        return ExecutionPath.IN_PROCESS
+
+    def submit_in_process_job(self, job_id: str, seq_regions: list[dict[str, Any]]) -> bool:
+        """
+        Queue a job to be run in-process, on the bounded in-process worker pool.
+
+        In Step Functions mode, jobs are only queued while the worker pool has capacity left.
+        Jobs that can not be queued are switched to the Step Functions execution path,
+        and must be started through `start_job` instead.
+
+        Args:
+            job_id: Job ID
+            seq_regions: List of sequence region definitions
+
+        Returns:
+            True if the job was queued, False if the worker pool was at capacity
+        """
+        executor: Optional[ThreadPoolExecutor] = None
+        with self._in_process_lock:
+            at_capacity = (self.use_step_functions
+                           and self._in_process_job_count >= self.in_process_workers + self.in_process_max_queued_jobs)
+            if not at_capacity:
+                if self._in_process_executor is None:
+                    self._in_process_executor = ThreadPoolExecutor(max_workers=max(1, self.in_process_workers),
+                                                                   thread_name_prefix='in-process-job')
+                executor = self._in_process_executor
+                self._in_process_job_count += 1
+                if self.use_step_functions:
+                    self._in_process_jobs.add(job_id)
+                    if self._lease_renewer is None:
+                        self._lease_renewer = threading.Thread(target=self._renew_in_process_leases,
+                                                               name='in-process-lease-renewer', daemon=True)
+                        self._lease_renewer.start()
+
+        if executor is None:
+            log.info(f"In-process worker pool at capacity, running job {job_id} through Step Functions")
+            self._update_job_dynamodb(job_id, execution_path=ExecutionPath.STEP_FUNCTIONS.value)
+            return False
+
+        def run() -> None:
+            try:
+                self.run_job_in_process(job_id, seq_regions)
+            finally:
+                with self._in_process_lock:
+                    self._in_process_job_count -= 1
+                    self._in_process_jobs.discard(job_id)
+
+        executor.submit(run)
+        log.info(f"Queued job {job_id} for in-process execution")
+        return True
+
+    def _renew_in_process_leases(self) -> None:
+        """Periodically renew the leases of all in-process jobs queued or running on this instance."""
+        while True:
+            time.sleep(self.in_process_lease_seconds / 3)
+            with self._in_process_lock:
+                job_ids = sorted(self._in_process_jobs)
+            renewed_at = datetime.utcnow().isoformat() + 'Z'
+            for job_id in job_ids:
+                try:
+                    self._update_job_dynamodb(job_id, lease_renewed_at=renewed_at)
+                except ClientError as e:
+                    log.warning(f"Failed to renew the lease of in-process job {job_id}: {e}")
+
+    def _in_process_lease_expired(self, job: JobInfo) -> bool:
+        """Check whether a pending or running in-process job was lost, as its lease was not renewed in time."""
+        if job.execution_path != ExecutionPath.IN_PROCESS or job.execution_arn or job.source_job_id:
+            return False
+        renewed_at = job.lease_renewed_at or job.created_at
+        if not renewed_at:
+            return False
+        lease_age = datetime.utcnow() - datetime.fromisoformat(renewed_at.rstrip('Z'))
+        return lease_age.total_seconds() > self.in_process_lease_seconds
+
+    def _fail_lost_in_process_job(self, job: JobInfo) -> None:
+        """Mark an in-process job whose lease expired as failed."""
+        log.warning(f"Lease of in-process job {job.job_id} (owner {job.lease_owner}) expired, marking job as failed")
+        self._update_job_dynamodb(
+            job.job_id,
+            status=JobStatus.FAILED,
+            stage=JobStage.ERROR,
+            completed_at=datetime.utcnow().isoformat() + 'Z',
+            error_message='In-process execution was lost (the API instance running the job stopped)'
+        )
+
+    def run_job_in_process(self, job_id: str, seq_regions: list[dict[str, Any]]) -> None:
+        """
+        Run the pipeline of a job in-process (blocking) and store its results.
+
+        In Step Functions mode, result files are uploaded to the same S3 location (and under the same names)
+        as Step Functions executions store them. In local mode, result files are written to the
+        local results directory (API_RESULTS_PATH_PREFIX). Either way, results are served identically.
+        Failures are recorded on the job record rather than raised.
+
+        Args:
+            job_id: Job ID
+            seq_regions: List of sequence region definitions
+        """
+        from local_pipeline import LOCAL_ALIGNMENT_RESULT_FILE, RESULT_FILES, run_local_pipeline
+
+        log.info(f"Running job {job_id} in-process")
+        self._update_job(job_id, status=JobStatus.RUNNING, stage=JobStage.SEQUENCE_RETRIEVAL)
+
+        def progress(stage: str, processed: int) -> None:
+            self._update_job(job_id, stage=JobStage(stage), sequences_processed=processed)
+
+        results_prefix = f'executions/{job_id}/results/'
+        try:
+            with tempfile.TemporaryDirectory(prefix=f'pavi-job-{job_id}-') as work_dir:
+                if self.use_step_functions:
+                    results_dir = os.path.join(work_dir, 'results')
+                    retrieval_workers = 1
+                    alignment_result_file = RESULT_FILES[0]
+                else:
+                    results_dir = os.path.join(os.environ.get('API_RESULTS_PATH_PREFIX', './results/'),
+                                               f'pipeline-results_{job_id}')
+                    retrieval_workers = self.local_retrieval_workers
+                    alignment_result_file = LOCAL_ALIGNMENT_RESULT_FILE
+
+                processed = run_local_pipeline(seq_regions, work_dir, results_dir, aligner=self.in_process_aligner,
+                                               progress=progress, retrieval_workers=retrieval_workers,
+                                               alignment_result_file=alignment_result_file)
+
+                if self.use_step_functions:
+                    for result_file in RESULT_FILES:
+                        self.s3.upload_file(os.path.join(results_dir, result_file), self.s3_bucket,
+                                            results_prefix + result_file)
+        except Exception as e:
+            log.error(f"In-process execution of job {job_id} failed: {e}")
+            self._update_job(
+                job_id,
+                status=JobStatus.FAILED,
+                stage=JobStage.ERROR,
+                completed_at=datetime.utcnow().isoformat() + 'Z',
+                error_message=str(e)[:1000]
+            )
+            return
+
+        result_attributes: dict[str, Any] = {}
+        if self.use_step_functions:
+            result_attributes['result_s3_uri'] = f's3://{self.s3_bucket}/{results_prefix}{RESULT_FILES[0]}'
+        self._update_job(
+            job_id,
+            status=JobStatus.COMPLETED,
+            stage=JobStage.DONE,
+            completed_at=datetime.utcnow().isoformat() + 'Z',
+            sequences_processed=processed,
+            **result_attributes
+        )
+        log.info(f"Job {job_id} completed in-process")
+
     def get_job(self, job_id: str) -> Optional[JobInfo]:
         """
         Get job information by ID.
@@ -242,6 +806,66 @@ class JobService:
         else:
             return self._local_jobs.get(job_id)
 
+    def get_jobs(self, job_ids: list[str]) -> list[JobInfo]:
+        """
+        Get job information for multiple jobs.
+
+        Cached terminal job statuses are returned from the status cache,
+        all other jobs are read from DynamoDB with BatchGetItem (in chunks of 100 keys).
+
+        Args:
+            job_ids: Job IDs
+
+        Returns:
+            List of JobInfo objects of all jobs found (in order of `job_ids`, without duplicates)
+        """
+        unique_job_ids = list(dict.fromkeys(job_ids))
+
+        if not self.use_step_functions:
+            return [self._local_jobs[job_id] for job_id in unique_job_ids if job_id in self._local_jobs]
+
+        jobs: dict[str, JobInfo] = {}
+        missing_job_ids = []
+        for job_id in unique_job_ids:
+            cached_job = self._get_cached_status(job_id)
+            if cached_job and cached_job.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+                jobs[job_id] = cached_job
+            else:
+                missing_job_ids.append(job_id)
+
+        for i in range(0, len(missing_job_ids), self.BATCH_GET_MAX_KEYS):
+            for job in self._batch_get_jobs_dynamodb(missing_job_ids[i:i + self.BATCH_GET_MAX_KEYS]):
+                jobs[job.job_id] = job
+                if job.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+                    self._cache_status(job)
+
+        return [jobs[job_id] for job_id in unique_job_ids if job_id in jobs]
+
+    def _batch_get_jobs_dynamodb(self, job_ids: list[str]) -> list[JobInfo]:
+        """Get up to 100 jobs from DynamoDB in a single BatchGetItem request (retrying unprocessed keys)."""
+        request_items: dict[str, Any] = {
+            self.table_name: {'Keys': [{'job_id': job_id} for job_id in job_ids]}
+        }
+        jobs: list[JobInfo] = []
+        for attempt in range(self.BATCH_GET_MAX_ATTEMPTS):
+            try:
+                response = self.dynamodb.batch_get_item(RequestItems=request_items)
+            except ClientError as e:
+                log.error(f"Failed to batch get jobs from DynamoDB: {e}")
+                raise JobServiceError(f"Failed to get jobs: {e}")
+
+            jobs.extend(JobInfo.from_dynamodb_item(item)
+                        for item in response.get('Responses', {}).get(self.table_name, []))
+
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                return jobs
+            # Back off exponentially before retrying throttled keys
+            time.sleep(0.05 * 2 ** attempt)
+
+        raise JobServiceError(f"Failed to get {len(request_items[self.table_name]['Keys'])} jobs"
+                              f" from DynamoDB after {self.BATCH_GET_MAX_ATTEMPTS} attempts")
+
     def get_job_result_alignment(self, job_id: str) -> Optional[bytes]:
         """
         Get alignment result for a job.
@@ -300,6 +924,157 @@ class JobService:
                     return f.read()
         return None
 
+    def open_job_result(
+        self,
+        job: JobInfo,
+        result_file: str,
+        range_header: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ) -> Optional[JobResultStream]:
+        """
+        Open a result file of a completed job for streaming.
+
+        Args:
+            job: Completed job to get the result of
+            result_file: Result file name ('alignment-output.aln' or 'aligned_seq_info.json').
+                In Step Functions mode the alignment is read from the job's `result_s3_uri`,
+                other result files from the same directory.
+            range_header: Optional HTTP Range header value, to only return part of the file
+            if_none_match: Optional HTTP If-None-Match header value, to skip returning
+                the file content when it was not modified
+
+        Returns:
+            JobResultStream, or None if the result file was not found
+
+        Raises:
+            JobResultRangeError: If the requested range cannot be satisfied
+        """
+        if job.status != JobStatus.COMPLETED:
+            return None
+
+        if self.use_step_functions and job.result_s3_uri:
+            if result_file == 'alignment-output.aln':
+                s3_uri = job.result_s3_uri
+            else:
+                # Other result files are stored in the same directory as the alignment
+                s3_uri = job.result_s3_uri.rsplit('/', 1)[0] + '/' + result_file
+            return self._open_s3_object(s3_uri, range_header, if_none_match)
+        else:
+            # Local fallback - read from filesystem
+            results_dir = os.environ.get('API_RESULTS_PATH_PREFIX', './results/')
+            results_job_id = job.source_job_id or job.job_id
+            filepath = os.path.join(results_dir, f'pipeline-results_{results_job_id}', result_file)
+            return self._open_local_file(filepath, range_header, if_none_match)
+
+    def _open_s3_object(
+        self,
+        s3_uri: str,
+        range_header: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ) -> Optional[JobResultStream]:
+        """Open an S3 object for streaming (see `open_job_result`)."""
+        if not s3_uri.startswith('s3://'):
+            return None
+        bucket, _, key = s3_uri[5:].partition('/')
+
+        # Result objects are immutable, so known ETags can be matched without any S3 request
+        with self._result_etags_lock:
+            known_etag = self._result_etags.get(s3_uri)
+            if known_etag:
+                self._result_etags.move_to_end(s3_uri)
+        if if_none_match and etag_matches(if_none_match, known_etag):
+            return JobResultStream(etag=known_etag, not_modified=True)
+
+        request_args: dict[str, Any] = {'Bucket': bucket, 'Key': key}
+        if range_header:
+            request_args['Range'] = range_header
+        if if_none_match:
+            request_args['IfNoneMatch'] = if_none_match
+
+        try:
+            response = self.s3.get_object(**request_args)
+        except ClientError as e:
+            http_status = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+            error_code = e.response.get('Error', {}).get('Code', '')
+            if http_status == 304 or error_code in ('304', 'NotModified'):
+                etag = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('etag')
+                return JobResultStream(etag=etag, not_modified=True)
+            if http_status == 416 or error_code == 'InvalidRange':
+                raise JobResultRangeError(str(range_header))
+            log.error(f"Failed to get S3 object {s3_uri}: {e}")
+            return None
+
+        etag = response.get('ETag')
+        if etag:
+            with self._result_etags_lock:
+                self._result_etags[s3_uri] = etag
+                while len(self._result_etags) > self.result_etag_cache_max_entries:
+                    self._result_etags.popitem(last=False)
+
+        return JobResultStream(
+            etag=etag,
+            chunks=response['Body'].iter_chunks(chunk_size=self.result_chunk_size),
+            content_length=int(response.get('ContentLength', 0)),
+            content_range=response.get('ContentRange'),
+            close=response['Body'].close
+        )
+
+    def _open_local_file(
+        self,
+        filepath: str,
+        range_header: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ) -> Optional[JobResultStream]:
+        """Open a local file for streaming (see `open_job_result`)."""
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if if_none_match and etag_matches(if_none_match, etag):
+            return JobResultStream(etag=etag, not_modified=True)
+
+        start, end = 0, stat.st_size - 1
+        content_range = None
+        if range_header:
+            start, end = parse_byte_range(range_header, stat.st_size)
+            content_range = f'bytes {start}-{end}/{stat.st_size}'
+
+        def read_chunks() -> Iterator[bytes]:
+            remaining = end - start + 1
+            with open(filepath, 'rb') as f:
+                f.seek(start)
+                while remaining > 0:
+                    chunk = f.read(min(self.result_chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+        return JobResultStream(
+            etag=etag,
+            chunks=read_chunks(),
+            content_length=max(0, end - start + 1),
+            content_range=content_range
+        )
+
+    def retrieval_chunk_size(self, input_count: int) -> int:
+        """
+        Get the number of input regions to retrieve per seq retrieval job.
+
+        Chunks are sized so that the input regions are spread over
+        (at most) `retrieval_target_parallelism` retrieval jobs.
+
+        Args:
+            input_count: Number of input regions of the job
+
+        Returns:
+            Number of input regions per retrieval chunk (at least 1)
+        """
+        parallelism = max(1, self.retrieval_target_parallelism)
+        return max(1, math.ceil(input_count / parallelism))
+
     # Private helper methods
 
     def _store_job_dynamodb(self, job: JobInfo) -> None:
@@ -312,9 +1087,24 @@ class JobService:
                 'stage': job.stage.value if job.stage else None,
                 'created_at': job.created_at,
                 'input_count': job.input_count,
+                'parent_job_id': job.parent_job_id,
                 # TTL: 30 days from creation
                 'ttl': int((datetime.utcnow() + timedelta(days=30)).timestamp())
             }
+            # Optional attributes (index keys can not be stored as null)
+            optional_attributes = {
+                'input_fingerprint': job.input_fingerprint,
+                'source_job_id': job.source_job_id,
+                'execution_path': job.execution_path.value if job.execution_path else None,
+                'execution_arn': job.execution_arn,
+                'result_s3_uri': job.result_s3_uri,
+                'parent_result_s3_uri': job.parent_result_s3_uri,
+                'lease_owner': job.lease_owner,
+                'lease_renewed_at': job.lease_renewed_at,
+                'completed_at': job.completed_at,
+                'sequences_processed': job.sequences_processed or None
+            }
+            item.update({key: value for key, value in optional_attributes.items() if value is not None})
             table.put_item(Item=item)
         except ClientError as e:
             log.error(f"Failed to store job in DynamoDB: {e}")
@@ -330,22 +1120,32 @@ class JobService:
             if not item:
                 return None
 
-            return JobInfo(
-                job_id=item['job_id'],
-                status=JobStatus(item['status']),
-                stage=JobStage(item.get('stage')) if item.get('stage') else None,
-                created_at=item.get('created_at'),
-                completed_at=item.get('completed_at'),
-                input_count=int(item.get('input_count', 0)),
-                sequences_processed=int(item.get('sequences_processed', 0)),
-                result_s3_uri=item.get('result_s3_uri'),
-                error_message=item.get('error_message'),
-                execution_arn=item.get('execution_arn')
-            )
+            return JobInfo.from_dynamodb_item(item)
         except ClientError as e:
             log.error(f"Failed to get job from DynamoDB: {e}")
             return None
 
+    def _update_job(
+        self,
+        job_id: str,
+        status: Optional[JobStatus] = None,
+        stage: Optional[JobStage] = None,
+        **kwargs: Any
+    ) -> None:
+        """Update a job, in DynamoDB or (in local mode) in memory."""
+        if self.use_step_functions:
+            self._update_job_dynamodb(job_id, status=status, stage=stage, **kwargs)
+            return
+
+        job = self._local_jobs.get(job_id)
+        if job:
+            if status:
+                job.status = status
+            if stage:
+                job.stage = stage
+            for key, value in kwargs.items():
+                setattr(job, key, value)
+
     def _update_job_dynamodb(
         self,
         job_id: str,
@@ -389,6 +1189,8 @@ class JobService:
         except ClientError as e:
             log.error(f"Failed to update job in DynamoDB: {e}")
             raise
+        finally:
+            self._invalidate_cached_status(job_id)
 
     def _start_step_functions_execution(
         self, job_id: str, seq_regions: list[dict]
@@ -400,9 +1202,22 @@ class JobService:
         execution_input = {
             'job_id': job_id,
             'seq_regions': seq_regions,
-            'job_queue_arn': self.job_queue_arn
+            'job_queue_arn': self.job_queue_arn,
+            'retrieval_chunk_size': self.retrieval_chunk_size(len(seq_regions)),
+            # Empty values run a full (non-incremental) alignment
+            'parent_alignment_s3_uri': '',
+            'parent_results_s3_prefix': ''
         }
 
+        job = self._get_job_dynamodb(job_id)
+        if job and job.parent_job_id:
+            if job.parent_result_s3_uri:
+                execution_input['parent_alignment_s3_uri'] = job.parent_result_s3_uri
+                execution_input['parent_results_s3_prefix'] = job.parent_result_s3_uri.rsplit('/', 1)[0] + '/'
+            else:
+                log.warning(f"No parent alignment found for job {job_id} (parent {job.parent_job_id}),"
+                            " running full alignment.")
+
         try:
             response = self.sfn.start_execution(
                 stateMachineArn=self.state_machine_arn,
@@ -436,13 +1251,23 @@ class JobService:
 
     def _start_local_execution(self, job_id: str, seq_regions: list[dict]) -> JobInfo:
         """
-        Start a local execution (fallback for development).
-        This uses the existing Nextflow subprocess approach.
+        Start a local execution (fallback for development, CI and performance testing).
+
+        The pipeline is run in-process (see `run_job_in_process`) on the in-process worker pool,
+        retrieving sequences on a pool of `local_retrieval_workers` processes, without
+        requiring AWS, Nextflow or Docker.
+
+        Returns:
+            Snapshot of the started job
         """
         job = self._local_jobs.get(job_id)
         if job:
             job.status = JobStatus.RUNNING
             job.stage = JobStage.SEQUENCE_RETRIEVAL
+            job.execution_path = ExecutionPath.IN_PROCESS
+            started_job = copy.copy(job)
+            self.submit_in_process_job(job_id, seq_regions)
+            return started_job
         return job
 
     def _get_s3_object(self, s3_uri: str) -> Optional[bytes]:
@@ -463,7 +1288,7 @@ class JobService:
             log.error(f"Failed to get S3 object {s3_uri}: {e}")
             return None
 
-    def sync_job_status(self, job_id: str) -> Optional[JobInfo]:
+    def sync_job_status(self, job_id: str, job: Optional[JobInfo] = None) -> Optional[JobInfo]:
         """
         Synchronize job status from Step Functions execution state.
 
@@ -472,11 +1297,13 @@ class JobService:
 
         Args:
             job_id: Job ID to sync
+            job: Optional job record already read from DynamoDB (to sync without reading it again)
 
         Returns:
             Updated JobInfo or None if job not found
         """
-        job = self._get_job_dynamodb(job_id)
+        if job is None:
+            job = self._get_job_dynamodb(job_id)
         if not job:
             return None
 
@@ -485,6 +1312,12 @@ class JobService:
             return job
 
         if not job.execution_arn:
+            if job.source_job_id:
+                # Reusing job attached before the source job's execution started
+                return self._sync_from_source_job(job)
+            if self._in_process_lease_expired(job):
+                self._fail_lost_in_process_job(job)
+                return self._get_job_dynamodb(job_id)
             return job
 
         try:
@@ -492,57 +1325,14 @@ class JobService:
                 executionArn=job.execution_arn
             )
 
-            sf_status = response.get('status', 'RUNNING')
-            now = datetime.utcnow().isoformat() + 'Z'
-
-            if sf_status == 'SUCCEEDED':
-                # Parse output to get result S3 URI
-                output = json.loads(response.get('output', '{}'))
-                result_uri = output.get('result_s3_uri')
-
-                self._update_job_dynamodb(
-                    job_id,
-                    status=JobStatus.COMPLETED,
-                    stage=JobStage.DONE,
-                    completed_at=now,
-                    result_s3_uri=result_uri
-                )
-                log.info(f"Job {job_id} completed successfully")
-
-            elif sf_status == 'FAILED':
-                # Extract error information
-                error = response.get('error', 'Unknown error')
-                cause = response.get('cause', 'No details available')
-                error_msg = f"{error}: {cause}"
-
-                self._update_job_dynamodb(
-                    job_id,
-                    status=JobStatus.FAILED,
-                    stage=JobStage.ERROR,
-                    completed_at=now,
-                    error_message=error_msg[:1000]  # Truncate to fit DynamoDB
-                )
-                log.error(f"Job {job_id} failed: {error_msg}")
-
-            elif sf_status == 'TIMED_OUT':
-                self._update_job_dynamodb(
-                    job_id,
-                    status=JobStatus.FAILED,
-                    stage=JobStage.ERROR,
-                    completed_at=now,
-                    error_message='Execution timed out'
-                )
-                log.error(f"Job {job_id} timed out")
-
-            elif sf_status == 'ABORTED':
-                self._update_job_dynamodb(
-                    job_id,
-                    status=JobStatus.FAILED,
-                    stage=JobStage.ERROR,
-                    completed_at=now,
-                    error_message='Execution was aborted'
-                )
-                log.warning(f"Job {job_id} was aborted")
+            if not self._apply_execution_status(
+                job_id,
+                sf_status=response.get('status', 'RUNNING'),
+                output=response.get('output'),
+                error=response.get('error'),
+                cause=response.get('cause')
+            ):
+                return job
 
             # Return the updated job
             return self._get_job_dynamodb(job_id)
@@ -551,27 +1341,302 @@ class JobService:
             log.error(f"Failed to sync job status for {job_id}: {e}")
             return job
 
-    def get_job_with_sync(self, job_id: str) -> Optional[JobInfo]:
+    def _sync_from_source_job(self, job: JobInfo) -> JobInfo:
+        """Copy the execution (status) of a job's source job, once the source job's execution started."""
+        source_job = self._get_job_dynamodb(str(job.source_job_id))
+        if not source_job or (not source_job.execution_arn and source_job.status == job.status):
+            return job
+
+        updates: dict[str, Any] = {
+            key: value for key, value in {
+                'execution_arn': source_job.execution_arn,
+                'result_s3_uri': source_job.result_s3_uri,
+                'error_message': source_job.error_message,
+                'completed_at': source_job.completed_at
+            }.items() if value is not None
+        }
+        self._update_job_dynamodb(job.job_id, status=source_job.status, stage=source_job.stage, **updates)
+        return self._get_job_dynamodb(job.job_id) or job
+
+    def _apply_execution_status(
+        self,
+        job_id: str,
+        sf_status: str,
+        output: Optional[str] = None,
+        error: Optional[str] = None,
+        cause: Optional[str] = None
+    ) -> bool:
+        """
+        Update a job record according to the (terminal) status of its Step Functions execution.
+
+        Args:
+            job_id: Job ID
+            sf_status: Step Functions execution status
+            output: Execution output (JSON string), for succeeded executions
+            error: Execution error, for failed executions
+            cause: Execution failure cause, for failed executions
+
+        Returns:
+            True if the job record was updated, False if the execution is still running
+        """
+        now = datetime.utcnow().isoformat() + 'Z'
+
+        if sf_status == 'SUCCEEDED':
+            # Parse output to get result S3 URI
+            result_uri = json.loads(output or '{}').get('result_s3_uri')
+
+            self._update_job_dynamodb(
+                job_id,
+                status=JobStatus.COMPLETED,
+                stage=JobStage.DONE,
+                completed_at=now,
+                result_s3_uri=result_uri
+            )
+            log.info(f"Job {job_id} completed successfully")
+
+        elif sf_status == 'FAILED':
+            # Extract error information
+            error_msg = f"{error or 'Unknown error'}: {cause or 'No details available'}"
+
+            self._update_job_dynamodb(
+                job_id,
+                status=JobStatus.FAILED,
+                stage=JobStage.ERROR,
+                completed_at=now,
+                error_message=error_msg[:1000]  # Truncate to fit DynamoDB
+            )
+            log.error(f"Job {job_id} failed: {error_msg}")
+
+        elif sf_status == 'TIMED_OUT':
+            self._update_job_dynamodb(
+                job_id,
+                status=JobStatus.FAILED,
+                stage=JobStage.ERROR,
+                completed_at=now,
+                error_message='Execution timed out'
+            )
+            log.error(f"Job {job_id} timed out")
+
+        elif sf_status == 'ABORTED':
+            self._update_job_dynamodb(
+                job_id,
+                status=JobStatus.FAILED,
+                stage=JobStage.ERROR,
+                completed_at=now,
+                error_message='Execution was aborted'
+            )
+            log.warning(f"Job {job_id} was aborted")
+
+        else:
+            return False
+
+        return True
+
+    def list_active_jobs(self) -> list[JobInfo]:
+        """
+        List all pending and running jobs, using the status index of the jobs table.
+
+        Returns:
+            List of JobInfo objects
+        """
+        if not self.use_step_functions:
+            return [job for job in self._local_jobs.values()
+                    if job.status in [JobStatus.RUNNING, JobStatus.PENDING]]
+
+        table = self.dynamodb.Table(self.table_name)
+        jobs: list[JobInfo] = []
+        for status in [JobStatus.PENDING, JobStatus.RUNNING]:
+            query_args: dict[str, Any] = {
+                'IndexName': 'status-created_at-index',
+                'KeyConditionExpression': '#status = :status',
+                'ExpressionAttributeNames': {'#status': 'status'},
+                'ExpressionAttributeValues': {':status': status.value}
+            }
+            while True:
+                response = table.query(**query_args)
+                jobs.extend(JobInfo.from_dynamodb_item(item) for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        return jobs
+
+    def _list_running_execution_arns(self) -> set[str]:
+        """List the ARNs of all running executions of the state machine."""
+        running_arns: set[str] = set()
+        paginator = self.sfn.get_paginator('list_executions')
+        for page in paginator.paginate(stateMachineArn=self.state_machine_arn, statusFilter='RUNNING'):
+            running_arns.update(execution['executionArn'] for execution in page.get('executions', []))
+        return running_arns
+
+    def reconcile_active_jobs(self) -> int:
+        """
+        Synchronize the status of all pending and running jobs with their Step Functions executions.
+
+        In-process jobs whose lease expired (as the API instance running them stopped) are marked as failed.
+
+        Rather than describing every execution, all running executions are listed
+        in (paginated) batches, and only executions no longer running are described.
+
+        Returns:
+            Number of job records updated
+        """
+        if not self.use_step_functions:
+            return 0
+
+        active_jobs = []
+        updated = 0
+        for job in self.list_active_jobs():
+            if job.execution_arn:
+                active_jobs.append(job)
+            elif job.source_job_id:
+                # Reusing jobs attached before their source job's execution started
+                if self._sync_from_source_job(job).status != job.status:
+                    updated += 1
+            elif self._in_process_lease_expired(job):
+                # In-process jobs of API instances that stopped
+                self._fail_lost_in_process_job(job)
+                updated += 1
+        if not active_jobs:
+            return updated
+
+        running_arns = self._list_running_execution_arns()
+
+        for job in active_jobs:
+            if job.execution_arn in running_arns:
+                continue
+            try:
+                response = self.sfn.describe_execution(executionArn=job.execution_arn)
+                if self._apply_execution_status(
+                    job.job_id,
+                    sf_status=response.get('status', 'RUNNING'),
+                    output=response.get('output'),
+                    error=response.get('error'),
+                    cause=response.get('cause')
+                ):
+                    updated += 1
+            except ClientError as e:
+                log.error(f"Failed to reconcile job status for {job.job_id}: {e}")
+
+        log.debug(f"Reconciled {len(active_jobs)} active jobs, {updated} updated")
+        return updated
+
+    def apply_execution_event(self, event: dict[str, Any]) -> bool:
+        """
+        Apply a Step Functions "Execution Status Change" (EventBridge) event to its job record.
+
+        Args:
+            event: Decoded EventBridge event
+
+        Returns:
+            True if a job record was updated, False if the event was not applicable
+        """
+        detail = event.get('detail', {})
+        execution_name = detail.get('name', '')
+        if not execution_name.startswith('pavi-job-'):
+            log.debug(f"Ignoring event for unknown execution {execution_name}")
+            return False
+        job_id = execution_name[len('pavi-job-'):]
+
+        job = self._get_job_dynamodb(job_id)
+        if not job or job.status not in [JobStatus.RUNNING, JobStatus.PENDING]:
+            return False
+
+        return self._apply_execution_status(
+            job_id,
+            sf_status=detail.get('status', 'RUNNING'),
+            output=detail.get('output'),
+            error=detail.get('error'),
+            cause=detail.get('cause')
+        )
+
+    def get_job_with_sync(self, job_id: str, job: Optional[JobInfo] = None) -> Optional[JobInfo]:
         """
         Get job information with automatic status synchronization.
 
         For running jobs, this will check the Step Functions execution
-        and update the job status before returning.
+        and update the job status before returning, unless job statuses are
+        synchronized in the background (see `background_sync`).
+
+        Results are cached: non-terminal job statuses for `status_cache_ttl` seconds,
+        terminal (completed or failed) job statuses indefinitely. Concurrent calls for
+        the same job ID are coalesced into a single lookup and synchronization.
 
         Args:
             job_id: Job ID
+            job: Optional job record already read from DynamoDB (e.g. by `get_jobs`),
+                to sync without reading it again
 
         Returns:
             JobInfo object or None if not found
         """
-        if self.use_step_functions:
-            job = self._get_job_dynamodb(job_id)
-            if job and job.status in [JobStatus.RUNNING, JobStatus.PENDING]:
+        if not self.use_step_functions:
+            return self._local_jobs.get(job_id)
+
+        cached_job = self._get_cached_status(job_id)
+        if cached_job:
+            return cached_job
+
+        with self._job_sync_lock(job_id):
+            # Another caller may have synced the job while waiting for the lock
+            cached_job = self._get_cached_status(job_id)
+            if cached_job:
+                return cached_job
+
+            if job is None:
+                job = self._get_job_dynamodb(job_id)
+            if job and job.status in [JobStatus.RUNNING, JobStatus.PENDING] and not self.background_sync:
                 # Sync status from Step Functions
-                return self.sync_job_status(job_id)
+                job = self.sync_job_status(job_id, job)
+
+            if job:
+                self._cache_status(job)
             return job
-        else:
-            return self._local_jobs.get(job_id)
+
+    def _get_cached_status(self, job_id: str) -> Optional[JobInfo]:
+        """Get a job from the status cache, if cached and not expired."""
+        with self._status_cache_lock:
+            cached = self._status_cache.get(job_id)
+            if not cached:
+                return None
+
+            cached_at, job = cached
+            if job.status in [JobStatus.RUNNING, JobStatus.PENDING] \
+               and time.monotonic() - cached_at > self.status_cache_ttl:
+                del self._status_cache[job_id]
+                return None
+
+            self._status_cache.move_to_end(job_id)
+            return job
+
+    def _cache_status(self, job: JobInfo) -> None:
+        """Add a job to the status cache."""
+        with self._status_cache_lock:
+            self._status_cache[job.job_id] = (time.monotonic(), job)
+            self._status_cache.move_to_end(job.job_id)
+            while len(self._status_cache) > self.status_cache_max_entries:
+                self._status_cache.popitem(last=False)
+
+    def _invalidate_cached_status(self, job_id: str) -> None:
+        """Remove a job from the status cache."""
+        with self._status_cache_lock:
+            self._status_cache.pop(job_id, None)
+
+    @contextmanager
+    def _job_sync_lock(self, job_id: str) -> Iterator[None]:
+        """Hold the sync lock of a job, coalescing concurrent syncs of the same job."""
+        with self._status_cache_lock:
+            lock_entry = self._sync_locks.setdefault(job_id, [threading.Lock(), 0])
+            lock_entry[1] += 1
+
+        try:
+            with lock_entry[0]:
+                yield
+        finally:
+            with self._status_cache_lock:
+                lock_entry[1] -= 1
+                if lock_entry[1] == 0:
+                    del self._sync_locks[job_id]
 
 
 # Singleton instance for the API
@@ -0,0 +1,150 @@
+"""
+Background job status poller for PAVI API.
+
+Keeps the job records in DynamoDB up to date with their Step Functions executions,
+independent of API clients polling for job status. Optionally ingests Step Functions
+"Execution Status Change" events (delivered by EventBridge to an SQS queue) to pick up
+execution status changes without waiting for the next reconciliation.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from job_service import JobService
+from log_mgmt.log_manager import get_logger
+
+log = get_logger(__name__)
+
+
+class JobStatusPoller:
+    """
+    Background thread reconciling the status of active jobs.
+
+    Every `interval` seconds, all pending and running jobs are reconciled
+    with their Step Functions executions in one batch. When an events queue is
+    configured, execution status change events are consumed in between reconciliations.
+    """
+
+    def __init__(
+        self,
+        job_service: JobService,
+        interval: Optional[float] = None,
+        events_queue_url: Optional[str] = None
+    ):
+        """
+        Initialize the job status poller.
+
+        Args:
+            job_service: Job service to reconcile the jobs of
+            interval: Seconds between reconciliations of all active jobs
+            events_queue_url: Optional SQS queue URL to receive Step Functions execution events from
+        """
+        self.job_service = job_service
+        self.interval = interval if interval is not None else float(os.environ.get(
+            'JOB_STATUS_POLL_INTERVAL_SECONDS', '15'
+        ))
+        self.events_queue_url = events_queue_url or os.environ.get('JOB_STATUS_EVENTS_QUEUE_URL')
+
+        self._sqs = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def sqs(self) -> Any:
+        """Lazy initialization of SQS client."""
+        if self._sqs is None:
+            self._sqs = boto3.client('sqs')
+        return self._sqs
+
+    def start(self) -> None:
+        """Start polling in a background (daemon) thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self.job_service.background_sync = True
+        self._thread = threading.Thread(target=self._run, name='job-status-poller', daemon=True)
+        self._thread.start()
+        log.info(f"Started job status poller (interval {self.interval}s, "
+                 f"events queue: {self.events_queue_url or 'none'})")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread, returning job status synchronization to API requests."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.job_service.background_sync = False
+        log.info("Stopped job status poller")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.poll_once()
+
+            if self.events_queue_url:
+                # Consume events until the next reconciliation is due
+                deadline = time.monotonic() + self.interval
+                while not self._stop_event.is_set() and time.monotonic() < deadline:
+                    try:
+                        self.ingest_events(wait_seconds=min(20, max(1, int(deadline - time.monotonic()))))
+                    except Exception as e:
+                        log.error(f"Failed to ingest execution events: {e}")
+                        self._stop_event.wait(self.interval)
+            else:
+                self._stop_event.wait(self.interval)
+
+    def poll_once(self) -> int:
+        """
+        Reconcile all active jobs once.
+
+        Returns:
+            Number of job records updated
+        """
+        try:
+            return self.job_service.reconcile_active_jobs()
+        except Exception as e:
+            log.error(f"Failed to reconcile active jobs: {e}")
+            return 0
+
+    def ingest_events(self, wait_seconds: int = 0) -> int:
+        """
+        Receive and apply a batch of Step Functions execution status change events.
+
+        Args:
+            wait_seconds: Long polling wait time (in seconds) for the SQS receive call
+
+        Returns:
+            Number of job records updated
+        """
+        if not self.events_queue_url:
+            return 0
+
+        response = self.sqs.receive_message(
+            QueueUrl=self.events_queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=wait_seconds
+        )
+
+        updated = 0
+        for message in response.get('Messages', []):
+            try:
+                event: dict[str, Any] = json.loads(message['Body'])
+                if self.job_service.apply_execution_event(event):
+                    updated += 1
+            except (ValueError, KeyError, ClientError) as e:
+                # Leave the message on the queue to be retried (or dead-lettered)
+                log.error(f"Failed to apply execution event {message.get('MessageId')}: {e}")
+                continue
+
+            self.sqs.delete_message(
+                QueueUrl=self.events_queue_url,
+                ReceiptHandle=message['ReceiptHandle']
+            )
+
+        return updated
@@ -0,0 +1,241 @@
+"""
+In-process pipeline execution for PAVI API.
+
+Runs the alignment pipeline within the API process, rather than through Step Functions
+and AWS Batch: sequences are retrieved through the seq_retrieval library, aligned by a locally
+installed aligner and their sequence info aligned through `seq_info_align`.
+Result files are written under the same names as Step Functions executions store them
+(other than the alignment in local results directories, see `LOCAL_ALIGNMENT_RESULT_FILE`).
+
+The seq_retrieval library (pipeline_components/seq_retrieval/src) must be importable
+and the aligner executable must be on the PATH for in-process execution to be available.
+"""
+
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Optional
+
+from log_mgmt.log_manager import get_logger
+
+log = get_logger(__name__)
+
+# Result file names, as the Step Functions alignment and seq info align steps store them
+ALIGNMENT_RESULT_FILE = 'alignment.aln'
+SEQ_INFO_RESULT_FILE = 'aligned_seq_info.json'
+RESULT_FILES = (ALIGNMENT_RESULT_FILE, SEQ_INFO_RESULT_FILE)
+# Alignment result file name in local results directories (API_RESULTS_PATH_PREFIX), as the Nextflow pipeline writes it
+LOCAL_ALIGNMENT_RESULT_FILE = 'alignment-output.aln'
+
+SUPPORTED_ALIGNERS = ('clustalo', 'mafft')
+
+# Pipeline stages reported to progress callbacks (matching job_service.JobStage values)
+STAGE_SEQUENCE_RETRIEVAL = 'SEQUENCE_RETRIEVAL'
+STAGE_ALIGNMENT = 'ALIGNMENT'
+STAGE_COLLECTING_RESULTS = 'COLLECTING_RESULTS'
+
+ProgressCallback = Callable[[str, int], None]
+"""Called with the current pipeline stage and the number of sequences processed so far."""
+
+# Reference files are fetched once per process (and cached in memory by the seq_retrieval data mover).
+# Fetching is serialized, as concurrent fetches of the same (remote) file would overwrite each other.
+_reference_files_lock = threading.Lock()
+
+
+class LocalPipelineError(Exception):
+    """Exception raised when an in-process pipeline run fails."""
+    pass
+
+
+def local_pipeline_available(aligner: str) -> bool:
+    """
+    Check whether the pipeline can be run in-process.
+
+    Args:
+        aligner: Aligner to run the alignment with (one of `SUPPORTED_ALIGNERS`)
+
+    Returns:
+        True if the seq_retrieval library can be imported and the aligner is installed
+    """
+    if aligner not in SUPPORTED_ALIGNERS or shutil.which(aligner) is None:
+        return False
+    try:
+        import seq_retrieval  # type: ignore  # noqa: F401
+        import seq_info_align  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def aligner_command(aligner: str, input_file: str, output_file: str) -> list[str]:
+    """
+    Get the command to align the sequences of a FASTA file to a clustal-formatted output file.
+
+    Uses the same aligner settings as the pipeline's alignment step. mafft writes the
+    alignment to stdout, which must be redirected to `output_file` by the caller.
+    """
+    if aligner == 'mafft':
+        return ['mafft', '--quiet', '--localpair', '--maxiterate', '1000', '--clustalout', input_file]
+    if aligner == 'clustalo':
+        return ['clustalo', '-i', input_file, '-o', output_file, '--outfmt=clu', '--threads=2', '--force']
+    raise ValueError(f"Unsupported aligner '{aligner}', must be one of {SUPPORTED_ALIGNERS}")
+
+
+def fetch_reference_files(seq_regions: list[dict[str, Any]]) -> None:
+    """Fetch the (faidx-indexed) reference FASTA files of all seq regions, if not fetched before."""
+    from seq_region import get_reference_genome  # type: ignore
+
+    with _reference_files_lock:
+        for fasta_file_url in sorted({seq_region['fasta_file_url'] for seq_region in seq_regions}):
+            get_reference_genome(fasta_file_url).fetch_files()
+
+
+def init_retrieval_worker() -> None:
+    """Initialize a retrieval worker process to reuse the reference files fetched by the parent process."""
+    from data_mover import data_file_mover  # type: ignore
+
+    data_file_mover.set_local_cache_reuse(True)
+
+
+def retrieve_sequences(seq_region: dict[str, Any], output_dir: str, output_type: str = 'protein') -> None:
+    """
+    Retrieve the sequence(s) of a single seq region (pipeline entry), as the seq_retrieval CLI does.
+
+    Writes `{unique_entry_id}-{output_type}.fa` and `{unique_entry_id}-seqinfo.json` to `output_dir`.
+    """
+    from seq_retrieval import normalise_strand, parse_seq_regions, retrieve_entry  # type: ignore
+
+    retrieve_entry(seq_id=seq_region['seq_id'],
+                   seq_strand=normalise_strand(seq_region.get('seq_strand') or '+'),
+                   exon_seq_regions=parse_seq_regions(list(seq_region['exon_seq_regions'])),
+                   cds_seq_regions=parse_seq_regions(list(seq_region.get('cds_seq_regions') or [])),
+                   variant_ids=set(seq_region.get('variant_ids') or []),
+                   alt_seq_name_suffix=seq_region.get('alt_seq_name_suffix') or '_alt',
+                   fasta_file_url=seq_region['fasta_file_url'],
+                   output_type=output_type,
+                   base_seq_name=seq_region['base_seq_name'],
+                   unique_entry_id=seq_region['unique_entry_id'],
+                   output_dir=output_dir)
+
+
+def run_alignment(aligner: str, input_file: str, output_file: str) -> None:
+    """
+    Align the sequences of a FASTA file, writing the (clustal-formatted) alignment to `output_file`.
+
+    Raises:
+        LocalPipelineError: If the aligner failed.
+    """
+    command = aligner_command(aligner, input_file, output_file)
+    log.debug(f"Running alignment: {' '.join(command)}")
+
+    with open(output_file, 'wb') if aligner == 'mafft' else open(os.devnull, 'wb') as stdout:
+        result = subprocess.run(command, stdout=stdout, stderr=subprocess.PIPE)
+
+    if result.returncode != 0:
+        raise LocalPipelineError(f"Alignment with {aligner} failed (exit code {result.returncode}): "
+                                 + result.stderr.decode(errors='replace')[-500:])
+
+
+def run_local_pipeline(
+    seq_regions: list[dict[str, Any]],
+    work_dir: str,
+    results_dir: str,
+    aligner: str = 'clustalo',
+    progress: Optional[ProgressCallback] = None,
+    retrieval_workers: int = 1,
+    alignment_result_file: str = ALIGNMENT_RESULT_FILE
+) -> int:
+    """
+    Run the complete alignment pipeline in-process.
+
+    Args:
+        seq_regions: Seq regions (pipeline entries) to retrieve and align
+        work_dir: Directory to write intermediate files to
+        results_dir: Directory to write the result files (`RESULT_FILES`) to
+        aligner: Aligner to run the alignment with (one of `SUPPORTED_ALIGNERS`)
+        progress: Optional callback, called on every stage change and on every processed seq region
+        retrieval_workers: Number of processes to retrieve sequences with
+            (retrieval runs in the calling thread when 1)
+        alignment_result_file: Name to write the alignment result file under
+
+    Returns:
+        Number of sequences processed
+
+    Raises:
+        LocalPipelineError: If any of the pipeline steps failed.
+    """
+    from seq_info_align import align_seq_info, write_aligned_seq_info  # type: ignore
+
+    def report(stage: str, processed: int) -> None:
+        if progress:
+            progress(stage, processed)
+
+    os.makedirs(work_dir, exist_ok=True)
+    os.makedirs(results_dir, exist_ok=True)
+
+    # Sequence retrieval
+    report(STAGE_SEQUENCE_RETRIEVAL, 0)
+    try:
+        fetch_reference_files(seq_regions)
+    except Exception as e:
+        raise LocalPipelineError(f"Failed to fetch reference files: {e}")
+
+    failed_entries: list[str] = []
+
+    def retrieval_failed(seq_region: dict[str, Any], error: Exception) -> None:
+        log.error(f"Failed to retrieve sequences for entry {seq_region['unique_entry_id']}: {error}")
+        failed_entries.append(seq_region['unique_entry_id'])
+
+    if retrieval_workers > 1 and len(seq_regions) > 1:
+        # Worker processes are started from a forkserver rather than forked, as forking this (multi-threaded)
+        # process could copy locks held by other threads into the workers, deadlocking them
+        with ProcessPoolExecutor(max_workers=min(retrieval_workers, len(seq_regions)),
+                                 mp_context=multiprocessing.get_context('forkserver'),
+                                 initializer=init_retrieval_worker) as executor:
+            futures = {executor.submit(retrieve_sequences, seq_region, work_dir): seq_region
+                       for seq_region in seq_regions}
+            for processed, future in enumerate(as_completed(futures), start=1):
+                try:
+                    future.result()
+                except Exception as e:
+                    retrieval_failed(futures[future], e)
+                report(STAGE_SEQUENCE_RETRIEVAL, processed)
+    else:
+        for processed, seq_region in enumerate(seq_regions, start=1):
+            try:
+                retrieve_sequences(seq_region, work_dir)
+            except Exception as e:
+                retrieval_failed(seq_region, e)
+            report(STAGE_SEQUENCE_RETRIEVAL, processed)
+
+    if failed_entries:
+        raise LocalPipelineError(f"Sequence retrieval failed for {len(failed_entries)} of"
+                                 f" {len(seq_regions)} entries: {failed_entries}")
+
+    # Alignment, of all retrieved sequences combined (in input order)
+    report(STAGE_ALIGNMENT, len(seq_regions))
+    alignment_input_file = os.path.join(work_dir, 'alignment-input.fa')
+    with open(alignment_input_file, 'w') as alignment_input:
+        for seq_region in seq_regions:
+            fasta_file = os.path.join(work_dir, f"{seq_region['unique_entry_id']}-protein.fa")
+            if os.path.exists(fasta_file):
+                with open(fasta_file, 'r') as f:
+                    alignment_input.write(f.read())
+
+    alignment_file = os.path.join(results_dir, alignment_result_file)
+    run_alignment(aligner, alignment_input_file, alignment_file)
+
+    # Sequence info alignment
+    report(STAGE_COLLECTING_RESULTS, len(seq_regions))
+    seq_info_files = [os.path.join(work_dir, f"{seq_region['unique_entry_id']}-seqinfo.json")
+                      for seq_region in seq_regions]
+    try:
+        aligned_seq_info = align_seq_info(seq_info_files, alignment_file)
+    except ValueError as e:
+        raise LocalPipelineError(str(e))
+    write_aligned_seq_info(aligned_seq_info, os.path.join(results_dir, SEQ_INFO_RESULT_FILE))
+
+    return len(seq_regions)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, BackgroundTasks, FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
-from io import StringIO, BytesIO
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, BackgroundTasks, FastAPI, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from io import StringIO
 from os import getenv
 from pydantic import BaseModel
 
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Optional
 
+import asyncio
+import functools
 import json
 import subprocess
 from uuid import uuid1, UUID
@@ -15,9 +18,13 @@ from log_mgmt import get_logger
 
 # Import the new job service
 from job_service import (
-    get_job_service, JobService, JobInfo, JobStatus as SFJobStatus,
-    JobServiceError, JobNotFoundError, JobExecutionError, JobResultNotReadyError
+    get_job_service, JobService, JobInfo, JobStatus as SFJobStatus, ExecutionPath,
+    JobServiceError, JobNotFoundError, JobExecutionError, JobResultNotReadyError, JobResultRangeError, JobResultStream
 )
+from job_status_poller import JobStatusPoller
+from job_scheduler import JobQueueFullError, JobScheduler
+from job_events import JobEventBroker
+from aws_io import run_aws_io
 
 # Import configuration module
 from config import get_api_config, should_use_step_functions, Environment
@@ -35,6 +42,9 @@ api_pipeline_image_tag = _config.pipeline_image_tag
 # Feature flag for Step Functions mode (from config)
 USE_STEP_FUNCTIONS = _config.pipeline.use_step_functions
 
+# Maximum number of jobs per batch job status request
+MAX_STATUS_BATCH_SIZE = 1000
+
 
 class Pipeline_seq_region(BaseModel):
     base_seq_name: str
@@ -57,6 +67,11 @@ class Pipeline_job(BaseModel):
     input_count: Optional[int] = None
     sequences_processed: Optional[int] = None
     error_message: Optional[str] = None
+    parent_job_id: Optional[UUID] = None
+    source_job_id: Optional[UUID] = None
+    execution_path: Optional[str] = None
+    # Position in the job queue, while waiting to be started (legacy Nextflow mode)
+    queue_position: Optional[int] = None
 
     def __init__(self, uuid: UUID, **data: Any):
         super().__init__(uuid=uuid, name=f'pavi-job-{uuid}', **data)
@@ -70,7 +85,10 @@ class Pipeline_job(BaseModel):
             stage=job_info.stage.value if job_info.stage else None,
             input_count=job_info.input_count,
             sequences_processed=job_info.sequences_processed,
-            error_message=job_info.error_message
+            error_message=job_info.error_message,
+            parent_job_id=UUID(job_info.parent_job_id) if job_info.parent_job_id else None,
+            source_job_id=UUID(job_info.source_job_id) if job_info.source_job_id else None,
+            execution_path=job_info.execution_path.value.lower() if job_info.execution_path else None
         )
 
 
@@ -169,7 +187,26 @@ def run_pipeline_step_functions(
             logger.error(f'Failed to update job status after error: {update_err}')
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(fastapi_app: FastAPI) -> AsyncIterator[None]:
+    """Start and stop the background job status poller (Step Functions mode only)."""
+    poller: Optional[JobStatusPoller] = None
+    if USE_STEP_FUNCTIONS and _config.pipeline.job_status_poller_enabled:
+        poller = JobStatusPoller(
+            get_job_service(),
+            interval=_config.pipeline.job_status_poll_interval,
+            events_queue_url=_config.pipeline.job_status_events_queue_url
+        )
+        poller.start()
+    fastapi_app.state.job_status_poller = poller
+    try:
+        yield
+    finally:
+        if poller:
+            poller.stop(timeout=5)
+
+
+app = FastAPI(lifespan=lifespan)
 router = APIRouter(
     prefix="/api"
 )
@@ -177,6 +214,13 @@ router = APIRouter(
 # Legacy in-memory job storage (used when USE_STEP_FUNCTIONS=false)
 jobs: dict[UUID, Pipeline_job] = {}
 
+# Legacy Nextflow pipeline runs, each a separate JVM, are limited in concurrency and queued
+nextflow_scheduler = JobScheduler(
+    max_workers=_config.nextflow_max_concurrent_jobs,
+    max_queued=_config.nextflow_max_queued_jobs,
+    name='nextflow'
+)
+
 
 def get_pipeline_job(uuid: UUID) -> Pipeline_job | None:
     """Get job from in-memory storage (legacy mode)."""
@@ -211,37 +255,16 @@ async def health() -> dict[str, Any]:
     return response
 
 
-@router.get("/deployment-status", status_code=200, description='Deployment status for all PAVI components', tags=['metadata'])
-async def deployment_status() -> dict[str, Any]:
-    """
-    Get deployment status for all PAVI components.
+@router.get("/job-queue", status_code=200, description='Job queue and worker metrics (Nextflow mode)', tags=['metadata'])
+async def job_queue_metrics() -> dict[str, Any]:
+    return nextflow_scheduler.metrics()
 
-    Returns status information for:
-    - API service
-    - Step Functions state machine
-    - AWS Batch compute
-    - DynamoDB jobs table
-    - S3 buckets (results and work)
-    """
+
+def _probe_step_functions() -> dict[str, Any]:
+    """Get the status of the Step Functions state machine."""
     import boto3
     from botocore.exceptions import ClientError, NoCredentialsError
 
-    components: dict[str, Any] = {}
-
-    # API Status
-    components["api"] = {
-        "name": "API Service",
-        "status": "healthy",
-        "environment": _config.environment.value,
-        "execution_mode": "step_functions" if USE_STEP_FUNCTIONS else "nextflow",
-        "details": {
-            "host": _config.api_host,
-            "port": _config.api_port,
-            "debug": _config.debug,
-        }
-    }
-
-    # Step Functions Status
     sf_status: dict[str, Any] = {
         "name": "Step Functions",
         "status": "unknown",
@@ -273,9 +296,14 @@ async def deployment_status() -> dict[str, Any]:
         sf_status["status"] = "disabled"
         sf_status["details"]["message"] = "Step Functions not enabled"
 
-    components["step_functions"] = sf_status
+    return sf_status
+
+
+def _probe_batch() -> dict[str, Any]:
+    """Get the status of the AWS Batch job queue."""
+    import boto3
+    from botocore.exceptions import ClientError, NoCredentialsError
 
-    # AWS Batch Status
     batch_status: dict[str, Any] = {
         "name": "AWS Batch",
         "status": "unknown",
@@ -313,9 +341,14 @@ async def deployment_status() -> dict[str, Any]:
         batch_status["status"] = "disabled"
         batch_status["details"]["message"] = "AWS Batch not configured"
 
-    components["batch"] = batch_status
+    return batch_status
+
+
+def _probe_dynamodb() -> dict[str, Any]:
+    """Get the status of the DynamoDB jobs table."""
+    import boto3
+    from botocore.exceptions import ClientError, NoCredentialsError
 
-    # DynamoDB Status
     dynamo_status: dict[str, Any] = {
         "name": "DynamoDB Jobs Table",
         "status": "unknown",
@@ -348,75 +381,89 @@ async def deployment_status() -> dict[str, Any]:
         dynamo_status["status"] = "error"
         dynamo_status["details"]["error"] = str(e)
 
-    components["dynamodb"] = dynamo_status
+    return dynamo_status
 
-    # S3 Results Bucket Status
-    s3_results_status: dict[str, Any] = {
-        "name": "S3 Results Bucket",
+
+def _probe_s3_bucket(name: str, bucket_name: str) -> dict[str, Any]:
+    """Get the status of an S3 bucket."""
+    import boto3
+    from botocore.exceptions import ClientError, NoCredentialsError
+
+    s3_status: dict[str, Any] = {
+        "name": name,
         "status": "unknown",
         "details": {}
     }
 
     try:
         s3 = boto3.client('s3')
-        s3.head_bucket(Bucket=_config.pipeline.results_bucket)
-        s3_results_status["status"] = "healthy"
-        s3_results_status["details"] = {
-            "bucket_name": _config.pipeline.results_bucket,
+        s3.head_bucket(Bucket=bucket_name)
+        s3_status["status"] = "healthy"
+        s3_status["details"] = {
+            "bucket_name": bucket_name,
         }
     except NoCredentialsError:
-        s3_results_status["status"] = "unavailable"
-        s3_results_status["details"]["error"] = "AWS credentials not configured"
+        s3_status["status"] = "unavailable"
+        s3_status["details"]["error"] = "AWS credentials not configured"
     except ClientError as e:
         error_code = e.response.get('Error', {}).get('Code', '')
         if error_code == '404':
-            s3_results_status["status"] = "not_found"
-            s3_results_status["details"]["error"] = f"Bucket {_config.pipeline.results_bucket} not found"
+            s3_status["status"] = "not_found"
+            s3_status["details"]["error"] = f"Bucket {bucket_name} not found"
         elif error_code == '403':
-            s3_results_status["status"] = "no_access"
-            s3_results_status["details"]["error"] = "Access denied to bucket"
+            s3_status["status"] = "no_access"
+            s3_status["details"]["error"] = "Access denied to bucket"
         else:
-            s3_results_status["status"] = "error"
-            s3_results_status["details"]["error"] = str(e)
+            s3_status["status"] = "error"
+            s3_status["details"]["error"] = str(e)
     except Exception as e:
-        s3_results_status["status"] = "error"
-        s3_results_status["details"]["error"] = str(e)
+        s3_status["status"] = "error"
+        s3_status["details"]["error"] = str(e)
 
-    components["s3_results"] = s3_results_status
+    return s3_status
 
-    # S3 Work Bucket Status (if different from results)
-    if _config.pipeline.work_bucket != _config.pipeline.results_bucket:
-        s3_work_status: dict[str, Any] = {
-            "name": "S3 Work Bucket",
-            "status": "unknown",
-            "details": {}
+
+@router.get("/deployment-status", status_code=200, description='Deployment status for all PAVI components', tags=['metadata'])
+async def deployment_status() -> dict[str, Any]:
+    """
+    Get deployment status for all PAVI components.
+
+    Returns status information for:
+    - API service
+    - Step Functions state machine
+    - AWS Batch compute
+    - DynamoDB jobs table
+    - S3 buckets (results and work)
+
+    All AWS components are probed concurrently.
+    """
+    components: dict[str, Any] = {}
+
+    # API Status
+    components["api"] = {
+        "name": "API Service",
+        "status": "healthy",
+        "environment": _config.environment.value,
+        "execution_mode": "step_functions" if USE_STEP_FUNCTIONS else "nextflow",
+        "details": {
+            "host": _config.api_host,
+            "port": _config.api_port,
+            "debug": _config.debug,
         }
+    }
 
-        try:
-            s3.head_bucket(Bucket=_config.pipeline.work_bucket)
-            s3_work_status["status"] = "healthy"
-            s3_work_status["details"] = {
-                "bucket_name": _config.pipeline.work_bucket,
-            }
-        except NoCredentialsError:
-            s3_work_status["status"] = "unavailable"
-            s3_work_status["details"]["error"] = "AWS credentials not configured"
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', '')
-            if error_code == '404':
-                s3_work_status["status"] = "not_found"
-                s3_work_status["details"]["error"] = f"Bucket {_config.pipeline.work_bucket} not found"
-            elif error_code == '403':
-                s3_work_status["status"] = "no_access"
-                s3_work_status["details"]["error"] = "Access denied to bucket"
-            else:
-                s3_work_status["status"] = "error"
-                s3_work_status["details"]["error"] = str(e)
-        except Exception as e:
-            s3_work_status["status"] = "error"
-            s3_work_status["details"]["error"] = str(e)
+    probes: dict[str, Awaitable[dict[str, Any]]] = {
+        "step_functions": run_aws_io(_probe_step_functions),
+        "batch": run_aws_io(_probe_batch),
+        "dynamodb": run_aws_io(_probe_dynamodb),
+        "s3_results": run_aws_io(_probe_s3_bucket, "S3 Results Bucket", _config.pipeline.results_bucket),
+    }
+    # S3 Work Bucket Status (if different from results)
+    if _config.pipeline.work_bucket != _config.pipeline.results_bucket:
+        probes["s3_work"] = run_aws_io(_probe_s3_bucket, "S3 Work Bucket", _config.pipeline.work_bucket)
 
-        components["s3_work"] = s3_work_status
+    probe_results = await asyncio.gather(*probes.values())
+    components.update(zip(probes.keys(), probe_results))
 
     # Calculate overall status
     statuses = [c.get('status') for c in components.values()]
@@ -436,25 +483,48 @@ async def deployment_status() -> dict[str, Any]:
     }
 
 
-@router.post('/pipeline-job/', status_code=201, response_model_exclude_none=True)
+@router.post('/pipeline-job/', status_code=201, response_model_exclude_none=True, responses={
+    400: {'model': HTTP_exception_response},
+    404: {'model': HTTP_exception_response},
+    429: {'model': HTTP_exception_response}
+})
 async def create_new_pipeline_job(
     pipeline_seq_regions: list[Pipeline_seq_region],
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    parent_job_id: Optional[UUID] = None
 ) -> Pipeline_job:
     """
     Create and start a new pipeline job.
 
     In Step Functions mode, job is created in DynamoDB and execution started.
-    In Nextflow mode (legacy), job is stored in-memory and Nextflow is invoked.
+    In Nextflow mode (legacy), job is stored in-memory and queued to be run by Nextflow,
+    with at most NEXTFLOW_MAX_CONCURRENT_JOBS pipelines running at once. The job's `queue_position`
+    is reported while it waits. Once NEXTFLOW_MAX_QUEUED_JOBS jobs are waiting, new jobs are rejected (429).
 
     When gradual rollout is enabled, jobs are routed to Step Functions based
     on a percentage configured via STEP_FUNCTIONS_ROLLOUT_PERCENTAGE.
+
+    When `parent_job_id` references a completed job, the submitted sequences are
+    added to that job's alignment (incremental alignment) instead of aligning
+    all sequences from scratch. Incremental alignment requires Step Functions mode.
+
+    In Step Functions mode, jobs with input identical to a completed or running job
+    reuse that job's results or execution (reported as `source_job_id`) instead of starting a new execution.
+
+    When in-process execution is enabled, small jobs (see IN_PROCESS_MAX_SEQ_REGIONS and IN_PROCESS_MAX_SEQ_LENGTH)
+    are run within the API process rather than through Step Functions (reported as `execution_path`).
     """
     # Generate job ID first for consistent routing
     new_job_id = str(uuid1())
 
-    # Determine which backend to use (supports gradual rollout)
-    use_sf = should_use_step_functions(_config, new_job_id)
+    if parent_job_id is not None:
+        if not _config.pipeline.use_step_functions:
+            raise HTTPException(status_code=400, detail='Incremental alignment requires Step Functions mode.')
+        # Parent results only exist in Step Functions mode, bypass rollout routing
+        use_sf = True
+    else:
+        # Determine which backend to use (supports gradual rollout)
+        use_sf = should_use_step_functions(_config, new_job_id)
 
     if use_sf:
         # Step Functions mode
@@ -462,9 +532,28 @@ async def create_new_pipeline_job(
         seq_regions = [sr.model_dump() for sr in pipeline_seq_regions]
 
         # Create job in DynamoDB
-        job_info = job_service.create_job(seq_regions)
+        try:
+            job_info = await run_aws_io(
+                job_service.create_job,
+                seq_regions,
+                parent_job_id=str(parent_job_id) if parent_job_id else None
+            )
+        except JobNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except JobResultNotReadyError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         logger.info(f'Created Step Functions pipeline job {job_info.job_id}.')
 
+        if job_info.source_job_id:
+            # Identical input as an existing job, whose execution and results are reused
+            return Pipeline_job.from_job_info(job_info)
+
+        if job_info.execution_path == ExecutionPath.IN_PROCESS:
+            # Small job, run on the bounded in-process worker pool (unless it filled up since the job was created)
+            if await run_aws_io(job_service.submit_in_process_job, job_info.job_id, seq_regions):
+                return Pipeline_job.from_job_info(job_info)
+            job_info.execution_path = ExecutionPath.STEP_FUNCTIONS
+
         # Start execution in background
         background_tasks.add_task(
             func=run_pipeline_step_functions,
@@ -478,14 +567,20 @@ async def create_new_pipeline_job(
         # Legacy Nextflow mode
         new_task: Pipeline_job = Pipeline_job(uuid=UUID(new_job_id))
         jobs[new_task.uuid] = new_task
-        logger.info(f'Created Nextflow pipeline job {new_task.uuid}.')
-        background_tasks.add_task(
-            func=run_pipeline,
-            pipeline_seq_regions=pipeline_seq_regions,
-            uuid=new_task.uuid
-        )
+        try:
+            queue_position = nextflow_scheduler.submit(
+                new_job_id,
+                functools.partial(run_pipeline, pipeline_seq_regions=pipeline_seq_regions, uuid=new_task.uuid)
+            )
+        except JobQueueFullError as e:
+            del jobs[new_task.uuid]
+            logger.warning(f'Rejected Nextflow pipeline job: {e}')
+            raise HTTPException(status_code=429, detail='Too many pipeline jobs queued, please retry later.',
+                                headers={'Retry-After': '30'})
+        logger.info(f'Created Nextflow pipeline job {new_task.uuid} (queue position {queue_position}).')
 
-        return new_task
+        queued_task: Pipeline_job = new_task.model_copy(update={'queue_position': queue_position})
+        return queued_task
 
 
 @router.get("/pipeline-job/{uuid}", response_model_exclude_none=True, responses={404: {'model': HTTP_exception_response}})
@@ -494,13 +589,14 @@ async def get_pipeline_job_handler(uuid: UUID) -> Pipeline_job:
     Get job status and details.
 
     For running jobs in Step Functions mode, this will sync the status
-    from the Step Functions execution before returning.
+    from the Step Functions execution before returning
+    (unless the background job status poller is enabled).
     """
     if USE_STEP_FUNCTIONS:
         job_service = get_job_service()
         try:
             # Use get_job_with_sync to auto-update status from Step Functions
-            job_info = job_service.get_job_with_sync(str(uuid))
+            job_info = await run_aws_io(job_service.get_job_with_sync, str(uuid))
             if job_info is None:
                 raise HTTPException(status_code=404, detail='Job not found.')
             return Pipeline_job.from_job_info(job_info)
@@ -512,27 +608,180 @@ async def get_pipeline_job_handler(uuid: UUID) -> Pipeline_job:
         if job is None:
             raise HTTPException(status_code=404, detail='Job not found.')
         else:
-            return job
+            queued_job: Pipeline_job = job.model_copy(update={'queue_position': nextflow_scheduler.queue_position(str(uuid))})
+            return queued_job
+
+
+async def _fetch_job_event_state(job_id: str) -> Optional[dict[str, Any]]:
+    """Get the current (JSON-serializable) state of a job, for job event subscribers."""
+    job: Optional[Pipeline_job]
+    if USE_STEP_FUNCTIONS:
+        job_info = await run_aws_io(get_job_service().get_job_with_sync, job_id)
+        job = Pipeline_job.from_job_info(job_info) if job_info else None
+    else:
+        job = jobs.get(UUID(job_id))
+    return job.model_dump(mode='json', exclude_none=True) if job else None
+
+
+job_event_broker = JobEventBroker(
+    _fetch_job_event_state,
+    poll_interval=float(getenv('JOB_EVENTS_POLL_INTERVAL_SECONDS', '2')),
+    heartbeat_interval=float(getenv('JOB_EVENTS_HEARTBEAT_SECONDS', '15'))
+)
+
+
+@router.get("/pipeline-job/{uuid}/events", response_class=StreamingResponse, responses={404: {'model': HTTP_exception_response}})
+async def get_pipeline_job_events(uuid: UUID) -> StreamingResponse:
+    """
+    Stream job progress as Server-Sent Events.
+
+    Sends a `status` event with the current job details (as returned by GET /pipeline-job/{uuid})
+    on connect and on every change of status, stage or progress counters. The stream is closed
+    once the job has completed or failed. All clients following the same job share a single
+    upstream job status poll.
+    """
+    # Subscribe first, so the job's initial state (fetched once, by its watcher) also serves the not found check
+    subscription = job_event_broker.subscribe(str(uuid))
+    first_state: Optional[dict[str, Any]] = None
+    try:
+        while first_state is None:
+            first_state = await anext(subscription)
+    except StopAsyncIteration:
+        raise HTTPException(status_code=404, detail='Job not found.')
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            yield 'retry: 5000\n\n'
+            yield f'event: status\ndata: {json.dumps(first_state)}\n\n'
+            async for state in subscription:
+                if state is None:
+                    # Comment line, keeps idle connections (and proxies) from timing out
+                    yield ': keep-alive\n\n'
+                else:
+                    yield f'event: status\ndata: {json.dumps(state)}\n\n'
+        finally:
+            await subscription.aclose()
+
+    return StreamingResponse(event_stream(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Disable response buffering by reverse proxies
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@router.post("/pipeline-jobs/status", response_model_exclude_none=True, responses={400: {'model': HTTP_exception_response}})
+async def get_pipeline_jobs_status(uuids: list[UUID]) -> list[Pipeline_job]:
+    """
+    Get the status and details of multiple jobs in one request.
+
+    In Step Functions mode, jobs are read in batches and only the jobs that are not
+    completed or failed yet are synced with their Step Functions execution (concurrently).
+    Jobs that are not found are omitted from the response.
+    """
+    if len(uuids) > MAX_STATUS_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f'At most {MAX_STATUS_BATCH_SIZE} jobs can be requested at once.')
+
+    if USE_STEP_FUNCTIONS:
+        job_service = get_job_service()
+        try:
+            job_infos = await run_aws_io(job_service.get_jobs, [str(uuid) for uuid in uuids])
+
+            # Active jobs are synced from their batch-read records, rather than reading each again
+            active_jobs = [job_info for job_info in job_infos
+                           if job_info.status in [SFJobStatus.RUNNING, SFJobStatus.PENDING]]
+            synced_jobs = await asyncio.gather(*(run_aws_io(job_service.get_job_with_sync, job_info.job_id, job_info)
+                                                 for job_info in active_jobs))
+        except JobServiceError as e:
+            logger.error(f"Error getting jobs status: {e}")
+            raise HTTPException(status_code=500, detail=f'Error retrieving jobs: {str(e)}')
+
+        synced = {job_info.job_id: job_info for job_info in synced_jobs if job_info is not None}
+        return [Pipeline_job.from_job_info(synced.get(job_info.job_id, job_info)) for job_info in job_infos]
+    else:
+        return [job for job in (get_pipeline_job(uuid) for uuid in dict.fromkeys(uuids)) if job is not None]
+
+
+async def _stream_chunks(result: JobResultStream) -> AsyncIterator[bytes]:
+    """
+    Stream the chunks of a (blocking S3 or file) job result stream, reading each chunk on the AWS I/O thread pool.
+
+    The result stream is closed once streaming ends, also when aborted early (e.g. when the client disconnects).
+    """
+    try:
+        while True:
+            chunk = await run_aws_io(next, result.chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        result.close()
+
+
+async def _job_result_response(
+    job_service: JobService,
+    job_info: JobInfo,
+    result_file: str,
+    media_type: str,
+    range_header: Optional[str],
+    if_none_match: Optional[str]
+) -> Response:
+    """Build a streaming (or not modified) response for a result file of a completed job."""
+    try:
+        result = await run_aws_io(job_service.open_job_result, job_info, result_file,
+                                  range_header=range_header, if_none_match=if_none_match)
+    except JobResultRangeError as e:
+        headers = {'Content-Range': f'bytes */{e.content_length}'} if e.content_length is not None else None
+        raise HTTPException(status_code=416, detail=str(e), headers=headers)
+
+    if result is None:
+        logger.warning(f'GET result error: File {result_file} not found for job "{job_info.job_id}".')
+        raise HTTPException(status_code=404, detail='Result file not found.')
+
+    headers = {
+        'Accept-Ranges': 'bytes',
+        # Have browsers revalidate (getting a 304 when unchanged) rather than re-download
+        'Cache-Control': 'no-cache'
+    }
+    if result.etag:
+        headers['ETag'] = result.etag
+
+    if result.not_modified:
+        return Response(status_code=304, headers=headers)
+
+    headers['Content-Length'] = str(result.content_length)
+    if result.content_range:
+        headers['Content-Range'] = result.content_range
+
+    return StreamingResponse(_stream_chunks(result), status_code=206 if result.content_range else 200,
+                             media_type=media_type, headers=headers)
 
 
 @router.get("/pipeline-job/{uuid}/result/alignment", responses={
     404: {'model': HTTP_exception_response},
     400: {'model': HTTP_exception_response},
+    416: {'model': HTTP_exception_response},
     500: {'model': HTTP_exception_response}
 })
-async def get_pipeline_job_alignment_result(uuid: UUID) -> StreamingResponse:
+async def get_pipeline_job_alignment_result(
+    uuid: UUID,
+    range_header: Optional[str] = Header(default=None, alias='Range'),
+    if_none_match: Optional[str] = Header(default=None, alias='If-None-Match')
+) -> Response:
     """
     Get alignment result file.
 
     Returns 400 if the job has failed or is not yet complete.
     Returns 404 if the job or result file is not found.
+
+    In Step Functions mode, supports (single) byte Range requests
+    and conditional requests through If-None-Match (returning 304 when not modified).
     """
     if USE_STEP_FUNCTIONS:
         job_service = get_job_service()
 
         # First sync and check job status
         try:
-            job_info = job_service.get_job_with_sync(str(uuid))
+            job_info = await run_aws_io(job_service.get_job_with_sync, str(uuid))
         except JobServiceError as e:
             logger.error(f"Error getting job {uuid}: {e}")
             raise HTTPException(status_code=500, detail=f'Error retrieving job: {str(e)}')
@@ -551,16 +800,7 @@ async def get_pipeline_job_alignment_result(uuid: UUID) -> StreamingResponse:
                 detail=f'Results not ready. Job status: {job_info.status.value.lower()}'
             )
 
-        content = job_service.get_job_result_alignment(str(uuid))
-        if content is None:
-            logger.warning(f'GET result/alignment error: File not found for job "{uuid}".')
-            raise HTTPException(status_code=404, detail='Result file not found.')
-
-        def iterfile():  # type: ignore
-            with BytesIO(content) as f:
-                yield from f
-
-        return StreamingResponse(iterfile(), media_type="text/plain")
+        return await _job_result_response(job_service, job_info, 'alignment-output.aln', "text/plain", range_header, if_none_match)
     else:
         # Legacy filesystem-based retrieval
         try:
@@ -583,21 +823,29 @@ async def get_pipeline_job_alignment_result(uuid: UUID) -> StreamingResponse:
 @router.get("/pipeline-job/{uuid}/result/seq-info", responses={
     404: {'model': HTTP_exception_response},
     400: {'model': HTTP_exception_response},
+    416: {'model': HTTP_exception_response},
     500: {'model': HTTP_exception_response}
 })
-async def get_pipeline_job_seq_info_result(uuid: UUID) -> StreamingResponse:
+async def get_pipeline_job_seq_info_result(
+    uuid: UUID,
+    range_header: Optional[str] = Header(default=None, alias='Range'),
+    if_none_match: Optional[str] = Header(default=None, alias='If-None-Match')
+) -> Response:
     """
     Get sequence info result file.
 
     Returns 400 if the job has failed or is not yet complete.
     Returns 404 if the job or result file is not found.
+
+    In Step Functions mode, supports (single) byte Range requests
+    and conditional requests through If-None-Match (returning 304 when not modified).
     """
     if USE_STEP_FUNCTIONS:
         job_service = get_job_service()
 
         # First sync and check job status
         try:
-            job_info = job_service.get_job_with_sync(str(uuid))
+            job_info = await run_aws_io(job_service.get_job_with_sync, str(uuid))
         except JobServiceError as e:
             logger.error(f"Error getting job {uuid}: {e}")
             raise HTTPException(status_code=500, detail=f'Error retrieving job: {str(e)}')
@@ -616,16 +864,7 @@ async def get_pipeline_job_seq_info_result(uuid: UUID) -> StreamingResponse:
                 detail=f'Results not ready. Job status: {job_info.status.value.lower()}'
             )
 
-        content = job_service.get_job_result_seqinfo(str(uuid))
-        if content is None:
-            logger.warning(f'GET result/seq-info error: File not found for job "{uuid}".')
-            raise HTTPException(status_code=404, detail='Result file not found.')
-
-        def iterfile():  # type: ignore
-            with BytesIO(content) as f:
-                yield from f
-
-        return StreamingResponse(iterfile(), media_type="application/json")
+        return await _job_result_response(job_service, job_info, 'aligned_seq_info.json', "application/json", range_header, if_none_match)
     else:
         # Legacy filesystem-based retrieval
         try:
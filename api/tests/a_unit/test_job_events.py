@@ -0,0 +1,82 @@
+"""
+Unit tests for job_events module.
+
+Tests the JobEventBroker fan-out with a fake job state source.
+"""
+
+import asyncio
+from typing import Any, Optional
+
+from src.job_events import JobEventBroker
+
+
+class FakeJobStates:
+    """Job state source returning a predefined sequence of states, counting fetches."""
+
+    def __init__(self, states: list[Optional[dict[str, Any]]]):
+        self.states = states
+        self.fetch_count = 0
+
+    async def fetch(self, job_id: str) -> Optional[dict[str, Any]]:
+        assert job_id == 'job-1'
+        state = self.states[min(self.fetch_count, len(self.states) - 1)]
+        self.fetch_count += 1
+        return state
+
+
+async def collect(broker: JobEventBroker, job_id: str) -> list[Optional[dict[str, Any]]]:
+    return [state async for state in broker.subscribe(job_id)]
+
+
+def test_fan_out_single_watcher() -> None:
+    """Test all subscribers receive every state change from a single upstream poll."""
+    states = FakeJobStates([
+        {'status': 'running', 'stage': 'SEQUENCE_RETRIEVAL'},
+        {'status': 'running', 'stage': 'SEQUENCE_RETRIEVAL'},
+        {'status': 'running', 'stage': 'ALIGNMENT'},
+        {'status': 'completed', 'stage': 'DONE'}
+    ])
+    broker = JobEventBroker(states.fetch, poll_interval=0.01, heartbeat_interval=5)
+
+    async def run() -> list[list[Optional[dict[str, Any]]]]:
+        return await asyncio.gather(*(collect(broker, 'job-1') for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    expected = [
+        {'status': 'running', 'stage': 'SEQUENCE_RETRIEVAL'},
+        {'status': 'running', 'stage': 'ALIGNMENT'},
+        {'status': 'completed', 'stage': 'DONE'}
+    ]
+    assert all(result == expected for result in results)
+    assert states.fetch_count == 4
+    assert broker.watched_job_count() == 0
+
+
+def test_heartbeat_and_unsubscribe() -> None:
+    """Test heartbeats are sent while idle, and the watcher stops when its last subscriber leaves."""
+    states = FakeJobStates([{'status': 'running', 'stage': 'ALIGNMENT'}])
+    broker = JobEventBroker(states.fetch, poll_interval=0.01, heartbeat_interval=0.05)
+
+    async def run() -> list[Optional[dict[str, Any]]]:
+        received: list[Optional[dict[str, Any]]] = []
+        subscription = broker.subscribe('job-1')
+        async for state in subscription:
+            received.append(state)
+            if state is None:
+                break
+        assert broker.watched_job_count() == 1
+        await subscription.aclose()
+        return received
+
+    received = asyncio.run(run())
+
+    assert received == [{'status': 'running', 'stage': 'ALIGNMENT'}, None]
+    assert broker.watched_job_count() == 0
+
+
+def test_job_not_found_closes_stream() -> None:
+    """Test the event stream ends when the job is not found."""
+    broker = JobEventBroker(FakeJobStates([None]).fetch, poll_interval=0.01)
+
+    assert asyncio.run(collect(broker, 'job-1')) == []
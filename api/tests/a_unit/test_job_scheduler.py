@@ -0,0 +1,118 @@
+"""
+Unit tests for job_scheduler module.
+"""
+
+import threading
+
+import pytest
+
+from src.job_scheduler import JobQueueFullError, JobScheduler
+
+
+class TestJobScheduler:
+    """Test the bounded job scheduler."""
+
+    def test_priority_and_fifo_order(self) -> None:
+        """Test waiting jobs are started by priority, then in submission order."""
+        scheduler = JobScheduler(max_workers=1, max_queued=10, name='test')
+        release = threading.Event()
+        started: list[str] = []
+
+        scheduler.submit('blocker', release.wait)
+        self._wait_running(scheduler, 1)
+        positions = [
+            scheduler.submit('low-1', lambda: started.append('low-1'), priority=5),
+            scheduler.submit('high', lambda: started.append('high'), priority=0),
+            scheduler.submit('low-2', lambda: started.append('low-2'), priority=5)
+        ]
+
+        assert positions[0] == 1
+        assert scheduler.queue_position('high') == 1
+        assert scheduler.queue_position('low-1') == 2
+        assert scheduler.queue_position('low-2') == 3
+
+        release.set()
+        self._wait_completed(scheduler, 4)
+
+        assert started == ['high', 'low-1', 'low-2']
+        assert scheduler.queue_position('high') is None
+
+    def test_queue_full_rejected(self) -> None:
+        """Test jobs are rejected once the maximum number of jobs is waiting."""
+        scheduler = JobScheduler(max_workers=1, max_queued=1, name='test')
+        release = threading.Event()
+
+        scheduler.submit('running', release.wait)
+        self._wait_running(scheduler, 1)
+        scheduler.submit('waiting', lambda: None)
+        with pytest.raises(JobQueueFullError):
+            scheduler.submit('rejected', lambda: None)
+
+        metrics = scheduler.metrics()
+        assert metrics['running'] == 1
+        assert metrics['queue_depth'] == 1
+        assert metrics['rejected'] == 1
+
+        threading.Event().wait(0.02)
+        release.set()
+        self._wait_completed(scheduler, 2)
+        assert scheduler.metrics()['wait_time_seconds']['max'] > 0
+
+    def test_no_queue(self) -> None:
+        """Test jobs are started right away by idle workers with max_queued=0, and rejected once all workers are busy."""
+        scheduler = JobScheduler(max_workers=2, max_queued=0, name='test')
+        release = threading.Event()
+
+        scheduler.submit('first', release.wait)
+        scheduler.submit('second', release.wait)
+        self._wait_running(scheduler, 2)
+        with pytest.raises(JobQueueFullError):
+            scheduler.submit('rejected', lambda: None)
+
+        release.set()
+        self._wait_completed(scheduler, 2)
+        scheduler.submit('after', lambda: None)
+        self._wait_completed(scheduler, 3)
+        assert scheduler.metrics()['rejected'] == 1
+        scheduler.shutdown()
+
+    def test_concurrency_limit(self) -> None:
+        """Test no more than max_workers jobs run at once, and failing jobs do not stop workers."""
+        scheduler = JobScheduler(max_workers=2, max_queued=20, name='test')
+        lock = threading.Lock()
+        active = [0, 0]  # current, max
+
+        def job() -> None:
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            threading.Event().wait(0.01)
+            with lock:
+                active[0] -= 1
+
+        def failing_job() -> None:
+            raise RuntimeError('Pipeline failed')
+
+        scheduler.submit('failing', failing_job)
+        for i in range(10):
+            scheduler.submit(f'job-{i}', job)
+        self._wait_completed(scheduler, 11)
+
+        assert active[1] == 2
+        scheduler.shutdown()
+
+    @staticmethod
+    def _wait_running(scheduler: JobScheduler, count: int) -> None:
+        for _ in range(500):
+            if scheduler.metrics()['running'] == count:
+                return
+            threading.Event().wait(0.01)
+        raise AssertionError(f'Expected {count} running jobs')
+
+    @staticmethod
+    def _wait_completed(scheduler: JobScheduler, count: int) -> None:
+        for _ in range(500):
+            if scheduler.metrics()['completed'] == count:
+                return
+            threading.Event().wait(0.01)
+        raise AssertionError(f'Expected {count} completed jobs')
@@ -4,13 +4,19 @@ Unit tests for job_service module.
 Tests the JobService class with mocked AWS dependencies.
 """
 
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, cast
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 from botocore.exceptions import ClientError
 
 from src.job_service import (
-    JobService, JobInfo, JobStatus, JobStage,
-    JobServiceError, JobNotFoundError, JobExecutionError, JobResultNotReadyError
+    JobService, JobInfo, JobStatus, JobStage, ExecutionPath,
+    JobServiceError, JobNotFoundError, JobExecutionError, JobResultNotReadyError, JobResultRangeError,
+    parse_byte_range, etag_matches, compute_input_fingerprint, seq_region_length
 )
 
 
@@ -107,10 +113,77 @@ class TestJobServiceLocal:
         service = JobService(use_step_functions=False)
         job = service.create_job([{"test": "data"}])
 
-        started = service._start_local_execution(job.job_id, [{"test": "data"}])
+        with patch('local_pipeline.run_local_pipeline', return_value=1):
+            started = service._start_local_execution(job.job_id, [{"test": "data"}])
+            assert service._in_process_executor is not None
+            service._in_process_executor.shutdown(wait=True)
         assert started.status == JobStatus.RUNNING
         assert started.stage == JobStage.SEQUENCE_RETRIEVAL
 
+    def test_local_execution(self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test local executions run the pipeline in-process, writing results to the local results directory."""
+        monkeypatch.setenv('API_RESULTS_PATH_PREFIX', str(tmp_path))
+        monkeypatch.setenv('LOCAL_RETRIEVAL_WORKERS', '4')
+        seq_regions = [{'unique_entry_id': f'entry{i}'} for i in range(3)]
+
+        def run_local_pipeline(seq_regions: list[dict[str, Any]], work_dir: str, results_dir: str, **kwargs: Any) -> int:
+            import os
+            assert work_dir and kwargs['retrieval_workers'] == 4
+            for processed in range(1, len(seq_regions) + 1):
+                kwargs['progress']('SEQUENCE_RETRIEVAL', processed)
+                assert service.get_job(job.job_id).sequences_processed == processed  # type: ignore[union-attr]
+            os.makedirs(results_dir)
+            for result_file in ['alignment-output.aln', 'aligned_seq_info.json']:
+                with open(os.path.join(results_dir, result_file), 'w') as f:
+                    f.write(f'{result_file} content')
+            return len(seq_regions)
+
+        service = JobService(use_step_functions=False)
+        job = service.create_job(seq_regions)
+        with patch('local_pipeline.run_local_pipeline', side_effect=run_local_pipeline):
+            service.run_job_in_process(job.job_id, seq_regions)
+
+        completed = service.get_job(job.job_id)
+        assert completed is not None
+        assert completed.status == JobStatus.COMPLETED
+        assert completed.stage == JobStage.DONE
+        assert completed.sequences_processed == 3
+        assert service.get_job_result_alignment(job.job_id) == b'alignment-output.aln content'
+        assert service.get_job_result_seqinfo(job.job_id) == b'aligned_seq_info.json content'
+
+    def test_start_local_execution_submits_job(self) -> None:
+        """Test starting a local execution runs the pipeline on the in-process worker pool."""
+        service = JobService(use_step_functions=False)
+        job = service.create_job([{"test": "data"}])
+
+        with patch.object(service, 'run_job_in_process') as mock_run:
+            service.start_job(job.job_id, [{"test": "data"}])
+            assert service._in_process_executor is not None
+            service._in_process_executor.shutdown(wait=True)
+
+        mock_run.assert_called_once_with(job.job_id, [{"test": "data"}])
+        assert job.execution_path == ExecutionPath.IN_PROCESS
+
+
+class TestRetrievalChunking:
+    """Test chunking of input regions over seq retrieval jobs."""
+
+    @pytest.mark.parametrize("input_count,parallelism,expected", [
+        (0, 40, 1),
+        (1, 40, 1),
+        (40, 40, 1),
+        (41, 40, 2),
+        (400, 40, 10),
+        (401, 40, 11),
+        (10, 0, 10),
+    ])
+    def test_retrieval_chunk_size(self, input_count: int, parallelism: int, expected: int) -> None:
+        """Test chunk size derivation from input count and target parallelism."""
+        service = JobService(use_step_functions=False)
+        service.retrieval_target_parallelism = parallelism
+
+        assert service.retrieval_chunk_size(input_count) == expected
+
 
 class TestJobServiceStepFunctions:
     """Test JobService with Step Functions (mocked AWS services)."""
@@ -215,6 +288,8 @@ class TestJobServiceStepFunctions:
 
         mock_sfn.start_execution.assert_called_once()
         mock_table.update_item.assert_called()
+        execution_input = json.loads(mock_sfn.start_execution.call_args.kwargs['input'])
+        assert execution_input['retrieval_chunk_size'] == 1
 
     @patch('src.job_service.boto3')
     def test_sync_job_status_succeeded(self, mock_boto3: MagicMock) -> None:
@@ -341,3 +416,789 @@ class TestJobResultRetrieval:
 
         result = service.get_job_result_seqinfo('test-id')
         assert result is None
+
+
+class TestIncrementalAlignment:
+    """Test incremental alignment against a parent job."""
+
+    def test_create_job_with_parent_local(self) -> None:
+        """Test creating a job referencing a completed parent job."""
+        service = JobService(use_step_functions=False)
+        parent = service.create_job([{"test": "data"}])
+        parent.status = JobStatus.COMPLETED
+        parent.result_s3_uri = 's3://bucket/executions/parent/results/alignment.aln'
+
+        job = service.create_job([{"test": "more"}], parent_job_id=parent.job_id)
+
+        assert job.parent_job_id == parent.job_id
+        assert job.parent_result_s3_uri == parent.result_s3_uri
+        assert job.to_dict()["parent_job_id"] == parent.job_id
+
+    def test_create_job_parent_not_found(self) -> None:
+        """Test creating a job referencing a non-existent parent job."""
+        service = JobService(use_step_functions=False)
+
+        with pytest.raises(JobNotFoundError):
+            service.create_job([{"test": "data"}], parent_job_id="non-existent-id")
+
+    def test_create_job_parent_not_completed(self) -> None:
+        """Test creating a job referencing a parent job that is still running."""
+        service = JobService(use_step_functions=False)
+        parent = service.create_job([{"test": "data"}])
+
+        with pytest.raises(JobResultNotReadyError):
+            service.create_job([{"test": "more"}], parent_job_id=parent.job_id)
+
+    @patch('src.job_service.boto3')
+    def test_start_execution_with_parent_alignment(self, mock_boto3: MagicMock) -> None:
+        """Test the parent alignment location is passed to the Step Functions execution."""
+        items = {
+            'child-id': {
+                'job_id': 'child-id',
+                'status': 'PENDING',
+                'input_count': 1,
+                'parent_job_id': 'parent-id',
+                'parent_result_s3_uri': 's3://bucket/executions/parent/results/alignment.aln'
+            }
+        }
+        mock_table = MagicMock()
+        mock_table.get_item.side_effect = lambda Key: {'Item': items[Key['job_id']]}
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        mock_sfn = MagicMock()
+        mock_sfn.start_execution.return_value = {
+            'executionArn': 'arn:aws:states:us-east-1:123456789:execution:test:run-1'
+        }
+        mock_boto3.client.return_value = mock_sfn
+
+        service = JobService(
+            dynamodb_table_name='test-table',
+            state_machine_arn='arn:aws:states:us-east-1:123456789:stateMachine:test',
+            use_step_functions=True
+        )
+        service._start_step_functions_execution('child-id', [{"test": "data"}])
+
+        execution_input = json.loads(mock_sfn.start_execution.call_args.kwargs['input'])
+        assert execution_input['parent_alignment_s3_uri'] == 's3://bucket/executions/parent/results/alignment.aln'
+        assert execution_input['parent_results_s3_prefix'] == 's3://bucket/executions/parent/results/'
+        # The parent job is not read again
+        assert all(call.kwargs['Key'] == {'job_id': 'child-id'} for call in mock_table.get_item.call_args_list)
+
+
+class TestJobStatusCache:
+    """Test the job status cache of get_job_with_sync."""
+
+    @staticmethod
+    def _make_service(mock_boto3: MagicMock, status: str, describe_execution: Optional[Callable[..., dict[str, Any]]] = None) -> tuple[JobService, MagicMock, MagicMock]:
+        mock_table = MagicMock()
+        mock_table.get_item.return_value = {
+            'Item': {
+                'job_id': 'test-id',
+                'status': status,
+                'stage': 'ALIGNMENT',
+                'input_count': 1,
+                'execution_arn': 'arn:aws:states:us-east-1:123456789:execution:test:run-1'
+            }
+        }
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        mock_sfn = MagicMock()
+        if describe_execution:
+            mock_sfn.describe_execution.side_effect = describe_execution
+        else:
+            mock_sfn.describe_execution.return_value = {'status': 'RUNNING'}
+        mock_boto3.client.return_value = mock_sfn
+
+        service = JobService(
+            dynamodb_table_name='test-table',
+            state_machine_arn='arn:aws:states:us-east-1:123456789:stateMachine:test',
+            use_step_functions=True
+        )
+        return service, mock_table, mock_sfn
+
+    @patch('src.job_service.boto3')
+    def test_running_job_cached_within_ttl(self, mock_boto3: MagicMock) -> None:
+        """Test repeated lookups of a running job within the TTL do not hit AWS."""
+        service, mock_table, mock_sfn = self._make_service(mock_boto3, 'RUNNING')
+        service.status_cache_ttl = 60
+
+        for _ in range(5):
+            job = service.get_job_with_sync('test-id')
+            assert job is not None
+            assert job.status == JobStatus.RUNNING
+
+        assert mock_sfn.describe_execution.call_count == 1
+
+    @patch('src.job_service.boto3')
+    def test_running_job_cache_expires(self, mock_boto3: MagicMock) -> None:
+        """Test running job statuses are synced again once the TTL expired."""
+        service, mock_table, mock_sfn = self._make_service(mock_boto3, 'RUNNING')
+        service.status_cache_ttl = 0
+
+        service.get_job_with_sync('test-id')
+        time.sleep(0.01)
+        service.get_job_with_sync('test-id')
+
+        assert mock_sfn.describe_execution.call_count == 2
+
+    @patch('src.job_service.boto3')
+    def test_terminal_job_cached_indefinitely(self, mock_boto3: MagicMock) -> None:
+        """Test completed job statuses never expire from the cache."""
+        service, mock_table, mock_sfn = self._make_service(mock_boto3, 'COMPLETED')
+        service.status_cache_ttl = 0
+
+        service.get_job_with_sync('test-id')
+        time.sleep(0.01)
+        job = service.get_job_with_sync('test-id')
+
+        assert job is not None
+        assert job.status == JobStatus.COMPLETED
+        assert mock_table.get_item.call_count == 1
+        mock_sfn.describe_execution.assert_not_called()
+
+    @patch('src.job_service.boto3')
+    def test_concurrent_lookups_single_flight(self, mock_boto3: MagicMock) -> None:
+        """Test concurrent lookups of the same job share a single status sync."""
+        def slow_describe_execution(executionArn: str) -> dict[str, str]:
+            assert executionArn
+            time.sleep(0.2)
+            return {'status': 'RUNNING'}
+
+        service, mock_table, mock_sfn = self._make_service(mock_boto3, 'RUNNING', slow_describe_execution)
+        service.status_cache_ttl = 60
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(service.get_job_with_sync, 'test-id') for i in range(8)]
+            jobs = [future.result() for future in futures]
+
+        assert all(job is not None and job.status == JobStatus.RUNNING for job in jobs)
+        assert mock_sfn.describe_execution.call_count == 1
+        assert service._sync_locks == {}
+
+    @patch('src.job_service.boto3')
+    def test_update_invalidates_cache(self, mock_boto3: MagicMock) -> None:
+        """Test job updates through the service invalidate the cached status."""
+        service, mock_table, mock_sfn = self._make_service(mock_boto3, 'COMPLETED')
+
+        service.get_job_with_sync('test-id')
+        service._update_job_dynamodb('test-id', error_message='updated')
+        service.get_job_with_sync('test-id')
+
+        assert mock_table.get_item.call_count == 2
+
+    @patch('src.job_service.boto3')
+    def test_cache_max_entries(self, mock_boto3: MagicMock) -> None:
+        """Test the least recently used entries are evicted when exceeding the cache size."""
+        service, mock_table, mock_sfn = self._make_service(mock_boto3, 'COMPLETED')
+        service.status_cache_max_entries = 2
+
+        for job_id in ['job-1', 'job-2', 'job-3']:
+            service._cache_status(JobInfo(job_id=job_id, status=JobStatus.COMPLETED))
+
+        assert list(service._status_cache.keys()) == ['job-2', 'job-3']
+
+
+class TestJobReconciliation:
+    """Test background reconciliation of active job statuses."""
+
+    @patch('src.job_service.boto3')
+    def test_reconcile_active_jobs(self, mock_boto3: MagicMock) -> None:
+        """Test only executions no longer running are described and applied."""
+        mock_table = MagicMock()
+        mock_table.query.side_effect = [
+            {'Items': []},  # PENDING
+            {'Items': [
+                {'job_id': 'running-id', 'status': 'RUNNING', 'execution_arn': 'arn:running'},
+                {'job_id': 'done-id', 'status': 'RUNNING', 'execution_arn': 'arn:done'}
+            ]}  # RUNNING
+        ]
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        mock_sfn = MagicMock()
+        mock_sfn.get_paginator.return_value.paginate.return_value = [
+            {'executions': [{'executionArn': 'arn:running'}]}
+        ]
+        mock_sfn.describe_execution.return_value = {
+            'status': 'SUCCEEDED',
+            'output': '{"result_s3_uri": "s3://bucket/results/alignment.aln"}'
+        }
+        mock_boto3.client.return_value = mock_sfn
+
+        service = JobService(
+            dynamodb_table_name='test-table',
+            state_machine_arn='arn:aws:states:us-east-1:123456789:stateMachine:test',
+            use_step_functions=True
+        )
+
+        assert service.reconcile_active_jobs() == 1
+        mock_sfn.describe_execution.assert_called_once_with(executionArn='arn:done')
+        update_kwargs = mock_table.update_item.call_args.kwargs
+        assert update_kwargs['Key'] == {'job_id': 'done-id'}
+        assert update_kwargs['ExpressionAttributeValues'][':status'] == 'COMPLETED'
+
+    @patch('src.job_service.boto3')
+    def test_reconcile_no_active_jobs(self, mock_boto3: MagicMock) -> None:
+        """Test reconciliation without active jobs does not call Step Functions."""
+        mock_table = MagicMock()
+        mock_table.query.return_value = {'Items': []}
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        mock_sfn = MagicMock()
+        mock_boto3.client.return_value = mock_sfn
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+
+        assert service.reconcile_active_jobs() == 0
+        mock_sfn.get_paginator.assert_not_called()
+
+    @patch('src.job_service.boto3')
+    def test_apply_execution_event(self, mock_boto3: MagicMock) -> None:
+        """Test applying a Step Functions execution status change event."""
+        mock_table = MagicMock()
+        mock_table.get_item.return_value = {
+            'Item': {'job_id': 'test-id', 'status': 'RUNNING', 'execution_arn': 'arn:test'}
+        }
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        event = {
+            'detail-type': 'Step Functions Execution Status Change',
+            'detail': {
+                'executionArn': 'arn:test',
+                'name': 'pavi-job-test-id',
+                'status': 'FAILED',
+                'error': 'Batch.JobFailed',
+                'cause': 'Container exited with non-zero status'
+            }
+        }
+
+        assert service.apply_execution_event(event) is True
+        update_kwargs = mock_table.update_item.call_args.kwargs
+        assert update_kwargs['ExpressionAttributeValues'][':status'] == 'FAILED'
+
+        # Events of other executions are ignored
+        assert service.apply_execution_event({'detail': {'name': 'other-execution', 'status': 'FAILED'}}) is False
+
+    @patch('src.job_service.boto3')
+    def test_background_sync_skips_inline_sync(self, mock_boto3: MagicMock) -> None:
+        """Test get_job_with_sync answers from stored state when synced in the background."""
+        mock_table = MagicMock()
+        mock_table.get_item.return_value = {
+            'Item': {'job_id': 'test-id', 'status': 'RUNNING', 'execution_arn': 'arn:test'}
+        }
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+        mock_sfn = MagicMock()
+        mock_boto3.client.return_value = mock_sfn
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        service.background_sync = True
+
+        job = service.get_job_with_sync('test-id')
+
+        assert job is not None
+        assert job.status == JobStatus.RUNNING
+        mock_sfn.describe_execution.assert_not_called()
+
+
+class TestJobResultStreaming:
+    """Test streaming of job result files."""
+
+    @pytest.mark.parametrize("range_header,expected", [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=900-2000", (900, 999)),
+    ])
+    def test_parse_byte_range(self, range_header: str, expected: tuple[int, int]) -> None:
+        """Test parsing of satisfiable byte ranges."""
+        assert parse_byte_range(range_header, 1000) == expected
+
+    @pytest.mark.parametrize("range_header", ["bytes=1000-", "bytes=5-1", "lines=0-1", "bytes=0-1,5-6", "bytes=a-b", "bytes=-"])
+    def test_parse_byte_range_invalid(self, range_header: str) -> None:
+        """Test invalid or unsatisfiable byte ranges raise a JobResultRangeError."""
+        with pytest.raises(JobResultRangeError):
+            parse_byte_range(range_header, 1000)
+
+    def test_etag_matches(self) -> None:
+        """Test If-None-Match header matching."""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('"xyz", W/"abc"', '"abc"')
+        assert etag_matches('*', '"abc"')
+        assert not etag_matches('"xyz"', '"abc"')
+        assert not etag_matches('"abc"', None)
+
+    def test_open_job_result_local(self, tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test streaming a local result file in chunks, with range and conditional requests."""
+        monkeypatch.setenv('API_RESULTS_PATH_PREFIX', str(tmp_path))
+        results_dir = tmp_path / 'pipeline-results_test-id'
+        results_dir.mkdir()
+        (results_dir / 'alignment-output.aln').write_bytes(b'0123456789' * 10)
+
+        service = JobService(use_step_functions=False)
+        service.result_chunk_size = 16
+        job = JobInfo(job_id='test-id', status=JobStatus.COMPLETED)
+
+        result = service.open_job_result(job, 'alignment-output.aln')
+        assert result is not None
+        chunks = list(result.chunks)
+        assert b''.join(chunks) == b'0123456789' * 10
+        assert result.content_length == 100
+        assert max(len(chunk) for chunk in chunks) == 16
+
+        partial = service.open_job_result(job, 'alignment-output.aln', range_header='bytes=10-24')
+        assert partial is not None
+        assert b''.join(partial.chunks) == b'012345678901234'
+        assert partial.content_length == 15
+        assert partial.content_range == 'bytes 10-24/100'
+
+        not_modified = service.open_job_result(job, 'alignment-output.aln', if_none_match=result.etag)
+        assert not_modified is not None
+        assert not_modified.not_modified
+
+        assert service.open_job_result(job, 'missing.json') is None
+
+    @patch('src.job_service.boto3')
+    def test_open_job_result_s3(self, mock_boto3: MagicMock) -> None:
+        """Test streaming an S3 result object, answering repeated conditional requests without S3 calls."""
+        mock_body = MagicMock()
+        mock_body.iter_chunks.return_value = iter([b'CLUSTAL', b' alignment'])
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {
+            'Body': mock_body,
+            'ContentLength': 17,
+            'ETag': '"abc123"'
+        }
+        mock_boto3.client.return_value = mock_s3
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        job = JobInfo(job_id='test-id', status=JobStatus.COMPLETED,
+                      result_s3_uri='s3://bucket/executions/test-id/results/alignment-output.aln')
+
+        result = service.open_job_result(job, 'aligned_seq_info.json', range_header='bytes=0-16')
+        assert result is not None
+        assert b''.join(result.chunks) == b'CLUSTAL alignment'
+        assert result.etag == '"abc123"'
+        mock_s3.get_object.assert_called_once_with(
+            Bucket='bucket', Key='executions/test-id/results/aligned_seq_info.json', Range='bytes=0-16')
+
+        repeated = service.open_job_result(job, 'aligned_seq_info.json', if_none_match='"abc123"')
+        assert repeated is not None
+        assert repeated.not_modified
+        assert mock_s3.get_object.call_count == 1
+
+    @patch('src.job_service.boto3')
+    def test_open_job_result_s3_not_modified(self, mock_boto3: MagicMock) -> None:
+        """Test conditional requests for unknown ETags are passed on to S3."""
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = ClientError(
+            cast(Any, {'Error': {'Code': '304', 'Message': 'Not Modified'},
+                       'ResponseMetadata': {'HTTPStatusCode': 304, 'HTTPHeaders': {'etag': '"abc123"'}}}),
+            'GetObject'
+        )
+        mock_boto3.client.return_value = mock_s3
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        job = JobInfo(job_id='test-id', status=JobStatus.COMPLETED,
+                      result_s3_uri='s3://bucket/executions/test-id/results/alignment-output.aln')
+
+        result = service.open_job_result(job, 'alignment-output.aln', if_none_match='"abc123"')
+        assert result is not None
+        assert result.not_modified
+        assert result.etag == '"abc123"'
+
+    @patch('src.job_service.boto3')
+    def test_open_job_result_s3_step_functions_layout(self, mock_boto3: MagicMock) -> None:
+        """Test the alignment is read from the result URI itself, other result files from its directory."""
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {'Body': MagicMock(), 'ContentLength': 0, 'ETag': '"abc123"'}
+        mock_boto3.client.return_value = mock_s3
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        job = JobInfo(job_id='test-id', status=JobStatus.COMPLETED,
+                      result_s3_uri='s3://bucket/executions/test-id/results/alignment.aln')
+
+        assert service.open_job_result(job, 'alignment-output.aln') is not None
+        mock_s3.get_object.assert_called_with(Bucket='bucket', Key='executions/test-id/results/alignment.aln')
+
+        assert service.open_job_result(job, 'aligned_seq_info.json') is not None
+        mock_s3.get_object.assert_called_with(Bucket='bucket', Key='executions/test-id/results/aligned_seq_info.json')
+
+    @patch('src.job_service.boto3')
+    def test_open_job_result_s3_close(self, mock_boto3: MagicMock) -> None:
+        """Test closing a partially streamed result closes the S3 response body."""
+        mock_body = MagicMock()
+        mock_body.iter_chunks.return_value = iter([b'CLUSTAL', b' alignment'])
+        mock_s3 = MagicMock()
+        mock_s3.get_object.return_value = {'Body': mock_body, 'ContentLength': 17}
+        mock_boto3.client.return_value = mock_s3
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        job = JobInfo(job_id='test-id', status=JobStatus.COMPLETED,
+                      result_s3_uri='s3://bucket/executions/test-id/results/alignment.aln')
+
+        result = service.open_job_result(job, 'alignment-output.aln')
+        assert result is not None
+        assert next(result.chunks) == b'CLUSTAL'
+        result.close()
+        mock_body.close.assert_called_once_with()
+
+
+class TestJobReuse:
+    """Test reuse of jobs with identical input (by input fingerprint)."""
+
+    SEQ_REGION = {
+        'base_seq_name': 'seq1', 'unique_entry_id': 'entry1', 'seq_id': 'X', 'seq_strand': '+',
+        'exon_seq_regions': ['X:1..100'], 'cds_seq_regions': ['X:1..100'],
+        'fasta_file_url': 'https://example.org/genome.fa.gz', 'variant_ids': ['var2', 'var1'],
+        'alt_seq_name_suffix': None
+    }
+
+    def test_input_fingerprint_canonical(self) -> None:
+        """Test fingerprints ignore key order, variant ID order and unset properties."""
+        reordered = {key: self.SEQ_REGION[key] for key in reversed(list(self.SEQ_REGION.keys()))
+                     if key != 'alt_seq_name_suffix'}
+        reordered['variant_ids'] = ['var1', 'var2']
+
+        fingerprint = compute_input_fingerprint([self.SEQ_REGION], 'v1')
+        assert compute_input_fingerprint([reordered], 'v1') == fingerprint
+
+    def test_input_fingerprint_distinct(self) -> None:
+        """Test fingerprints differ for different regions, FASTA files, pipeline versions and parent jobs."""
+        fingerprint = compute_input_fingerprint([self.SEQ_REGION], 'v1')
+        other_fasta = dict(self.SEQ_REGION, fasta_file_url='https://example.org/other.fa.gz')
+
+        assert compute_input_fingerprint([other_fasta], 'v1') != fingerprint
+        assert compute_input_fingerprint([dict(self.SEQ_REGION, variant_ids=[])], 'v1') != fingerprint
+        assert compute_input_fingerprint([self.SEQ_REGION], 'v2') != fingerprint
+        assert compute_input_fingerprint([self.SEQ_REGION], 'v1', parent_job_id='parent') != fingerprint
+        assert compute_input_fingerprint([self.SEQ_REGION, other_fasta], 'v1') \
+            != compute_input_fingerprint([other_fasta, self.SEQ_REGION], 'v1')
+
+    def test_reuse_completed_job_local(self) -> None:
+        """Test a job with the input of a completed job is created completed, referencing its results."""
+        service = JobService(use_step_functions=False)
+        first = service.create_job([self.SEQ_REGION])
+        first.status = JobStatus.COMPLETED
+        first.stage = JobStage.DONE
+
+        second = service.create_job([self.SEQ_REGION])
+
+        assert second.job_id != first.job_id
+        assert second.source_job_id == first.job_id
+        assert second.status == JobStatus.COMPLETED
+        assert second.completed_at is not None
+
+    def test_failed_job_not_reused_local(self) -> None:
+        """Test failed jobs are never reused."""
+        service = JobService(use_step_functions=False)
+        first = service.create_job([self.SEQ_REGION])
+        first.status = JobStatus.FAILED
+
+        second = service.create_job([self.SEQ_REGION])
+
+        assert second.source_job_id is None
+        assert second.status == JobStatus.PENDING
+
+    def test_job_reuse_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test jobs are not reused when job reuse is disabled."""
+        monkeypatch.setenv('JOB_REUSE_ENABLED', 'false')
+        service = JobService(use_step_functions=False)
+        first = service.create_job([self.SEQ_REGION])
+        first.status = JobStatus.COMPLETED
+
+        assert service.create_job([self.SEQ_REGION]).source_job_id is None
+
+    @patch('src.job_service.boto3')
+    def test_attach_to_running_job(self, mock_boto3: MagicMock) -> None:
+        """Test a job with the input of a running job attaches to its execution."""
+        mock_table = MagicMock()
+        mock_table.query.return_value = {
+            'Items': [
+                {'job_id': 'failed-id', 'status': 'FAILED', 'created_at': '2024-01-02T00:00:00Z'},
+                {'job_id': 'running-id', 'status': 'RUNNING', 'stage': 'ALIGNMENT',
+                 'created_at': '2024-01-01T00:00:00Z', 'execution_arn': 'arn:running'}
+            ]
+        }
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        job = service.create_job([self.SEQ_REGION])
+
+        assert job.source_job_id == 'running-id'
+        assert job.status == JobStatus.RUNNING
+        assert mock_table.query.call_args.kwargs['IndexName'] == 'input_fingerprint-created_at-index'
+        stored_item = mock_table.put_item.call_args.kwargs['Item']
+        assert stored_item['execution_arn'] == 'arn:running'
+        assert stored_item['source_job_id'] == 'running-id'
+        assert stored_item['input_fingerprint'] == job.input_fingerprint
+
+    @patch('src.job_service.boto3')
+    def test_sync_from_source_job(self, mock_boto3: MagicMock) -> None:
+        """Test a job attached to a pending job picks up the source job's execution once started."""
+        items = {
+            'attached-id': {'job_id': 'attached-id', 'status': 'PENDING', 'source_job_id': 'source-id'},
+            'source-id': {'job_id': 'source-id', 'status': 'RUNNING', 'stage': 'INITIALIZING',
+                          'execution_arn': 'arn:source'}
+        }
+        mock_table = MagicMock()
+        mock_table.get_item.side_effect = lambda Key: {'Item': items[Key['job_id']]}
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        service.sync_job_status('attached-id')
+
+        update_kwargs = mock_table.update_item.call_args.kwargs
+        assert update_kwargs['Key'] == {'job_id': 'attached-id'}
+        assert update_kwargs['ExpressionAttributeValues'][':arn'] == 'arn:source'
+        assert update_kwargs['ExpressionAttributeValues'][':status'] == 'RUNNING'
+
+
+class TestBatchJobStatus:
+    """Test getting multiple jobs with DynamoDB BatchGetItem."""
+
+    @patch('src.job_service.boto3')
+    def test_get_jobs_chunked(self, mock_boto3: MagicMock) -> None:
+        """Test jobs are requested in chunks of 100 keys and returned in request order."""
+        def batch_get_item(RequestItems: dict[str, Any]) -> dict[str, Any]:
+            keys = RequestItems['test-table']['Keys']
+            return {'Responses': {'test-table': [
+                {'job_id': key['job_id'], 'status': 'RUNNING'} for key in reversed(keys) if key['job_id'] != 'job-5'
+            ]}}
+
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.batch_get_item.side_effect = batch_get_item
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        job_ids = [f'job-{i}' for i in range(250)]
+        jobs = service.get_jobs(job_ids + ['job-0'])
+
+        assert mock_dynamodb.batch_get_item.call_count == 3
+        assert [len(call.kwargs['RequestItems']['test-table']['Keys'])
+                for call in mock_dynamodb.batch_get_item.call_args_list] == [100, 100, 50]
+        assert [job.job_id for job in jobs] == [job_id for job_id in job_ids if job_id != 'job-5']
+
+    @patch('src.job_service.time.sleep')
+    @patch('src.job_service.boto3')
+    def test_get_jobs_unprocessed_keys(self, mock_boto3: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test unprocessed keys are retried."""
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.batch_get_item.side_effect = [
+            {'Responses': {'test-table': [{'job_id': 'job-1', 'status': 'RUNNING'}]},
+             'UnprocessedKeys': {'test-table': {'Keys': [{'job_id': 'job-2'}]}}},
+            {'Responses': {'test-table': [{'job_id': 'job-2', 'status': 'COMPLETED'}]}}
+        ]
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        jobs = service.get_jobs(['job-1', 'job-2'])
+
+        assert [job.job_id for job in jobs] == ['job-1', 'job-2']
+        mock_sleep.assert_called_once()
+
+    @patch('src.job_service.boto3')
+    def test_get_jobs_cached_terminal(self, mock_boto3: MagicMock) -> None:
+        """Test cached terminal jobs are not requested from DynamoDB."""
+        mock_dynamodb = MagicMock()
+        mock_boto3.resource.return_value = mock_dynamodb
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        service._cache_status(JobInfo(job_id='job-1', status=JobStatus.COMPLETED))
+        jobs = service.get_jobs(['job-1'])
+
+        assert [job.job_id for job in jobs] == ['job-1']
+        mock_dynamodb.batch_get_item.assert_not_called()
+
+    @patch('src.job_service.boto3')
+    def test_sync_batch_read_jobs(self, mock_boto3: MagicMock) -> None:
+        """Test jobs read with BatchGetItem are synced without reading them again."""
+        mock_dynamodb = MagicMock()
+        mock_dynamodb.batch_get_item.return_value = {'Responses': {'test-table': [
+            {'job_id': 'job-1', 'status': 'RUNNING', 'execution_arn': 'arn:running'}
+        ]}}
+        mock_boto3.resource.return_value = mock_dynamodb
+        mock_sfn = MagicMock()
+        mock_sfn.describe_execution.return_value = {'status': 'RUNNING'}
+        mock_boto3.client.return_value = mock_sfn
+
+        service = JobService(dynamodb_table_name='test-table', use_step_functions=True)
+        job = service.get_jobs(['job-1'])[0]
+        synced = service.get_job_with_sync(job.job_id, job)
+
+        assert synced is not None and synced.status == JobStatus.RUNNING
+        mock_sfn.describe_execution.assert_called_once_with(executionArn='arn:running')
+        mock_dynamodb.Table.return_value.get_item.assert_not_called()
+
+
+class TestInProcessExecution:
+    """Test in-process execution of small jobs."""
+
+    SEQ_REGION = {
+        'base_seq_name': 'seq1', 'unique_entry_id': 'entry1', 'seq_id': 'X', 'seq_strand': '+',
+        'exon_seq_regions': ['1..100', {'start': 201, 'end': 300}], 'cds_seq_regions': ['1..100'],
+        'fasta_file_url': 'https://example.org/genome.fa.gz', 'variant_ids': []
+    }
+
+    @staticmethod
+    def in_process_service(monkeypatch: pytest.MonkeyPatch) -> JobService:
+        monkeypatch.setenv('IN_PROCESS_JOBS_ENABLED', 'true')
+        monkeypatch.setenv('IN_PROCESS_MAX_SEQ_REGIONS', '2')
+        monkeypatch.setenv('IN_PROCESS_MAX_SEQ_LENGTH', '1000')
+        service = JobService(dynamodb_table_name='test-table', s3_bucket='test-bucket', use_step_functions=True)
+        service._in_process_available = True
+        return service
+
+    def test_seq_region_length(self) -> None:
+        """Test exon region lengths are summed for both region formats."""
+        assert seq_region_length(self.SEQ_REGION) == 200
+        with pytest.raises(ValueError):
+            seq_region_length({'exon_seq_regions': ['X:1-100']})
+
+    def test_select_execution_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test only jobs within the size thresholds are run in-process."""
+        service = self.in_process_service(monkeypatch)
+        long_region = dict(self.SEQ_REGION, exon_seq_regions=['1..2000'])
+
+        assert service.select_execution_path([self.SEQ_REGION]) == ExecutionPath.IN_PROCESS
+        assert service.select_execution_path([self.SEQ_REGION] * 3) == ExecutionPath.STEP_FUNCTIONS
+        assert service.select_execution_path([long_region]) == ExecutionPath.STEP_FUNCTIONS
+        assert service.select_execution_path([self.SEQ_REGION], parent_job_id='parent') == ExecutionPath.STEP_FUNCTIONS
+
+        service._in_process_job_count = service.in_process_workers + service.in_process_max_queued_jobs
+        assert service.select_execution_path([self.SEQ_REGION]) == ExecutionPath.STEP_FUNCTIONS
+
+    def test_select_execution_path_disabled(self) -> None:
+        """Test all jobs run through Step Functions when in-process execution is disabled."""
+        service = JobService(use_step_functions=True)
+
+        assert service.select_execution_path([self.SEQ_REGION]) == ExecutionPath.STEP_FUNCTIONS
+
+    @patch('src.job_service.boto3')
+    def test_create_job_records_execution_path(self, mock_boto3: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the selected execution path is stored on the job record."""
+        mock_table = MagicMock()
+        mock_table.query.return_value = {'Items': []}
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+
+        service = self.in_process_service(monkeypatch)
+        job = service.create_job([self.SEQ_REGION])
+
+        assert job.execution_path == ExecutionPath.IN_PROCESS
+        assert job.to_dict()['execution_path'] == 'in_process'
+        assert mock_table.put_item.call_args.kwargs['Item']['execution_path'] == 'IN_PROCESS'
+
+    @patch('src.job_service.boto3')
+    def test_run_job_in_process(self, mock_boto3: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test in-process results are stored in the same S3 layout as Step Functions executions."""
+        mock_table = MagicMock()
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+        mock_s3 = MagicMock()
+        mock_boto3.client.return_value = mock_s3
+
+        def run_local_pipeline(seq_regions: list[dict[str, Any]], work_dir: str, results_dir: str, **kwargs: Any) -> int:
+            import os
+            assert work_dir
+            os.makedirs(results_dir)
+            for result_file in [kwargs['alignment_result_file'], 'aligned_seq_info.json']:
+                with open(os.path.join(results_dir, result_file), 'w') as f:
+                    f.write('result')
+            kwargs['progress']('ALIGNMENT', len(seq_regions))
+            return len(seq_regions)
+
+        service = self.in_process_service(monkeypatch)
+        with patch('local_pipeline.run_local_pipeline', side_effect=run_local_pipeline):
+            service.run_job_in_process('job-1', [self.SEQ_REGION])
+
+        assert [call.args[1:] for call in mock_s3.upload_file.call_args_list] == [
+            ('test-bucket', 'executions/job-1/results/alignment.aln'),
+            ('test-bucket', 'executions/job-1/results/aligned_seq_info.json')
+        ]
+        stages = [call.kwargs['ExpressionAttributeValues'].get(':stage')
+                  for call in mock_table.update_item.call_args_list]
+        assert stages == ['SEQUENCE_RETRIEVAL', 'ALIGNMENT', 'DONE']
+        final_values = mock_table.update_item.call_args.kwargs['ExpressionAttributeValues']
+        assert final_values[':status'] == 'COMPLETED'
+        assert final_values[':result_s3_uri'] == 's3://test-bucket/executions/job-1/results/alignment.aln'
+        assert final_values[':sequences_processed'] == 1
+
+    @patch('src.job_service.boto3')
+    def test_run_job_in_process_failure(self, mock_boto3: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test in-process pipeline failures are recorded on the job."""
+        mock_table = MagicMock()
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+
+        service = self.in_process_service(monkeypatch)
+        with patch('local_pipeline.run_local_pipeline', side_effect=RuntimeError('Alignment failed')):
+            service.run_job_in_process('job-1', [self.SEQ_REGION])
+
+        final_values = mock_table.update_item.call_args.kwargs['ExpressionAttributeValues']
+        assert final_values[':status'] == 'FAILED'
+        assert final_values[':error_message'] == 'Alignment failed'
+
+    def test_submit_in_process_job(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test submitted jobs run on the in-process worker pool and release their capacity."""
+        service = self.in_process_service(monkeypatch)
+        with patch.object(service, 'run_job_in_process') as mock_run:
+            assert service.submit_in_process_job('job-1', [self.SEQ_REGION])
+            assert service._in_process_executor is not None
+            service._in_process_executor.shutdown(wait=True)
+
+        mock_run.assert_called_once_with('job-1', [self.SEQ_REGION])
+        assert service._in_process_job_count == 0
+        assert not service._in_process_jobs
+
+    @patch('src.job_service.boto3')
+    def test_submit_in_process_job_at_capacity(self, mock_boto3: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test jobs submitted while the worker pool is at capacity are switched to Step Functions."""
+        mock_table = MagicMock()
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+
+        service = self.in_process_service(monkeypatch)
+        service._in_process_job_count = service.in_process_workers + service.in_process_max_queued_jobs
+        with patch.object(service, 'run_job_in_process') as mock_run:
+            assert not service.submit_in_process_job('job-1', [self.SEQ_REGION])
+
+        mock_run.assert_not_called()
+        assert service._in_process_job_count == service.in_process_workers + service.in_process_max_queued_jobs
+        assert mock_table.update_item.call_args.kwargs['ExpressionAttributeValues'] == {
+            ':execution_path': 'STEP_FUNCTIONS'
+        }
+
+    @patch('src.job_service.boto3')
+    def test_reconcile_expired_in_process_jobs(self, mock_boto3: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test in-process jobs whose lease expired are marked as failed."""
+        now = datetime.utcnow()
+        mock_table = MagicMock()
+        mock_table.query.side_effect = [
+            {'Items': []},  # PENDING
+            {'Items': [
+                {'job_id': 'lost-id', 'status': 'RUNNING', 'execution_path': 'IN_PROCESS', 'lease_owner': 'stopped-task',
+                 'lease_renewed_at': (now - timedelta(minutes=10)).isoformat() + 'Z'},
+                {'job_id': 'running-id', 'status': 'RUNNING', 'execution_path': 'IN_PROCESS', 'lease_owner': 'task',
+                 'lease_renewed_at': now.isoformat() + 'Z'}
+            ]}  # RUNNING
+        ]
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+
+        service = self.in_process_service(monkeypatch)
+
+        assert service.reconcile_active_jobs() == 1
+        mock_table.update_item.assert_called_once()
+        update_kwargs = mock_table.update_item.call_args.kwargs
+        assert update_kwargs['Key'] == {'job_id': 'lost-id'}
+        assert update_kwargs['ExpressionAttributeValues'][':status'] == 'FAILED'
@@ -0,0 +1,63 @@
+"""
+Unit tests for job_status_poller module.
+
+Tests the JobStatusPoller class with a mocked job service and SQS client.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+from src.job_status_poller import JobStatusPoller
+
+
+def test_poll_once() -> None:
+    """Test a poll reconciles all active jobs."""
+    job_service = MagicMock()
+    job_service.reconcile_active_jobs.return_value = 3
+
+    poller = JobStatusPoller(job_service, interval=60)
+
+    assert poller.poll_once() == 3
+
+
+def test_poll_once_error() -> None:
+    """Test reconciliation errors do not stop the poller."""
+    job_service = MagicMock()
+    job_service.reconcile_active_jobs.side_effect = Exception('throttled')
+
+    poller = JobStatusPoller(job_service, interval=60)
+
+    assert poller.poll_once() == 0
+
+
+def test_ingest_events() -> None:
+    """Test events are applied and deleted from the queue, unless they failed to apply."""
+    job_service = MagicMock()
+    job_service.apply_execution_event.return_value = True
+
+    poller = JobStatusPoller(job_service, interval=60, events_queue_url='https://sqs/queue')
+    poller._sqs = MagicMock()
+    poller._sqs.receive_message.return_value = {
+        'Messages': [
+            {'MessageId': '1', 'ReceiptHandle': 'handle-1',
+             'Body': json.dumps({'detail': {'name': 'pavi-job-test-id', 'status': 'SUCCEEDED'}})},
+            {'MessageId': '2', 'ReceiptHandle': 'handle-2', 'Body': 'not-json'}
+        ]
+    }
+
+    assert poller.ingest_events() == 1
+    poller._sqs.delete_message.assert_called_once_with(QueueUrl='https://sqs/queue', ReceiptHandle='handle-1')
+
+
+def test_start_stop() -> None:
+    """Test starting the poller enables background sync on the job service, stopping disables it."""
+    job_service = MagicMock()
+    job_service.reconcile_active_jobs.return_value = 0
+
+    poller = JobStatusPoller(job_service, interval=60)
+    poller.start()
+    assert job_service.background_sync is True
+
+    poller.stop(timeout=5)
+    assert job_service.background_sync is False
+    job_service.reconcile_active_jobs.assert_called()
@@ -0,0 +1,25 @@
+"""
+Unit tests for local_pipeline module.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.local_pipeline import aligner_command, local_pipeline_available
+
+
+def test_aligner_command() -> None:
+    """Test aligner commands produce clustal-formatted output."""
+    assert aligner_command('clustalo', 'in.fa', 'out.aln') == \
+        ['clustalo', '-i', 'in.fa', '-o', 'out.aln', '--outfmt=clu', '--threads=2', '--force']
+    assert '--clustalout' in aligner_command('mafft', 'in.fa', 'out.aln')
+
+    with pytest.raises(ValueError):
+        aligner_command('muscle', 'in.fa', 'out.aln')
+
+
+def test_local_pipeline_unavailable() -> None:
+    """Test in-process execution is unavailable without the aligner installed."""
+    assert not local_pipeline_available('muscle')
+    with patch('src.local_pipeline.shutil.which', return_value=None):
+        assert not local_pipeline_available('clustalo')
@@ -1,6 +1,13 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+import httpx
 from fastapi.testclient import TestClient
 
-from src.main import app
+from src.main import app, job_event_broker, Pipeline_job, JobScheduler
+from src.job_service import ExecutionPath, JobInfo, JobResultStream, JobStatus
 from uuid import uuid1, UUID
 
 from pytest_mock import MockerFixture
@@ -80,3 +87,241 @@ def test_alignment_result_seq_info_read_error(mocker: MockerFixture) -> None:
     response = client.get(f'/api/pipeline-job/{mock_uuid}/result/seq-info')
 
     assert response.status_code == 404
+
+
+def test_concurrent_job_polling(mocker: MockerFixture) -> None:
+    """
+    Test concurrent job status polling against a blocking job service.
+
+    Blocking AWS calls run on the AWS I/O thread pool, so concurrent polls are served
+    in parallel and unrelated requests (health checks) are not delayed by them.
+    All polls block in the job service until every one of them was received
+    and a health check was served, which can only happen when none of them blocks the event loop.
+    Polling latency percentiles are measured by pipeline_components/aws_infra/local-testing/benchmark_polling.py.
+    """
+    concurrent_polls = 20
+    # Concurrent polls blocking in the job service (and the test, waiting for them)
+    polls_blocked = threading.Barrier(concurrent_polls + 1)
+    release = threading.Event()
+
+    def blocking_get_job_with_sync(job_id: str) -> JobInfo:
+        # Simulated blocking boto3 round trip (timeouts only prevent a hanging test when the event loop is blocked)
+        polls_blocked.wait(timeout=10)
+        release.wait(timeout=10)
+        return JobInfo(job_id=job_id, status=JobStatus.RUNNING)
+
+    mock_job_service = mocker.MagicMock()
+    mock_job_service.get_job_with_sync.side_effect = blocking_get_job_with_sync
+    mocker.patch('src.main.USE_STEP_FUNCTIONS', True)
+    mocker.patch('src.main.get_job_service', return_value=mock_job_service)
+
+    async def run_load() -> tuple[list[httpx.Response], httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as async_client:
+            polls = [asyncio.create_task(async_client.get(f'/api/pipeline-job/{uuid1()}'))
+                     for _ in range(concurrent_polls)]
+            await asyncio.to_thread(polls_blocked.wait, 10)
+            # Served while all polls are still blocked in the job service
+            health = await async_client.get('/api/health')
+            release.set()
+            return await asyncio.gather(*polls), health
+
+    poll_responses, health_response = asyncio.run(run_load())
+
+    assert all(response.status_code == 200 for response in poll_responses)
+    assert health_response.status_code == 200
+    assert mock_job_service.get_job_with_sync.call_count == concurrent_polls
+
+
+def test_result_alignment_streaming(mocker: MockerFixture) -> None:
+    """Test Step Functions mode result responses: full, partial (range) and not modified."""
+    job_info = JobInfo(job_id=str(mock_uuid), status=JobStatus.COMPLETED)
+    mock_job_service = mocker.MagicMock()
+    mock_job_service.get_job_with_sync.return_value = job_info
+    mocker.patch('src.main.USE_STEP_FUNCTIONS', True)
+    mocker.patch('src.main.get_job_service', return_value=mock_job_service)
+
+    mock_job_service.open_job_result.return_value = JobResultStream(
+        etag='"abc123"', chunks=iter([b'CLUSTAL', b' alignment']), content_length=17)
+    response = client.get(f'/api/pipeline-job/{mock_uuid}/result/alignment')
+    assert response.status_code == 200
+    assert response.text == 'CLUSTAL alignment'
+    assert response.headers['Content-Length'] == '17'
+    assert response.headers['ETag'] == '"abc123"'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+
+    mock_job_service.open_job_result.return_value = JobResultStream(
+        etag='"abc123"', chunks=iter([b'CLUSTAL']), content_length=7, content_range='bytes 0-6/17')
+    response = client.get(f'/api/pipeline-job/{mock_uuid}/result/alignment', headers={'Range': 'bytes=0-6'})
+    assert response.status_code == 206
+    assert response.text == 'CLUSTAL'
+    assert response.headers['Content-Range'] == 'bytes 0-6/17'
+    assert mock_job_service.open_job_result.call_args.kwargs['range_header'] == 'bytes=0-6'
+
+    mock_job_service.open_job_result.return_value = JobResultStream(etag='"abc123"', not_modified=True)
+    response = client.get(f'/api/pipeline-job/{mock_uuid}/result/alignment', headers={'If-None-Match': '"abc123"'})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == '"abc123"'
+    assert mock_job_service.open_job_result.call_args.kwargs['if_none_match'] == '"abc123"'
+
+
+def test_create_job_reusing_existing_job(mocker: MockerFixture) -> None:
+    """Test no execution is started for jobs reusing an existing job's results."""
+    source_uuid = uuid1()
+    job_info = JobInfo(job_id=str(uuid1()), status=JobStatus.COMPLETED, source_job_id=str(source_uuid))
+    mock_job_service = mocker.MagicMock()
+    mock_job_service.create_job.return_value = job_info
+    mocker.patch('src.main.should_use_step_functions', return_value=True)
+    mocker.patch('src.main.get_job_service', return_value=mock_job_service)
+    mock_run = mocker.patch('src.main.run_pipeline_step_functions')
+
+    response = client.post('/api/pipeline-job/', json=[{
+        'base_seq_name': 'seq1', 'unique_entry_id': 'entry1', 'seq_id': 'X', 'seq_strand': '+',
+        'exon_seq_regions': ['X:1..100'], 'cds_seq_regions': ['X:1..100'],
+        'fasta_file_url': 'https://example.org/genome.fa.gz', 'variant_ids': []
+    }])
+
+    assert response.status_code == 201
+    assert response.json()['status'] == 'completed'
+    assert response.json()['source_job_id'] == str(source_uuid)
+    mock_run.assert_not_called()
+
+
+def test_create_job_in_process(mocker: MockerFixture) -> None:
+    """Test small jobs are submitted to the in-process worker pool rather than Step Functions."""
+    job_info = JobInfo(job_id=str(uuid1()), status=JobStatus.PENDING, execution_path=ExecutionPath.IN_PROCESS)
+    mock_job_service = mocker.MagicMock()
+    mock_job_service.create_job.return_value = job_info
+    mocker.patch('src.main.should_use_step_functions', return_value=True)
+    mocker.patch('src.main.get_job_service', return_value=mock_job_service)
+    mock_run = mocker.patch('src.main.run_pipeline_step_functions')
+
+    response = client.post('/api/pipeline-job/', json=[{
+        'base_seq_name': 'seq1', 'unique_entry_id': 'entry1', 'seq_id': 'X', 'seq_strand': '+',
+        'exon_seq_regions': ['1..100'], 'cds_seq_regions': ['1..100'],
+        'fasta_file_url': 'https://example.org/genome.fa.gz', 'variant_ids': []
+    }])
+
+    assert response.status_code == 201
+    assert response.json()['execution_path'] == 'in_process'
+    mock_job_service.submit_in_process_job.assert_called_once()
+    assert mock_job_service.submit_in_process_job.call_args.args[0] == job_info.job_id
+    mock_run.assert_not_called()
+
+
+def test_create_job_in_process_at_capacity(mocker: MockerFixture) -> None:
+    """Test in-process jobs are run through Step Functions when the worker pool filled up in the meantime."""
+    job_info = JobInfo(job_id=str(uuid1()), status=JobStatus.PENDING, execution_path=ExecutionPath.IN_PROCESS)
+    mock_job_service = mocker.MagicMock()
+    mock_job_service.create_job.return_value = job_info
+    # At capacity, submitting updates the job record (blocking AWS I/O), so must not run on the event loop
+    submit_threads: list[str] = []
+
+    def submit_in_process_job(job_id: str, seq_regions: list[dict[str, Any]]) -> bool:  # noqa: U100
+        submit_threads.append(threading.current_thread().name)
+        return False
+
+    mock_job_service.submit_in_process_job.side_effect = submit_in_process_job
+    mocker.patch('src.main.should_use_step_functions', return_value=True)
+    mocker.patch('src.main.get_job_service', return_value=mock_job_service)
+    mock_run = mocker.patch('src.main.run_pipeline_step_functions')
+
+    response = client.post('/api/pipeline-job/', json=[{
+        'base_seq_name': 'seq1', 'unique_entry_id': 'entry1', 'seq_id': 'X', 'seq_strand': '+',
+        'exon_seq_regions': ['1..100'], 'cds_seq_regions': ['1..100'],
+        'fasta_file_url': 'https://example.org/genome.fa.gz', 'variant_ids': []
+    }])
+
+    assert response.status_code == 201
+    assert response.json()['execution_path'] == 'step_functions'
+    assert submit_threads[0].startswith('aws-io')
+    mock_run.assert_called_once()
+
+
+def test_create_job_nextflow_queue(mocker: MockerFixture) -> None:
+    """Test Nextflow jobs are queued with a reported queue position, and rejected once the queue is full."""
+    scheduler = JobScheduler(max_workers=1, max_queued=1, name='test')
+    mocker.patch('src.main.nextflow_scheduler', scheduler)
+    mocker.patch('src.main.should_use_step_functions', return_value=False)
+    mocker.patch('src.main.USE_STEP_FUNCTIONS', False)
+    mock_run = mocker.patch('src.main.run_pipeline')
+    # Keep the (single) worker busy, so submitted jobs wait in the queue
+    release = threading.Event()
+    scheduler.submit('blocker', release.wait)
+    while scheduler.metrics()['running'] == 0:
+        time.sleep(0.01)
+
+    seq_regions = [{
+        'base_seq_name': 'seq1', 'unique_entry_id': 'entry1', 'seq_id': 'X', 'seq_strand': '+',
+        'exon_seq_regions': ['1..100'], 'cds_seq_regions': ['1..100'],
+        'fasta_file_url': 'https://example.org/genome.fa.gz', 'variant_ids': []
+    }]
+    response = client.post('/api/pipeline-job/', json=seq_regions)
+    assert response.status_code == 201
+    assert response.json()['queue_position'] == 1
+    job_uuid = response.json()['uuid']
+
+    assert client.get(f'/api/pipeline-job/{job_uuid}').json()['queue_position'] == 1
+
+    response = client.post('/api/pipeline-job/', json=seq_regions)
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '30'
+
+    assert client.get('/api/job-queue').json()['rejected'] == 1
+
+    # Discard the queued job rather than running it
+    scheduler.shutdown(wait=False)
+    release.set()
+    mock_run.assert_not_called()
+
+
+def test_batch_job_status(mocker: MockerFixture) -> None:
+    """Test the batch job status endpoint only syncs non-terminal jobs."""
+    completed_uuid, running_uuid = uuid1(), uuid1()
+    mock_job_service = mocker.MagicMock()
+    mock_job_service.get_jobs.return_value = [
+        JobInfo(job_id=str(completed_uuid), status=JobStatus.COMPLETED),
+        JobInfo(job_id=str(running_uuid), status=JobStatus.RUNNING)
+    ]
+    mock_job_service.get_job_with_sync.return_value = JobInfo(job_id=str(running_uuid), status=JobStatus.FAILED)
+    mocker.patch('src.main.USE_STEP_FUNCTIONS', True)
+    mocker.patch('src.main.get_job_service', return_value=mock_job_service)
+
+    response = client.post('/api/pipeline-jobs/status', json=[str(completed_uuid), str(running_uuid), str(NOT_FOUND_UUID)])
+
+    assert response.status_code == 200
+    assert [(job['uuid'], job['status']) for job in response.json()] == [
+        (str(completed_uuid), 'completed'), (str(running_uuid), 'failed')
+    ]
+    mock_job_service.get_job_with_sync.assert_called_once_with(
+        str(running_uuid), mock_job_service.get_jobs.return_value[1])
+
+
+def test_batch_job_status_too_many_jobs() -> None:
+    response = client.post('/api/pipeline-jobs/status', json=[str(uuid1()) for _ in range(1001)])
+
+    assert response.status_code == 400
+
+
+def test_job_events_stream(mocker: MockerFixture) -> None:
+    """Test the job events endpoint streams the job state as Server-Sent Events."""
+    job_uuid = uuid1()
+    mocker.patch.dict('src.main.jobs', {job_uuid: Pipeline_job(uuid=job_uuid, status='completed')})
+    fetch_job = mocker.patch.object(job_event_broker, 'fetch_job', side_effect=job_event_broker.fetch_job)
+
+    with client.stream('GET', f'/api/pipeline-job/{job_uuid}/events') as response:
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+        body = ''.join(response.iter_text())
+
+    assert body.count('event: status\n') == 1
+    assert f'"uuid": "{job_uuid}"' in body
+    assert '"status": "completed"' in body
+    # The job state fetched by the subscription also serves the not found check
+    fetch_job.assert_called_once_with(str(job_uuid))
+
+
+def test_job_events_not_found() -> None:
+    response = client.get(f'/api/pipeline-job/{NOT_FOUND_UUID}/events')
+
+    assert response.status_code == 404
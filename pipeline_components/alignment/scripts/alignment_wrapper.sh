@@ -3,7 +3,13 @@
 #
 # Downloads FASTA files from S3 work directory, runs alignment, uploads results to S3.
 #
+# When a parent alignment is provided (--parent-alignment or PARENT_ALIGNMENT_S3_URI),
+# the new sequences are added to that existing alignment instead of realigning everything:
+#  * mafft: mafft --add <new seqs> --keeplength (parent alignment columns are preserved)
+#  * clustalo: profile alignment of the new sequences against the parent alignment
+#
 # Usage: alignment_wrapper.sh --s3-work-prefix <s3-uri> --s3-results-prefix <s3-uri> [--aligner <clustalo|mafft>]
+#                             [--parent-alignment <s3-uri>]
 
 set -e  # Exit on error
 
@@ -11,6 +17,7 @@ set -e  # Exit on error
 S3_WORK_PREFIX=""
 S3_RESULTS_PREFIX=""
 ALIGNER="clustalo"  # Default aligner
+PARENT_ALIGNMENT="${PARENT_ALIGNMENT_S3_URI:-}"  # Incremental mode when set
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -26,6 +33,10 @@ while [[ $# -gt 0 ]]; do
             ALIGNER="$2"
             shift 2
             ;;
+        --parent-alignment)
+            PARENT_ALIGNMENT="$2"
+            shift 2
+            ;;
         *)
             echo "Unknown option: $1"
             exit 1
@@ -75,12 +86,37 @@ echo "Combined input has $SEQ_COUNT sequences"
 ALIGNMENT_OUTPUT="$WORK_DIR/output/alignment.aln"
 
 # Run alignment
-echo "Running alignment with $ALIGNER..."
-
-if [ "$ALIGNER" = "mafft" ]; then
+if [ -n "$PARENT_ALIGNMENT" ]; then
+    echo "Downloading parent alignment from $PARENT_ALIGNMENT..."
+    PARENT_CLUSTAL="$WORK_DIR/parent_alignment.aln"
+    aws s3 cp "$PARENT_ALIGNMENT" "$PARENT_CLUSTAL"
+
+    echo "Adding sequences to parent alignment with $ALIGNER..."
+
+    if [ "$ALIGNER" = "mafft" ]; then
+        # mafft --add requires the existing alignment in (aligned) FASTA format
+        PARENT_FASTA="$WORK_DIR/parent_alignment.fa"
+        awk '
+            NR == 1 && /^CLUSTAL/ { next }
+            /^[[:space:]]*$/ { next }
+            /^[[:space:]]/ { next }
+            {
+                if (!($1 in seqs)) { order[++n] = $1 }
+                seqs[$1] = seqs[$1] $2
+            }
+            END { for (i = 1; i <= n; i++) { print ">" order[i]; print seqs[order[i]] } }
+        ' "$PARENT_CLUSTAL" > "$PARENT_FASTA"
+
+        mafft --add "$COMBINED_INPUT" --keeplength --clustalout "$PARENT_FASTA" > "$ALIGNMENT_OUTPUT"
+    else
+        clustalo -i "$COMBINED_INPUT" --profile1 "$PARENT_CLUSTAL" -o "$ALIGNMENT_OUTPUT" --outfmt=clu --threads=2 --force
+    fi
+elif [ "$ALIGNER" = "mafft" ]; then
+    echo "Running alignment with $ALIGNER..."
     # MAFFT with L-INS-i for accuracy (best for small-medium datasets)
     mafft --localpair --maxiterate 1000 --clustalout "$COMBINED_INPUT" > "$ALIGNMENT_OUTPUT"
 else
+    echo "Running alignment with $ALIGNER..."
     # Clustal Omega (default)
     clustalo -i "$COMBINED_INPUT" -o "$ALIGNMENT_OUTPUT" --outfmt=clu --threads=2 --force
 fi
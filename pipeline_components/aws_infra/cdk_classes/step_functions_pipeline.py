@@ -18,6 +18,9 @@ from aws_cdk import (
     aws_iam as iam,
     aws_logs as cwl,
     aws_dynamodb as dynamodb,
+    aws_events as events,
+    aws_events_targets as events_targets,
+    aws_sqs as sqs,
     Tags as cdk_tags
 )
 from constructs import Construct
@@ -41,6 +44,7 @@ class PaviStepFunctionsPipeline:
     seq_retrieval_job_def: batch.EcsJobDefinition
     alignment_job_def: batch.EcsJobDefinition
     log_group: cwl.LogGroup
+    execution_events_queue: sqs.Queue
 
     def __init__(
         self,
@@ -82,6 +86,9 @@ class PaviStepFunctionsPipeline:
         # Create Step Functions state machine
         self._create_state_machine()
 
+        # Create queue receiving execution status change events (for API job status updates)
+        self._create_execution_events_queue()
+
     def _create_work_bucket(self) -> None:
         """Create S3 bucket for Step Functions work directory and results."""
         bucket_name = 'agr-pavi-pipeline-stepfunctions'
@@ -147,6 +154,20 @@ class PaviStepFunctionsPipeline:
             projection_type=dynamodb.ProjectionType.ALL
         )
 
+        # Global Secondary Index for job reuse (lookup of jobs with identical input)
+        self.jobs_table.add_global_secondary_index(
+            index_name='input_fingerprint-created_at-index',
+            partition_key=dynamodb.Attribute(
+                name='input_fingerprint',
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name='created_at',
+                type=dynamodb.AttributeType.STRING
+            ),
+            projection_type=dynamodb.ProjectionType.ALL
+        )
+
         cdk_tags.of(self.jobs_table).add("Product", "PAVI")
         cdk_tags.of(self.jobs_table).add("CreatedBy", "PAVI")
         cdk_tags.of(self.jobs_table).add("AppComponent", "pipeline")
@@ -226,6 +247,50 @@ class PaviStepFunctionsPipeline:
         cdk_tags.of(self.alignment_job_def).add("CreatedBy", "PAVI")
         cdk_tags.of(self.alignment_job_def).add("AppComponent", "pipeline")
 
+    def _create_seq_retrieval_task(self, task_id: str, as_array_job: bool) -> sfn_tasks.BatchSubmitJob:
+        """
+        Create a Batch seq retrieval task, retrieving its entries from the seq retrieval manifest.
+
+        Args:
+            task_id: Task identifier (suffix to the construct ID)
+            as_array_job: Submit as array job with one child per manifest chunk when True,
+                          as single job retrieving the first manifest chunk otherwise.
+        """
+        task = sfn_tasks.BatchSubmitJob(
+            self.scope,
+            f'{self.construct_id}-{task_id}',
+            job_definition_arn=self.seq_retrieval_job_def.job_definition_arn,
+            job_name=sfn.JsonPath.format(
+                'seq-retrieval-{}',
+                sfn.JsonPath.string_at('$.execution_id')
+            ),
+            job_queue_arn=sfn.JsonPath.string_at('$.job_queue_arn'),
+            array_size=sfn.JsonPath.number_at('$.chunk_count') if as_array_job else None,
+            container_overrides=sfn_tasks.BatchContainerOverrides(
+                memory=Size.mebibytes(500),
+                vcpus=1,
+                # Manifest and output prefix are read from the environment by the batch CLI,
+                # array job children select their manifest chunk through AWS_BATCH_JOB_ARRAY_INDEX
+                command=['seq_retrieval_batch.py', '--output_type', 'protein'],
+                environment={
+                    'SEQ_RETRIEVAL_MANIFEST': sfn.JsonPath.string_at('$.retrieval_manifest_s3_uri'),
+                    'S3_OUTPUT_PREFIX': sfn.JsonPath.string_at('$.s3_work_prefix'),
+                    'OUTPUT_TYPE': 'protein'
+                }
+            ),
+            result_path='$.retrieval_result'
+        )
+
+        # Add retry logic for transient failures
+        task.add_retry(
+            errors=['Batch.JobFailed', 'States.TaskFailed'],
+            interval=Duration.seconds(2),
+            max_attempts=2,
+            backoff_rate=2.0
+        )
+
+        return task
+
     def _create_state_machine(self) -> None:
         """Create the Step Functions state machine for the pipeline."""
 
@@ -233,76 +298,71 @@ class PaviStepFunctionsPipeline:
         # We'll build it step by step for clarity
 
         # 1. Validate and prepare input
+        # Input regions are split into chunks of `retrieval_chunk_size` entries (derived by the API
+        # from the number of input regions and the target retrieval parallelism).
+        # All chunks are written to a manifest, from which each seq retrieval (array) job
+        # resolves the chunk to retrieve.
+        manifest_key = 'executions/{}/manifests/seq-retrieval.json'
         validate_input = sfn.Pass(
             self.scope,
             f'{self.construct_id}-validate-input',
             comment='Validate and prepare input parameters',
             parameters={
                 "execution_id.$": "$$.Execution.Name",
-                "input_regions.$": "$.seq_regions",
-                "s3_work_prefix.$": sfn.JsonPath.format(
+                "job_queue_arn.$": "$.job_queue_arn",
+                "input_chunks.$": "States.ArrayPartition($.seq_regions, $.retrieval_chunk_size)",
+                "chunk_count.$": "States.ArrayLength(States.ArrayPartition($.seq_regions, $.retrieval_chunk_size))",
+                "parent_alignment_s3_uri.$": "$.parent_alignment_s3_uri",
+                "parent_results_s3_prefix.$": "$.parent_results_s3_prefix",
+                "retrieval_manifest_s3_uri": sfn.JsonPath.format(
+                    f's3://{self.work_bucket.bucket_name}/{manifest_key}',
+                    sfn.JsonPath.string_at('$$.Execution.Name')
+                ),
+                "s3_work_prefix": sfn.JsonPath.format(
                     f's3://{self.work_bucket.bucket_name}/executions/{{}}/work/',
                     sfn.JsonPath.string_at('$$.Execution.Name')
                 ),
-                "s3_results_prefix.$": sfn.JsonPath.format(
+                "s3_results_prefix": sfn.JsonPath.format(
                     f's3://{self.work_bucket.bucket_name}/executions/{{}}/results/',
                     sfn.JsonPath.string_at('$$.Execution.Name')
                 )
-            },
-            result_path=sfn.JsonPath.DISCARD
+            }
         )
 
-        # 2. Parallel sequence retrieval (Map state)
-        # Note: We'll use a simplified version for POC
-        # The actual Batch job task would go here
-        seq_retrieval_task = sfn_tasks.BatchSubmitJob(
+        # 2. Write the seq retrieval manifest to S3
+        write_manifest = sfn_tasks.CallAwsService(
             self.scope,
-            f'{self.construct_id}-seq-retrieval-task',
-            job_definition_arn=self.seq_retrieval_job_def.job_definition_arn,
-            job_name=sfn.JsonPath.format(
-                'seq-retrieval-{}',
-                sfn.JsonPath.string_at('$.unique_entry_id')
-            ),
-            job_queue_arn=sfn.JsonPath.string_at('$.job_queue_arn'),
-            container_overrides=sfn_tasks.BatchContainerOverrides(
-                memory=Size.mebibytes(500),
-                vcpus=1,
-                # Use environment variables for dynamic values
-                environment={
-                    'UNIQUE_ENTRY_ID': sfn.JsonPath.string_at('$.unique_entry_id'),
-                    'BASE_SEQ_NAME': sfn.JsonPath.string_at('$.base_seq_name'),
-                    'SEQ_ID': sfn.JsonPath.string_at('$.seq_id'),
-                    'SEQ_STRAND': sfn.JsonPath.string_at('$.seq_strand'),
-                    'FASTA_FILE_URL': sfn.JsonPath.string_at('$.fasta_file_url'),
-                    'S3_OUTPUT_PREFIX': sfn.JsonPath.string_at('$.s3_work_prefix'),
-                    'OUTPUT_TYPE': 'protein'
-                }
-            ),
-            result_path='$.batch_result'
+            f'{self.construct_id}-write-retrieval-manifest',
+            comment='Write input chunks to the seq retrieval manifest',
+            service='s3',
+            action='putObject',
+            parameters={
+                'Bucket': self.work_bucket.bucket_name,
+                'Key': sfn.JsonPath.format(manifest_key, sfn.JsonPath.string_at('$.execution_id')),
+                'Body': sfn.JsonPath.json_to_string(sfn.JsonPath.list_at('$.input_chunks'))
+            },
+            iam_resources=[self.work_bucket.arn_for_objects('executions/*')],
+            result_path=sfn.JsonPath.DISCARD
         )
 
-        # Add retry logic for transient failures
-        seq_retrieval_task.add_retry(
-            errors=['Batch.JobFailed', 'States.TaskFailed'],
-            interval=Duration.seconds(2),
-            max_attempts=2,
-            backoff_rate=2.0
-        )
+        # 3. Sequence retrieval, as one array job (one child per chunk)
+        # or as a single job when all input fits in one chunk (array jobs require 2+ children)
+        array_retrieval_task = self._create_seq_retrieval_task('array-seq-retrieval-task', as_array_job=True)
+        single_retrieval_task = self._create_seq_retrieval_task('seq-retrieval-task', as_array_job=False)
 
-        # Map state for parallel retrieval
-        parallel_retrieval = sfn.Map(
+        retrieval_choice = sfn.Choice(
             self.scope,
-            f'{self.construct_id}-parallel-retrieval',
-            comment='Retrieve sequences in parallel for each input region',
-            items_path=sfn.JsonPath.string_at('$.input_regions'),
-            max_concurrency=40,
-            result_path='$.retrieval_results'
+            f'{self.construct_id}-retrieval-choice',
+            comment='Submit seq retrieval as array job when multiple chunks'
         )
-        parallel_retrieval.iterator(seq_retrieval_task)
+        retrieval_choice.when(
+            sfn.Condition.number_greater_than('$.chunk_count', 1),
+            array_retrieval_task
+        ).otherwise(single_retrieval_task)
 
-        # Note: Map state catch will be added after failure_state is defined
+        # Note: retrieval catches will be added after failure_state is defined
 
-        # 3. Prepare alignment input
+        # 4. Prepare alignment input
         prepare_alignment = sfn.Pass(
             self.scope,
             f'{self.construct_id}-prepare-alignment',
@@ -311,11 +371,14 @@ class PaviStepFunctionsPipeline:
                 "execution_id.$": "$.execution_id",
                 "s3_work_prefix.$": "$.s3_work_prefix",
                 "s3_results_prefix.$": "$.s3_results_prefix",
-                "job_queue_arn.$": "$.job_queue_arn"
+                "job_queue_arn.$": "$.job_queue_arn",
+                # Incremental alignment inputs (empty for full alignment)
+                "parent_alignment_s3_uri.$": "$.parent_alignment_s3_uri",
+                "parent_results_s3_prefix.$": "$.parent_results_s3_prefix"
             }
         )
 
-        # 4. Alignment job
+        # 5. Alignment job
         alignment_task = sfn_tasks.BatchSubmitJob(
             self.scope,
             f'{self.construct_id}-alignment-task',
@@ -330,7 +393,8 @@ class PaviStepFunctionsPipeline:
                 vcpus=2,
                 environment={
                     'S3_WORK_PREFIX': sfn.JsonPath.string_at('$.s3_work_prefix'),
-                    'S3_RESULTS_PREFIX': sfn.JsonPath.string_at('$.s3_results_prefix')
+                    'S3_RESULTS_PREFIX': sfn.JsonPath.string_at('$.s3_results_prefix'),
+                    'PARENT_ALIGNMENT_S3_URI': sfn.JsonPath.string_at('$.parent_alignment_s3_uri')
                 }
             ),
             result_path='$.alignment_result'
@@ -344,7 +408,7 @@ class PaviStepFunctionsPipeline:
             backoff_rate=2.0
         )
 
-        # 5. Collect and align seq info
+        # 6. Collect and align seq info
         collect_task = sfn_tasks.BatchSubmitJob(
             self.scope,
             f'{self.construct_id}-collect-task',
@@ -360,6 +424,7 @@ class PaviStepFunctionsPipeline:
                 environment={
                     'S3_WORK_PREFIX': sfn.JsonPath.string_at('$.s3_work_prefix'),
                     'S3_RESULTS_PREFIX': sfn.JsonPath.string_at('$.s3_results_prefix'),
+                    'PARENT_RESULTS_S3_PREFIX': sfn.JsonPath.string_at('$.parent_results_s3_prefix'),
                     'TASK_TYPE': 'collect_seq_info'
                 }
             ),
@@ -374,7 +439,7 @@ class PaviStepFunctionsPipeline:
             backoff_rate=2.0
         )
 
-        # 6. Failure state for unrecoverable errors
+        # 7. Failure state for unrecoverable errors
         failure_state = sfn.Fail(
             self.scope,
             f'{self.construct_id}-failure',
@@ -382,19 +447,20 @@ class PaviStepFunctionsPipeline:
             error='PipelineError'
         )
 
-        # 7. Success state
+        # 8. Success state
         success_state = sfn.Succeed(
             self.scope,
             f'{self.construct_id}-success',
             comment='Pipeline completed successfully'
         )
 
-        # Add catch for unrecoverable errors on parallel retrieval
-        parallel_retrieval.add_catch(
-            failure_state,
-            errors=['States.ALL'],
-            result_path='$.error'
-        )
+        # Add catch for unrecoverable errors on manifest writing and seq retrieval
+        for retrieval_state in [write_manifest, array_retrieval_task, single_retrieval_task]:
+            retrieval_state.add_catch(
+                failure_state,
+                errors=['States.ALL'],
+                result_path='$.error'
+            )
 
         # Add catch for unrecoverable errors on alignment task
         alignment_task.add_catch(
@@ -411,14 +477,18 @@ class PaviStepFunctionsPipeline:
         )
 
         # Chain the states together
-        definition = (
-            validate_input
-            .next(parallel_retrieval)
+        (
+            retrieval_choice.afterwards()
             .next(prepare_alignment)
             .next(alignment_task)
             .next(collect_task)
             .next(success_state)
         )
+        definition = (
+            validate_input
+            .next(write_manifest)
+            .next(retrieval_choice)
+        )
 
         # Create CloudWatch log group for state machine
         self.log_group = cwl.LogGroup(
@@ -484,3 +554,52 @@ class PaviStepFunctionsPipeline:
 
         # Grant state machine permission to access DynamoDB jobs table
         self.jobs_table.grant_read_write_data(self.state_machine.role)
+
+    def _create_execution_events_queue(self) -> None:
+        """
+        Create SQS queue receiving the state machine's execution status change events.
+
+        The API job status poller consumes these events to update job records
+        as soon as executions complete, rather than on its next reconciliation.
+        """
+        queue_name = 'pavi-execution-events'
+        if self.env_suffix:
+            queue_name += f'-{self.env_suffix}'
+
+        dead_letter_queue = sqs.Queue(
+            self.scope,
+            f'{self.construct_id}-execution-events-dlq',
+            queue_name=f'{queue_name}-dlq',
+            retention_period=Duration.days(14)
+        )
+
+        self.execution_events_queue = sqs.Queue(
+            self.scope,
+            f'{self.construct_id}-execution-events-queue',
+            queue_name=queue_name,
+            retention_period=Duration.days(1),
+            visibility_timeout=Duration.seconds(60),
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=5,
+                queue=dead_letter_queue
+            )
+        )
+
+        events.Rule(
+            self.scope,
+            f'{self.construct_id}-execution-status-change-rule',
+            description='Forward PAVI pipeline execution status changes to the API events queue',
+            event_pattern=events.EventPattern(
+                source=['aws.states'],
+                detail_type=['Step Functions Execution Status Change'],
+                detail={
+                    'stateMachineArn': [self.state_machine.state_machine_arn],
+                    'status': ['SUCCEEDED', 'FAILED', 'TIMED_OUT', 'ABORTED']
+                }
+            ),
+            targets=[events_targets.SqsQueue(self.execution_events_queue)]
+        )
+
+        cdk_tags.of(self.execution_events_queue).add("Product", "PAVI")
+        cdk_tags.of(self.execution_events_queue).add("CreatedBy", "PAVI")
+        cdk_tags.of(self.execution_events_queue).add("AppComponent", "pipeline")
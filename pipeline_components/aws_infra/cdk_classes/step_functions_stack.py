@@ -149,6 +149,13 @@ class StepFunctionsPocStack(Stack):
             description='DynamoDB jobs table ARN'
         )
 
+        CfnOutput(
+            self,
+            'ExecutionEventsQueueUrl',
+            value=self.step_functions_pipeline.execution_events_queue.queue_url,
+            description='SQS queue URL receiving execution status change events'
+        )
+
         # Create CloudWatch monitoring
         self._create_cloudwatch_alarms(env_suffix)
         self._create_cloudwatch_dashboard(env_suffix)
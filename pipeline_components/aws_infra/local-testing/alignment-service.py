@@ -3,6 +3,13 @@
 Local MAFFT alignment service for Step Functions testing.
 
 Accepts alignment requests via Lambda-style invocation and runs MAFFT.
+
+Requests are served by a threaded HTTP front end, while MAFFT subprocesses
+run on a bounded pool of worker threads (ALIGNMENT_WORKERS). Lambda-style invocations
+(/invocations, /align) wait for their alignment to complete, while /submit
+returns immediately and results can be polled through /status and /result.
+Finished results are kept in memory up to MAX_STORED_RESULTS entries,
+evicting the least recently used ones first.
 """
 
 import json
@@ -10,18 +17,201 @@ import os
 import subprocess
 import sys
 import tempfile
+import threading
 import uuid
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
 
+DATA_DIR = os.environ.get('DATA_DIR', '/data')
+ALIGNMENT_WORKERS = int(os.environ.get('ALIGNMENT_WORKERS', os.cpu_count() or 2))
+MAX_QUEUED_JOBS = int(os.environ.get('MAX_QUEUED_JOBS', 64))
+MAX_STORED_RESULTS = int(os.environ.get('MAX_STORED_RESULTS', 100))
+ALIGNMENT_TIMEOUT = int(os.environ.get('ALIGNMENT_TIMEOUT', 300))
+
+
+class AlignmentJobStore:
+    """Thread-safe store of active alignment jobs and LRU-bounded finished results."""
+
+    def __init__(self, max_results):
+        self.max_results = max_results
+        self.lock = threading.Lock()
+        self.active = {}
+        self.finished = OrderedDict()
+
+    def add_active(self, job_id, status, max_active):
+        """
+        Register a new active job, unless job_id is already active or max_active jobs are active.
+        Returns None when added, or the (HTTP status code, error message) of the rejection.
+        """
+        with self.lock:
+            if job_id in self.active:
+                return 409, f"Alignment job {job_id} is already active"
+            if len(self.active) >= max_active:
+                return 429, "Alignment queue is full"
+            self.active[job_id] = {"status": status, "job_id": job_id}
+        return None
+
+    def set_status(self, job_id, status):
+        with self.lock:
+            if job_id in self.active:
+                self.active[job_id]["status"] = status
+
+    def active_count(self):
+        with self.lock:
+            return len(self.active)
+
+    def finish(self, job_id, result):
+        with self.lock:
+            self.active.pop(job_id, None)
+            self.finished[job_id] = result
+            self.finished.move_to_end(job_id)
+            while len(self.finished) > self.max_results:
+                evicted_id, _ = self.finished.popitem(last=False)
+                print(f"[ALIGNMENT] Evicted result of job {evicted_id}", flush=True)
+
+    def get(self, job_id):
+        with self.lock:
+            if job_id in self.active:
+                return dict(self.active[job_id])
+            if job_id in self.finished:
+                self.finished.move_to_end(job_id)
+                return self.finished[job_id]
+        return None
+
+
 # Store job results
-alignment_jobs = {}
+alignment_jobs = AlignmentJobStore(MAX_STORED_RESULTS)
+alignment_pool = ThreadPoolExecutor(max_workers=ALIGNMENT_WORKERS, thread_name_prefix='mafft')
+
+
+def run_alignment(job_id, request):
+    """
+    Run MAFFT alignment on provided sequences.
+
+    Expected request format:
+    {
+        "job_id": "job-123",
+        "sequences": [
+            {"id": "seq1", "sequence": "ACGT..."},
+            {"id": "seq2", "sequence": "ACGT..."}
+        ]
+    }
+    """
+    alignment_jobs.set_status(job_id, "RUNNING")
+    input_path = None
+
+    try:
+        # Create temp files for input/output
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.fasta', delete=False) as input_file:
+            input_path = input_file.name
+
+            if 'sequences' in request:
+                # Write sequences to FASTA format
+                for seq in request['sequences']:
+                    input_file.write(f">{seq['id']}\n{seq['sequence']}\n")
+            elif 'input_file' in request:
+                # Read from provided file path
+                with open(request['input_file'], 'r') as f:
+                    input_file.write(f.read())
+            else:
+                return {"status": "ERROR", "job_id": job_id, "error": "No sequences or input_file provided"}
+
+        output_path = os.path.join(DATA_DIR, f'alignment_{job_id}.fasta')
+
+        # Run MAFFT
+        print(f"[ALIGNMENT] Running MAFFT on {input_path}", flush=True)
+        result = subprocess.run(
+            ['mafft', '--auto', input_path],
+            capture_output=True,
+            text=True,
+            timeout=ALIGNMENT_TIMEOUT
+        )
+
+        if result.returncode != 0:
+            return {
+                "status": "FAILED",
+                "job_id": job_id,
+                "error": result.stderr
+            }
 
-DATA_DIR = os.environ.get('DATA_DIR', '/data')
+        # Save alignment output
+        with open(output_path, 'w') as f:
+            f.write(result.stdout)
+
+        # Parse alignment for response
+        alignment_data = parse_fasta(result.stdout)
+
+        return {
+            "status": "COMPLETED",
+            "job_id": job_id,
+            "output_file": output_path,
+            "alignment": alignment_data,
+            "sequences_aligned": len(alignment_data),
+            "completed_at": datetime.utcnow().isoformat() + 'Z'
+        }
+
+    except subprocess.TimeoutExpired:
+        return {"status": "FAILED", "job_id": job_id, "error": "MAFFT timeout"}
+    except Exception as e:
+        return {"status": "FAILED", "job_id": job_id, "error": str(e)}
+    finally:
+        # Clean up temp file
+        if input_path and os.path.exists(input_path):
+            os.unlink(input_path)
+
+
+def parse_fasta(fasta_content):
+    """Parse FASTA content into a list of sequence records."""
+    sequences = []
+    current_id = None
+    current_seq = []
+
+    for line in fasta_content.strip().split('\n'):
+        if line.startswith('>'):
+            if current_id:
+                sequences.append({
+                    "id": current_id,
+                    "sequence": ''.join(current_seq)
+                })
+            current_id = line[1:].strip()
+            current_seq = []
+        else:
+            current_seq.append(line.strip())
+
+    if current_id:
+        sequences.append({
+            "id": current_id,
+            "sequence": ''.join(current_seq)
+        })
+
+    return sequences
+
+
+def submit_alignment(request):
+    """
+    Queue an alignment on the worker pool, returns (job_id, future, None),
+    or (job_id, None, (status_code, error)) when the job is rejected (queue full or job_id already active).
+    """
+    job_id = request.get('job_id', str(uuid.uuid4()))
+
+    rejection = alignment_jobs.add_active(job_id, "PENDING", ALIGNMENT_WORKERS + MAX_QUEUED_JOBS)
+    if rejection is not None:
+        return job_id, None, rejection
+
+    future: Future = alignment_pool.submit(run_alignment, job_id, request)
+    future.add_done_callback(lambda f: alignment_jobs.finish(job_id, f.result()))
+    return job_id, future, None
+
+
+def summarize(job):
+    """Strip the alignment payload from a job record for status responses."""
+    return {k: v for k, v in job.items() if k != 'alignment'}
 
 
 class AlignmentHandler(BaseHTTPRequestHandler):
-    def do_POST(self):
+    def read_body(self):
         # Handle both Content-Length and chunked transfer encoding
         transfer_encoding = self.headers.get('Transfer-Encoding', '')
         content_length = int(self.headers.get('Content-Length', 0))
@@ -41,9 +231,20 @@ class AlignmentHandler(BaseHTTPRequestHandler):
                 chunk_data = self.rfile.read(chunk_size).decode('utf-8')
                 body_parts.append(chunk_data)
                 self.rfile.readline()  # Read trailing CRLF after chunk
-            body = ''.join(body_parts)
+            return ''.join(body_parts)
         else:
-            body = self.rfile.read(content_length).decode('utf-8') if content_length > 0 else ''
+            return self.rfile.read(content_length).decode('utf-8') if content_length > 0 else ''
+
+    def send_json(self, response, status_code=200):
+        payload = json.dumps(response).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = self.read_body()
 
         try:
             request_data = json.loads(body) if body else {}
@@ -53,143 +254,67 @@ class AlignmentHandler(BaseHTTPRequestHandler):
         path = self.path
 
         print(f"[ALIGNMENT] Path: {path}", flush=True)
-        print(f"[ALIGNMENT] Headers: {dict(self.headers)}", flush=True)
         print(f"[ALIGNMENT] Raw body: {body[:500] if body else 'EMPTY'}", flush=True)
-        print(f"[ALIGNMENT] Request: {json.dumps(request_data, indent=2)}", flush=True)
         sys.stdout.flush()
 
+        status_code = 200
+
         # Handle Lambda-style invocation from Step Functions Local
         # Path format: /2015-03-31/functions/{FunctionName}/invocations
         if '/invocations' in path or path == '/align':
-            response = self.handle_align(request_data)
+            job_id, future, rejection = submit_alignment(request_data)
+            if future is None:
+                status_code, error = rejection
+                response = {"status": "FAILED", "job_id": job_id, "error": error}
+            else:
+                response = future.result()
+        elif path == '/submit':
+            job_id, future, rejection = submit_alignment(request_data)
+            if future is None:
+                status_code, error = rejection
+                response = {"status": "REJECTED", "job_id": job_id, "error": error}
+            else:
+                response = {"status": "PENDING", "job_id": job_id}
+                status_code = 202
         elif path == '/status':
-            response = self.handle_status(request_data)
+            response = self.handle_status(request_data.get('job_id'))
+        elif path == '/result':
+            response, status_code = self.handle_result(request_data.get('job_id'))
         else:
             response = {"error": f"Unknown path: {path}", "status": "ERROR"}
 
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(response).encode('utf-8'))
-        print(f"[ALIGNMENT] Response: {json.dumps(response, indent=2)}", flush=True)
+        self.send_json(response, status_code)
+        print(f"[ALIGNMENT] Response ({status_code}): {json.dumps(summarize(response))}", flush=True)
 
     def do_GET(self):
         if self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "healthy"}).encode('utf-8'))
+            self.send_json({
+                "status": "healthy",
+                "workers": ALIGNMENT_WORKERS,
+                "active_jobs": alignment_jobs.active_count()
+            })
+        elif self.path.startswith('/status/'):
+            self.send_json(self.handle_status(self.path[len('/status/'):]))
+        elif self.path.startswith('/result/'):
+            response, status_code = self.handle_result(self.path[len('/result/'):])
+            self.send_json(response, status_code)
         else:
             self.send_response(404)
             self.end_headers()
 
-    def handle_align(self, request):
-        """
-        Run MAFFT alignment on provided sequences.
-
-        Expected request format:
-        {
-            "job_id": "job-123",
-            "sequences": [
-                {"id": "seq1", "sequence": "ACGT..."},
-                {"id": "seq2", "sequence": "ACGT..."}
-            ]
-        }
-        """
-        job_id = request.get('job_id', str(uuid.uuid4()))
-
-        try:
-            # Create temp files for input/output
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.fasta', delete=False) as input_file:
-                input_path = input_file.name
-
-                if 'sequences' in request:
-                    # Write sequences to FASTA format
-                    for seq in request['sequences']:
-                        input_file.write(f">{seq['id']}\n{seq['sequence']}\n")
-                elif 'input_file' in request:
-                    # Read from provided file path
-                    with open(request['input_file'], 'r') as f:
-                        input_file.write(f.read())
-                else:
-                    return {"status": "ERROR", "error": "No sequences or input_file provided"}
-
-            output_path = os.path.join(DATA_DIR, f'alignment_{job_id}.fasta')
-
-            # Run MAFFT
-            print(f"[ALIGNMENT] Running MAFFT on {input_path}")
-            result = subprocess.run(
-                ['mafft', '--auto', input_path],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-
-            if result.returncode != 0:
-                return {
-                    "status": "FAILED",
-                    "job_id": job_id,
-                    "error": result.stderr
-                }
-
-            # Save alignment output
-            with open(output_path, 'w') as f:
-                f.write(result.stdout)
-
-            # Parse alignment for response
-            alignment_data = self.parse_fasta(result.stdout)
-
-            # Clean up temp file
-            os.unlink(input_path)
-
-            job_result = {
-                "status": "COMPLETED",
-                "job_id": job_id,
-                "output_file": output_path,
-                "alignment": alignment_data,
-                "sequences_aligned": len(alignment_data),
-                "completed_at": datetime.utcnow().isoformat() + 'Z'
-            }
-
-            alignment_jobs[job_id] = job_result
-            return job_result
-
-        except subprocess.TimeoutExpired:
-            return {"status": "FAILED", "job_id": job_id, "error": "MAFFT timeout"}
-        except Exception as e:
-            return {"status": "FAILED", "job_id": job_id, "error": str(e)}
-
-    def handle_status(self, request):
-        job_id = request.get('job_id')
-        if job_id in alignment_jobs:
-            return alignment_jobs[job_id]
+    def handle_status(self, job_id):
+        job = alignment_jobs.get(job_id)
+        if job is not None:
+            return summarize(job)
         return {"status": "NOT_FOUND", "job_id": job_id}
 
-    def parse_fasta(self, fasta_content):
-        """Parse FASTA content into a list of sequence records."""
-        sequences = []
-        current_id = None
-        current_seq = []
-
-        for line in fasta_content.strip().split('\n'):
-            if line.startswith('>'):
-                if current_id:
-                    sequences.append({
-                        "id": current_id,
-                        "sequence": ''.join(current_seq)
-                    })
-                current_id = line[1:].strip()
-                current_seq = []
-            else:
-                current_seq.append(line.strip())
-
-        if current_id:
-            sequences.append({
-                "id": current_id,
-                "sequence": ''.join(current_seq)
-            })
-
-        return sequences
+    def handle_result(self, job_id):
+        job = alignment_jobs.get(job_id)
+        if job is None:
+            return {"status": "NOT_FOUND", "job_id": job_id}, 404
+        if job["status"] in ("PENDING", "RUNNING"):
+            return job, 202
+        return job, 200
 
     def log_message(self, format, *args):
         print(f"[ALIGNMENT HTTP] {args[0]}")
@@ -199,11 +324,15 @@ def main():
     port = int(os.environ.get('PORT', 8085))
     os.makedirs(DATA_DIR, exist_ok=True)
 
-    server = HTTPServer(('0.0.0.0', port), AlignmentHandler)
+    server = ThreadingHTTPServer(('0.0.0.0', port), AlignmentHandler)
     print(f"[ALIGNMENT] Starting MAFFT alignment service on port {port}", flush=True)
     print(f"[ALIGNMENT] Data directory: {DATA_DIR}", flush=True)
+    print(f"[ALIGNMENT] Alignment workers: {ALIGNMENT_WORKERS}, max queued jobs: {MAX_QUEUED_JOBS}", flush=True)
     print(f"[ALIGNMENT] Listening for Lambda-style invocations...", flush=True)
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        alignment_pool.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the PAVI pipeline.
+
+Submits synthetic multi-transcript jobs at several concurrency levels and measures, per job,
+the time to first status (submission until the job is first seen beyond pending), the duration
+of every pipeline stage and the total latency (submission until completed or failed).
+Per concurrency level, it reports throughput and p50/p95/p99 latencies as a JSON report,
+which can be compared against the report of a previous release (--baseline).
+
+Backends:
+ * api: a running API (API_BASE_URL), through the job submission and batch job status endpoints.
+   The API can be backed by the local stand-ins (Step Functions Local, mock-batch-server.py,
+   alignment-service.py and a local S3/DynamoDB replacement) or run jobs in-process
+   (IN_PROCESS_JOBS_ENABLED=true).
+ * job-service: the API's job service in local mode, running every job through the in-process
+   executor (api/src/local_pipeline.py), without API server, AWS or Docker.
+   Requires the seq_retrieval dependencies and clustalo (or mafft, see IN_PROCESS_ALIGNER) on the PATH.
+
+By default, jobs are generated from a synthetic genome (see seq_retrieval's tests/benchmarks/synthetic_genome.py),
+written to the work directory and referenced through file:// URLs (so the pipeline must run on the same host).
+Use --seq-regions-file to submit copies of a fixed list of seq regions instead (e.g. test-input.json's seq_regions).
+
+Jobs are submitted by one client thread per concurrency slot (each waiting for its job to finish before
+submitting the next one), while the status of all active jobs is polled in batches by a single monitor thread,
+so hundreds of concurrent jobs can be driven without flooding the API with status requests.
+
+Usage:
+    # Fully offline, against the job service's local mode:
+    python benchmark_e2e.py --backend job-service --concurrency 1,10,100 --jobs-per-level 200
+
+    # Against a running API:
+    export API_BASE_URL="http://localhost:8080"
+    python benchmark_e2e.py --concurrency 1,10,50,200
+
+    # Compare against the report of a previous release, failing on regressions of more than 20%:
+    python benchmark_e2e.py --backend job-service --baseline reports/benchmark-e2e-previous.json --max-regression 20
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional, Protocol
+
+import requests
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..', '..', '..'))
+API_SRC_DIR = os.path.join(REPO_ROOT, 'api', 'src')
+SEQ_RETRIEVAL_DIR = os.path.join(REPO_ROOT, 'pipeline_components', 'seq_retrieval')
+
+REPORT_VERSION = 1
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Maximum number of job IDs per batch job status request (MAX_STATUS_BATCH_SIZE in the API)
+STATUS_BATCH_SIZE = 1000
+
+# Synthetic transcripts jobs are composed of: exon counts x coding sequence lengths x strands
+SYNTHETIC_EXON_COUNTS = (1, 4, 8, 12)
+SYNTHETIC_CODING_LENGTHS = (600, 1500, 3000)
+
+
+class Backend(Protocol):
+    """Job submission and status interface of a benchmarked pipeline deployment."""
+
+    name: str
+
+    def create_job(self, seq_regions: list[dict[str, Any]]) -> tuple[str, dict[str, Any]]:  # noqa: U100
+        """Submit a job, returning its ID and initial state (`status`, `stage`, ...)."""
+        ...
+
+    def get_jobs(self, job_ids: list[str]) -> dict[str, dict[str, Any]]:  # noqa: U100
+        """Get the current state of multiple jobs, by job ID."""
+        ...
+
+
+class JobRejectedError(Exception):
+    """Exception raised when a job submission was rejected (e.g. job queue full)."""
+    pass
+
+
+class ApiBackend:
+    """Benchmark backend submitting jobs to a running PAVI API."""
+
+    name = 'api'
+
+    def __init__(self, api_base_url: str, max_connections: int):
+        self.api_base_url = api_base_url.rstrip('/')
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(10, max_connections))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def create_job(self, seq_regions: list[dict[str, Any]]) -> tuple[str, dict[str, Any]]:
+        response = self.session.post(f"{self.api_base_url}/api/pipeline-job/", json=seq_regions, timeout=60)
+        if response.status_code == 429:
+            raise JobRejectedError(response.text)
+        if response.status_code != 201:
+            raise RuntimeError(f"Failed to create job: {response.status_code} {response.text}")
+        data = response.json()
+        return data['uuid'], data
+
+    def get_jobs(self, job_ids: list[str]) -> dict[str, dict[str, Any]]:
+        states: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(job_ids), STATUS_BATCH_SIZE):
+            response = self.session.post(f"{self.api_base_url}/api/pipeline-jobs/status",
+                                         json=job_ids[i:i + STATUS_BATCH_SIZE], timeout=60)
+            response.raise_for_status()
+            states.update({job['uuid']: job for job in response.json()})
+        return states
+
+
+class JobServiceBackend:
+    """Benchmark backend running jobs through the API's job service in local mode (in-process executor)."""
+
+    name = 'job-service'
+
+    def __init__(self, results_dir: str):
+        os.environ.setdefault('API_RESULTS_PATH_PREFIX', results_dir)
+        for path in (os.path.join(SEQ_RETRIEVAL_DIR, 'src'), API_SRC_DIR):
+            if path not in sys.path:
+                sys.path.insert(0, path)
+        from job_service import JobService  # type: ignore
+        from local_pipeline import local_pipeline_available  # type: ignore
+
+        self.service = JobService(use_step_functions=False)
+        if not local_pipeline_available(self.service.in_process_aligner):
+            raise RuntimeError(f"In-process execution not available: install {self.service.in_process_aligner}"
+                               " and the seq_retrieval dependencies")
+
+    def create_job(self, seq_regions: list[dict[str, Any]]) -> tuple[str, dict[str, Any]]:
+        job = self.service.create_job(seq_regions)
+        if not job.source_job_id:
+            job = self.service.start_job(job.job_id, seq_regions)
+        return job.job_id, job.to_dict()
+
+    def get_jobs(self, job_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return {job.job_id: job.to_dict() for job in self.service.get_jobs(job_ids)}
+
+
+@dataclass
+class JobRecord:
+    """Timings (monotonic clock, in seconds) and outcome of a single benchmarked job."""
+
+    index: int
+    submitted_at: float
+    job_id: Optional[str] = None
+    created_at: Optional[float] = None
+    first_status_at: Optional[float] = None
+    stages: dict[str, float] = field(default_factory=dict)
+    finished_at: Optional[float] = None
+    status: str = 'pending'
+    error: Optional[str] = None
+    sequence_count: int = 0
+    done: threading.Event = field(default_factory=threading.Event)
+
+    def observe(self, state: dict[str, Any], now: float) -> None:
+        """Record a job state (as returned by a backend) observed at `now`."""
+        status = str(state.get('status') or 'pending').lower()
+        stage = state.get('stage')
+        if self.first_status_at is None and status != 'pending':
+            self.first_status_at = now
+        # The stage of finished jobs (e.g. DONE) marks their end rather than a stage of their own
+        if stage and stage not in self.stages and status not in TERMINAL_STATUSES:
+            self.stages[stage] = now
+        self.status = status
+        if status in TERMINAL_STATUSES:
+            self.finished_at = now
+            self.error = state.get('error_message')
+            self.done.set()
+
+    def stage_durations(self) -> dict[str, float]:
+        """Duration of every stage the job was seen in, up to the next stage (or until finished)."""
+        ordered_stages = sorted(self.stages.items(), key=lambda item: item[1])
+        durations: dict[str, float] = {}
+        for i, (stage, started_at) in enumerate(ordered_stages):
+            ended_at = ordered_stages[i + 1][1] if i + 1 < len(ordered_stages) else self.finished_at
+            if ended_at is not None:
+                durations[stage] = ended_at - started_at
+        return durations
+
+
+class JobMonitor:
+    """Polls the status of all watched jobs in batches, from a single thread."""
+
+    def __init__(self, backend: Backend, poll_interval: float):
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.poll_errors = 0
+        self._jobs: dict[str, JobRecord] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='job-monitor', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def watch(self, record: JobRecord) -> None:
+        assert record.job_id is not None
+        with self._lock:
+            self._jobs[record.job_id] = record
+
+    def unwatch(self, record: JobRecord) -> None:
+        with self._lock:
+            self._jobs.pop(record.job_id or '', None)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                job_ids = list(self._jobs)
+            if job_ids:
+                try:
+                    states = self.backend.get_jobs(job_ids)
+                except Exception as e:
+                    self.poll_errors += 1
+                    print(f"    Status poll failed: {e}")
+                    states = {}
+                now = time.monotonic()
+                for job_id, state in states.items():
+                    with self._lock:
+                        record = self._jobs.get(job_id)
+                    if record is None:
+                        continue
+                    record.observe(state, now)
+                    if record.done.is_set():
+                        self.unwatch(record)
+            self._stopped.wait(self.poll_interval)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentile `q` (0-100) of sorted values, interpolating linearly between closest ranks."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize(values: list[float]) -> dict[str, Any]:
+    """Summary statistics (in seconds) of a list of durations."""
+    if not values:
+        return {'count': 0}
+    sorted_values = sorted(values)
+    return {
+        'count': len(values),
+        'mean': round(statistics.fmean(sorted_values), 4),
+        'min': round(sorted_values[0], 4),
+        'p50': round(percentile(sorted_values, 50), 4),
+        'p95': round(percentile(sorted_values, 95), 4),
+        'p99': round(percentile(sorted_values, 99), 4),
+        'max': round(sorted_values[-1], 4)
+    }
+
+
+def generate_synthetic_transcripts(work_dir: str, seed: int) -> list[dict[str, Any]]:
+    """
+    Generate a synthetic genome in `work_dir` and return the seq regions of all transcripts planted in it.
+
+    Seq regions are returned without `unique_entry_id`, which must be set per job.
+    """
+    for path in (SEQ_RETRIEVAL_DIR, os.path.join(SEQ_RETRIEVAL_DIR, 'src')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from tests.benchmarks.synthetic_genome import generate_genome, TranscriptSpec  # type: ignore
+
+    specs = [TranscriptSpec(exon_count=exon_count, coding_length=coding_length, strand=strand)
+             for exon_count in SYNTHETIC_EXON_COUNTS
+             for coding_length in SYNTHETIC_CODING_LENGTHS
+             for strand in ('+', '-')]
+    os.makedirs(work_dir, exist_ok=True)
+    genome = generate_genome(specs, output_dir=work_dir, seed=seed)
+
+    return [{
+        'base_seq_name': transcript['seq_id'],
+        'seq_id': transcript['seq_id'],
+        'seq_strand': transcript['strand'],
+        'exon_seq_regions': [{'start': start, 'end': end} for start, end in transcript['exons']],
+        'cds_seq_regions': [{'start': start, 'end': end, 'frame': frame} for start, end, frame in transcript['cds_regions']],
+        'fasta_file_url': genome['fasta_file_url'],
+        'variant_ids': []
+    } for transcript in genome['transcripts'].values()]
+
+
+class JobFactory:
+    """Builds job inputs from a pool of seq regions, with entry IDs unique to the benchmark run."""
+
+    def __init__(self, seq_regions: list[dict[str, Any]], regions_per_job: int, run_id: str):
+        self.seq_regions = seq_regions
+        self.regions_per_job = min(regions_per_job, len(seq_regions))
+        self.run_id = run_id
+
+    def job_input(self, level: int, index: int) -> list[dict[str, Any]]:
+        # Rotate through the pool, so that consecutive jobs differ in composition
+        offset = index * self.regions_per_job
+        job_regions = []
+        for i in range(self.regions_per_job):
+            seq_region = copy.deepcopy(self.seq_regions[(offset + i) % len(self.seq_regions)])
+            seq_region['unique_entry_id'] = f"{self.run_id}-{level}-{index}-{i}"
+            job_regions.append(seq_region)
+        return job_regions
+
+
+class E2EBenchmark:
+    """End-to-end benchmark, running jobs at a series of concurrency levels."""
+
+    def __init__(self, backend: Backend, job_factory: JobFactory, poll_interval: float, job_timeout: float):
+        self.backend = backend
+        self.job_factory = job_factory
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+
+    def run_job(self, monitor: JobMonitor, level: int, index: int) -> JobRecord:
+        """Submit a job and wait for it to finish (or time out)."""
+        seq_regions = self.job_factory.job_input(level, index)
+        record = JobRecord(index=index, submitted_at=time.monotonic(), sequence_count=len(seq_regions))
+        try:
+            job_id, state = self.backend.create_job(seq_regions)
+        except JobRejectedError as e:
+            record.status = 'rejected'
+            record.error = str(e)
+            return record
+        except Exception as e:
+            record.status = 'error'
+            record.error = str(e)
+            return record
+
+        record.job_id = job_id
+        record.created_at = time.monotonic()
+        record.observe(state, record.created_at)
+        if not record.done.is_set():
+            monitor.watch(record)
+            if not record.done.wait(self.job_timeout):
+                monitor.unwatch(record)
+                record.status = 'timed_out'
+        return record
+
+    def run_level(self, concurrency: int, job_count: int) -> dict[str, Any]:
+        """Run `job_count` jobs with `concurrency` concurrent clients and summarize the results."""
+        print(f"\n[LEVEL] concurrency {concurrency}, {job_count} jobs...")
+        monitor = JobMonitor(self.backend, self.poll_interval)
+        monitor.start()
+        started_at = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='benchmark-client') as clients:
+                records = list(clients.map(lambda index: self.run_job(monitor, concurrency, index), range(job_count)))
+        finally:
+            monitor.stop()
+        wall_time = time.monotonic() - started_at
+
+        completed = [record for record in records if record.status == 'completed']
+        stage_durations: dict[str, list[float]] = {}
+        for record in completed:
+            for stage, duration in record.stage_durations().items():
+                stage_durations.setdefault(stage, []).append(duration)
+
+        result: dict[str, Any] = {
+            'concurrency': concurrency,
+            'jobs': job_count,
+            'completed': len(completed),
+            'failed': sum(1 for record in records if record.status == 'failed'),
+            'rejected': sum(1 for record in records if record.status == 'rejected'),
+            'errors': sum(1 for record in records if record.status == 'error'),
+            'timed_out': sum(1 for record in records if record.status == 'timed_out'),
+            'status_poll_errors': monitor.poll_errors,
+            'wall_time_seconds': round(wall_time, 3),
+            'throughput_jobs_per_second': round(len(completed) / wall_time, 4),
+            'throughput_sequences_per_second': round(sum(record.sequence_count for record in completed) / wall_time, 4),
+            'latency_seconds': summarize([record.finished_at - record.submitted_at
+                                          for record in completed if record.finished_at is not None]),
+            'submit_latency_seconds': summarize([record.created_at - record.submitted_at
+                                                 for record in records if record.created_at is not None]),
+            'time_to_first_status_seconds': summarize([record.first_status_at - record.submitted_at
+                                                       for record in records if record.first_status_at is not None]),
+            'stage_duration_seconds': {stage: summarize(durations) for stage, durations in stage_durations.items()},
+            'errors_sample': sorted({record.error for record in records if record.error})[:5]
+        }
+
+        latency = result['latency_seconds']
+        print(f"    {result['completed']}/{job_count} completed in {result['wall_time_seconds']}s"
+              f" ({result['throughput_jobs_per_second']} jobs/s),"
+              f" latency p50 {latency.get('p50')}s, p95 {latency.get('p95')}s, p99 {latency.get('p99')}s")
+        if job_count - result['completed'] > 0:
+            print(f"    failed: {result['failed']}, rejected: {result['rejected']},"
+                  f" errors: {result['errors']}, timed out: {result['timed_out']}")
+        return result
+
+
+# Report metrics compared against baselines: (metric path, whether higher values are better)
+COMPARED_METRICS = [
+    (('throughput_jobs_per_second',), True),
+    (('latency_seconds', 'p50'), False),
+    (('latency_seconds', 'p95'), False),
+    (('latency_seconds', 'p99'), False),
+    (('time_to_first_status_seconds', 'p95'), False),
+]
+
+
+def compare_reports(report: dict[str, Any], baseline: dict[str, Any], max_regression: Optional[float]) -> bool:
+    """
+    Print the change of the compared metrics per concurrency level, relative to a baseline report.
+
+    Returns:
+        False if any metric regressed by more than `max_regression` percent, True otherwise
+    """
+    print("\n[COMPARE] against baseline from " + str(baseline.get('started_at')))
+    baseline_levels = {level['concurrency']: level for level in baseline.get('levels', [])}
+    passed = True
+    for level in report['levels']:
+        baseline_level = baseline_levels.get(level['concurrency'])
+        if baseline_level is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            value: Any = level
+            baseline_value: Any = baseline_level
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+                baseline_value = baseline_value.get(key) if isinstance(baseline_value, dict) else None
+            if not value or not baseline_value:
+                continue
+
+            change = (value - baseline_value) / baseline_value * 100
+            regression = -change if higher_is_better else change
+            marker = ''
+            if max_regression is not None and regression > max_regression:
+                marker = '  [REGRESSION]'
+                passed = False
+            print(f"    concurrency {level['concurrency']:>4} {'.'.join(path):<36}"
+                  f" {baseline_value:>10} -> {value:>10} ({change:+.1f}%){marker}")
+    return passed
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='End-to-end PAVI pipeline benchmark')
+    parser.add_argument('--backend', choices=['api', 'job-service'], default='api',
+                        help='Run jobs through a running API (API_BASE_URL) or the job service in local mode')
+    parser.add_argument('--api-base-url', default=os.environ.get('API_BASE_URL', 'http://localhost:8080'))
+    parser.add_argument('--concurrency', default='1,10,50',
+                        help='Comma-separated concurrency levels (number of concurrently submitted jobs)')
+    parser.add_argument('--jobs-per-level', type=int, default=None,
+                        help='Number of jobs to run per concurrency level (default: twice the concurrency)')
+    parser.add_argument('--regions-per-job', type=int, default=4, help='Number of seq regions (transcripts) per job')
+    parser.add_argument('--seq-regions-file', default=None,
+                        help='JSON file with the seq regions to compose jobs from (instead of a synthetic genome)')
+    parser.add_argument('--work-dir', default=None, help='Directory to write the synthetic genome and job results to')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic genome')
+    parser.add_argument('--poll-interval', type=float, default=None,
+                        help='Seconds between job status polls (default: 0.5 for api, 0.05 for job-service)')
+    parser.add_argument('--job-timeout', type=float, default=600, help='Seconds to wait for a job to finish')
+    parser.add_argument('--output', default='benchmark-e2e-report.json', help='Path to write the JSON report to')
+    parser.add_argument('--baseline', default=None, help='JSON report (of a previous run) to compare results to')
+    parser.add_argument('--max-regression', type=float, default=None,
+                        help='Fail when any compared metric regressed by more than this percentage relative to the baseline')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Main entry point."""
+    args = parse_args(argv)
+    concurrency_levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='pavi-benchmark-')
+    os.makedirs(work_dir, exist_ok=True)
+    run_id = uuid.uuid4().hex[:8]
+
+    print("=" * 60)
+    print("PAVI End-to-End Pipeline Benchmark")
+    print("=" * 60)
+
+    if args.seq_regions_file:
+        with open(args.seq_regions_file, 'r') as f:
+            seq_regions = json.load(f)
+        if isinstance(seq_regions, dict):
+            seq_regions = seq_regions['seq_regions']
+    else:
+        seq_regions = generate_synthetic_transcripts(os.path.join(work_dir, 'genome'), args.seed)
+    print(f"Composing jobs of {args.regions_per_job} out of {len(seq_regions)} seq regions (run {run_id})")
+
+    backend: Backend
+    if args.backend == 'job-service':
+        backend = JobServiceBackend(results_dir=os.path.join(work_dir, 'results') + os.sep)
+        poll_interval = args.poll_interval if args.poll_interval is not None else 0.05
+    else:
+        backend = ApiBackend(args.api_base_url, max_connections=max(concurrency_levels) + 1)
+        poll_interval = args.poll_interval if args.poll_interval is not None else 0.5
+    print(f"Backend: {backend.name}" + (f" ({args.api_base_url})" if args.backend == 'api' else ''))
+
+    benchmark = E2EBenchmark(backend, JobFactory(seq_regions, args.regions_per_job, run_id),
+                             poll_interval=poll_interval, job_timeout=args.job_timeout)
+
+    report: dict[str, Any] = {
+        'report_version': REPORT_VERSION,
+        'run_id': run_id,
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'backend': backend.name,
+        'api_base_url': args.api_base_url if args.backend == 'api' else None,
+        'parameters': {
+            'concurrency_levels': concurrency_levels,
+            'jobs_per_level': args.jobs_per_level,
+            'regions_per_job': benchmark.job_factory.regions_per_job,
+            'seq_regions_file': args.seq_regions_file,
+            'seed': args.seed,
+            'poll_interval_seconds': poll_interval,
+            'job_timeout_seconds': args.job_timeout
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'in_process_workers': os.environ.get('IN_PROCESS_WORKERS'),
+            'local_retrieval_workers': os.environ.get('LOCAL_RETRIEVAL_WORKERS')
+        },
+        'levels': []
+    }
+
+    for concurrency in concurrency_levels:
+        job_count = args.jobs_per_level or 2 * concurrency
+        report['levels'].append(benchmark.run_level(concurrency, job_count))
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    passed = True
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            passed = compare_reports(report, json.load(f), args.max_regression)
+
+    print("=" * 60)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Job status polling benchmark for the PAVI API.
+
+Polls job status (GET /api/pipeline-job/{uuid}) from a number of concurrent clients at several
+concurrency levels and reports, per level, the poll throughput and p50/p95/p99 latencies as a JSON report.
+Health checks (GET /api/health) are probed throughout every level, to show whether status polls
+(and their blocking AWS calls) delay unrelated requests.
+
+Backends:
+ * in-process: the API app served in-process (through httpx's ASGI transport), with a job service stand-in
+   simulating a blocking AWS round trip of --aws-latency seconds per job status read.
+   Requires the API dependencies, but no API server, AWS or Docker.
+ * api: a running API (API_BASE_URL), polling the jobs given through --job-ids
+   (or random job IDs, measuring not found responses, when none are given).
+
+This benchmark only reports latencies, it does not assert on them.
+
+Usage:
+    # Offline, against the API app with simulated AWS latency:
+    python benchmark_polling.py --concurrency 1,10,50,200 --polls-per-level 2000 --aws-latency 0.02
+
+    # Against a running API:
+    export API_BASE_URL="http://localhost:8080"
+    python benchmark_polling.py --backend api --job-ids <uuid>,<uuid> --concurrency 1,10,50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import httpx
+
+from benchmark_e2e import API_SRC_DIR, REPO_ROOT, summarize
+
+REPORT_VERSION = 1
+
+# Interval (in seconds) between two health check probes
+HEALTH_PROBE_INTERVAL = 0.01
+
+
+class SimulatedJobService:
+    """Job service stand-in, simulating a blocking AWS round trip (like boto3's) per job status read."""
+
+    def __init__(self, aws_latency: float):
+        self.aws_latency = aws_latency
+        from job_service import JobInfo, JobStatus  # type: ignore
+
+        self._job_info = JobInfo
+        self._running = JobStatus.RUNNING
+
+    def get_job_with_sync(self, job_id: str, job: Any = None) -> Any:  # noqa: U100
+        time.sleep(self.aws_latency)
+        return self._job_info(job_id=job_id, status=self._running)
+
+
+def in_process_client(aws_latency: float, max_connections: int) -> httpx.AsyncClient:
+    """Return a client for the API app served in-process, backed by a `SimulatedJobService`."""
+    for path in (API_SRC_DIR, os.path.join(REPO_ROOT, 'api')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    import main  # type: ignore
+
+    job_service = SimulatedJobService(aws_latency)
+    main.USE_STEP_FUNCTIONS = True
+    main.get_job_service = lambda: job_service
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://benchmark',
+                             limits=httpx.Limits(max_connections=max_connections))
+
+
+async def poll_level(client: httpx.AsyncClient, job_ids: list[str], concurrency: int, poll_count: int) -> dict[str, Any]:
+    """Run `poll_count` job status polls from `concurrency` concurrent clients and summarize their latencies."""
+    print(f"\n[LEVEL] concurrency {concurrency}, {poll_count} polls...")
+    poll_latencies: list[float] = []
+    health_latencies: list[float] = []
+    status_codes: dict[str, int] = {}
+    remaining = iter(range(poll_count))
+    polling_done = asyncio.Event()
+
+    async def poller() -> None:
+        for index in remaining:
+            started_at = time.perf_counter()
+            response = await client.get(f'/api/pipeline-job/{job_ids[index % len(job_ids)]}')
+            poll_latencies.append(time.perf_counter() - started_at)
+            status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+
+    async def health_prober() -> None:
+        while not polling_done.is_set():
+            started_at = time.perf_counter()
+            await client.get('/api/health')
+            health_latencies.append(time.perf_counter() - started_at)
+            await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+
+    started_at = time.perf_counter()
+    prober = asyncio.create_task(health_prober())
+    try:
+        await asyncio.gather(*(poller() for _ in range(concurrency)))
+    finally:
+        polling_done.set()
+        await prober
+    wall_time = time.perf_counter() - started_at
+
+    result: dict[str, Any] = {
+        'concurrency': concurrency,
+        'polls': poll_count,
+        'status_codes': status_codes,
+        'wall_time_seconds': round(wall_time, 3),
+        'throughput_polls_per_second': round(poll_count / wall_time, 2),
+        'poll_latency_seconds': summarize(poll_latencies),
+        'health_latency_seconds': summarize(health_latencies)
+    }
+
+    latency = result['poll_latency_seconds']
+    health_latency = result['health_latency_seconds']
+    print(f"    {result['throughput_polls_per_second']} polls/s,"
+          f" poll latency p50 {latency.get('p50')}s, p95 {latency.get('p95')}s, p99 {latency.get('p99')}s,"
+          f" health p99 {health_latency.get('p99')}s")
+    return result
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='PAVI API job status polling benchmark')
+    parser.add_argument('--backend', choices=['in-process', 'api'], default='in-process',
+                        help='Poll the API app in-process (simulated AWS latency) or a running API (API_BASE_URL)')
+    parser.add_argument('--api-base-url', default=os.environ.get('API_BASE_URL', 'http://localhost:8080'))
+    parser.add_argument('--concurrency', default='1,10,50,200',
+                        help='Comma-separated concurrency levels (number of concurrently polling clients)')
+    parser.add_argument('--polls-per-level', type=int, default=None,
+                        help='Number of polls per concurrency level (default: 20 per client, at least 200)')
+    parser.add_argument('--aws-latency', type=float, default=0.02,
+                        help='Simulated AWS round trip (in seconds) per job status read (in-process backend only)')
+    parser.add_argument('--job-ids', default=None,
+                        help='Comma-separated IDs of the jobs to poll (default: random job IDs)')
+    parser.add_argument('--output', default='benchmark-polling-report.json', help='Path to write the JSON report to')
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    concurrency_levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    job_ids = [job_id.strip() for job_id in args.job_ids.split(',')] if args.job_ids else [str(uuid.uuid1()) for _ in range(100)]
+
+    if args.backend == 'in-process':
+        client = in_process_client(args.aws_latency, max_connections=max(concurrency_levels) + 1)
+    else:
+        client = httpx.AsyncClient(base_url=args.api_base_url.rstrip('/'), timeout=60,
+                                   limits=httpx.Limits(max_connections=max(concurrency_levels) + 1))
+    print(f"Backend: {args.backend}"
+          + (f" ({args.api_base_url})" if args.backend == 'api' else f" (simulated AWS latency {args.aws_latency}s)"))
+
+    report: dict[str, Any] = {
+        'report_version': REPORT_VERSION,
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'backend': args.backend,
+        'api_base_url': args.api_base_url if args.backend == 'api' else None,
+        'parameters': {
+            'concurrency_levels': concurrency_levels,
+            'polls_per_level': args.polls_per_level,
+            'aws_latency_seconds': args.aws_latency if args.backend == 'in-process' else None,
+            'job_count': len(job_ids)
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'aws_io_workers': os.environ.get('AWS_IO_WORKERS')
+        },
+        'levels': []
+    }
+
+    async with client:
+        for concurrency in concurrency_levels:
+            poll_count = args.polls_per_level or max(200, 20 * concurrency)
+            report['levels'].append(await poll_level(client, job_ids, concurrency, poll_count))
+
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Main entry point."""
+    args = parse_args(argv)
+
+    print("=" * 60)
+    print("PAVI API Job Status Polling Benchmark")
+    print("=" * 60)
+
+    report = asyncio.run(run(args))
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,9 +7,18 @@ This server simulates AWS Batch API responses for:
 - DescribeJobs
 
 Jobs are "completed" immediately with success status.
+
+Array jobs (arrayProperties.size) are supported: a child job is created for
+every array index, reachable as "<jobId>:<index>" through DescribeJobs.
+When MOCK_BATCH_RUN_COMMANDS=true, the container command of every (child) job
+is executed locally, with the container environment overrides and
+AWS_BATCH_JOB_ARRAY_INDEX set as AWS Batch would, and the job status
+reflects the command exit code.
 """
 
 import json
+import os
+import subprocess
 import uuid
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
@@ -17,6 +26,8 @@ from datetime import datetime
 # Store submitted jobs
 jobs = {}
 
+RUN_COMMANDS = os.environ.get('MOCK_BATCH_RUN_COMMANDS', 'false').lower() == 'true'
+
 
 class BatchMockHandler(BaseHTTPRequestHandler):
     def do_POST(self):
@@ -34,9 +45,12 @@ class BatchMockHandler(BaseHTTPRequestHandler):
         print(f"[MOCK BATCH] Target: {target}")
         print(f"[MOCK BATCH] Request: {json.dumps(request_data, indent=2)}")
 
-        if 'SubmitJob' in target:
+        # Support both the X-Amz-Target header and the REST paths used by the AWS SDKs
+        path = self.path.lower()
+
+        if 'SubmitJob' in target or path.endswith('/submitjob'):
             response = self.handle_submit_job(request_data)
-        elif 'DescribeJobs' in target:
+        elif 'DescribeJobs' in target or path.endswith('/describejobs'):
             response = self.handle_describe_jobs(request_data)
         else:
             response = {"error": f"Unknown action: {target}"}
@@ -52,9 +66,43 @@ class BatchMockHandler(BaseHTTPRequestHandler):
         job_name = request.get('jobName', 'mock-job')
         job_queue = request.get('jobQueue', 'mock-queue')
         job_definition = request.get('jobDefinition', 'mock-definition')
+        array_size = request.get('arrayProperties', {}).get('size')
 
         # Create job record (immediately succeeded for testing)
-        job = {
+        job = self.create_job_record(job_id, job_name, job_queue, job_definition)
+
+        if array_size:
+            # Create (and optionally run) a child job for every array index
+            child_statuses = []
+            for index in range(array_size):
+                child_id = f'{job_id}:{index}'
+                child = self.create_job_record(child_id, job_name, job_queue, job_definition)
+                child['arrayProperties'] = {'index': index}
+                if RUN_COMMANDS:
+                    self.run_container_command(child, request.get('containerOverrides', {}), array_index=index)
+                jobs[child_id] = child
+                child_statuses.append(child['status'])
+
+            job['arrayProperties'] = {
+                'size': array_size,
+                'statusSummary': {status: child_statuses.count(status) for status in set(child_statuses)}
+            }
+            if 'FAILED' in child_statuses:
+                job['status'] = 'FAILED'
+                job['statusReason'] = 'One or more array child jobs failed'
+        elif RUN_COMMANDS:
+            self.run_container_command(job, request.get('containerOverrides', {}))
+
+        jobs[job_id] = job
+
+        return {
+            'jobArn': job['jobArn'],
+            'jobId': job_id,
+            'jobName': job_name
+        }
+
+    def create_job_record(self, job_id, job_name, job_queue, job_definition):
+        return {
             'jobArn': f'arn:aws:batch:us-east-1:123456789012:job/{job_id}',
             'jobId': job_id,
             'jobName': job_name,
@@ -70,13 +118,30 @@ class BatchMockHandler(BaseHTTPRequestHandler):
             }
         }
 
-        jobs[job_id] = job
-
-        return {
-            'jobArn': job['jobArn'],
-            'jobId': job_id,
-            'jobName': job_name
-        }
+    def run_container_command(self, job, container_overrides, array_index=None):
+        command = container_overrides.get('command')
+        if not command:
+            return
+
+        env = dict(os.environ)
+        for env_var in container_overrides.get('environment', []):
+            env[env_var['name']] = env_var['value']
+        if array_index is not None:
+            env['AWS_BATCH_JOB_ARRAY_INDEX'] = str(array_index)
+
+        print(f"[MOCK BATCH] Running command for job {job['jobId']}: {command}")
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        print(f"[MOCK BATCH] Job {job['jobId']} exited with code {result.returncode}")
+        if result.stdout:
+            print(result.stdout)
+        if result.stderr:
+            print(result.stderr)
+
+        job['container']['exitCode'] = result.returncode
+        job['stoppedAt'] = int(datetime.now().timestamp() * 1000)
+        if result.returncode != 0:
+            job['status'] = 'FAILED'
+            job['statusReason'] = f'Essential container in task exited with code {result.returncode}'
 
     def handle_describe_jobs(self, request):
         job_ids = request.get('jobs', [])
@@ -105,10 +170,13 @@ class BatchMockHandler(BaseHTTPRequestHandler):
 
 
 def main():
-    port = 8084
+    port = int(os.environ.get('PORT', 8084))
     server = HTTPServer(('0.0.0.0', port), BatchMockHandler)
     print(f"[MOCK BATCH] Starting mock Batch server on port {port}")
-    print(f"[MOCK BATCH] All jobs will complete immediately with SUCCEEDED status")
+    if RUN_COMMANDS:
+        print(f"[MOCK BATCH] Job container commands will be run locally")
+    else:
+        print(f"[MOCK BATCH] All jobs will complete immediately with SUCCEEDED status")
     server.serve_forever()
 
 
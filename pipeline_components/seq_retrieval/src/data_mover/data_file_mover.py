@@ -3,7 +3,6 @@ Module used to find, access and copy files at/to/from remote locations
 """
 import os.path
 from pathlib import Path
-import requests
 from typing import Dict, Optional
 from urllib.parse import urlparse, unquote
 
@@ -52,6 +51,8 @@ def is_accessible_url(url: str) -> bool:
     Returns:
         `True` when provided `url` is an accessible URL, `False` otherwise
     """
+    import requests
+
     response = requests.head(url)
     if response.ok:
         return True
@@ -176,6 +177,8 @@ def download_from_url(url: str, dest_filepath: str, chunk_size: int = 10 * 1024)
             logger.warning(f"Pre-existing file {dest_filepath} found at download destination, deleting before download.")
             os.remove(dest_filepath)
 
+        import requests
+
         logger.debug(f"Downloading {url}...")
         # Download file through streaming to support large files
         tmp_file_path = f"{dest_filepath}.part"
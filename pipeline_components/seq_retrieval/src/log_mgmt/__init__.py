@@ -4,3 +4,4 @@ Module containing all variables and functions to control PAVI logging
 
 from .log_manager import get_logger
 from .log_manager import set_log_level
+from .stage_timing import set_timing_enabled, timed_entry, timing_span
@@ -0,0 +1,270 @@
+"""
+Module containing built-in profiling for PAVI pipeline component CLIs
+
+Profiles the code run within a `ProfilingSession` context, using either
+ * the deterministic profiler (cProfile), writing a pstats file and a (call graph derived) collapsed-stack file
+ * a sampling profiler, periodically sampling the call stack of the profiled thread and writing a collapsed-stack file
+and optionally reports the peak memory usage (and its top allocation sites) through tracemalloc.
+
+Collapsed-stack files contain one line per unique call stack (`frame;frame;frame value`)
+and can be rendered by flamegraph tools such as FlameGraph's `flamegraph.pl` or speedscope.
+"""
+
+from collections import Counter
+import os.path
+import sys
+import threading
+from types import FrameType, TracebackType
+from typing import Dict, List, Literal, Optional, override, Set, Tuple, Type, TYPE_CHECKING
+
+from .log_manager import get_logger
+
+# Profiler modules are only imported when profiling, to not slow down CLI startup
+if TYPE_CHECKING:
+    import cProfile  # pragma: no cover
+    import pstats  # pragma: no cover
+
+logger = get_logger(name=__name__)
+
+ProfileMode = Literal['deterministic', 'sampling']
+PROFILE_MODES: Tuple[ProfileMode, ...] = ('deterministic', 'sampling')
+
+DEFAULT_SAMPLING_INTERVAL = 0.005
+"""Default interval (in seconds) between two call stack samples of the sampling profiler."""
+
+MEMORY_REPORT_TOP_N = 25
+"""Number of top allocation sites to include in the memory report."""
+
+MAX_COLLAPSED_STACKS = 50_000
+"""Maximum number of call paths derived from deterministic profiling statistics (heaviest paths first)."""
+
+_MAX_STACK_DEPTH = 200
+
+_PstatsFunction = Tuple[str, int, str]
+"""Function key used by pstats: (filename, line number, function name)"""
+
+
+def frame_name(filename: str, lineno: int, function_name: str) -> str:
+    """Return the name to represent a function by in collapsed stacks."""
+    if filename == '~':
+        # Built-in functions
+        return function_name
+    return f'{function_name} ({os.path.basename(filename)}:{lineno})'
+
+
+def write_collapsed_stacks(stacks: Dict[str, int], output_file: str) -> None:
+    """Write collapsed stacks (and their value) to `output_file`, one stack per line."""
+    with open(output_file, 'w') as f:
+        for stack, value in sorted(stacks.items()):
+            if value > 0:
+                f.write(f'{stack} {value}\n')
+
+
+def pstats_to_collapsed_stacks(stats: 'pstats.Stats', max_stacks: int = MAX_COLLAPSED_STACKS) -> Dict[str, int]:
+    """
+    Derive collapsed stacks from deterministic profiling statistics.
+
+    cProfile only records caller-callee pairs rather than complete call stacks, so stacks are reconstructed
+    by walking the call graph down from its roots, attributing each function's time to the paths it was called through
+    proportionally to the (cumulative) time spent in it from every caller. Recursive calls are folded into their first occurence,
+    so time spent within call cycles (such as nested imports) is only partly attributed: use the sampling profiler for those.
+
+    As the number of call paths grows exponentially with the size of the call graph (import machinery in particular),
+    paths are walked heaviest callees first, paths attributed less than a microsecond are pruned
+    and the walk stops once `max_stacks` paths were emitted.
+
+    Args:
+        stats: deterministic profiling statistics
+        max_stacks: maximum number of call paths to emit
+
+    Returns:
+        Dict of collapsed stacks, with the (own) time spent in them in microseconds as value.
+    """
+    raw_stats = stats.stats  # type: ignore[attr-defined]
+
+    callees: Dict[_PstatsFunction, Dict[_PstatsFunction, float]] = {}
+    roots: List[_PstatsFunction] = []
+    for function, (_, _, _, _, callers) in raw_stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, {})[function] = caller_stats[3]
+
+    # Heaviest callees first, so only the lightest paths are dropped when reaching `max_stacks`
+    sorted_callees: Dict[_PstatsFunction, List[Tuple[_PstatsFunction, float]]] = {
+        function: sorted(function_callees.items(), key=lambda callee: callee[1], reverse=True)
+        for function, function_callees in callees.items()
+    }
+    roots.sort(key=lambda root: raw_stats[root][3], reverse=True)
+
+    collapsed_stacks: Counter[str] = Counter()
+    emitted_paths = 0
+
+    def visit(function: _PstatsFunction, stack: List[str], visited: Set[_PstatsFunction], fraction: float) -> None:
+        nonlocal emitted_paths
+        own_time: float = raw_stats[function][2]
+        stack = stack + [frame_name(*function)]
+        collapsed_stacks[';'.join(stack)] += round(own_time * fraction * 1_000_000)
+        emitted_paths += 1
+
+        if len(stack) >= _MAX_STACK_DEPTH:
+            return
+        for callee, edge_cumulative_time in sorted_callees.get(function, []):
+            if emitted_paths >= max_stacks:
+                return
+            callee_cumulative_time = raw_stats[callee][3]
+            if callee in visited or callee_cumulative_time <= 0:
+                continue
+            # Prune paths (and all paths below them) that no measurable time would be attributed to
+            if round(edge_cumulative_time * fraction * 1_000_000) == 0:
+                continue
+            visit(callee, stack, visited | {callee}, fraction * edge_cumulative_time / callee_cumulative_time)
+
+    for root in roots:
+        if emitted_paths >= max_stacks:
+            break
+        visit(root, [], {root}, 1.0)
+    if emitted_paths >= max_stacks:
+        logger.warning(f"Collapsed stacks truncated to the {max_stacks} heaviest call paths")
+
+    return dict(collapsed_stacks)
+
+
+class StackSampler(threading.Thread):
+    """Thread periodically sampling the call stack of another thread."""
+
+    samples: Counter[str]
+    """Number of samples, by collapsed stack."""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLING_INTERVAL):
+        super().__init__(name='pavi-stack-sampler', daemon=True)
+        self.samples = Counter()
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop_event = threading.Event()
+
+    @override
+    def run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            frame: Optional[FrameType] = sys._current_frames().get(self._thread_id)
+            stack: List[str] = []
+            while frame is not None and len(stack) < _MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append(frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to finish."""
+        self._stop_event.set()
+        self.join()
+
+
+class ProfilingSession():
+    """
+    Context manager profiling the code it wraps.
+
+    Profile artifacts are written to `output_dir` on exit (also when exiting through an exception),
+    named `{name}.pstats`, `{name}.collapsed` and `{name}-memory.txt`. Their paths are listed in the `artifacts` attribute.
+    """
+
+    artifacts: List[str]
+    """Paths of the profile artifacts written."""
+
+    def __init__(self, name: str, output_dir: str = '.', mode: Optional[ProfileMode] = 'deterministic', memory: bool = False,
+                 sampling_interval: float = DEFAULT_SAMPLING_INTERVAL):
+        """
+        Args:
+            name: base name of the profile artifacts
+            output_dir: directory to write the profile artifacts to
+            mode: profiler to use (one of `PROFILE_MODES`), or `None` to only report memory usage
+            memory: when `True`, trace memory allocations and write a peak memory report
+            sampling_interval: interval (in seconds) between two call stack samples in 'sampling' mode
+        """
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Profile mode '{mode}' is not a valid mode, must be one of {PROFILE_MODES}.")
+
+        self.name = name
+        self.output_dir = output_dir
+        self.mode = mode
+        self.memory = memory
+        self.sampling_interval = sampling_interval
+        self.artifacts = []
+
+        self._profiler: Optional['cProfile.Profile'] = None
+        self._sampler: Optional[StackSampler] = None
+
+    def _artifact_path(self, suffix: str) -> str:
+        return os.path.join(self.output_dir, f'{self.name}{suffix}')
+
+    def __enter__(self) -> 'ProfilingSession':
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        if self.memory:
+            import tracemalloc
+
+            tracemalloc.start()
+
+        if self.mode == 'deterministic':
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.mode == 'sampling':
+            self._sampler = StackSampler(thread_id=threading.get_ident(), interval=self.sampling_interval)
+            self._sampler.start()
+
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],  # noqa: U100
+                 traceback: Optional[TracebackType]) -> None:  # noqa: U100
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+        # Report memory before writing any other artifacts, to exclude the allocations made while writing them
+        if self.memory:
+            import tracemalloc
+
+            memory_report_file = self._artifact_path('-memory.txt')
+            self.write_memory_report(memory_report_file)
+            tracemalloc.stop()
+            self.artifacts.append(memory_report_file)
+
+        if self._profiler is not None:
+            import pstats
+
+            pstats_file = self._artifact_path('.pstats')
+            self._profiler.dump_stats(pstats_file)
+            self.artifacts.append(pstats_file)
+
+            collapsed_file = self._artifact_path('.collapsed')
+            write_collapsed_stacks(pstats_to_collapsed_stacks(pstats.Stats(self._profiler)), collapsed_file)
+            self.artifacts.append(collapsed_file)
+
+        if self._sampler is not None:
+            collapsed_file = self._artifact_path('.collapsed')
+            write_collapsed_stacks(self._sampler.samples, collapsed_file)
+            self.artifacts.append(collapsed_file)
+
+        logger.info(f"Wrote profile artifacts: {', '.join(self.artifacts)}")
+
+    def write_memory_report(self, output_file: str) -> None:
+        """Write the current and peak traced memory usage, and the top allocation sites, to `output_file`."""
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')
+        ])
+
+        with open(output_file, 'w') as f:
+            f.write(f'Peak traced memory: {peak / 1024 / 1024:.2f} MiB\n')
+            f.write(f'Current traced memory: {current / 1024 / 1024:.2f} MiB\n')
+            f.write(f'\nTop {MEMORY_REPORT_TOP_N} allocation sites (currently allocated):\n')
+            for statistic in snapshot.statistics('lineno')[:MEMORY_REPORT_TOP_N]:
+                f.write(f'{statistic}\n')
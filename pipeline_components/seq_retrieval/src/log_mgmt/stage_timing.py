@@ -0,0 +1,189 @@
+"""
+Module containing lightweight per-stage timing instrumentation for PAVI pipeline components
+
+Timing is disabled by default. When disabled, `timing_span` returns a shared no-op context manager,
+so instrumented code paths only incur a function call and a flag check.
+When enabled, the durations of all spans entered within a `timed_entry` context are accumulated per stage
+and emitted as one JSON record (one line on stderr) when that context exits.
+
+Span durations are inclusive: the time of a span nested within another span is counted for both stages.
+"""
+
+from contextlib import contextmanager
+import json
+import sys
+import threading
+from time import perf_counter
+from types import TracebackType
+from typing import Any, Dict, Iterator, Optional, Type
+
+STAGE_GENOME_DOWNLOAD = 'genome_download'
+STAGE_VARIANT_FETCH = 'variant_fetch'
+STAGE_FAIDX_READ = 'faidx_read'
+STAGE_VARIANT_EMBEDDING = 'variant_embedding'
+STAGE_ORF_SEARCH = 'orf_search'
+STAGE_TRANSLATION = 'translation'
+STAGE_JSON_DECODING = 'json_decoding'
+STAGE_JSON_ENCODING = 'json_encoding'
+STAGE_ALIGNMENT_PARSING = 'alignment_parsing'
+STAGE_VARIANT_ALIGNMENT = 'variant_alignment'
+STAGE_S3_DOWNLOAD = 's3_download'
+STAGE_S3_UPLOAD = 's3_upload'
+
+TIMING_RECORD_TYPE = 'pavi_stage_timings'
+"""Value of the `record_type` property of all emitted timing records, to identify them in (container) logs."""
+
+_timing_enabled: bool = False
+"""Module level toggle enabling timing. Change the value through the `set_timing_enabled` function."""
+
+_thread_state = threading.local()
+"""Thread-local holder of the `EntryTimings` of the entry currently being timed (`timings` attribute)."""
+
+
+def set_timing_enabled(enabled: bool) -> None:
+    """
+    Enable or disable stage timing for all subsequently started `timed_entry` contexts.
+
+    Args:
+        enabled (bool): set to `True` to enable stage timing (default `False`)
+    """
+    global _timing_enabled
+    _timing_enabled = enabled
+
+
+def timing_enabled() -> bool:
+    """Return `True` when stage timing is enabled."""
+    return _timing_enabled
+
+
+class EntryTimings():
+    """Accumulated stage timings of a single pipeline entry (or component run)."""
+
+    component: str
+    """Name of the pipeline component the timings were recorded in."""
+    entry_id: str
+    """ID of the entry the timings were recorded for."""
+    stage_seconds: Dict[str, float]
+    """Total (inclusive) duration of all spans, by stage."""
+    stage_calls: Dict[str, int]
+    """Number of spans, by stage."""
+
+    def __init__(self, component: str, entry_id: str):
+        self.component = component
+        self.entry_id = entry_id
+        self.stage_seconds = {}
+        self.stage_calls = {}
+        self._start: float = perf_counter()
+        self._end: Optional[float] = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add the duration of a single span to the totals of `stage`."""
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+        self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+
+    def stop(self) -> None:
+        """Stop the total entry timer."""
+        self._end = perf_counter()
+
+    def total_seconds(self) -> float:
+        """Return the total time elapsed since the start of the entry (until stopped)."""
+        end = self._end if self._end is not None else perf_counter()
+        return end - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the timings as a JSON-serializable dict."""
+        return {
+            'record_type': TIMING_RECORD_TYPE,
+            'component': self.component,
+            'entry_id': self.entry_id,
+            'total_seconds': round(self.total_seconds(), 6),
+            'stages': {stage: {'seconds': round(seconds, 6), 'calls': self.stage_calls[stage]}
+                       for stage, seconds in self.stage_seconds.items()}
+        }
+
+
+class _TimingSpan():
+    """Context manager adding its duration to the stage totals of an `EntryTimings` object on exit."""
+
+    __slots__ = ('_timings', '_stage', '_start')
+
+    def __init__(self, timings: EntryTimings, stage: str):
+        self._timings = timings
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],  # noqa: U100
+                 traceback: Optional[TracebackType]) -> None:  # noqa: U100
+        self._timings.add(self._stage, perf_counter() - self._start)
+
+
+class _NoopSpan():
+    """Context manager doing nothing, used when timing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],  # noqa: U100
+                 traceback: Optional[TracebackType]) -> None:  # noqa: U100
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def timing_span(stage: str) -> _TimingSpan | _NoopSpan:
+    """
+    Get a context manager timing the code it wraps as part of `stage`.
+
+    Args:
+        stage: name of the stage to add the span's duration to (use the `STAGE_*` constants where applicable)
+
+    Returns:
+        A context manager, which is a no-op when timing is disabled or no entry is currently being timed.
+    """
+    if not _timing_enabled:
+        return _NOOP_SPAN
+    timings: Optional[EntryTimings] = getattr(_thread_state, 'timings', None)
+    if timings is None:
+        return _NOOP_SPAN
+    return _TimingSpan(timings, stage)
+
+
+def emit_timings(timings: EntryTimings) -> None:
+    """Write the timings of an entry as a single JSON record (line) to stderr."""
+    sys.stderr.write(json.dumps(timings.to_dict()) + '\n')
+    sys.stderr.flush()
+
+
+@contextmanager
+def timed_entry(component: str, entry_id: str) -> Iterator[Optional[EntryTimings]]:
+    """
+    Time all spans entered within this context (in the current thread) as part of a single entry.
+
+    Emits the entry's timings (see `emit_timings`) on exit, when timing is enabled.
+
+    Args:
+        component: name of the pipeline component timing the entry
+        entry_id: ID of the entry to time
+
+    Yields:
+        The (accumulating) timings of the entry, or `None` when timing is disabled.
+    """
+    if not _timing_enabled:
+        yield None
+        return
+
+    previous_timings: Optional[EntryTimings] = getattr(_thread_state, 'timings', None)
+    timings = EntryTimings(component=component, entry_id=entry_id)
+    _thread_state.timings = timings
+    try:
+        yield timings
+    finally:
+        _thread_state.timings = previous_timings
+        timings.stop()
+        emit_timings(timings)
@@ -1,2 +1,12 @@
+from typing import Any
+
 from .alt_seq_info import AltSeqInfo
-from .seq_info import EnumValueHandler, SeqInfo
+from .seq_info import SeqInfo
+
+
+def __getattr__(name: str) -> Any:
+    # Import EnumValueHandler (and jsonpickle) on first access only
+    if name == 'EnumValueHandler':
+        from .json_handlers import EnumValueHandler
+        return EnumValueHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
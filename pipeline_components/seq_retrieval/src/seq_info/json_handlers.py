@@ -0,0 +1,18 @@
+"""
+Module containing jsonpickle handlers for encoding sequence information
+
+Kept apart from the sequence information classes, so jsonpickle is only imported when encoding.
+"""
+from enum import Enum
+import jsonpickle.handlers  # type: ignore
+from typing import Any
+
+
+class EnumValueHandler(jsonpickle.handlers.BaseHandler):
+    def flatten(self, obj: Enum, data: Any) -> Any:  # noqa: U100
+        # Only store the value
+        return obj.value
+
+    def restore(self, data: Any):  # type: ignore
+        # Restore using the Enum class this handler is registered for
+        return self.cls(data)
@@ -1,8 +1,6 @@
 """
 Module containing classes related to sequence information reporting
 """
-from enum import Enum
-import jsonpickle.handlers  # type: ignore
 from typing import Any, override, Optional
 
 from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, SeqEmbeddedVariant, SeqEmbeddedVariantsList
@@ -17,9 +15,11 @@ class SeqInfo():
     """The sequence as a string."""
     error: Optional[str]
     """An error message, if any occured during sequence retrieval."""
+    timings: Optional[dict[str, Any]]
+    """Stage timings of the sequence retrieval, if requested (see `log_mgmt.stage_timing`)."""
 
     def __init__(self, sequence: Optional[str] = None, embedded_variants: Optional[SeqEmbeddedVariantsList | AlignmentEmbeddedVariantsList] = None,
-                 error: Optional[str] = None):
+                 error: Optional[str] = None, timings: Optional[dict[str, Any]] = None):
         if sequence is not None:
             self.sequence = sequence
 
@@ -29,12 +29,16 @@ class SeqInfo():
         if error is not None:
             self.error = error
 
+        if timings is not None:
+            self.timings = timings
+
     @classmethod
     def from_dict(cls, seq_info_dict: dict[str, Any]) -> 'SeqInfo':
         """Loads a SeqInfo object from a dictionary."""
         sequence: Optional[str] = None
         embedded_variants: Optional[SeqEmbeddedVariantsList | AlignmentEmbeddedVariantsList] = None
         error: Optional[str] = None
+        timings: Optional[dict[str, Any]] = None
 
         if 'sequence' in seq_info_dict:
             if not isinstance(seq_info_dict['sequence'], str):
@@ -61,8 +65,12 @@ class SeqInfo():
             if not isinstance(seq_info_dict['error'], str):
                 raise TypeError('error must be a string')
             error = seq_info_dict['error']
+        if 'timings' in seq_info_dict:
+            if not isinstance(seq_info_dict['timings'], dict):
+                raise TypeError('timings must be a dict')
+            timings = seq_info_dict['timings']
 
-        return cls(sequence=sequence, embedded_variants=embedded_variants, error=error)
+        return cls(sequence=sequence, embedded_variants=embedded_variants, error=error, timings=timings)
 
     @override
     def __repr__(self) -> str:
@@ -71,13 +79,3 @@ class SeqInfo():
     @override
     def __str__(self) -> str:  # pragma: no cover
         return f'SeqInfo(sequence={self.sequence}, embedded_variants={self.embedded_variants})'
-
-
-class EnumValueHandler(jsonpickle.handlers.BaseHandler):
-    def flatten(self, obj: Enum, data: Any) -> Any:  # noqa: U100
-        # Only store the value
-        return obj.value
-
-    def restore(self, data: Any):  # type: ignore
-        # Restore using the Enum class this handler is registered for
-        return self.cls(data)
@@ -5,23 +5,21 @@ Main module serving the CLI for PAVI sequence info align component.
 Collects and merges sequence info generated by the sequence retrieval component
  + adds relative alignment positions for all variants using alignment results.
 """
-from Bio import AlignIO
-from Bio.SeqRecord import SeqRecord
-from Bio.Align import MultipleSeqAlignment
+from contextlib import nullcontext
 from copy import deepcopy
 import click
-from enum import Enum
 import glob
 import json
-import jsonpickle  # type: ignore
 import logging
 from os import path, access, R_OK
 import subprocess
 from typing import Any, List, Optional
 
-from log_mgmt import set_log_level, get_logger
+from log_mgmt import set_log_level, get_logger, set_timing_enabled, timed_entry, timing_span
+from log_mgmt.profiling import PROFILE_MODES, ProfileMode, ProfilingSession
+from log_mgmt.stage_timing import STAGE_ALIGNMENT_PARSING, STAGE_JSON_DECODING, STAGE_JSON_ENCODING, STAGE_S3_DOWNLOAD, STAGE_S3_UPLOAD, STAGE_VARIANT_ALIGNMENT
 from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList
-from seq_info import EnumValueHandler, SeqInfo
+from seq_info import SeqInfo
 
 logger = get_logger(name=__name__)
 
@@ -43,11 +41,12 @@ def download_from_s3(s3_prefix: str, local_dir: str, pattern: str = "*") -> List
 
     logger.info(f'Downloading files from {s3_prefix} to {local_dir}...')
 
-    result = subprocess.run(
-        ['aws', 's3', 'cp', s3_prefix, local_dir, '--recursive', '--include', pattern],
-        capture_output=True,
-        text=True
-    )
+    with timing_span(STAGE_S3_DOWNLOAD):
+        result = subprocess.run(
+            ['aws', 's3', 'cp', s3_prefix, local_dir, '--recursive', '--include', pattern],
+            capture_output=True,
+            text=True
+        )
 
     if result.returncode != 0:
         logger.error(f'Failed to download from S3: {result.stderr}')
@@ -75,11 +74,12 @@ def upload_to_s3(local_path: str, s3_prefix: str) -> None:
 
     logger.info(f'Uploading {local_path} to {s3_uri}...')
 
-    result = subprocess.run(
-        ['aws', 's3', 'cp', local_path, s3_uri],
-        capture_output=True,
-        text=True
-    )
+    with timing_span(STAGE_S3_UPLOAD):
+        result = subprocess.run(
+            ['aws', 's3', 'cp', local_path, s3_uri],
+            capture_output=True,
+            text=True
+        )
 
     if result.returncode != 0:
         logger.error(f'Failed to upload {local_path} to S3: {result.stderr}')
@@ -136,6 +136,132 @@ def process_alignment_result_file_param(ctx: click.Context, param: click.Paramet
     return value
 
 
+def align_seq_info(seq_info_files: List[str], alignment_file: str,
+                   parent_seq_info_file: Optional[str] = None) -> dict[str, Any]:
+    """
+    Merge sequence info files and add relative alignment positions for all embedded variants.
+
+    Args:
+        seq_info_files: Sequence info (JSON) files, as written by seq_retrieval
+        alignment_file: Alignment result file (clustal format)
+        parent_seq_info_file: Optional aligned sequence info file of a parent job (incremental alignment),
+            of which the info of alignment records not present in `seq_info_files` is carried over
+
+    Returns:
+        Aligned sequence info, by alignment record ID
+
+    Raises:
+        ValueError: If any of the input files could not be read or parsed.
+    """
+    from Bio import AlignIO
+    from Bio.Align import MultipleSeqAlignment
+    from Bio.SeqRecord import SeqRecord
+
+    alt_sequence_info_dict: dict[str, SeqInfo] = {}
+
+    # * Read each of the sequence_info_files (JSON) and merge into a single dict
+    with timing_span(STAGE_JSON_DECODING):
+        for file in seq_info_files:
+            try:
+                with open(file, 'r') as f:
+                    sequence_info_json_dict: dict[str, Any] = json.load(f)
+                    sequence_info_dict: dict[str, SeqInfo] = {}
+                    for key, value in sequence_info_json_dict.items():
+                        sequence_info_dict[key] = SeqInfo.from_dict(value)
+                    alt_sequence_info_dict.update(sequence_info_dict)
+            except Exception as e:
+                raise ValueError(f"Failed to read sequence info file '{file}': {e}")
+
+    # * Read alignment_file
+    alignment: MultipleSeqAlignment
+    try:
+        with timing_span(STAGE_ALIGNMENT_PARSING):
+            alignment = next(AlignIO.parse(alignment_file, "clustal"))
+    except Exception as e:
+        raise ValueError(f"Failed to read alignment result file '{alignment_file}': {e}")
+
+    if not isinstance(alignment, MultipleSeqAlignment):
+        raise ValueError(f"Alignment result file '{alignment_file}' does not contain a multiple sequence alignment.")
+
+    # * Loop over each record in the alignment_file and update the sequence info dict with relative alignment positions
+    aligned_seq_info_dict: dict[str, SeqInfo] = deepcopy(alt_sequence_info_dict)
+    for record in alignment:
+        if not isinstance(record, SeqRecord):
+            raise ValueError(f"Error while parsing record of alignment result file '{alignment_file}'.")
+        if record.seq is None:
+            raise ValueError(f"Error while reading record sequence for alignment record '{record.id}'.")
+
+        aligned_variants: Optional[AlignmentEmbeddedVariantsList] = None
+
+        if record.id in alt_sequence_info_dict:
+            aligned_seq_info = deepcopy(alt_sequence_info_dict[record.id])
+
+            # Replace the embedded variants with their aligned counterparts
+            if hasattr(alt_sequence_info_dict[record.id], 'embedded_variants'):
+                embedded_variants = deepcopy(alt_sequence_info_dict[record.id].embedded_variants)
+                delattr(aligned_seq_info, 'embedded_variants')
+                if isinstance(embedded_variants, AlignmentEmbeddedVariantsList):
+                    aligned_variants = embedded_variants
+                else:
+                    aligned_variants = AlignmentEmbeddedVariantsList()
+                    if embedded_variants:
+                        with timing_span(STAGE_VARIANT_ALIGNMENT):
+                            for variant in embedded_variants:
+                                aligned_variants.append(AlignmentEmbeddedVariant(variant, record))
+                aligned_seq_info.embedded_variants = aligned_variants
+
+            aligned_seq_info_dict[record.id] = aligned_seq_info
+
+    # * Carry over the aligned sequence info of parent alignment records (incremental alignment)
+    if parent_seq_info_file:
+        try:
+            with open(parent_seq_info_file, 'r') as f:
+                parent_seq_info_dict: dict[str, Any] = json.load(f)
+        except Exception as e:
+            raise ValueError(f"Failed to read parent sequence info file '{parent_seq_info_file}': {e}")
+
+        for record in alignment:
+            if record.id not in aligned_seq_info_dict and record.id in parent_seq_info_dict:
+                try:
+                    parent_seq_info = SeqInfo.from_dict(parent_seq_info_dict[record.id])
+                except Exception as e:
+                    raise ValueError(f"Failed to read parent sequence info for alignment record '{record.id}': {e}")
+
+                # Adding sequences to an alignment can insert gap columns into the parent records (e.g. profile alignment),
+                # so the variants' alignment positions are recomputed against the new alignment
+                parent_variants = getattr(parent_seq_info, 'embedded_variants', None)
+                if parent_variants:
+                    with timing_span(STAGE_VARIANT_ALIGNMENT):
+                        parent_seq_info.embedded_variants = AlignmentEmbeddedVariantsList(
+                            [AlignmentEmbeddedVariant(variant, record) for variant in parent_variants])
+
+                aligned_seq_info_dict[record.id] = parent_seq_info
+
+    return aligned_seq_info_dict
+
+
+def write_aligned_seq_info(aligned_seq_info_dict: dict[str, Any], output_file: str) -> None:
+    """
+    Write aligned sequence info (as returned by `align_seq_info`) to a JSON file.
+
+    Args:
+        aligned_seq_info_dict: Aligned sequence info, by alignment record ID
+        output_file: Path of the file to write to
+    """
+    from enum import Enum
+    import jsonpickle  # type: ignore
+    from seq_info.json_handlers import EnumValueHandler
+
+    jsonpickle.set_encoder_options("simplejson", sort_maps=True)
+    jsonpickle.register(Enum, EnumValueHandler, base=True)
+
+    with timing_span(STAGE_JSON_ENCODING):
+        aligned_seq_info_json = jsonpickle.encode(aligned_seq_info_dict, make_refs=False, unpicklable=False)
+
+    with open(output_file, 'w') as f:
+        f.write(aligned_seq_info_json)
+
+
 @click.command(context_settings={'show_default': True})
 @click.option("--sequence-info-files", type=click.STRING, required=False, default=None,
               help="Space separated list of sequence info files to read (local mode).")
@@ -145,15 +271,55 @@ def process_alignment_result_file_param(ctx: click.Context, param: click.Paramet
               help="S3 URI prefix for work directory (S3 mode). Downloads seqinfo JSON files from here.")
 @click.option("--s3-results-prefix", type=click.STRING, required=False, default=None,
               help="S3 URI prefix for results (S3 mode). Downloads alignment.aln from here and uploads aligned_seq_info.json.")
+@click.option("--parent-seq-info-file", type=click.STRING, required=False, default=None,
+              help="Aligned sequence info file of a parent job (local incremental alignment mode).")
+@click.option("--s3-parent-results-prefix", type=click.STRING, required=False, default=None,
+              envvar='PARENT_RESULTS_S3_PREFIX',
+              help="S3 URI prefix for the results of a parent job (S3 incremental alignment mode)."
+                   + " Downloads aligned_seq_info.json from here.")
+@click.option("--timing", is_flag=True, envvar='PAVI_STAGE_TIMING',
+              help="""Flag to enable stage timing. Emits the duration of every stage as a single JSON record (line) on stderr.""")
+@click.option("--profile", type=click.Choice(PROFILE_MODES), required=False, default=None,
+              help="""Profile the sequence info alignment with the deterministic (cProfile) or sampling profiler,
+              writing seq_info_align-profile.pstats (deterministic only) and a flamegraph-compatible
+              seq_info_align-profile.collapsed file to `profile-dir` (and uploading them to `s3-results-prefix` in S3 mode).""")
+@click.option("--profile-memory", is_flag=True,
+              help="""Flag to trace memory allocations and write a peak memory report (seq_info_align-profile-memory.txt).""")
+@click.option("--profile-dir", type=click.STRING, default='.',
+              help="""Directory to write profile artifacts to.""")
 @click.option("--debug", is_flag=True,
               help="""Flag to enable debug printing.""")
 def main(alignment_result_file: Optional[str], sequence_info_files: Optional[str],
-         s3_work_prefix: Optional[str], s3_results_prefix: Optional[str], debug: bool) -> None:
+         s3_work_prefix: Optional[str], s3_results_prefix: Optional[str],
+         parent_seq_info_file: Optional[str], s3_parent_results_prefix: Optional[str], timing: bool,
+         profile: Optional[ProfileMode], profile_memory: bool, profile_dir: str, debug: bool) -> None:
     if debug:
         set_log_level(logging.DEBUG)
     else:
         set_log_level(logging.INFO)
 
+    set_timing_enabled(timing)
+
+    profiling_session: Optional[ProfilingSession] = None
+    if profile or profile_memory:
+        profiling_session = ProfilingSession(name='seq_info_align-profile', output_dir=profile_dir, mode=profile, memory=profile_memory)
+
+    with profiling_session or nullcontext():
+        with timed_entry(component='seq_info_align', entry_id=s3_results_prefix or alignment_result_file or 'aligned_seq_info'):
+            run_seq_info_align(alignment_result_file=alignment_result_file, sequence_info_files=sequence_info_files,
+                               s3_work_prefix=s3_work_prefix, s3_results_prefix=s3_results_prefix,
+                               parent_seq_info_file=parent_seq_info_file, s3_parent_results_prefix=s3_parent_results_prefix)
+
+    if profiling_session and s3_work_prefix and s3_results_prefix:
+        for profile_artifact in profiling_session.artifacts:
+            upload_to_s3(profile_artifact, s3_results_prefix)
+
+
+def run_seq_info_align(alignment_result_file: Optional[str], sequence_info_files: Optional[str],
+                       s3_work_prefix: Optional[str], s3_results_prefix: Optional[str],
+                       parent_seq_info_file: Optional[str], s3_parent_results_prefix: Optional[str]) -> None:
+    """Run sequence info alignment in S3 or local mode, as defined by the CLI arguments received by `main`."""
+
     # Determine mode: S3 or local
     s3_mode = s3_work_prefix is not None and s3_results_prefix is not None
 
@@ -174,6 +340,12 @@ def main(alignment_result_file: Optional[str], sequence_info_files: Optional[str
         if not path.exists(alignment_file):
             logger.error(f"Alignment file not found at {alignment_file}")
             exit(1)
+
+        # Download aligned seqinfo of the parent job (incremental alignment)
+        if s3_parent_results_prefix:
+            parent_dir = '/tmp/seq_info_parent'
+            download_from_s3(s3_parent_results_prefix, parent_dir, "aligned_seq_info.json")
+            parent_seq_info_file = path.join(parent_dir, 'aligned_seq_info.json')
     else:
         logger.info("Running in local mode")
         # Validate local mode has required parameters
@@ -210,69 +382,14 @@ def main(alignment_result_file: Optional[str], sequence_info_files: Optional[str
     logger.debug(f"sequence_info_files: {seq_info_file_list}")
     logger.debug(f"alignment output file: {alignment_file}")
 
-    alt_sequence_info_dict: dict[str, SeqInfo] = {}
-
-    # * Read each of the sequence_info_files (JSON) and merge into a single dict
-    for file in seq_info_file_list:
-        try:
-            with open(file, 'r') as f:
-                sequence_info_json_dict: dict[str, Any] = json.load(f)
-                sequence_info_dict: dict[str, SeqInfo] = {}
-                for key, value in sequence_info_json_dict.items():
-                    sequence_info_dict[key] = SeqInfo.from_dict(value)
-                alt_sequence_info_dict.update(sequence_info_dict)
-        except Exception as e:
-            logger.error(f"Failed to read sequence info file '{file}': {e}")
-            exit(1)
-
-    # * Read alignment_file
-    alignment: MultipleSeqAlignment
     try:
-        alignment = next(AlignIO.parse(alignment_file, "clustal"))
-    except Exception as e:
-        logger.error(f"Failed to read alignment result file '{alignment_file}': {e}")
+        aligned_seq_info_dict = align_seq_info(seq_info_file_list, alignment_file, parent_seq_info_file)
+    except ValueError as e:
+        logger.error(str(e))
         exit(1)
 
-    if not isinstance(alignment, MultipleSeqAlignment):
-        logger.error(f"Alignment result file '{alignment_file}' does not contain a multiple sequence alignment.")
-        exit(1)
-
-    # * Loop over each record in the alignment_file and update the sequence info dict with relative alignment positions
-    aligned_seq_info_dict: dict[str, SeqInfo] = deepcopy(alt_sequence_info_dict)
-    for record in alignment:
-        if not isinstance(record, SeqRecord):
-            logger.error(f"Error while parsing record of alignment result file '{alignment_file}'.")
-            exit(1)
-        if record.seq is None:
-            logger.error(f"Error while reading record sequence for alignment record '{record.id}'.")
-            exit(1)
-
-        aligned_variants: Optional[AlignmentEmbeddedVariantsList] = None
-
-        if record.id in alt_sequence_info_dict:
-            aligned_seq_info = deepcopy(alt_sequence_info_dict[record.id])
-
-            # Replace the embedded variants with their aligned counterparts
-            if hasattr(alt_sequence_info_dict[record.id], 'embedded_variants'):
-                embedded_variants = deepcopy(alt_sequence_info_dict[record.id].embedded_variants)
-                delattr(aligned_seq_info, 'embedded_variants')
-                if isinstance(embedded_variants, AlignmentEmbeddedVariantsList):
-                    aligned_variants = embedded_variants
-                else:
-                    aligned_variants = AlignmentEmbeddedVariantsList()
-                    if embedded_variants:
-                        for variant in embedded_variants:
-                            aligned_variants.append(AlignmentEmbeddedVariant(variant, record))
-                aligned_seq_info.embedded_variants = aligned_variants
-
-            aligned_seq_info_dict[record.id] = aligned_seq_info
-
-    jsonpickle.set_encoder_options("simplejson", sort_maps=True)
-    jsonpickle.register(Enum, EnumValueHandler, base=True)
-
     output_file = 'aligned_seq_info.json'
-    with open(output_file, 'w') as f:
-        f.write(jsonpickle.encode(aligned_seq_info_dict, make_refs=False, unpicklable=False))
+    write_aligned_seq_info(aligned_seq_info_dict, output_file)
 
     logger.info(f"Wrote aligned sequence info to {output_file}")
 
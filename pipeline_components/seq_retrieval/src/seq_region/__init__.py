@@ -3,6 +3,7 @@ Module containing all SeqRegion-related classes (and related functions)
 """
 
 from .exceptions import *  # noqa: F403
+from .reference_genome import get_reference_genome, ReferenceGenome
 from .seq_region import SeqRegion
 from .multipart_seq_region import MultiPartSeqRegion
 from .translated_seq_region import TranslatedSeqRegion
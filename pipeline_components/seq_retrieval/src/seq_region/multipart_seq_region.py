@@ -2,9 +2,13 @@
 Module containing the MultiPartSeqRegion class.
 """
 
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from typing import Any, Callable, Dict, List, override, Optional, Set, TypedDict
 
+from .reference_genome import ReferenceGenome
 from .seq_region import SeqRegion, AltSeqInfo
+from .soft_mask import slice_soft_mask, SoftMask
 from variant import SeqEmbeddedVariantsList, Variant, variants_overlap
 
 from log_mgmt import get_logger
@@ -17,11 +21,20 @@ class MultiPartSeqRegion(SeqRegion):
     Defines a (non-continuous) genetic sequence region consisting of multiple (consecutive) sequence regions.
     """
 
+    __slots__ = ('ordered_seqRegions', 'part_offsets')
+
     ordered_seqRegions: List[SeqRegion]
     """Ordered list of SeqRegions which constitute a single multi-part sequence region"""
 
+    part_offsets: List[int]
+    """
+    Cumulative sequence lengths of the `ordered_seqRegions` (prefix sums, starting at 0):
+    `part_offsets[i]` is the number of bases preceding part `i` in the multi-part sequence,
+    the last element equals `seq_length`.
+    """
+
     sequence: Optional[str]
-    """Sequence of the complete multi-part sequence region"""
+    """Sequence of the complete multi-part sequence region, normalized to upper case (see `soft_mask` for its soft-masked bases)"""
 
     def __init__(self, seq_regions: List[SeqRegion]):
         """
@@ -33,11 +46,11 @@ class MultiPartSeqRegion(SeqRegion):
 
         Args:
             seq_regions:      List of SeqRegion objects that constitute this multi-part sequence region.\
-                              All SeqRegions must have identical seq_id, strand and fasta_file_path properties \
+                              All SeqRegions must have identical seq_id, strand and genome properties \
                               to form a valid MultipartSeqRegion.
 
         Raises:
-            ValueError: if `seq_regions` have distinct `seq_id`, `strand` or `fasta_file_path` properties.
+            ValueError: if `seq_regions` have distinct `seq_id`, `strand` or `genome` properties.
         """
 
         self.start = min(map(lambda seq_region: seq_region.start, seq_regions))
@@ -60,13 +73,16 @@ class MultiPartSeqRegion(SeqRegion):
         else:
             self.seq_id = seq_ids.pop()
 
-        # Ensure one fasta_file_path
-        fasta_file_paths: Set[str] = set(map(lambda seq_region: seq_region.fasta_file_path, seq_regions))
-        if len(fasta_file_paths) > 1:
-            raise ValueError(f"Multiple fasta_file_paths defined accross seq regions ({fasta_file_paths})."
-                             + " All seqRegions in multiPartSeqRegion must have equal value for fasta_file_path attribute.")
+        # Ensure one reference genome
+        genomes: Set[Optional[ReferenceGenome]] = set(map(lambda seq_region: seq_region.genome, seq_regions))
+        if len(genomes) > 1:
+            raise ValueError(f"Multiple reference genomes defined accross seq regions ({genomes})."
+                             + " All seqRegions in multiPartSeqRegion must have equal value for genome attribute.")
         else:
-            self.fasta_file_path = fasta_file_paths.pop()
+            self.genome = genomes.pop()
+
+        # Sequences are chained from the parts' sequences (which can use their own seq_memo)
+        self.seq_memo = None
 
         # Sort seq_regions before storing
         sort_args: Dict[str, Any] = dict(key=lambda region: region.start, reverse=False)
@@ -101,8 +117,10 @@ class MultiPartSeqRegion(SeqRegion):
                     reading_frame_size += seq_region.seq_length - seq_region.frame
 
         self.ordered_seqRegions = ordered_seq_regions
+        self.part_offsets = [0, *accumulate(seq_region.seq_length for seq_region in ordered_seq_regions)]
         self.frame = ordered_seq_regions[0].frame
         self.sequence = None
+        self.soft_mask = []
 
     @override
     def __str__(self) -> str:  # pragma: no cover
@@ -115,22 +133,27 @@ class MultiPartSeqRegion(SeqRegion):
         consisting SeqRegions' sequenes together into one continuous sequence.
 
         Chains seqRegions in the order defined in the `ordered_seqRegions` attribute.
-        Stores resulting sequence in `sequence` attribute.
+        Stores resulting (normalized) sequence in `sequence` attribute, and its soft-masking in `soft_mask` attribute.
 
         Args:
             recursive_fetch: if True, fetch sequence for each SeqRegion part of the MultiPartSeqRegion first, before chaining the results.
 
         Returns:
-            The fetched sequence as a string.
+            The fetched (soft-masked) sequence as a string.
         """
 
-        fetch_result = self.fetch_alt_seq(recursive_fetch=recursive_fetch, variants=[])
+        # Chain the normalized sequences and soft-masked intervals of all parts
+        sequences: List[str] = []
+        soft_mask: SoftMask = []
+        for region_part, part_offset in zip(self.ordered_seqRegions, self.part_offsets):
+            sequences.append(region_part.get_sequence(unmasked=True, autofetch=recursive_fetch))
+            soft_mask.extend((start + part_offset, end + part_offset) for start, end in region_part.soft_mask)
 
-        self.set_sequence(sequence=fetch_result.sequence)
+        self.set_sequence(sequence=''.join(sequences), soft_mask=soft_mask)
 
-        return fetch_result.sequence
+        return self.get_sequence(autofetch=False)
 
-    def fetch_alt_seq(self, inframe_only: bool = False, recursive_fetch: bool = True, variants: List[Variant] = []) -> AltSeqInfo:
+    def fetch_alt_seq(self, inframe_only: bool = False, recursive_fetch: bool = True, variants: List[Variant] = [], unmasked: bool = False) -> AltSeqInfo:
         """
         Fetch alternative genetic (DNA) sequence for MultiPartSeqRegion, \
         by applying the relevant variants to each of the consisting SeqRegions, \
@@ -143,6 +166,8 @@ class MultiPartSeqRegion(SeqRegion):
                              Default `False`.
             recursive_fetch: if True, fetch sequence for each SeqRegion part of the MultiPartSeqRegion first, before chaining the results.
             variants:        Optional list of variants to apply to the sequence before returning.
+            unmasked:        Flag to remove soft masking (lowercase letters) \
+                             and return unmasked sequence instead (uppercase). Default `False`.
 
         Returns:
             The fetched sequence as a string.
@@ -173,7 +198,7 @@ class MultiPartSeqRegion(SeqRegion):
         for region_part in region.ordered_seqRegions:
             region_part_str = str(region_part)
             if region_part_str in variants_overlap_map and len(variants_overlap_map[region_part_str]) > 0:
-                region_alt_seq = region_part.get_alt_sequence(autofetch=recursive_fetch, variants=variants_overlap_map[region_part_str])
+                region_alt_seq = region_part.get_alt_sequence(unmasked=unmasked, autofetch=recursive_fetch, variants=variants_overlap_map[region_part_str])
 
                 if len(region_alt_seq.embedded_variants) > 0:
                     # Check if last embedded variant is overlapping with this region as well
@@ -189,7 +214,7 @@ class MultiPartSeqRegion(SeqRegion):
 
                 complete_multipart_sequence += region_alt_seq.sequence
             else:
-                complete_multipart_sequence += region_part.get_sequence(autofetch=recursive_fetch)
+                complete_multipart_sequence += region_part.get_sequence(unmasked=unmasked, autofetch=recursive_fetch)
 
         if inframe_only and len(embedded_variants) > 0:
             # Trim sequence to complete in-frame codons (possibly extended/shortened by embedded variants)
@@ -206,14 +231,15 @@ class MultiPartSeqRegion(SeqRegion):
         )
 
     @override
-    def set_sequence(self, sequence: str) -> None:
+    def set_sequence(self, sequence: str, soft_mask: Optional[SoftMask] = None) -> None:
         """
-        Set the `sequence` attribute.
+        Set the `sequence` (and `soft_mask`) attribute.
 
         Asserts the length of `sequence` matches the expected sequence length for this region.
 
         Args:
-            sequence: DNA sequence (string)
+            sequence: DNA sequence (string), soft-masked (lowercase) unless `soft_mask` is provided
+            soft_mask: soft-masked intervals of `sequence`, when `sequence` is already normalized (upper case)
 
         Raises:
             valueError: If the length of `sequence` provided does not match the region length (sum of SeqRegion lengths)
@@ -224,7 +250,7 @@ class MultiPartSeqRegion(SeqRegion):
         if sequence_len != self.seq_length:
             raise ValueError(f"Sequence length ({sequence_len}) does not equal length expected based on region positions ({self.seq_length}).")
 
-        self.sequence = sequence
+        super().set_sequence(sequence=sequence, soft_mask=soft_mask)
 
     @override
     def get_alt_sequence(self, unmasked: bool = False, variants: List[Variant] = [], autofetch: bool = True, inframe_only: bool = False) -> AltSeqInfo:
@@ -261,13 +287,7 @@ class MultiPartSeqRegion(SeqRegion):
         if self.sequence is None and autofetch:
             self.fetch_seq(recursive_fetch=True)
 
-        alt_seq_info = self.fetch_alt_seq(variants=variants, inframe_only=inframe_only)
-        alt_sequence = alt_seq_info.sequence
-
-        if unmasked:
-            alt_sequence = alt_sequence.upper()
-
-        return AltSeqInfo(sequence=alt_sequence, embedded_variants=alt_seq_info.embedded_variants)
+        return self.fetch_alt_seq(variants=variants, inframe_only=inframe_only, unmasked=unmasked)
 
     @override
     def inframe_seq_region(self) -> 'MultiPartSeqRegion':
@@ -361,21 +381,30 @@ class MultiPartSeqRegion(SeqRegion):
         if self.seq_length < rel_end:
             raise ValueError(f'Relative end position {rel_end} fall outside the boundaries of the MultipartSeqRegion {self} (len {self.seq_length}).')
 
-        seq_regions: List[SeqRegion] = []
-
-        covered_length: int = 0
-        for seq_region in self.ordered_seqRegions:
-            if (covered_length + seq_region.seq_length) < rel_start:
-                covered_length += seq_region.seq_length
-                continue
-
-            seq_regions.append(seq_region.sub_region(rel_start=max(1, rel_start - covered_length), rel_end=min(rel_end - covered_length, seq_region.seq_length)))
-            covered_length += seq_region.seq_length
+        # Find the first and last part overlapping the subregion
+        first_part_idx = bisect_right(self.part_offsets, rel_start - 1) - 1
+        last_part_idx = bisect_left(self.part_offsets, rel_end) - 1
 
-            if rel_end <= covered_length:
-                break
-
-        return MultiPartSeqRegion(seq_regions=seq_regions)
+        seq_regions: List[SeqRegion] = []
+        part_offsets: List[int] = [0]
+        for part_idx in range(first_part_idx, last_part_idx + 1):
+            seq_region = self.ordered_seqRegions[part_idx]
+            part_offset = self.part_offsets[part_idx]
+            seq_regions.append(seq_region.sub_region(rel_start=max(1, rel_start - part_offset),
+                                                     rel_end=min(rel_end - part_offset, seq_region.seq_length)))
+            part_offsets.append(part_offsets[-1] + seq_regions[-1].seq_length)
+
+        # Subregions of valid multi-part regions are valid by definition,
+        # so build the subregion as a view on `self` rather than re-validating it through __init__.
+        # The subregion shares the parent's (fetched) sequence, rather than requiring it to be fetched and concatenated again.
+        return self.replace(start=min(seq_region.start for seq_region in seq_regions),
+                            end=max(seq_region.end for seq_region in seq_regions),
+                            seq_length=rel_end - rel_start + 1,
+                            frame=seq_regions[0].frame,
+                            sequence=self.sequence[(rel_start - 1):rel_end] if self.sequence is not None else None,
+                            soft_mask=slice_soft_mask(self.soft_mask, rel_start - 1, rel_end),
+                            ordered_seqRegions=seq_regions,
+                            part_offsets=part_offsets)
 
     @override
     def to_rel_position(self, seq_position: int) -> int:
@@ -394,18 +423,54 @@ class MultiPartSeqRegion(SeqRegion):
         if seq_position < self.start or self.end < seq_position:
             raise ValueError(f'Seq position {seq_position} out of boundaries of MultipartSeqRegion {self}.')
 
-        rel_position: int | None = None
-        for i in range(0, len(self.ordered_seqRegions)):
-            region = self.ordered_seqRegions[i]
+        part_idx = self.part_index(seq_position)
+        if part_idx is None:
+            raise ValueError(f'Seq position {seq_position} located between SeqRegion parts defining the MultipartSeqRegion {self}.')
 
-            if region.start <= seq_position and seq_position <= region.end:
-                rel_position = sum(map(lambda seq_region: seq_region.seq_length, self.ordered_seqRegions[0:i]))
+        return self.part_offsets[part_idx] + self.ordered_seqRegions[part_idx].to_rel_position(seq_position)
 
-                rel_position += region.to_rel_position(seq_position)
+    @override
+    def to_seq_position(self, rel_position: int) -> int:
+        """
+        Convert relative position within the MultipartSeqRegion to absolute sequence position
 
-                break
+        Args:
+            rel_position: relative position on the complete MultipartSeqRegion sequence (1-based) to be converted
 
-        if rel_position is None:
-            raise ValueError(f'Seq position {seq_position} located between SeqRegion parts defining the MultipartSeqRegion {self}.')
+        Returns:
+            Absolute sequence position
+
+        Raises:
+            ValueError: when rel_position falls outside of the MultipartSeqRegion boundaries
+        """
+        if rel_position < 1 or self.seq_length < rel_position:
+            raise ValueError(f'Relative position {rel_position} out of boundaries of MultipartSeqRegion {self} (len {self.seq_length}).')
+
+        part_idx = bisect_right(self.part_offsets, rel_position - 1) - 1
+
+        return self.ordered_seqRegions[part_idx].to_seq_position(rel_position - self.part_offsets[part_idx])
+
+    def part_index(self, seq_position: int) -> Optional[int]:
+        """
+        Find the SeqRegion part containing an absolute sequence position (binary search).
+
+        Args:
+            seq_position: absolute sequence position to find the part for
+
+        Returns:
+            Index of the part in `ordered_seqRegions` containing `seq_position`, or `None` when no part contains it.
+        """
+        part_idx: int
+        if self.strand == '-':
+            # Parts are ordered descending on position
+            part_idx = bisect_right(self.ordered_seqRegions, -seq_position, key=lambda seq_region: -seq_region.end) - 1
+        else:
+            part_idx = bisect_right(self.ordered_seqRegions, seq_position, key=lambda seq_region: seq_region.start) - 1
+
+        if part_idx < 0:
+            return None
 
-        return rel_position
+        seq_region = self.ordered_seqRegions[part_idx]
+        if seq_region.start <= seq_position and seq_position <= seq_region.end:
+            return part_idx
+        return None
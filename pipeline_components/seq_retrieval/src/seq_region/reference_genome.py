@@ -0,0 +1,194 @@
+"""
+Module containing the ReferenceGenome class and related functions.
+"""
+import os
+import threading
+from typing import Dict, Optional, override, Tuple, TYPE_CHECKING
+
+from data_mover import data_file_mover
+from log_mgmt import get_logger, timing_span
+from log_mgmt.stage_timing import STAGE_FAIDX_READ, STAGE_GENOME_DOWNLOAD
+
+# pysam is only imported when reading sequences, to not slow down CLI startup
+if TYPE_CHECKING:
+    import pysam  # pragma: no cover
+
+logger = get_logger(name=__name__)
+
+_reference_genomes: Dict[str, 'ReferenceGenome'] = dict()
+"""Module level cache of all ReferenceGenome objects obtained through `get_reference_genome`, by fasta file URL."""
+
+_lock = threading.Lock()
+"""Lock guarding the creation of ReferenceGenome objects (the fetching of their files is guarded per genome)."""
+
+
+class ReferenceGenome():
+    """
+    Defines a (lazily resolved) reference genome, stored as faidx-indexed fasta file.
+
+    The fasta file and its index files are only fetched on first access of `fasta_file_path` (or `fasta_file`),
+    after which the local path and the opened fasta file are reused by all sequence regions referring to the genome.
+    As pysam file handles can not be shared between threads or processes, the fasta file is opened once per thread (and process).
+    Use `get_reference_genome` to obtain the (shared) ReferenceGenome object for a fasta file URL.
+    """
+
+    __slots__ = ('fasta_file_url', '_fasta_file_path', '_fetch_lock', '_local')
+
+    fasta_file_url: str
+    """URL of the faidx-indexed fasta file containing the reference sequences"""
+
+    def __init__(self, fasta_file_url: str):
+        """
+        Initializes a ReferenceGenome instance (without fetching any files).
+
+        Args:
+            fasta_file_url: URL of faidx-indexed FASTA file containing the reference sequences.\
+                            Faidx-index files `fasta_file_url`.fai and `fasta_file_url`.gzi for compressed fasta file must be accessible URLs.
+        """
+        self.fasta_file_url = fasta_file_url
+        self._fasta_file_path: Optional[str] = None
+        # Only guards the fetching of this genome's files, so slow fetches do not block other genomes
+        self._fetch_lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def fasta_file_path(self) -> str:
+        """Absolute path to the local (faidx indexed) fasta file, fetching the fasta file and its index files on first access."""
+        return self.fetch_files()
+
+    def fetch_files(self) -> str:
+        """
+        Fetch the fasta file and its index files, when not fetched before.
+
+        Returns:
+            Absolute path to the local fasta file.
+        """
+        if self._fasta_file_path is None:
+            with self._fetch_lock:
+                if self._fasta_file_path is None:
+                    self._fasta_file_path = fetch_faidx_files(self.fasta_file_url)
+        return self._fasta_file_path
+
+    def is_fetched(self) -> bool:
+        """Return `True` when the fasta file and its index files have been fetched."""
+        return self._fasta_file_path is not None
+
+    def fasta_file(self) -> 'pysam.FastaFile':
+        """
+        Return the opened fasta file, opening it (and fetching the files as required) on first access by the current thread.
+
+        Raises:
+            ValueError: if the index files cannot be found
+            IOError: if the fasta file or its index files cannot be read
+        """
+        # Opened fasta file, with the ID of the process that opened it (to not reuse handles inherited by forked processes)
+        opened_file: Optional[Tuple[int, 'pysam.FastaFile']] = getattr(self._local, 'fasta_file', None)
+        if opened_file is None or opened_file[0] != os.getpid():
+            import pysam
+
+            opened_file = (os.getpid(), pysam.FastaFile(self.fasta_file_path))
+            self._local.fasta_file = opened_file
+        return opened_file[1]
+
+    def close(self) -> None:
+        """Close the fasta file opened by the current thread (if any). It is reopened on next access."""
+        opened_file: Optional[Tuple[int, 'pysam.FastaFile']] = getattr(self._local, 'fasta_file', None)
+        if opened_file is not None:
+            if opened_file[0] == os.getpid():
+                opened_file[1].close()
+            self._local.fasta_file = None
+
+    def fetch_seq(self, seq_id: str, start: int, end: int) -> str:
+        """
+        Read the (positive strand) sequence found at `seq_id`:`start`-`end` from the fasta file.
+
+        Args:
+            seq_id: The sequence identifier found in the fasta file
+            start: The start position of the sequence to read (1-based, inclusive)
+            end: The end position of the sequence to read (1-based, inclusive)
+
+        Returns:
+            The sequence read as a string
+
+        Raises:
+            FileNotFoundError: if the index files cannot be found
+            IOError: if the fasta file or its index files cannot be read
+        """
+        # Fetch the files (when not fetched before) outside of the read span
+        fasta_file_path = self.fasta_file_path
+
+        with timing_span(STAGE_FAIDX_READ):
+            try:
+                fasta_file = self.fasta_file()
+            except ValueError:
+                raise FileNotFoundError(f"Missing index file matching path {fasta_file_path}.")
+            except IOError:
+                raise IOError(f"Error while reading fasta file or index matching path {fasta_file_path}.")
+            else:
+                seq: str = fasta_file.fetch(reference=seq_id, start=(start - 1), end=end)
+
+        return seq
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ReferenceGenome):
+            return self.fasta_file_url == other.fasta_file_url
+        return False
+
+    @override
+    def __hash__(self) -> int:
+        return hash(self.fasta_file_url)
+
+    @override
+    def __str__(self) -> str:  # pragma: no cover
+        return self.fasta_file_url
+
+    @override
+    def __repr__(self) -> str:  # pragma: no cover
+        return f'ReferenceGenome({self.fasta_file_url})'
+
+
+def get_reference_genome(fasta_file_url: str) -> ReferenceGenome:
+    """
+    Get the (shared) ReferenceGenome object for a fasta file URL, creating it on first request.
+
+    Args:
+        fasta_file_url: URL of faidx-indexed FASTA file containing the reference sequences.
+
+    Returns:
+        The ReferenceGenome object for `fasta_file_url` (files are not fetched until first used).
+    """
+    reference_genome = _reference_genomes.get(fasta_file_url)
+    if reference_genome is None:
+        with _lock:
+            reference_genome = _reference_genomes.setdefault(fasta_file_url, ReferenceGenome(fasta_file_url))
+    return reference_genome
+
+
+def fetch_faidx_files(fasta_file_url: str) -> str:
+    """
+    Fetch faidx-indexed fasta file and index files.
+
+    Fetches fasta file and index files (.fai + .gzi if fasta file is (bgzip) compressed).
+
+    Args:
+        fasta_file_url: URL of faidx-indexed FASTA file to fetch.\
+                        Index files `fasta_file_url`.fai and `fasta_file_url`.gzi for compressed fasta file must be accessible URLs.
+
+    Returns:
+        Absolute path to fasta file matching the requested URL (string).
+    """
+    with timing_span(STAGE_GENOME_DOWNLOAD):
+        # Fetch the fasta file
+        local_fasta_file_path = data_file_mover.fetch_file(fasta_file_url)
+
+        # Fetch additional faidx index files in addition to fasta file itself
+        # (to the same location)
+        index_files = [fasta_file_url + '.fai']
+        if fasta_file_url.endswith('.gz'):
+            index_files.append(fasta_file_url + '.gzi')
+
+        for index_file in index_files:
+            data_file_mover.fetch_file(index_file)
+
+    return local_fasta_file_path
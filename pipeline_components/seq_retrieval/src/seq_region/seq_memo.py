@@ -0,0 +1,88 @@
+"""
+Module containing the SeqMemo class.
+"""
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+from .reference_genome import ReferenceGenome
+
+from log_mgmt import get_logger
+
+logger = get_logger(name=__name__)
+
+
+class SeqMemo():
+    """
+    Defines a memo of the (positive strand) genomic sequences read for a set of related sequence regions,
+    such as the exon and CDS regions of a single transcript.
+
+    Overlapping and adjacent sequence spans are merged into buffer spans, each of which is read
+    from the reference genome at most once (on first request). Sequences of all (sub)regions
+    within a buffer span are sliced from the buffered sequence, rather than read from the reference genome again.
+    """
+
+    __slots__ = ('genome', 'seq_id', 'span_starts', 'span_ends', '_buffers')
+
+    genome: ReferenceGenome
+    """Reference genome to read the buffer spans' sequences from"""
+
+    seq_id: str
+    """The sequence identifier on which all buffer spans are located"""
+
+    span_starts: List[int]
+    """Start positions of the (non-overlapping) buffer spans (1-based, inclusive), in ascending order"""
+
+    span_ends: List[int]
+    """End positions of the buffer spans (1-based, inclusive), matching `span_starts`"""
+
+    def __init__(self, genome: ReferenceGenome, seq_id: str, spans: Iterable[Tuple[int, int]]):
+        """
+        Initializes a SeqMemo instance (without reading any sequences).
+
+        Args:
+            genome: reference genome to read sequences from
+            seq_id: the sequence identifier on which all `spans` are located
+            spans: (start, end) positions (1-based, inclusive) of the sequence spans to buffer
+        """
+        self.genome = genome
+        self.seq_id = seq_id
+        self.span_starts = []
+        self.span_ends = []
+
+        # Merge overlapping and adjacent spans
+        for start, end in sorted(spans):
+            if self.span_ends and start <= self.span_ends[-1] + 1:
+                self.span_ends[-1] = max(self.span_ends[-1], end)
+            else:
+                self.span_starts.append(start)
+                self.span_ends.append(end)
+
+        self._buffers: List[Optional[str]] = [None] * len(self.span_starts)
+
+    def fetch_seq(self, seq_id: str, start: int, end: int) -> str:
+        """
+        Return the (positive strand) sequence found at `seq_id`:`start`-`end`,
+        slicing it from the buffer span containing it (reading the buffer span on first request).
+
+        Sequences not contained in any buffer span are read from the reference genome directly.
+
+        Args:
+            seq_id: The sequence identifier found in the fasta file
+            start: The start position of the sequence (1-based, inclusive)
+            end: The end position of the sequence (1-based, inclusive)
+
+        Returns:
+            The sequence as a string
+        """
+        span_idx = bisect_right(self.span_starts, start) - 1
+        if seq_id != self.seq_id or span_idx < 0 or self.span_ends[span_idx] < end:
+            logger.debug(f'Sequence {seq_id}:{start}-{end} not contained in any buffer span, reading from reference genome.')
+            return self.genome.fetch_seq(seq_id=seq_id, start=start, end=end)
+
+        span_start = self.span_starts[span_idx]
+        buffer = self._buffers[span_idx]
+        if buffer is None:
+            buffer = self.genome.fetch_seq(seq_id=self.seq_id, start=span_start, end=self.span_ends[span_idx])
+            self._buffers[span_idx] = buffer
+
+        return buffer[(start - span_start):(end - span_start + 1)]
@@ -1,12 +1,8 @@
 """
 Module containing the SeqRegion class and related functions.
 """
-from typing import cast, Dict, List, Literal, Optional, override, TypedDict, TYPE_CHECKING
+from typing import Any, cast, Dict, List, Literal, Optional, override, Self, TypedDict, TYPE_CHECKING
 
-from Bio import Seq  # Bio.Seq biopython submodule
-import pysam
-
-from data_mover import data_file_mover
 from log_mgmt import get_logger
 
 if TYPE_CHECKING:
@@ -14,6 +10,11 @@ if TYPE_CHECKING:
 
 from seq_info import AltSeqInfo
 from variant import SeqEmbeddedVariant, SeqEmbeddedVariantsList, SeqSubstitutionType
+from variant.variant import slot_attributes
+
+from .reference_genome import get_reference_genome, ReferenceGenome
+from .seq_memo import SeqMemo
+from .soft_mask import apply_soft_mask, normalize_sequence, slice_soft_mask, SoftMask
 
 logger = get_logger(name=__name__)
 
@@ -23,6 +24,8 @@ class SeqRegion():
     Defines a (continuous) genetic sequence region.
     """
 
+    __slots__ = ('seq_id', 'start', 'end', 'frame', 'strand', 'seq_length', 'genome', 'seq_memo', 'sequence', 'soft_mask')
+
     seq_id: str
     """The sequence identifier found in the fasta file on which the sequence region is located"""
 
@@ -43,16 +46,25 @@ class SeqRegion():
     seq_length: int
     """Sequence length (expected) of the sequence region."""
 
-    fasta_file_path: str
-    """Absolute path to (faidx indexed) FASTA file containing reference sequences"""
+    genome: Optional[ReferenceGenome]
+    """Reference genome containing the sequence region, `None` for coordinate-only sequence regions (which can not fetch sequences)"""
+
+    seq_memo: Optional[SeqMemo]
+    """Optional sequence memo (shared by related sequence regions) to fetch the sequence from, rather than reading it from the reference genome"""
 
     sequence: Optional[str]
-    """the DNA sequence of a sequence region"""
+    """the DNA sequence of a sequence region, normalized to upper case (see `soft_mask` for its soft-masked bases)"""
 
-    def __init__(self, seq_id: str, start: int, end: int, fasta_file_url: str, strand: STRAND_TYPE = None, frame: Optional[FRAME_TYPE] = None, seq: Optional[str] = None):
+    soft_mask: SoftMask
+    """Soft-masked (lowercase) intervals of `sequence`, relative to `sequence` (0-based, end-exclusive)"""
+
+    def __init__(self, seq_id: str, start: int, end: int, fasta_file_url: Optional[str] = None, strand: STRAND_TYPE = None, frame: Optional[FRAME_TYPE] = None, seq: Optional[str] = None,
+                 genome: Optional[ReferenceGenome] = None):
         """
         Initializes a SeqRegion instance
 
+        Does not fetch any files: the reference genome's files are fetched on first sequence retrieval.
+
         Args:
             seq_id: The sequence identifier found in the fasta file on which the sequence region is located
             start: The start position of the sequence region (1-based, inclusive).\
@@ -64,9 +76,11 @@ class SeqRegion():
             fasta_file_url: URL of faidx-indexed FASTA file containing the reference sequences to retrieve (regions of).\
                             Faidx-index files `fasta_file_url`.fai and `fasta_file_url`.gzi for compressed fasta file must be accessible URLs.
             seq: optional DNA sequence of the sequence region
+            genome: reference genome containing the sequence region (alternative to `fasta_file_url`).\
+                    Define neither for coordinate-only sequence regions.
 
         Raises:
-            ValueError: if value of `end` < `start` and `strand` is '+'
+            ValueError: if value of `end` < `start` and `strand` is '+', or if both `fasta_file_url` and `genome` are defined
         """
         self.seq_id = seq_id
         self.strand = strand
@@ -90,10 +104,57 @@ class SeqRegion():
 
         self.seq_length = self.end - self.start + 1
 
-        # Fetch the file(s)
-        self.fasta_file_path = fetch_faidx_files(fasta_file_url)
+        if fasta_file_url is not None:
+            if genome is not None:
+                raise ValueError("Only one of fasta_file_url and genome can be defined.")
+            genome = get_reference_genome(fasta_file_url)
+        self.genome = genome
+        self.seq_memo = None
+
+        self.sequence = None
+        self.soft_mask = []
+        if seq is not None:
+            self.sequence, self.soft_mask = normalize_sequence(seq)
+
+    @property
+    def fasta_file_path(self) -> str:
+        """
+        Absolute path to (faidx indexed) FASTA file containing reference sequences.
+
+        Fetches the reference genome's files if not fetched before.
+
+        Raises:
+            ValueError: if the sequence region has no reference genome (coordinate-only sequence region)
+        """
+        if self.genome is None:
+            raise ValueError(f'Coordinate-only SeqRegion {self} has no reference genome.')
+        return self.genome.fasta_file_path
+
+    def replace(self, **changes: Any) -> Self:
+        """
+        Return a (shallow) copy of the sequence region, with the attributes in `changes` replaced.
 
-        self.sequence = seq
+        Does not rerun `__init__` (no validations), the copy refers to the same reference genome.
+        so callers are responsible for providing consistent values (e.g. `seq_length` matching `start` and `end`).
+
+        Args:
+            **changes: attribute values to replace in the copy, by attribute name
+
+        Returns:
+            A new object of the same class as `self`.
+
+        Raises:
+            TypeError: if `changes` contains names which are not attributes of the sequence region
+        """
+        attributes = slot_attributes(type(self))
+        invalid_attributes = changes.keys() - attributes
+        if invalid_attributes:
+            raise TypeError(f'Invalid attribute(s) for {type(self).__name__}: {", ".join(sorted(invalid_attributes))}.')
+
+        seq_region_copy = object.__new__(type(self))
+        for attribute in attributes:
+            setattr(seq_region_copy, attribute, changes[attribute] if attribute in changes else getattr(self, attribute))
+        return seq_region_copy
 
     @override
     def __str__(self) -> str:  # pragma: no cover
@@ -123,8 +184,7 @@ class SeqRegion():
         """
 
         # If variant is not in the SeqRegion boundaries, raise error
-        variant_seq_region = SeqRegion(seq_id=variant.genomic_seq_id, start=variant.genomic_start_pos, end=variant.genomic_end_pos,
-                                       fasta_file_url='file:' + self.fasta_file_path)
+        variant_seq_region = SeqRegion(seq_id=variant.genomic_seq_id, start=variant.genomic_start_pos, end=variant.genomic_end_pos)
         if self.overlaps(variant_seq_region) is not True:
             raise ValueError(f'Variant {variant.variant_id} ({variant.genomic_seq_id}:{variant.genomic_start_pos}-{variant.genomic_end_pos}) '
                              + f'out of boundaries of SeqRegion {self}.')
@@ -158,6 +218,8 @@ class SeqRegion():
         overlap_alt_seq = variant.genomic_alt_seq
 
         if self.strand == '-':
+            from Bio import Seq
+
             overlap_ref_seq = str(Seq.reverse_complement(overlap_ref_seq))
             overlap_alt_seq = str(Seq.reverse_complement(overlap_alt_seq))
 
@@ -181,39 +243,44 @@ class SeqRegion():
     def fetch_seq(self) -> str:
         """
         Fetch sequence found at `seq_id`:`start`-`end`(:`strand`)
-        by reading from faidx files at `fasta_file_path`.
+        by reading from the faidx files of the reference genome (or slicing from the `seq_memo` if defined).
 
         Assumes `+` as strand if undefined.
         Stores resulting sequence in `sequence` attribute.
 
         Returns:
             Return the fetched sequence as a string
+
+        Raises:
+            ValueError: if the sequence region has no reference genome (coordinate-only sequence region)
         """
-        try:
-            fasta_file = pysam.FastaFile(self.fasta_file_path)
-        except ValueError:
-            raise FileNotFoundError(f"Missing index file matching path {self.fasta_file_path}.")
-        except IOError:
-            raise IOError(f"Error while reading fasta file or index matching path {self.fasta_file_path}.")
+        if self.genome is None:
+            raise ValueError(f'Coordinate-only SeqRegion {self} has no reference genome to fetch its sequence from.')
+
+        seq: str
+        if self.seq_memo is not None:
+            seq = self.seq_memo.fetch_seq(seq_id=self.seq_id, start=self.start, end=self.end)
         else:
-            seq: str = fasta_file.fetch(reference=self.seq_id, start=(self.start - 1), end=self.end)
-            fasta_file.close()
+            seq = self.genome.fetch_seq(seq_id=self.seq_id, start=self.start, end=self.end)
+
+        if self.strand == '-':
+            from Bio import Seq
 
-            if self.strand == '-':
-                seq = str(Seq.reverse_complement(seq))
+            seq = str(Seq.reverse_complement(seq))
 
         self.set_sequence(seq)
 
         return seq
 
-    def set_sequence(self, sequence: str) -> None:
+    def set_sequence(self, sequence: str, soft_mask: Optional[SoftMask] = None) -> None:
         """
-        Set the `sequence` attribute.
+        Set the `sequence` (and `soft_mask`) attribute.
 
         Asserts the length of `sequence` matches the expected sequence length for this region.
 
         Args:
-            sequence: DNA sequence (string)
+            sequence: DNA sequence (string), soft-masked (lowercase) unless `soft_mask` is provided
+            soft_mask: soft-masked intervals of `sequence`, when `sequence` is already normalized (upper case)
 
         Raises:
             valueError: If the length of `sequence` provided does not match the region length
@@ -222,12 +289,15 @@ class SeqRegion():
         seq_len = len(sequence)
         if seq_len != self.seq_length:
             raise ValueError(f"Sequence length {seq_len} does not match expected length {self.seq_length}.")
+        elif soft_mask is None:
+            self.sequence, self.soft_mask = normalize_sequence(sequence)
         else:
             self.sequence = sequence
+            self.soft_mask = soft_mask
 
     def get_sequence(self, unmasked: bool = False, autofetch: bool = True, inframe_only: bool = False) -> str:
         """
-        Return the `sequence` attribute as a string.
+        Return the `sequence` attribute as a string, with soft-masked bases in lowercase (unless `unmasked`).
 
         Args:
             unmasked: Flag to remove soft masking (lowercase letters) \
@@ -243,9 +313,11 @@ class SeqRegion():
         if self.sequence is None and autofetch:
             self.fetch_seq()
 
-        seq = str(self.sequence)
-        if unmasked:
-            seq = seq.upper()
+        seq: str
+        if self.sequence is not None and not unmasked:
+            seq = apply_soft_mask(self.sequence, self.soft_mask)
+        else:
+            seq = str(self.sequence)
 
         if inframe_only:
             seq = self.inframe_sequence(seq)
@@ -260,14 +332,14 @@ class SeqRegion():
         Trims the end of the resultingsequence to a length that matches complete codons (a multiple of 3).
 
         Args:
-            sequence: optional DNA sequence of the sequence region to convert, otherwise uses `self.sequence`
+            sequence: optional DNA sequence of the sequence region to convert, otherwise uses the (soft-masked) `sequence` attribute
 
         Returns:
             The in-frame sequence of a seq region as a string (empty string if `None`).
         """
         seq: str
         if sequence is None:
-            seq = str(self.sequence)
+            seq = self.get_sequence(autofetch=False)
         else:
             seq = str(sequence)
 
@@ -344,20 +416,25 @@ class SeqRegion():
         for rel_start, positioned_variant in sorted(positioned_variants.items(), reverse=True):
             rel_end = rel_start + abs(positioned_variant['boundary_end'] - positioned_variant['boundary_start'])
 
+            overlap_alt_seq = positioned_variant['overlap_alt_seq']
+            if unmasked:
+                overlap_alt_seq = overlap_alt_seq.upper()
+
             # Replace variant sequence
             if positioned_variant['variant'].seq_substitution_type == SeqSubstitutionType.INSERTION:
                 # Insertion variants are positioned on the reference sequence by their flanking positions
-                sequence = sequence[:rel_start] + positioned_variant['overlap_alt_seq'] + sequence[(rel_end - 1):]
+                sequence = sequence[:rel_start] + overlap_alt_seq + sequence[(rel_end - 1):]
             else:
                 # All other variants
-                seq_region_variant_seq = sequence[(rel_start - 1):(rel_end)]
+                # Compare to the normalized reference sequence (positions before rel_end are not altered yet)
+                seq_region_variant_seq = str(self.sequence)[(rel_start - 1):(rel_end)]
 
-                if seq_region_variant_seq.upper() != positioned_variant['overlap_ref_seq'].upper():
+                if seq_region_variant_seq != positioned_variant['overlap_ref_seq'].upper():
                     logger.error(f'Variant ({positioned_variant["variant"]}) '
                                  + f'does not match the reference sequence of SeqRegion {self} at positions {rel_start}-{rel_end}.'
                                  + f'Expected: "{positioned_variant['overlap_ref_seq']}", Found: "{seq_region_variant_seq}"')
                     raise ValueError('Unexpected variant reference sequence mismatch.')
-                sequence = sequence[:(rel_start - 1)] + positioned_variant['overlap_alt_seq'] + sequence[rel_end:]
+                sequence = sequence[:(rel_start - 1)] + overlap_alt_seq + sequence[rel_end:]
 
         alt_seq_offset = 0
 
@@ -421,13 +498,16 @@ class SeqRegion():
         """
         Compare two SeqRegion instances and check for overlap.
 
+        Sequence regions on different reference genomes never overlap,
+        coordinate-only sequence regions (without reference genome) are compared on their coordinates only.
+
         Args:
             seq_region_2: SeqRegion instance to check for overlap with self
 
         Returns:
             True if SeqRegion overlaps with another SeqRegion instance, False otherwise.
         """
-        if self.fasta_file_path != seq_region_2.fasta_file_path or \
+        if (self.genome is not None and seq_region_2.genome is not None and self.genome != seq_region_2.genome) or \
            self.seq_id != seq_region_2.seq_id or \
            (self.strand is not None and seq_region_2.strand is not None and self.strand != seq_region_2.strand):
             return False
@@ -450,6 +530,8 @@ class SeqRegion():
         Raises:
             ValueError: when rel_start or rel_end falls outside the SeqRegion boundaries
         """
+        if rel_end < rel_start:
+            raise ValueError(f'Relative start position {rel_start} should be smaller than relative end position {rel_end}.')
         if rel_start < 1 or self.seq_length < rel_end:
             raise ValueError(f'Relative start position {rel_start} or relative end position {rel_end} fall outside the boundaries of the SeqRegion {self} (len {self.seq_length}).')
 
@@ -467,13 +549,12 @@ class SeqRegion():
             new_start = self.start + (rel_start - 1)
             new_end = self.start + (rel_end - 1)
 
-        return SeqRegion(seq_id=self.seq_id,
-                         start=new_start,
-                         end=new_end,
-                         strand=self.strand,
-                         fasta_file_url='file:' + self.fasta_file_path,
-                         frame=new_frame,
-                         seq=self.sequence[(rel_start - 1):rel_end] if self.sequence is not None else None)
+        return self.replace(start=new_start,
+                            end=new_end,
+                            seq_length=new_end - new_start + 1,
+                            frame=new_frame,
+                            sequence=self.sequence[(rel_start - 1):rel_end] if self.sequence is not None else None,
+                            soft_mask=slice_soft_mask(self.soft_mask, rel_start - 1, rel_end))
 
     def to_rel_position(self, seq_position: int) -> int:
         """
@@ -500,6 +581,27 @@ class SeqRegion():
 
         return rel_position
 
+    def to_seq_position(self, rel_position: int) -> int:
+        """
+        Convert relative position within the SeqRegion to absolute sequence position
+
+        Args:
+            rel_position: relative position within the SeqRegion sequence (1-based) to be converted
+
+        Returns:
+            Absolute sequence position
+
+        Raises:
+            ValueError: when rel_position falls outside of the SeqRegion boundaries
+        """
+        if rel_position < 1 or self.seq_length < rel_position:
+            raise ValueError(f'Relative position {rel_position} out of boundaries of SeqRegion {self} (len {self.seq_length}).')
+
+        if self.strand == '-':
+            return self.end - rel_position + 1
+        else:
+            return self.start + rel_position - 1
+
 
 class PositionedVariant(TypedDict):
     variant: 'Variant'
@@ -518,31 +620,3 @@ class PositionedVariant(TypedDict):
     """Strand-corrected part of the variant's reference sequence that overlaps the SeqRegion"""
     overlap_alt_seq: str
     """Strand-corrected part of the variant's alternative sequence that overlaps the SeqRegion"""
-
-
-def fetch_faidx_files(fasta_file_url: str) -> str:
-    """
-    Fetch faidx-indexed fasta file and index files.
-
-    Fetches fasta file and index files (.fai + .gzi if fasta file is (bgzip) compressed).
-
-    Args:
-        fasta_file_url: URL of faidx-indexed FASTA file to fetch.\
-                        Index files `fasta_file_url`.fai and `fasta_file_url`.gzi for compressed fasta file must be accessible URLs.
-
-    Returns:
-        Absolute path to fasta file matching the requested URL (string).
-    """
-    # Fetch the fasta file
-    local_fasta_file_path = data_file_mover.fetch_file(fasta_file_url)
-
-    # Fetch additional faidx index files in addition to fasta file itself
-    # (to the same location)
-    index_files = [fasta_file_url + '.fai']
-    if fasta_file_url.endswith('.gz'):
-        index_files.append(fasta_file_url + '.gzi')
-
-    for index_file in index_files:
-        data_file_mover.fetch_file(index_file)
-
-    return local_fasta_file_path
@@ -0,0 +1,80 @@
+"""
+Module containing functions to handle soft-masking (lowercase bases) of sequences.
+
+Sequences are stored normalized (in upper case), with their soft-masking held separately as a list of intervals.
+This enables using unmasked sequences without copying them, rendering soft-masked sequences only when requested.
+"""
+from bisect import bisect_right
+import re
+from typing import List, Optional, Tuple
+
+SoftMask = List[Tuple[int, int]]
+"""Soft-masked intervals of a sequence: (start, end) positions (0-based, end-exclusive), in ascending and non-overlapping order."""
+
+_SOFT_MASKED_BASES = re.compile('[a-z]+')
+
+
+def normalize_sequence(sequence: str) -> Tuple[str, SoftMask]:
+    """
+    Split a (soft-masked) sequence into its normalized (upper case) sequence and its soft-masked intervals.
+
+    Args:
+        sequence: DNA sequence, with soft-masked bases in lower case
+
+    Returns:
+        Tuple of the normalized sequence (`sequence` itself when not soft-masked) and its soft-masked intervals.
+    """
+    soft_mask: SoftMask = [match.span() for match in _SOFT_MASKED_BASES.finditer(sequence)]
+    if soft_mask:
+        return (sequence.upper(), soft_mask)
+    else:
+        return (sequence, soft_mask)
+
+
+def apply_soft_mask(sequence: str, soft_mask: SoftMask) -> str:
+    """
+    Render the soft-masked sequence of a normalized sequence, by converting the bases in the soft-masked intervals to lower case.
+
+    Args:
+        sequence: normalized (upper case) DNA sequence
+        soft_mask: soft-masked intervals of `sequence`
+
+    Returns:
+        The soft-masked sequence (`sequence` itself when no intervals are soft-masked).
+    """
+    if not soft_mask:
+        return sequence
+
+    sequence_parts: List[str] = []
+    position = 0
+    for start, end in soft_mask:
+        sequence_parts.append(sequence[position:start])
+        sequence_parts.append(sequence[start:end].lower())
+        position = end
+    sequence_parts.append(sequence[position:])
+
+    return ''.join(sequence_parts)
+
+
+def slice_soft_mask(soft_mask: SoftMask, start: int, end: Optional[int] = None) -> SoftMask:
+    """
+    Return the soft-masked intervals of a slice of a sequence, relative to the slice.
+
+    Args:
+        soft_mask: soft-masked intervals of the complete sequence
+        start: start position of the slice (0-based)
+        end: end position of the slice (0-based, exclusive), `None` to slice until the end of the sequence
+
+    Returns:
+        The soft-masked intervals of `sequence[start:end]`.
+    """
+    sliced_soft_mask: SoftMask = []
+
+    # Skip all intervals ending before the slice start
+    for interval_start, interval_end in soft_mask[bisect_right(soft_mask, start, key=lambda interval: interval[1]):]:
+        if end is not None and end <= interval_start:
+            break
+        sliced_soft_mask.append((max(interval_start, start) - start,
+                                 (interval_end if end is None else min(interval_end, end)) - start))
+
+    return sliced_soft_mask
@@ -2,15 +2,21 @@
 Module containing the translated MultiPartSeqRegion class.
 """
 
-from Bio import Seq  # Bio.Seq biopython submodule
-from Bio.Data import CodonTable
-from typing import Dict, List, Literal, Optional, override, Set, TypedDict
+from functools import cache
+from typing import Any, List, Literal, Optional, override, Set, TypedDict, TYPE_CHECKING
 
 from .exceptions import InvalidatedOrfException, OrfNotFoundException, OrfException, TranslationException, SequenceNotFoundException
+from .reference_genome import ReferenceGenome
+from .seq_memo import SeqMemo
 from .seq_region import SeqRegion, AltSeqInfo
 from .multipart_seq_region import MultiPartSeqRegion
 from variant import SeqEmbeddedVariantsList, Variant
-from log_mgmt import get_logger
+from log_mgmt import get_logger, timing_span
+from log_mgmt.stage_timing import STAGE_ORF_SEARCH, STAGE_TRANSLATION
+
+# Only import on type-checking, biopython is imported when translating or searching ORFs
+if TYPE_CHECKING:
+    from Bio.Data import CodonTable  # pragma: no cover
 
 logger = get_logger(name=__name__)
 
@@ -18,6 +24,22 @@ logger = get_logger(name=__name__)
 CODON_SIZE = 3
 
 
+@cache
+def standard_codon_table() -> 'CodonTable.CodonTable':
+    """Return the standard codon table (loading biopython's codon tables on first call)."""
+    from Bio.Data import CodonTable
+
+    codon_table: CodonTable.CodonTable = CodonTable.unambiguous_dna_by_name["Standard"]
+    return codon_table
+
+
+class _StandardCodonTableAttribute():
+    """Class attribute descriptor returning the standard codon table (see `standard_codon_table`)."""
+
+    def __get__(self, instance: Any, owner: Any) -> 'CodonTable.CodonTable':  # noqa: U100
+        return standard_codon_table()
+
+
 class CalculatedOrf(TypedDict):
     sequence: str
     seq_start: int
@@ -36,9 +58,18 @@ class TranslatedSeqRegion():
     exon_seq_region: MultiPartSeqRegion
     """Multipart sequence region representing the exons of a translated sequence region"""
 
-    codon_table: CodonTable.CodonTable = CodonTable.unambiguous_dna_by_name["Standard"]
+    codon_table: 'CodonTable.CodonTable' = _StandardCodonTableAttribute()  # type: ignore[assignment]
     """Codon table to be used for translating cDNA to protein sequences."""
 
+    genome: Optional[ReferenceGenome]
+    """Reference genome containing the translated sequence region"""
+
+    seq_memo: Optional[SeqMemo]
+    """
+    Sequence memo shared by all exon and CDS sequence regions (and their subregions),
+    to read each genomic exon/CDS span at most once. `None` for coordinate-only sequence regions.
+    """
+
     coding_seq_region: MultiPartSeqRegion | None
     """Multipart sequence region representing the coding regions of a translated sequence region"""
 
@@ -61,14 +92,19 @@ class TranslatedSeqRegion():
 
         Args:
             exon_seq_regions: list of SeqRegion objects that define the exons of this multi-part sequence region.\
-                              All SeqRegions must have identical seq_id, strand and fasta_file_path properties \
+                              All SeqRegions must have identical seq_id, strand and genome properties \
                               to form a valid MultipartSeqRegion.
             cds_seq_regions:  list of SeqRegion objects that define the CDS regions of this multi-part sequence region.\
-                              All SeqRegions must have identical seq_id, strand and fasta_file_path properties \
+                              All SeqRegions must have identical seq_id, strand and genome properties \
                               to form a valid MultipartSeqRegion.
 
+        Note:
+            When the sequence regions have a reference genome, the `seq_memo` attribute of all \
+            `exon_seq_regions` and `cds_seq_regions` objects passed is set to the (shared) `seq_memo` \
+            of this instance, so their sequences are retrieved through it from then on.
+
         Raises:
-            ValueError: if `seq_regions` have distinct `seq_id`, `strand` or `fasta_file_path` properties.
+            ValueError: if `seq_regions` have distinct `seq_id`, `strand` or `genome` properties.
         """
 
         self.start: int = min(map(lambda seq_region: seq_region.start, exon_seq_regions))
@@ -91,13 +127,23 @@ class TranslatedSeqRegion():
         else:
             self.seq_id = seq_ids.pop()
 
-        # Ensure one fasta_file_path
-        fasta_file_paths: Set[str] = set(map(lambda seq_region: seq_region.fasta_file_path, exon_seq_regions + cds_seq_regions))
-        if len(fasta_file_paths) > 1:
-            raise ValueError(f"Multiple fasta_file_paths defined accross seq regions ({fasta_file_paths})."
-                             + " All seqRegions in multiPartSeqRegion must have equal value for fasta_file_path attribute.")
+        # Ensure one reference genome
+        genomes: Set[Optional[ReferenceGenome]] = set(map(lambda seq_region: seq_region.genome, exon_seq_regions + cds_seq_regions))
+        if len(genomes) > 1:
+            raise ValueError(f"Multiple reference genomes defined accross seq regions ({genomes})."
+                             + " All seqRegions in multiPartSeqRegion must have equal value for genome attribute.")
+        else:
+            self.genome = genomes.pop()
+
+        # Share one sequence memo accross all exon and CDS seq regions,
+        # so (overlapping) exon and CDS sequences and all sequences derived from them are sliced from a single read
+        if self.genome is not None:
+            self.seq_memo = SeqMemo(genome=self.genome, seq_id=self.seq_id,
+                                    spans=[(seq_region.start, seq_region.end) for seq_region in exon_seq_regions + cds_seq_regions])
+            for seq_region in exon_seq_regions + cds_seq_regions:
+                seq_region.seq_memo = self.seq_memo
         else:
-            self.fasta_file_path = fasta_file_paths.pop()
+            self.seq_memo = None
 
         self.exon_seq_region = MultiPartSeqRegion(exon_seq_regions)
 
@@ -147,7 +193,8 @@ class TranslatedSeqRegion():
                     dna_sequence = self.exon_seq_region.get_sequence(unmasked=True)
 
                     # Find the best open reading frame
-                    orfs = find_orfs(dna_sequence, self.codon_table, return_type='longest')
+                    with timing_span(STAGE_ORF_SEARCH):
+                        orfs = find_orfs(dna_sequence, self.codon_table, return_type='longest')
 
                     if len(orfs) > 0:
                         # Save resulting coding region as MultiPartSeqRegion in coding_seq_region attribute
@@ -337,7 +384,8 @@ class TranslatedSeqRegion():
                 # Check if stop codon in current coding region changed
                 # * If an early stop was gained or previous stop maintained, accept alternative coding sequence
                 # * If the reference stop codon was lost, extend the alternative coding sequence and search for new (longer) ORF using reference start codon
-                new_orfs = find_orfs(dna_sequence=alt_coding_seq_info.sequence, codon_table=self.codon_table, force_start=1)
+                with timing_span(STAGE_ORF_SEARCH):
+                    new_orfs = find_orfs(dna_sequence=alt_coding_seq_info.sequence, codon_table=self.codon_table, force_start=1)
 
                 if len(new_orfs) > 0:
                     # An early stop was gained or previous stop maintained,
@@ -370,7 +418,8 @@ class TranslatedSeqRegion():
                     logger.debug('Extended coding seq region: %s', extended_coding_region)
 
                     extended_region_alt_seq_info = extended_coding_region.get_alt_sequence(unmasked=unmasked, variants=variants, autofetch=autofetch, inframe_only=True)
-                    extended_region_alt_orfs = find_orfs(dna_sequence=extended_region_alt_seq_info.sequence, codon_table=self.codon_table, force_start=1)
+                    with timing_span(STAGE_ORF_SEARCH):
+                        extended_region_alt_orfs = find_orfs(dna_sequence=extended_region_alt_seq_info.sequence, codon_table=self.codon_table, force_start=1)
 
                     # If no extended ORF was found, reject alternative coding sequence
                     if not len(extended_region_alt_orfs) > 0:
@@ -388,11 +437,9 @@ class TranslatedSeqRegion():
                     # Reuse code from get/fetch_alt_sequence methods
                     coding_alt_embedded_variants = SeqEmbeddedVariantsList.trimmed_on_rel_positions(extended_region_alt_seq_info.embedded_variants, trim_end=extended_region_alt_orfs[0]['seq_end'])
 
+                # Alternative coding sequences are sliced from unmasked alternative sequences if `unmasked`
                 alt_seq_info = AltSeqInfo(sequence=coding_alt_seq, embedded_variants=coding_alt_embedded_variants)
 
-                if unmasked:
-                    alt_seq_info.sequence = alt_seq_info.sequence.upper()
-
             case 'protein':
                 protein_alt_seq: str
                 protein_alt_embedded_variants: SeqEmbeddedVariantsList
@@ -500,9 +547,12 @@ class TranslatedSeqRegion():
             else:
                 store_protein = True
 
+        from Bio import Seq
+
         # Translate to protein
         try:
-            protein_sequence = str(Seq.translate(sequence=coding_sequence, table=self.codon_table, cds=False, to_stop=True))  # type: ignore
+            with timing_span(STAGE_TRANSLATION):
+                protein_sequence = str(Seq.translate(sequence=coding_sequence, table=self.codon_table, cds=False, to_stop=True))  # type: ignore
         except Exception:  # pragma: no cover
             msg = 'Unexpected error occured during translation.'
             translation_exception = TranslationException(msg)
@@ -515,7 +565,7 @@ class TranslatedSeqRegion():
         return protein_sequence
 
 
-def find_orfs(dna_sequence: str, codon_table: CodonTable.CodonTable, force_start: Optional[int] = None, return_type: str = 'all') -> List[CalculatedOrf]:
+def find_orfs(dna_sequence: str, codon_table: 'CodonTable.CodonTable', force_start: Optional[int] = None, return_type: str = 'all') -> List[CalculatedOrf]:
     """
     Find Open Reading Frames (ORFs) in a (spliced) DNA sequence.
 
@@ -536,20 +586,13 @@ def find_orfs(dna_sequence: str, codon_table: CodonTable.CodonTable, force_start
         ValueError: if `return_type` does not have a valid value.
     """
 
-    # Remove any softmasking
-    unmasked_dna_sequence = dna_sequence.upper()
+    # Remove any softmasking (unmasked sequences are used as is)
+    unmasked_dna_sequence = dna_sequence if dna_sequence.isupper() else dna_sequence.upper()
     force_start_offset = 0
 
     if force_start is not None:
-        unmasked_dna_sequence = unmasked_dna_sequence[force_start - 1:]
         force_start_offset = force_start - 1
 
-    # Split the DNA sequence in codons (3-base blocks).
-    # Frameshift the sequence by 0, 1 or 2 (skip first N bases) to obtain all possible codons.
-    codons: Dict[int, List[str]] = dict()
-    for frameshift in range(0, CODON_SIZE):
-        codons[frameshift] = [unmasked_dna_sequence[i:i + CODON_SIZE] for i in range(frameshift, len(unmasked_dna_sequence), CODON_SIZE)]
-
     # Read through all codons accross all frameshifts and determine the ORFs
     orfs: List[CalculatedOrf] = []
     for frameshift in range(0, CODON_SIZE):
@@ -560,7 +603,10 @@ def find_orfs(dna_sequence: str, codon_table: CodonTable.CodonTable, force_start
         if force_start is not None and frameshift > 0:
             break
 
-        for i, codon in enumerate(codons[frameshift]):
+        # Read the DNA sequence in codons (3-base blocks), from `force_start_offset` onwards.
+        # Frameshift the sequence by 0, 1 or 2 (skip first N bases) to obtain all possible codons.
+        for i, codon_start in enumerate(range(force_start_offset + frameshift, len(unmasked_dna_sequence), CODON_SIZE)):
+            codon = unmasked_dna_sequence[codon_start:codon_start + CODON_SIZE]
 
             # When using force_start, first codon should be start codon
             if force_start is not None and i == 0 and codon not in codon_table.start_codons:
@@ -5,20 +5,22 @@ Main module serving the CLI for PAVI sequence retrieval.
 Retrieves multiple sequence regions and returns them as one chained sequence.
 """
 import click
-from enum import Enum
+from contextlib import nullcontext
 import json
-import jsonpickle  # type: ignore
 import logging
+import os
 import re
 import subprocess
 from typing import Any, get_args, List, TypedDict, Optional
 
 from data_mover import data_file_mover
-from seq_info import EnumValueHandler, SeqInfo
-from seq_region import SeqRegion, TranslatedSeqRegion
+from seq_info import SeqInfo
+from seq_region import get_reference_genome, SeqRegion, TranslatedSeqRegion
 from seq_region.exceptions import exception_description
 from variant import Variant
-from log_mgmt import set_log_level, get_logger
+from log_mgmt import set_log_level, get_logger, set_timing_enabled, timed_entry, timing_span
+from log_mgmt.profiling import PROFILE_MODES, ProfileMode, ProfilingSession
+from log_mgmt.stage_timing import STAGE_JSON_ENCODING, STAGE_S3_UPLOAD, STAGE_VARIANT_EMBEDDING, STAGE_VARIANT_FETCH
 
 logger = get_logger(name=__name__)
 
@@ -42,6 +44,19 @@ def validate_strand_param(ctx: click.Context, param: click.Parameter, value: str
     """
     Processes and normalises the value of click input argument `strand`.
 
+    Returns:
+        A normalised version of strings representing a strand: '-' or '+'
+
+    Raises:
+        click.BadParameter: If an unrecognised string was provided.
+    """
+    return normalise_strand(value)
+
+
+def normalise_strand(value: str) -> SeqRegion.STRAND_TYPE:
+    """
+    Normalises a string representing a strand.
+
     Returns:
         A normalised version of strings representing a strand: '-' or '+'
 
@@ -79,38 +94,53 @@ def process_seq_regions_param(ctx: click.Context, param: click.Parameter, value:
     except Exception:
         raise click.BadParameter("Must be a valid JSON-formatted string.")
     else:
-        if not isinstance(seq_regions, list):
-            raise click.BadParameter("Must be a valid list (JSON-array) of sequence regions to retrieve.")
-        for index, region in enumerate(seq_regions):
-            if isinstance(region, dict):
-                if 'start' not in region.keys():
-                    raise click.BadParameter(f"Region {region} does not have a 'start' property, which is a required property.")
-                if 'end' not in region.keys():
-                    raise click.BadParameter(f"Region {region} does not have a 'end' property, which is a required property.")
-                if not isinstance(region['start'], int):
-                    raise click.BadParameter(f"'start' property of region {region} is not an integer. All positions must be integers.")
-                if not isinstance(region['end'], int):
-                    raise click.BadParameter(f"'end' property of region {region} is not an integer. All positions must be integers.")
-                if 'frame' in region.keys():
-                    valid_frame_types = get_args(SeqRegion.FRAME_TYPE)
-                    if region['frame'] not in valid_frame_types:
-                        raise click.BadParameter(f"'frame' property of region {region} is not correctly typed. Value {region['frame']} must be one of {valid_frame_types}.")
-                else:
-                    region['frame'] = None
-            elif isinstance(region, str):
-                re_match = re.fullmatch(r'(\d+)\.\.(\d+)', region)
-                if re_match is not None:
-                    region = dict(start=int(re_match.group(1)),
-                                  end=int(re_match.group(2)),
-                                  frame=None)
-                else:
-                    raise click.BadParameter(f"Region {region} of type string has invalid format. Region of type string must be formatted '`start`..`end`'")
+        return parse_seq_regions(seq_regions)
+
+
+def parse_seq_regions(seq_regions: Any) -> List[SeqRegionDict]:
+    """
+    Validate the structure of a (JSON-decoded) list of sequence regions and normalise it.
+
+    Sequence regions can either be define as dicts or as string (see `process_seq_regions_param`).
+
+    Returns:
+        List of dicts representing SeqRegion attributes
+
+    Raises:
+        click.BadParameter: If value had an invalid structure or values.
+    """
+    if not isinstance(seq_regions, list):
+        raise click.BadParameter("Must be a valid list (JSON-array) of sequence regions to retrieve.")
+    for index, region in enumerate(seq_regions):
+        if isinstance(region, dict):
+            if 'start' not in region.keys():
+                raise click.BadParameter(f"Region {region} does not have a 'start' property, which is a required property.")
+            if 'end' not in region.keys():
+                raise click.BadParameter(f"Region {region} does not have a 'end' property, which is a required property.")
+            if not isinstance(region['start'], int):
+                raise click.BadParameter(f"'start' property of region {region} is not an integer. All positions must be integers.")
+            if not isinstance(region['end'], int):
+                raise click.BadParameter(f"'end' property of region {region} is not an integer. All positions must be integers.")
+            if 'frame' in region.keys():
+                valid_frame_types = get_args(SeqRegion.FRAME_TYPE)
+                if region['frame'] not in valid_frame_types:
+                    raise click.BadParameter(f"'frame' property of region {region} is not correctly typed. Value {region['frame']} must be one of {valid_frame_types}.")
+            else:
+                region['frame'] = None
+        elif isinstance(region, str):
+            re_match = re.fullmatch(r'(\d+)\.\.(\d+)', region)
+            if re_match is not None:
+                region = dict(start=int(re_match.group(1)),
+                              end=int(re_match.group(2)),
+                              frame=None)
             else:
-                raise click.BadParameter(f"Region {region} is not a valid type. All regions in seq_regions list must be valid dicts (JSON-objects) or strings.")
+                raise click.BadParameter(f"Region {region} of type string has invalid format. Region of type string must be formatted '`start`..`end`'")
+        else:
+            raise click.BadParameter(f"Region {region} is not a valid type. All regions in seq_regions list must be valid dicts (JSON-objects) or strings.")
 
-            seq_regions[index] = region
+        seq_regions[index] = region
 
-        return seq_regions
+    return seq_regions
 
 
 def process_variants_param(ctx: click.Context, param: click.Parameter, value: str) -> set[str]:  # noqa: U100
@@ -157,11 +187,12 @@ def upload_to_s3(local_path: str, s3_prefix: str) -> None:
 
     logger.info(f'Uploading {local_path} to {s3_uri}...')
 
-    result = subprocess.run(
-        ['aws', 's3', 'cp', local_path, s3_uri],
-        capture_output=True,
-        text=True
-    )
+    with timing_span(STAGE_S3_UPLOAD):
+        result = subprocess.run(
+            ['aws', 's3', 'cp', local_path, s3_uri],
+            capture_output=True,
+            text=True
+        )
 
     if result.returncode != 0:
         logger.error(f'Failed to upload {local_path} to S3: {result.stderr}')
@@ -172,7 +203,7 @@ def upload_to_s3(local_path: str, s3_prefix: str) -> None:
 
 def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, variants_flag: bool, alt_seq_name_suffix: str,
                  ref_seq: Optional[str], alt_seq: Optional[str], ref_info: SeqInfo, alt_info: Optional[SeqInfo],
-                 sequence_output_file: str | None = None, s3_output_prefix: str | None = None) -> None:
+                 sequence_output_file: str | None = None, s3_output_prefix: str | None = None, output_dir: str | None = None) -> None:
     # Define sequence names
     ref_seq_name: str = base_seq_name
     alt_seq_name: str
@@ -184,6 +215,8 @@ def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, var
     # Print sequence output
     if sequence_output_file is None:
         sequence_output_file = f'{unique_entry_id}-{output_type}.fa'
+        if output_dir is not None:
+            sequence_output_file = os.path.join(output_dir, sequence_output_file)
 
     if ref_seq is not None or alt_seq is not None:
         with open(sequence_output_file, 'w') as output_file:
@@ -206,13 +239,22 @@ def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, var
         indexed_seq_info[alt_seq_name] = alt_info
 
     seq_info_output_file = f'{unique_entry_id}-seqinfo.json'
+    if output_dir is not None:
+        seq_info_output_file = os.path.join(output_dir, seq_info_output_file)
+
+    from enum import Enum
+    import jsonpickle  # type: ignore
+    from seq_info.json_handlers import EnumValueHandler
 
     jsonpickle.register(Enum, EnumValueHandler, base=True)
 
+    with timing_span(STAGE_JSON_ENCODING):
+        seq_info_json = jsonpickle.encode(indexed_seq_info, make_refs=False, unpicklable=False)
+
     with open(seq_info_output_file, 'w') as output_file:
         logger.debug(f'Writing sequence info to {seq_info_output_file}...')
 
-        output_file.write(jsonpickle.encode(indexed_seq_info, make_refs=False, unpicklable=False))
+        output_file.write(seq_info_json)
 
     # Upload seq info to S3 if prefix provided
     if s3_output_prefix:
@@ -254,11 +296,24 @@ def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, var
               help="""When defined, return unmasked sequences (undo soft masking present in reference files).""")
 @click.option("--s3_output_prefix", type=click.STRING, required=False,
               help="""S3 URI prefix to upload output files to (e.g., s3://bucket/prefix/).""")
+@click.option("--timing", is_flag=True, envvar='PAVI_STAGE_TIMING',
+              help="""Flag to enable stage timing. Emits the duration of every retrieval stage as a single JSON record (line) on stderr.""")
+@click.option("--embed_timing", is_flag=True,
+              help="""Flag to embed the stage timings into the sequence info output (implies --timing).""")
+@click.option("--profile", type=click.Choice(PROFILE_MODES), required=False, default=None,
+              help="""Profile the sequence retrieval with the deterministic (cProfile) or sampling profiler,
+              writing `unique_entry_id`-profile.pstats (deterministic only) and a flamegraph-compatible
+              `unique_entry_id`-profile.collapsed file to `profile_dir` (and uploading them to `s3_output_prefix` when defined).""")
+@click.option("--profile_memory", is_flag=True,
+              help="""Flag to trace memory allocations and write a peak memory report (`unique_entry_id`-profile-memory.txt).""")
+@click.option("--profile_dir", type=click.STRING, default='.',
+              help="""Directory to write profile artifacts to.""")
 @click.option("--debug", is_flag=True,
               help="""Flag to enable debug printing.""")
 def main(seq_id: str, seq_strand: SeqRegion.STRAND_TYPE, exon_seq_regions: List[SeqRegionDict], cds_seq_regions: List[SeqRegionDict],
          variant_ids: set[str], alt_seq_name_suffix: str, fasta_file_url: str, output_type: str, base_seq_name: str, unique_entry_id: str,
-         sequence_output_file: str, reuse_local_cache: bool, unmasked: bool, s3_output_prefix: str, debug: bool) -> None:
+         sequence_output_file: str, reuse_local_cache: bool, unmasked: bool, s3_output_prefix: str, timing: bool, embed_timing: bool,
+         profile: Optional[ProfileMode], profile_memory: bool, profile_dir: str, debug: bool) -> None:
     """
     Main method for sequence retrieval from JBrowse faidx indexed fasta files. Receives input args from click.
 
@@ -271,88 +326,133 @@ def main(seq_id: str, seq_strand: SeqRegion.STRAND_TYPE, exon_seq_regions: List[
     else:
         set_log_level(logging.INFO)
 
-    logger.info(f'Running seq_retrieval for {unique_entry_id}.')
-
     data_file_mover.set_local_cache_reuse(reuse_local_cache)
+    set_timing_enabled(timing or embed_timing)
+
+    profiling_session: Optional[ProfilingSession] = None
+    if profile or profile_memory:
+        profiling_session = ProfilingSession(name=f'{unique_entry_id}-profile', output_dir=profile_dir, mode=profile, memory=profile_memory)
+
+    with profiling_session or nullcontext():
+        retrieve_entry(seq_id=seq_id, seq_strand=seq_strand, exon_seq_regions=exon_seq_regions, cds_seq_regions=cds_seq_regions,
+                       variant_ids=variant_ids, alt_seq_name_suffix=alt_seq_name_suffix, fasta_file_url=fasta_file_url,
+                       output_type=output_type, base_seq_name=base_seq_name, unique_entry_id=unique_entry_id,
+                       sequence_output_file=sequence_output_file, unmasked=unmasked, s3_output_prefix=s3_output_prefix,
+                       embed_timing=embed_timing)
+
+    if profiling_session and s3_output_prefix:
+        for profile_artifact in profiling_session.artifacts:
+            upload_to_s3(profile_artifact, s3_output_prefix)
+
+
+def retrieve_entry(seq_id: str, seq_strand: SeqRegion.STRAND_TYPE, exon_seq_regions: List[SeqRegionDict], cds_seq_regions: List[SeqRegionDict],
+                   variant_ids: set[str], alt_seq_name_suffix: str, fasta_file_url: str, output_type: str, base_seq_name: str,
+                   unique_entry_id: str, sequence_output_file: Optional[str] = None, unmasked: bool = False,
+                   s3_output_prefix: Optional[str] = None, output_dir: Optional[str] = None, embed_timing: bool = False) -> None:
+    """
+    Retrieve the sequence(s) and sequence info for a single pipeline entry and write them to output files.
+
+    Shared by the single-entry CLI (`main`), batch retrieval (`seq_retrieval_batch.py`)
+    and in-process pipeline execution by the API. Output files are written to the current working directory,
+    unless an `output_dir` is defined (which does not apply to an explicit `sequence_output_file`).
+
+    When stage timing is enabled (`log_mgmt.set_timing_enabled`), the entry's stage timings are emitted once retrieval completed.
+    When `embed_timing` is also set, the stage timings up to writing the output are embedded into the reference sequence info.
+    """
 
-    # Fetch variant info for all variant IDs through the public web API
-    variant_info: dict[str, Variant] = {}
-    for variant_id in variant_ids:
-        logger.debug(f"Fetching variant info for {variant_id}...")
-        variant_info[variant_id] = Variant.from_variant_id(variant_id)
-        logger.debug(f"Variant info for {variant_id} fetched: {variant_info[variant_id]}")
-
-    # Parse exon_seq_regions and cds_seq_regions into respective SeqRegion objects
-    exon_seq_region_objs: List[SeqRegion] = []
-    for region in exon_seq_regions:
-        exon_seq_region_objs.append(SeqRegion(seq_id=seq_id, start=region['start'], end=region['end'], strand=seq_strand,
-                                              fasta_file_url=fasta_file_url))
-
-    cds_seq_region_objs: List[SeqRegion] = []
-    for region in cds_seq_regions:
-        cds_seq_region_objs.append(SeqRegion(seq_id=seq_id, start=region['start'], end=region['end'], strand=seq_strand,
-                                             frame=region['frame'],
-                                             fasta_file_url=fasta_file_url))
-
-    # Build complete sequence region (using exons + cds)
-    fullRegion = TranslatedSeqRegion(exon_seq_regions=exon_seq_region_objs, cds_seq_regions=cds_seq_region_objs)
-
-    logger.debug(f"full region: {fullRegion.seq_id}:{fullRegion.start}-{fullRegion.end}:{fullRegion.strand}")
-
-    # Initiate output variables
-    ref_seq: str | None = None
-    alt_seq: str | None = None
-    ref_info: SeqInfo = SeqInfo()
-    alt_info: SeqInfo | None = None
-    error_msg: str
-
-    # Retrieve relevant sequence info
-    if output_type == 'transcript':
-        try:
-            ref_seq = fullRegion.get_sequence(type='transcript', unmasked=unmasked)
-        except Exception as e:  # pragma: no cover
-            logger.error(f'Failed to retrieve transcript sequence for TranslatedSeqRegion {fullRegion}: {e}')
-            error_msg = exception_description(e)
-            ref_info = SeqInfo(error=error_msg)
-
-        if variant_info:
-            # Generate additional sequence for full region with variants embedded
+    with timed_entry(component='seq_retrieval', entry_id=unique_entry_id) as timings:
+        logger.info(f'Running seq_retrieval for {unique_entry_id}.')
+
+        # Fetch variant info for all variant IDs through the public web API
+        variant_info: dict[str, Variant] = {}
+        for variant_id in variant_ids:
+            logger.debug(f"Fetching variant info for {variant_id}...")
+            with timing_span(STAGE_VARIANT_FETCH):
+                variant_info[variant_id] = Variant.from_variant_id(variant_id)
+            logger.debug(f"Variant info for {variant_id} fetched: {variant_info[variant_id]}")
+
+        # Fetch the reference genome files upfront (once, shared by all SeqRegion objects and entries using the same genome),
+        # to fail the entry when they are not accessible
+        genome = get_reference_genome(fasta_file_url)
+        genome.fetch_files()
+
+        # Parse exon_seq_regions and cds_seq_regions into respective SeqRegion objects
+        exon_seq_region_objs: List[SeqRegion] = []
+        for region in exon_seq_regions:
+            exon_seq_region_objs.append(SeqRegion(seq_id=seq_id, start=region['start'], end=region['end'], strand=seq_strand,
+                                                  genome=genome))
+
+        cds_seq_region_objs: List[SeqRegion] = []
+        for region in cds_seq_regions:
+            cds_seq_region_objs.append(SeqRegion(seq_id=seq_id, start=region['start'], end=region['end'], strand=seq_strand,
+                                                 frame=region['frame'],
+                                                 genome=genome))
+
+        # Build complete sequence region (using exons + cds)
+        fullRegion = TranslatedSeqRegion(exon_seq_regions=exon_seq_region_objs, cds_seq_regions=cds_seq_region_objs)
+
+        logger.debug(f"full region: {fullRegion.seq_id}:{fullRegion.start}-{fullRegion.end}:{fullRegion.strand}")
+
+        # Initiate output variables
+        ref_seq: str | None = None
+        alt_seq: str | None = None
+        ref_info: SeqInfo = SeqInfo()
+        alt_info: SeqInfo | None = None
+        error_msg: str
+
+        # Retrieve relevant sequence info
+        if output_type == 'transcript':
             try:
-                seq_info = fullRegion.get_alt_sequence(type='transcript', unmasked=unmasked, variants=list(variant_info.values()))
+                ref_seq = fullRegion.get_sequence(type='transcript', unmasked=unmasked)
             except Exception as e:  # pragma: no cover
-                logger.error(f'Failed to retrieve alternative transcript sequence for TranslatedSeqRegion {fullRegion} with variants ({variant_ids}): {e}')
+                logger.error(f'Failed to retrieve transcript sequence for TranslatedSeqRegion {fullRegion}: {e}')
                 error_msg = exception_description(e)
                 ref_info = SeqInfo(error=error_msg)
-            else:
-                alt_seq = seq_info.sequence
-                alt_info = SeqInfo(embedded_variants=seq_info.embedded_variants)
-
-    elif output_type == 'protein':
-        try:
-            ref_seq = fullRegion.get_sequence(type='protein')
-        except Exception as e:
-            error_msg = exception_description(e)
-            ref_info = SeqInfo(error=error_msg)
-
-        if variant_info:
-            # Generate additional sequence for full region with variants embedded
+
+            if variant_info:
+                # Generate additional sequence for full region with variants embedded
+                try:
+                    with timing_span(STAGE_VARIANT_EMBEDDING):
+                        seq_info = fullRegion.get_alt_sequence(type='transcript', unmasked=unmasked, variants=list(variant_info.values()))
+                except Exception as e:  # pragma: no cover
+                    logger.error(f'Failed to retrieve alternative transcript sequence for TranslatedSeqRegion {fullRegion} with variants ({variant_ids}): {e}')
+                    error_msg = exception_description(e)
+                    ref_info = SeqInfo(error=error_msg)
+                else:
+                    alt_seq = seq_info.sequence
+                    alt_info = SeqInfo(embedded_variants=seq_info.embedded_variants)
+
+        elif output_type == 'protein':
             try:
-                seq_info = fullRegion.get_alt_sequence(type='protein', variants=list(variant_info.values()))
+                ref_seq = fullRegion.get_sequence(type='protein')
             except Exception as e:
-                logger.error(f'Failed to retrieve alternative protein sequence for TranslatedSeqRegion {fullRegion} with variants ({variant_ids}): {e}')
                 error_msg = exception_description(e)
-                alt_info = SeqInfo(error=error_msg)
-            else:
-                alt_seq = seq_info.sequence
-                alt_info = SeqInfo(embedded_variants=seq_info.embedded_variants)
+                ref_info = SeqInfo(error=error_msg)
 
-            if alt_seq == '':
-                logger.error(f'No ORF found for TranslatedSeqRegion {fullRegion} with variants embedded ({variant_ids})')
-    else:
-        raise NotImplementedError(f"Output_type {output_type} is currently not implemented.")
+            if variant_info:
+                # Generate additional sequence for full region with variants embedded
+                try:
+                    with timing_span(STAGE_VARIANT_EMBEDDING):
+                        seq_info = fullRegion.get_alt_sequence(type='protein', variants=list(variant_info.values()))
+                except Exception as e:
+                    logger.error(f'Failed to retrieve alternative protein sequence for TranslatedSeqRegion {fullRegion} with variants ({variant_ids}): {e}')
+                    error_msg = exception_description(e)
+                    alt_info = SeqInfo(error=error_msg)
+                else:
+                    alt_seq = seq_info.sequence
+                    alt_info = SeqInfo(embedded_variants=seq_info.embedded_variants)
+
+                if alt_seq == '':
+                    logger.error(f'No ORF found for TranslatedSeqRegion {fullRegion} with variants embedded ({variant_ids})')
+        else:
+            raise NotImplementedError(f"Output_type {output_type} is currently not implemented.")
+
+        if timings is not None and embed_timing:
+            ref_info.timings = timings.to_dict()
 
-    write_output(unique_entry_id=unique_entry_id, base_seq_name=base_seq_name, output_type=output_type, sequence_output_file=sequence_output_file, alt_seq_name_suffix=alt_seq_name_suffix,
-                 ref_seq=ref_seq, alt_seq=alt_seq, ref_info=ref_info, alt_info=alt_info, variants_flag=len(variant_info) > 0, s3_output_prefix=s3_output_prefix)
+        write_output(unique_entry_id=unique_entry_id, base_seq_name=base_seq_name, output_type=output_type, sequence_output_file=sequence_output_file, alt_seq_name_suffix=alt_seq_name_suffix,
+                     ref_seq=ref_seq, alt_seq=alt_seq, ref_info=ref_info, alt_info=alt_info, variants_flag=len(variant_info) > 0, s3_output_prefix=s3_output_prefix,
+                     output_dir=output_dir)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Main module serving the CLI for PAVI batch sequence retrieval.
+
+Retrieves the sequences for multiple pipeline entries in a single invocation,
+producing the same per-entry output files as the single-entry seq_retrieval CLI.
+
+When run as an AWS Batch array job child, the entries to retrieve are resolved
+from a manifest (a JSON list of entry lists), using the child's array index.
+"""
+import click
+import json
+import logging
+import os
+import subprocess
+from typing import Any, List, Optional
+
+from data_mover import data_file_mover
+from log_mgmt import set_log_level, get_logger, set_timing_enabled
+from seq_retrieval import normalise_strand, parse_seq_regions, retrieve_entry
+
+logger = get_logger(name=__name__)
+
+REQUIRED_ENTRY_KEYS = ['unique_entry_id', 'base_seq_name', 'seq_id', 'exon_seq_regions', 'fasta_file_url']
+
+
+def parse_entries(value: Any) -> List[dict[str, Any]]:
+    """
+    Validate a (JSON-decoded) list of pipeline entries.
+
+    Each entry is expected to be formatted as a pipeline seq region
+    (as submitted to the API), with the same keys as the seq_retrieval CLI arguments.
+
+    Returns:
+        List of entry dicts
+
+    Raises:
+        click.BadParameter: If value had an invalid structure.
+    """
+    if not isinstance(value, list):
+        raise click.BadParameter("Must be a valid list (JSON-array) of entries to retrieve.")
+    for entry in value:
+        if not isinstance(entry, dict):
+            raise click.BadParameter(f"Entry {entry} is not a valid dict (JSON-object).")
+        for key in REQUIRED_ENTRY_KEYS:
+            if key not in entry.keys():
+                raise click.BadParameter(f"Entry {entry} does not have a '{key}' property, which is a required property.")
+
+    return value
+
+
+def download_from_s3(s3_uri: str, local_path: str) -> str:
+    """
+    Download a single file from S3 using AWS CLI.
+
+    Args:
+        s3_uri: S3 URI of the file to download (e.g., s3://bucket/prefix/file.json)
+        local_path: Local path to download the file to
+
+    Returns:
+        The local path the file was downloaded to
+    """
+    logger.info(f'Downloading {s3_uri} to {local_path}...')
+
+    result = subprocess.run(
+        ['aws', 's3', 'cp', s3_uri, local_path],
+        capture_output=True,
+        text=True
+    )
+
+    if result.returncode != 0:
+        logger.error(f'Failed to download {s3_uri} from S3: {result.stderr}')
+        raise RuntimeError(f'S3 download failed: {result.stderr}')
+
+    return local_path
+
+
+def resolve_manifest_slice(manifest: Any, array_index: int) -> Any:
+    """
+    Resolve the entries to retrieve for an array job child from a manifest.
+
+    Args:
+        manifest: (JSON-decoded) manifest, a list of entry lists
+        array_index: Array index of the job (0-based)
+
+    Returns:
+        The list of entries at position `array_index` in the manifest
+
+    Raises:
+        click.BadParameter: If the manifest has an invalid structure or the array index is out of range.
+    """
+    if not isinstance(manifest, list):
+        raise click.BadParameter("Manifest must be a valid list (JSON-array) of entry lists.")
+    if array_index < 0 or array_index >= len(manifest):
+        raise click.BadParameter(f"Array index {array_index} out of range for manifest of {len(manifest)} slices.")
+
+    return manifest[array_index]
+
+
+def load_entries(entries: Optional[str], entries_file: Optional[str], entries_manifest: Optional[str] = None,
+                 array_index: int = 0) -> List[dict[str, Any]]:
+    """
+    Load the entries to retrieve from either a JSON string, a local JSON file or a (local or S3) manifest.
+
+    Raises:
+        click.BadParameter: If no (or multiple) entry sources were defined, or entries could not be parsed.
+    """
+    if [entries, entries_file, entries_manifest].count(None) != 2:
+        raise click.BadParameter("Exactly one of --entries, --entries_file or --entries_manifest must be defined.")
+
+    entries_value: Any
+    try:
+        if entries_manifest is not None:
+            manifest_path = entries_manifest
+            if entries_manifest.startswith('s3://'):
+                manifest_path = download_from_s3(entries_manifest, os.path.join('/tmp', os.path.basename(entries_manifest)))
+            with open(manifest_path, 'r') as f:
+                entries_value = json.load(f)
+        elif entries_file is not None:
+            with open(entries_file, 'r') as f:
+                entries_value = json.load(f)
+        else:
+            entries_value = json.loads(str(entries))
+    except Exception as e:
+        raise click.BadParameter(f"Must be a valid JSON-formatted list of entries: {e}")
+
+    if entries_manifest is not None:
+        entries_value = resolve_manifest_slice(entries_value, array_index)
+
+    return parse_entries(entries_value)
+
+
+@click.command(context_settings={'show_default': True})
+@click.option("--entries", type=click.STRING, required=False, default=None, envvar='SEQ_RETRIEVAL_ENTRIES',
+              help="A JSON list of entries to retrieve sequences for (formatted as pipeline seq regions).")
+@click.option("--entries_file", type=click.STRING, required=False, default=None,
+              help="Path to a JSON file containing the list of entries to retrieve sequences for.")
+@click.option("--entries_manifest", type=click.STRING, required=False, default=None, envvar='SEQ_RETRIEVAL_MANIFEST',
+              help="Local path or S3 URI to a JSON manifest (list of entry lists), of which the entries"
+                   + " at position `array_index` will be retrieved.")
+@click.option("--array_index", type=click.INT, default=0, envvar='AWS_BATCH_JOB_ARRAY_INDEX',
+              help="Index of the manifest entry list to retrieve (set by AWS Batch for array job children).")
+@click.option("--output_type", type=click.Choice(['transcript', 'protein'], case_sensitive=False), required=True,
+              help="""The output type to return.""")
+@click.option("--reuse_local_cache", is_flag=True,
+              help="""When defined and using remote `fasta_file_url`, reused local files
+              if file already exists at destination path, rather than re-downloading and overwritting.""")
+@click.option("--unmasked", is_flag=True,
+              help="""When defined, return unmasked sequences (undo soft masking present in reference files).""")
+@click.option("--s3_output_prefix", type=click.STRING, required=False, envvar='S3_OUTPUT_PREFIX',
+              help="""S3 URI prefix to upload output files to (e.g., s3://bucket/prefix/).""")
+@click.option("--timing", is_flag=True, envvar='PAVI_STAGE_TIMING',
+              help="""Flag to enable stage timing. Emits the duration of every retrieval stage as a single JSON record (line) per entry on stderr.""")
+@click.option("--embed_timing", is_flag=True,
+              help="""Flag to embed the stage timings into the sequence info output of every entry (implies --timing).""")
+@click.option("--debug", is_flag=True,
+              help="""Flag to enable debug printing.""")
+def main(entries: Optional[str], entries_file: Optional[str], entries_manifest: Optional[str], array_index: int, output_type: str, reuse_local_cache: bool, unmasked: bool,
+         s3_output_prefix: Optional[str], timing: bool, embed_timing: bool, debug: bool) -> None:
+    """
+    Main method for batch sequence retrieval. Receives input args from click.
+
+    Runs the seq_retrieval of every entry sequentially within one process, so reference files
+    (and their indices) shared between entries are only fetched once.
+    Entry failures are logged and do not interrupt the retrieval of the remaining entries,
+    but result in a non-zero exit code once all entries were processed.
+    """
+
+    if debug:
+        set_log_level(logging.DEBUG)
+    else:
+        set_log_level(logging.INFO)
+
+    data_file_mover.set_local_cache_reuse(reuse_local_cache)
+    set_timing_enabled(timing or embed_timing)
+
+    entry_list = load_entries(entries=entries, entries_file=entries_file, entries_manifest=entries_manifest, array_index=array_index)
+
+    logger.info(f'Running batch seq_retrieval for {len(entry_list)} entries.')
+
+    failed_entries: List[str] = []
+    for entry in entry_list:
+        try:
+            retrieve_entry(seq_id=entry['seq_id'],
+                           seq_strand=normalise_strand(entry.get('seq_strand', '+')),
+                           exon_seq_regions=parse_seq_regions(entry['exon_seq_regions']),
+                           cds_seq_regions=parse_seq_regions(entry.get('cds_seq_regions', [])),
+                           variant_ids=set(entry.get('variant_ids') or []),
+                           alt_seq_name_suffix=entry.get('alt_seq_name_suffix') or '_alt',
+                           fasta_file_url=entry['fasta_file_url'],
+                           output_type=output_type,
+                           base_seq_name=entry['base_seq_name'],
+                           unique_entry_id=entry['unique_entry_id'],
+                           unmasked=unmasked,
+                           s3_output_prefix=s3_output_prefix,
+                           embed_timing=embed_timing)
+        except Exception as e:
+            logger.error(f"Failed to retrieve sequences for entry {entry['unique_entry_id']}: {e}")
+            failed_entries.append(entry['unique_entry_id'])
+
+    if failed_entries:
+        logger.error(f'Batch seq_retrieval failed for {len(failed_entries)} of {len(entry_list)} entries: {failed_entries}')
+        exit(1)
+
+    logger.info(f'Batch seq_retrieval completed for {len(entry_list)} entries.')
+
+
+if __name__ == '__main__':
+    main()
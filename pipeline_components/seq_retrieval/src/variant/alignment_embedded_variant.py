@@ -1,5 +1,8 @@
-from Bio.SeqRecord import SeqRecord
-from typing import Any, Iterable, override, Optional
+from typing import Any, Iterable, override, Optional, TYPE_CHECKING
+
+# Only import on type-checking, to not load biopython when merely importing the variant package
+if TYPE_CHECKING:
+    from Bio.SeqRecord import SeqRecord  # pragma: no cover
 
 from .seq_embedded_variant import SeqEmbeddedVariant
 
@@ -11,13 +14,15 @@ class AlignmentEmbeddedVariant(SeqEmbeddedVariant):
     Contains additional properties related to the embedding into the alignment (gapped sequence).
     """
 
+    __slots__ = ('alignment_start_pos', 'alignment_end_pos')
+
     alignment_start_pos: int
     """The relative start position of the variant in the alignment sequence (1-based)."""
     alignment_end_pos: int
     """The relative end position of the variant in the alignment sequence (1-based)."""
 
-    def __init__(self, embedded_variant: SeqEmbeddedVariant, alignment_record: Optional[SeqRecord] = None, alignment_start_pos: Optional[int] = None, alignment_end_pos: Optional[int] = None):
-        self.__dict__.update(vars(embedded_variant))
+    def __init__(self, embedded_variant: SeqEmbeddedVariant, alignment_record: Optional['SeqRecord'] = None, alignment_start_pos: Optional[int] = None, alignment_end_pos: Optional[int] = None):
+        self._copy_attributes(embedded_variant, SeqEmbeddedVariant)
 
         if alignment_record is not None:
             self.alignment_start_pos = seq_to_alignment_position(alignment_record, embedded_variant.seq_start_pos)
@@ -62,7 +67,7 @@ class AlignmentEmbeddedVariantsList(list[AlignmentEmbeddedVariant]):
         super().__init__(iterable)
 
 
-def seq_to_alignment_position(seq_record: SeqRecord, pos: int) -> int:
+def seq_to_alignment_position(seq_record: 'SeqRecord', pos: int) -> int:
     """
     Convert a sequence position to its corresponding alignment position.
 
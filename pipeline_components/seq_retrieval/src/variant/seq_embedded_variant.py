@@ -1,4 +1,3 @@
-from copy import deepcopy
 from math import ceil
 from typing import Any, Iterable, override
 
@@ -12,6 +11,8 @@ class SeqEmbeddedVariant(Variant):
     Contains additional properties related to the embedding into the sequence.
     """
 
+    __slots__ = ('seq_start_pos', 'seq_end_pos', 'embedded_ref_seq_len', 'embedded_alt_seq_len')
+
     seq_start_pos: int
     """The relative start position of the variant in the sequence (1-based)."""
     seq_end_pos: int
@@ -22,7 +23,7 @@ class SeqEmbeddedVariant(Variant):
     """The length of the variant's reference sequence portion embedded in the sequence."""
 
     def __init__(self, variant: 'Variant', seq_start_pos: int, seq_end_pos: int, embedded_ref_seq_len: int, embedded_alt_seq_len: int):
-        self.__dict__.update(vars(variant))
+        self._copy_attributes(variant, Variant)
         self.seq_start_pos = seq_start_pos
         self.seq_end_pos = seq_end_pos
         self.embedded_ref_seq_len = embedded_ref_seq_len
@@ -82,11 +83,9 @@ class SeqEmbeddedVariant(Variant):
         if not (other.seq_start_pos == 1 or (self.seq_substitution_type == SeqSubstitutionType.DELETION and other.seq_start_pos == 0)):
             raise ValueError(f'`other` SeqEmbeddedVariant must start at the start of its sequence to be fusable ({other.seq_start_pos} is not a start position for substitution type {self.seq_substitution_type}).')
 
-        fused_seq_embedded_variant: SeqEmbeddedVariant = deepcopy(self)
-
-        fused_seq_embedded_variant.seq_end_pos += other.seq_end_pos
-        fused_seq_embedded_variant.embedded_ref_seq_len += other.embedded_ref_seq_len
-        fused_seq_embedded_variant.embedded_alt_seq_len += other.embedded_alt_seq_len
+        fused_seq_embedded_variant = self.replace(seq_end_pos=self.seq_end_pos + other.seq_end_pos,
+                                                  embedded_ref_seq_len=self.embedded_ref_seq_len + other.embedded_ref_seq_len,
+                                                  embedded_alt_seq_len=self.embedded_alt_seq_len + other.embedded_alt_seq_len)
 
         # In case of deletions, seq_end_pos of first seq region would be at flanking base to the region end,
         # so must be adjusted.
@@ -162,12 +161,10 @@ class SeqEmbeddedVariant(Variant):
         else:
             raise ValueError(f"Unsupported substitution type: {self.seq_substitution_type}")
 
-        translated_seq_embedded_variant: SeqEmbeddedVariant = deepcopy(self)
-        translated_seq_embedded_variant.seq_start_pos = translated_start_pos
-        translated_seq_embedded_variant.seq_end_pos = translated_end_pos
-        translated_seq_embedded_variant.embedded_ref_seq_len = translate_seq_position(self.embedded_ref_seq_len)
-        translated_seq_embedded_variant.embedded_alt_seq_len = translate_seq_position(self.embedded_alt_seq_len)
-        return translated_seq_embedded_variant
+        return self.replace(seq_start_pos=translated_start_pos,
+                            seq_end_pos=translated_end_pos,
+                            embedded_ref_seq_len=translate_seq_position(self.embedded_ref_seq_len),
+                            embedded_alt_seq_len=translate_seq_position(self.embedded_alt_seq_len))
 
 
 class SeqEmbeddedVariantsList(list[SeqEmbeddedVariant]):
@@ -4,9 +4,7 @@ Module containing the Variant class and related functions.
 
 from enum import Enum
 
-import requests
-
-from typing import Any, List, Optional, override, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, override, Self, Tuple, TYPE_CHECKING
 from log_mgmt import get_logger
 
 # Only import on type-checking to prevent circular dependency at runtime
@@ -16,6 +14,18 @@ if TYPE_CHECKING:
 logger = get_logger(name=__name__)
 
 
+_slot_attributes_cache: Dict[type, Tuple[str, ...]] = {}
+
+
+def slot_attributes(cls: type) -> Tuple[str, ...]:
+    """Return the names of all slot attributes of `cls` (including inherited ones), base class attributes first."""
+    attributes = _slot_attributes_cache.get(cls)
+    if attributes is None:
+        attributes = tuple(attribute for klass in reversed(cls.__mro__) for attribute in klass.__dict__.get('__slots__', ()))
+        _slot_attributes_cache[cls] = attributes
+    return attributes
+
+
 class SeqSubstitutionType(Enum):
     """Value enum for variant sequence substitution type"""
     DELETION = 'deletion'
@@ -31,8 +41,14 @@ class SeqSubstitutionType(Enum):
 class Variant():
     """
     Defines a sequence region variant.
+
+    Variants (and the embedded variants derived from them) are slotted objects, to keep variant-heavy jobs memory efficient.
+    Use `replace` to make (modified) copies rather than re-initializing or deep-copying them.
     """
 
+    __slots__ = ('variant_id', 'genomic_seq_id', 'genomic_start_pos', 'genomic_end_pos', 'seq_length',
+                 'genomic_ref_seq', 'genomic_alt_seq', 'seq_substitution_type')
+
     variant_id: str
     """ID of the variant"""
 
@@ -45,6 +61,9 @@ class Variant():
     genomic_end_pos: int
     """Genomic end position of the variant (1-based, inclusive)"""
 
+    seq_length: int
+    """Genomic length of the variant (number of reference positions covered by `genomic_start_pos` to `genomic_end_pos`)"""
+
     genomic_ref_seq: str
     """Genomic reference sequence of the variant"""
 
@@ -136,6 +155,52 @@ class Variant():
             genomic_alt_seq=genomic_alt_seq
         )
 
+    def replace(self, **changes: Any) -> Self:
+        """
+        Return a (shallow) copy of the variant, with the attributes in `changes` replaced.
+
+        Does not rerun the validations of `__init__`, so callers are responsible for providing consistent values.
+
+        Args:
+            **changes: attribute values to replace in the copy, by attribute name
+
+        Returns:
+            A new object of the same class as `self`.
+
+        Raises:
+            TypeError: if `changes` contains names which are not attributes of the variant
+        """
+        attributes = slot_attributes(type(self))
+        invalid_attributes = changes.keys() - attributes
+        if invalid_attributes:
+            raise TypeError(f'Invalid attribute(s) for {type(self).__name__}: {", ".join(sorted(invalid_attributes))}.')
+
+        variant_copy = object.__new__(type(self))
+        for attribute in attributes:
+            setattr(variant_copy, attribute, changes[attribute] if attribute in changes else getattr(self, attribute))
+        return variant_copy
+
+    def _copy_attributes(self, other: 'Variant', cls: type['Variant']) -> None:
+        """Copy the values of all attributes defined by (variant class) `cls` from `other` onto `self`."""
+        for attribute in slot_attributes(cls):
+            setattr(self, attribute, getattr(other, attribute))
+
+    def __copy__(self) -> Self:
+        return self.replace()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Self:  # noqa: U100
+        # All attribute values are immutable, so a shallow copy is a deep copy
+        return self.replace()
+
+    @override
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return all attributes as dict, in definition order (as used by pickle and to encode variants as JSON)."""
+        return {attribute: getattr(self, attribute) for attribute in slot_attributes(type(self))}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
+
     @override
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
@@ -168,6 +233,8 @@ class Variant():
             a Variant object containing the variant information.
         """
 
+        import requests
+
         # Fetch variant information from the public web API.
         url = f"https://www.alliancegenome.org/api/variant/{variant_id}"
         response = requests.get(url)
@@ -0,0 +1,13 @@
+"""
+Fixtures for benchmarking
+"""
+
+import pytest
+
+from .scenarios import GENOME_SEED, TRANSCRIPT_SPECS
+from .synthetic_genome import generate_genome, SyntheticGenome
+
+
+@pytest.fixture(scope='session')
+def synthetic_genome(tmp_path_factory: pytest.TempPathFactory) -> SyntheticGenome:
+    return generate_genome(TRANSCRIPT_SPECS, output_dir=str(tmp_path_factory.mktemp('synthetic_genome')), seed=GENOME_SEED)
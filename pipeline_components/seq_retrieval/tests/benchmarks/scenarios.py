@@ -0,0 +1,62 @@
+"""
+Benchmark scenario definitions and seq region builders for synthetic transcripts
+"""
+
+from typing import cast, List, Literal, Tuple
+
+from seq_region import SeqRegion, MultiPartSeqRegion, TranslatedSeqRegion
+
+from .synthetic_genome import SyntheticGenome, TranscriptSpec, transcript_id, VariantKind
+
+
+GENOME_SEED = 20240101
+
+STRANDS: Tuple[Literal['+', '-'], ...] = ('+', '-')
+
+TRANSCRIPT_SPECS: List[TranscriptSpec] = [
+    TranscriptSpec(exon_count=exon_count, coding_length=coding_length, strand=strand)
+    for exon_count in (1, 10, 50)
+    for coding_length in (1500, 15000)
+    for strand in STRANDS
+]
+"""Transcript scenarios: exon counts x coding sequence lengths x strands"""
+
+TRANSCRIPT_IDS: List[str] = [transcript_id(spec) for spec in TRANSCRIPT_SPECS]
+
+SINGLE_EXON_TRANSCRIPT_IDS: List[str] = [transcript_id(spec) for spec in TRANSCRIPT_SPECS if spec['exon_count'] == 1]
+
+VARIANT_SETS: List[Tuple[VariantKind, float]] = [
+    ('substitutions', 1),
+    ('substitutions', 10),
+    ('frameshifts', 10)
+]
+"""Variant set scenarios: variant kind and density (variants per kb of coding sequence)"""
+
+VARIANT_SET_IDS: List[str] = [f'{kind}-{density:g}perkb' for kind, density in VARIANT_SETS]
+
+
+def exon_seq_regions(genome: SyntheticGenome, transcript_id: str, fasta_file_url: str | None = None) -> List[SeqRegion]:
+    """Return new SeqRegion objects for all exons of a synthetic transcript."""
+    transcript = genome['transcripts'][transcript_id]
+    return [SeqRegion(seq_id=transcript['seq_id'], start=start, end=end, strand=transcript['strand'],
+                      fasta_file_url=fasta_file_url or genome['fasta_file_url'])
+            for start, end in transcript['exons']]
+
+
+def cds_seq_regions(genome: SyntheticGenome, transcript_id: str) -> List[SeqRegion]:
+    """Return new SeqRegion objects for all CDS regions of a synthetic transcript."""
+    transcript = genome['transcripts'][transcript_id]
+    return [SeqRegion(seq_id=transcript['seq_id'], start=start, end=end, strand=transcript['strand'],
+                      frame=cast(SeqRegion.FRAME_TYPE, frame), fasta_file_url=genome['fasta_file_url'])
+            for start, end, frame in transcript['cds_regions']]
+
+
+def exon_multipart_seq_region(genome: SyntheticGenome, transcript_id: str) -> MultiPartSeqRegion:
+    """Return a new MultiPartSeqRegion object for the exons of a synthetic transcript."""
+    return MultiPartSeqRegion(seq_regions=exon_seq_regions(genome, transcript_id))
+
+
+def translated_seq_region(genome: SyntheticGenome, transcript_id: str) -> TranslatedSeqRegion:
+    """Return a new TranslatedSeqRegion object for a synthetic transcript."""
+    return TranslatedSeqRegion(exon_seq_regions=exon_seq_regions(genome, transcript_id),
+                               cds_seq_regions=cds_seq_regions(genome, transcript_id))
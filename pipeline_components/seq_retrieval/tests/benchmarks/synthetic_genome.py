@@ -0,0 +1,279 @@
+"""
+Synthetic genome generator for benchmarking
+
+Generates a reproducible genome (one contig per transcript) with planted multi-exon transcripts,
+written as both plain and bgzip-compressed faidx-indexed FASTA files,
+and variant sets on the coding sequence of those transcripts.
+"""
+
+import os.path
+import random
+
+from typing import Dict, List, Literal, Tuple, TypedDict
+
+from Bio import Seq
+import pysam
+
+from variant import Variant
+
+
+BASES = 'ACGT'
+STOP_CODONS = ('TAA', 'TAG', 'TGA')
+
+FLANK_LENGTH = 200
+"""Length of the (soft-masked) flanking sequence on both sides of every transcript"""
+
+UTR5_LENGTH = 60
+UTR3_LENGTH = 120
+
+UTR3_STOP_TRAIL = 'TAATTAATTAA'
+"""Stop codons in all three frames, ending the 3' UTR to ensure every ORF losing its stop codon finds a new one."""
+
+FASTA_LINE_LENGTH = 60
+
+
+class TranscriptSpec(TypedDict):
+    """
+    Type representing the specification of a synthetic transcript
+     * 'exon_count' property defines the number of exons the transcript is split in
+     * 'coding_length' property defines the (approximate) length of the coding sequence (bp)
+     * 'strand' property defines the genomic strand of the transcript
+    """
+    exon_count: int
+    coding_length: int
+    strand: Literal['+', '-']
+
+
+class SyntheticTranscript(TypedDict):
+    """
+    Type representing a synthetic transcript, planted on its own contig (`seq_id`)
+     * 'exons' and 'cds_regions' properties hold genomic positions (1-based, inclusive, start <= end)
+     * 'cds_regions' hold their frame as third element
+    """
+    seq_id: str
+    strand: Literal['+', '-']
+    exons: List[Tuple[int, int]]
+    cds_regions: List[Tuple[int, int, int]]
+    transcript_seq: str
+    coding_seq: str
+    contig_seq: str
+
+
+class SyntheticGenome(TypedDict):
+    """
+    Type representing a synthetic genome
+     * 'fasta_file_url' is the URL to the bgzip-compressed FASTA file
+     * 'plain_fasta_file_url' is the URL to the uncompressed FASTA file
+     * 'transcripts' holds all planted transcripts by ID
+    """
+    fasta_file_url: str
+    plain_fasta_file_url: str
+    transcripts: Dict[str, SyntheticTranscript]
+
+
+VariantKind = Literal['substitutions', 'frameshifts']
+
+
+def transcript_id(spec: TranscriptSpec) -> str:
+    """Return the ID (used as seq_id of its contig) of a synthetic transcript."""
+    strand_name = 'fw' if spec['strand'] == '+' else 'rv'
+    return f"tx_e{spec['exon_count']}_l{spec['coding_length']}_{strand_name}"
+
+
+def _random_seq(rng: random.Random, length: int) -> str:
+    return ''.join(rng.choices(BASES, k=length))
+
+
+def _coding_seq(rng: random.Random, length: int) -> str:
+    """Generate a complete ORF (start codon, sense codons, stop codon) of about `length` bases."""
+    codons = ['ATG']
+    while len(codons) < max(length // 3 - 1, 1):
+        codon = _random_seq(rng, 3)
+        if codon not in STOP_CODONS:
+            codons.append(codon)
+    codons.append(rng.choice(STOP_CODONS))
+    return ''.join(codons)
+
+
+def _to_plus_strand(start: int, end: int, contig_length: int, strand: Literal['+', '-']) -> Tuple[int, int]:
+    """Convert transcript-oriented contig positions to (+ strand) genomic positions."""
+    if strand == '-':
+        return contig_length - end + 1, contig_length - start + 1
+    return start, end
+
+
+def generate_transcript(rng: random.Random, spec: TranscriptSpec) -> SyntheticTranscript:
+    """
+    Generate a synthetic transcript and the contig it is located on.
+
+    The contig is built in transcript orientation (5' flank, exons separated by introns, 3' flank),
+    then reverse-complemented for transcripts on the negative strand.
+    Flanks and introns are soft-masked (lowercase).
+    """
+    coding_seq = _coding_seq(rng, spec['coding_length'])
+    utr5 = _random_seq(rng, UTR5_LENGTH)
+    utr3 = _random_seq(rng, UTR3_LENGTH - len(UTR3_STOP_TRAIL)) + UTR3_STOP_TRAIL
+    transcript_seq = utr5 + coding_seq + utr3
+
+    exon_count = spec['exon_count']
+    exon_length = len(transcript_seq) // exon_count
+    exon_seqs = [transcript_seq[i * exon_length:(i + 1) * exon_length] for i in range(exon_count - 1)]
+    exon_seqs.append(transcript_seq[(exon_count - 1) * exon_length:])
+
+    contig_parts = [_random_seq(rng, FLANK_LENGTH).lower()]
+    exon_positions: List[Tuple[int, int]] = []  # Transcript-oriented contig positions
+    position = FLANK_LENGTH
+    for i, exon_seq in enumerate(exon_seqs):
+        if i > 0:
+            intron = 'gt' + _random_seq(rng, rng.randint(60, 300)).lower() + 'ag'
+            contig_parts.append(intron)
+            position += len(intron)
+        contig_parts.append(exon_seq)
+        exon_positions.append((position + 1, position + len(exon_seq)))
+        position += len(exon_seq)
+    contig_parts.append(_random_seq(rng, FLANK_LENGTH).lower())
+    contig_seq = ''.join(contig_parts)
+
+    # CDS parts of each exon, with the frame of their first complete codon
+    cds_positions: List[Tuple[int, int, int]] = []
+    coding_start = len(utr5)
+    coding_end = len(utr5) + len(coding_seq)  # Transcript-relative, 0-based, exclusive
+    transcript_offset = 0
+    for exon_start, exon_end in exon_positions:
+        exon_len = exon_end - exon_start + 1
+        part_start = max(coding_start, transcript_offset)
+        part_end = min(coding_end, transcript_offset + exon_len)
+        if part_start < part_end:
+            frame = (3 - (part_start - coding_start) % 3) % 3
+            cds_positions.append((exon_start + part_start - transcript_offset,
+                                  exon_start + part_end - transcript_offset - 1,
+                                  frame))
+        transcript_offset += exon_len
+
+    strand = spec['strand']
+    if strand == '-':
+        contig_seq = str(Seq.reverse_complement(contig_seq))
+
+    contig_length = len(contig_seq)
+    return SyntheticTranscript(
+        seq_id=transcript_id(spec),
+        strand=strand,
+        exons=[_to_plus_strand(start, end, contig_length, strand) for start, end in exon_positions],
+        cds_regions=[(*_to_plus_strand(start, end, contig_length, strand), frame) for start, end, frame in cds_positions],
+        transcript_seq=transcript_seq,
+        coding_seq=coding_seq,
+        contig_seq=contig_seq
+    )
+
+
+def write_genome(transcripts: List[SyntheticTranscript], output_dir: str, name: str = 'synthetic_genome') -> Tuple[str, str]:
+    """
+    Write the contigs of all transcripts to faidx-indexed FASTA files.
+
+    Args:
+        transcripts: transcripts which contigs to write
+        output_dir: directory to write the FASTA files (and their indices) to
+        name: base name of the FASTA files
+
+    Returns:
+        Tuple of the paths to the plain FASTA file and the bgzip-compressed FASTA file.
+    """
+    plain_fasta_path = os.path.join(output_dir, f'{name}.fa')
+    with open(plain_fasta_path, 'w') as fasta_file:
+        for transcript in transcripts:
+            fasta_file.write(f">{transcript['seq_id']}\n")
+            contig_seq = transcript['contig_seq']
+            for i in range(0, len(contig_seq), FASTA_LINE_LENGTH):
+                fasta_file.write(contig_seq[i:i + FASTA_LINE_LENGTH] + '\n')
+    pysam.faidx(plain_fasta_path)
+
+    compressed_fasta_path = plain_fasta_path + '.gz'
+    pysam.tabix_compress(plain_fasta_path, compressed_fasta_path, force=True)
+    pysam.faidx(compressed_fasta_path)
+
+    return plain_fasta_path, compressed_fasta_path
+
+
+def generate_genome(specs: List[TranscriptSpec], output_dir: str, seed: int = 0) -> SyntheticGenome:
+    """
+    Generate a synthetic genome with one contig per transcript spec and write it to `output_dir`.
+
+    Args:
+        specs: specifications of the transcripts to plant
+        output_dir: directory to write the FASTA files (and their indices) to
+        seed: seed for the random generator
+
+    Returns:
+        The synthetic genome, referring to its FASTA files through `file://` URLs.
+    """
+    rng = random.Random(seed)
+    transcripts = [generate_transcript(rng, spec) for spec in specs]
+
+    plain_fasta_path, compressed_fasta_path = write_genome(transcripts, output_dir)
+
+    return SyntheticGenome(fasta_file_url=f'file://{os.path.abspath(compressed_fasta_path)}',
+                           plain_fasta_file_url=f'file://{os.path.abspath(plain_fasta_path)}',
+                           transcripts={transcript['seq_id']: transcript for transcript in transcripts})
+
+
+def generate_variants(transcript: SyntheticTranscript, density: float, kind: VariantKind, seed: int = 0) -> List[Variant]:
+    """
+    Generate a set of non-overlapping variants on the coding sequence of a transcript.
+
+    Variants are positioned within exons (not touching exon boundaries) and never affect the start codon.
+
+    Args:
+        transcript: transcript to generate variants for
+        density: number of variants per kb of coding sequence (at least one variant is generated)
+        kind: 'substitutions' to generate single nucleotide substitutions only,\
+              'frameshifts' to generate 1-2 bp insertions and deletions only
+        seed: seed for the random generator
+
+    Returns:
+        List of variants, in genomic position order.
+    """
+    rng = random.Random(seed)
+    contig_seq = transcript['contig_seq']
+
+    # Candidate (+ strand) positions: CDS positions at least 3 bases from the exon (and CDS) boundaries
+    candidates: List[int] = []
+    for start, end, _ in transcript['cds_regions']:
+        candidates.extend(range(start + 3, end - 2))
+    first_codon = transcript['cds_regions'][0]
+    if transcript['strand'] == '-':
+        start_codon_positions = set(range(first_codon[1] - 5, first_codon[1] + 1))
+    else:
+        start_codon_positions = set(range(first_codon[0], first_codon[0] + 6))
+    candidates = [position for position in candidates if position not in start_codon_positions]
+
+    variant_count = min(max(1, round(density * len(transcript['coding_seq']) / 1000)), len(candidates) // 5)
+
+    positions: List[int] = []
+    for position in sorted(rng.sample(candidates, k=variant_count)):
+        # Keep variants (including insertion flanks and deletion spans) apart
+        if not positions or position - positions[-1] > 4:
+            positions.append(position)
+
+    variants: List[Variant] = []
+    for position in positions:
+        ref_base = contig_seq[position - 1].upper()
+        variant: Variant
+        if kind == 'substitutions':
+            alt_base = rng.choice([base for base in BASES if base != ref_base])
+            variant = Variant(variant_id=f"{transcript['seq_id']}:g.{position}{ref_base}>{alt_base}",
+                              seq_id=transcript['seq_id'], start=position, end=position,
+                              genomic_ref_seq=ref_base, genomic_alt_seq=alt_base)
+        elif rng.random() < 0.5:
+            length = rng.randint(1, 2)
+            ref_seq = contig_seq[position - 1:position - 1 + length].upper()
+            variant = Variant(variant_id=f"{transcript['seq_id']}:g.{position}_{position + length - 1}del",
+                              seq_id=transcript['seq_id'], start=position, end=position + length - 1,
+                              genomic_ref_seq=ref_seq, genomic_alt_seq='')
+        else:
+            alt_seq = _random_seq(rng, rng.randint(1, 2))
+            variant = Variant(variant_id=f"{transcript['seq_id']}:g.{position}_{position + 1}ins{alt_seq}",
+                              seq_id=transcript['seq_id'], start=position, end=position + 1,
+                              genomic_ref_seq='', genomic_alt_seq=alt_seq)
+        variants.append(variant)
+
+    return variants
@@ -0,0 +1,22 @@
+"""
+Benchmarks for CLI start-up (interpreter start-up and module imports)
+"""
+
+import subprocess
+import sys
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from ..import_time import CLI_MODULES, SRC_DIR, import_times
+
+
+def start_cli(module: str) -> None:
+    subprocess.run([sys.executable, f'{module}.py', '--help'], cwd=SRC_DIR, stdout=subprocess.DEVNULL, check=True)
+
+
+@pytest.mark.benchmark(group='cli_startup')
+@pytest.mark.parametrize('module', CLI_MODULES)
+def test_cli_startup(benchmark: BenchmarkFixture, module: str) -> None:
+    benchmark.extra_info['import_time_us'] = import_times(module)[module]
+    benchmark.pedantic(start_cli, args=(module,), rounds=10, warmup_rounds=1)
@@ -0,0 +1,85 @@
+"""
+Benchmarks for SeqRegion and MultiPartSeqRegion hot paths
+"""
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from typing import Literal
+
+from seq_region import SeqRegion
+
+from .scenarios import exon_multipart_seq_region, SINGLE_EXON_TRANSCRIPT_IDS, TRANSCRIPT_IDS, VARIANT_SET_IDS, VARIANT_SETS
+from .synthetic_genome import generate_variants, SyntheticGenome, VariantKind
+
+
+@pytest.mark.benchmark(group='SeqRegion.fetch_seq')
+@pytest.mark.parametrize('compression', ['plain', 'bgzip'])
+@pytest.mark.parametrize('transcript_id', SINGLE_EXON_TRANSCRIPT_IDS)
+def test_seq_region_fetch_seq(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome,
+                              transcript_id: str, compression: Literal['plain', 'bgzip']) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+    fasta_file_url = synthetic_genome['plain_fasta_file_url'] if compression == 'plain' else synthetic_genome['fasta_file_url']
+    start, end = transcript['exons'][0]
+    seq_region = SeqRegion(seq_id=transcript['seq_id'], start=start, end=end, strand=transcript['strand'],
+                           fasta_file_url=fasta_file_url)
+
+    sequence = benchmark(seq_region.fetch_seq)
+
+    assert sequence.upper() == transcript['transcript_seq']
+
+
+@pytest.mark.benchmark(group='MultiPartSeqRegion.fetch_alt_seq')
+@pytest.mark.parametrize(('variant_kind', 'variant_density'), VARIANT_SETS, ids=VARIANT_SET_IDS)
+@pytest.mark.parametrize('transcript_id', TRANSCRIPT_IDS)
+def test_multipart_seq_region_fetch_alt_seq(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome,
+                                            transcript_id: str, variant_kind: VariantKind, variant_density: float) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+    multipart_seq_region = exon_multipart_seq_region(synthetic_genome, transcript_id)
+    variants = generate_variants(transcript, density=variant_density, kind=variant_kind)
+
+    alt_seq_info = benchmark(multipart_seq_region.fetch_alt_seq, variants=variants)
+
+    assert len(alt_seq_info.embedded_variants) == len(variants)
+
+
+@pytest.mark.benchmark(group='MultiPartSeqRegion.map_vars_to_region_parts')
+@pytest.mark.parametrize(('variant_kind', 'variant_density'), VARIANT_SETS, ids=VARIANT_SET_IDS)
+@pytest.mark.parametrize('transcript_id', TRANSCRIPT_IDS)
+def test_multipart_seq_region_map_vars_to_region_parts(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome,
+                                                       transcript_id: str, variant_kind: VariantKind, variant_density: float) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+    multipart_seq_region = exon_multipart_seq_region(synthetic_genome, transcript_id)
+    variants = generate_variants(transcript, density=variant_density, kind=variant_kind)
+
+    variant_overlap_map = benchmark(multipart_seq_region.map_vars_to_region_parts, variants)
+
+    assert sum(map(len, variant_overlap_map.values())) == len(variants)
+
+
+@pytest.mark.benchmark(group='MultiPartSeqRegion.to_rel_position')
+@pytest.mark.parametrize(('variant_kind', 'variant_density'), VARIANT_SETS, ids=VARIANT_SET_IDS)
+@pytest.mark.parametrize('transcript_id', TRANSCRIPT_IDS)
+def test_multipart_seq_region_to_rel_position(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome,
+                                              transcript_id: str, variant_kind: VariantKind, variant_density: float) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+    multipart_seq_region = exon_multipart_seq_region(synthetic_genome, transcript_id)
+    variants = generate_variants(transcript, density=variant_density, kind=variant_kind)
+
+    rel_positions = benchmark(lambda: [multipart_seq_region.to_rel_position(variant.genomic_start_pos) for variant in variants])
+
+    assert [multipart_seq_region.to_seq_position(rel_position) for rel_position in rel_positions] \
+        == [variant.genomic_start_pos for variant in variants]
+
+
+@pytest.mark.benchmark(group='MultiPartSeqRegion.sub_region')
+@pytest.mark.parametrize('transcript_id', TRANSCRIPT_IDS)
+def test_multipart_seq_region_sub_region(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome, transcript_id: str) -> None:
+    multipart_seq_region = exon_multipart_seq_region(synthetic_genome, transcript_id)
+    multipart_seq_region.fetch_seq()
+    rel_start = multipart_seq_region.seq_length // 4
+    rel_end = multipart_seq_region.seq_length * 3 // 4
+
+    sub_region = benchmark(multipart_seq_region.sub_region, rel_start, rel_end)
+
+    assert sub_region.get_sequence(autofetch=False) == multipart_seq_region.get_sequence()[rel_start - 1:rel_end]
@@ -0,0 +1,94 @@
+"""
+Benchmarks for TranslatedSeqRegion hot paths and ORF finding
+"""
+
+import contextlib
+import io
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from typing import List, Literal
+
+from log_mgmt import set_timing_enabled, timed_entry
+from log_mgmt.stage_timing import STAGE_FAIDX_READ
+from seq_region import TranslatedSeqRegion
+from seq_region.translated_seq_region import find_orfs
+
+from .scenarios import SINGLE_EXON_TRANSCRIPT_IDS, translated_seq_region, TRANSCRIPT_IDS, VARIANT_SET_IDS, VARIANT_SETS
+from .synthetic_genome import generate_variants, SyntheticGenome, VariantKind
+
+
+@pytest.mark.benchmark(group='TranslatedSeqRegion.get_alt_sequence')
+@pytest.mark.parametrize(('variant_kind', 'variant_density'), VARIANT_SETS, ids=VARIANT_SET_IDS)
+@pytest.mark.parametrize('seq_type', ['transcript', 'protein'])
+@pytest.mark.parametrize('transcript_id', TRANSCRIPT_IDS)
+def test_translated_seq_region_get_alt_sequence(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome,
+                                                transcript_id: str, seq_type: Literal['transcript', 'protein'],
+                                                variant_kind: VariantKind, variant_density: float) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+    variants = generate_variants(transcript, density=variant_density, kind=variant_kind)
+
+    # Reference sequences are fetched on first call and reused by all following (benchmarked) rounds
+    region: TranslatedSeqRegion = translated_seq_region(synthetic_genome, transcript_id)
+    region.get_sequence(type='protein')
+
+    alt_seq_info = benchmark(region.get_alt_sequence, type=seq_type, variants=variants)
+
+    assert len(alt_seq_info.sequence) > 0
+
+
+@pytest.mark.benchmark(group='find_orfs')
+@pytest.mark.parametrize('return_type', ['all', 'longest'])
+@pytest.mark.parametrize('transcript_id', SINGLE_EXON_TRANSCRIPT_IDS)
+def test_find_orfs(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome,
+                   transcript_id: str, return_type: Literal['all', 'longest']) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+
+    orfs = benchmark(find_orfs, transcript['transcript_seq'], TranslatedSeqRegion.codon_table, return_type=return_type)
+
+    if return_type == 'all':
+        # The planted ORF may be extended upstream by an in-frame start codon in the 5' UTR
+        assert any(orf['sequence'].endswith(transcript['coding_seq']) for orf in orfs)
+    else:
+        assert len(orfs) == 1
+
+
+@pytest.mark.benchmark(group='find_orfs')
+@pytest.mark.parametrize('transcript_id', SINGLE_EXON_TRANSCRIPT_IDS)
+def test_find_orfs_force_start(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome, transcript_id: str) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+    coding_start = transcript['transcript_seq'].index(transcript['coding_seq']) + 1
+
+    orfs = benchmark(find_orfs, transcript['transcript_seq'], TranslatedSeqRegion.codon_table, force_start=coding_start)
+
+    assert orfs[0]['sequence'] == transcript['coding_seq']
+
+
+@pytest.mark.benchmark(group='TranslatedSeqRegion.retrieval')
+@pytest.mark.parametrize('transcript_id', TRANSCRIPT_IDS)
+def test_translated_seq_region_retrieval(benchmark: BenchmarkFixture, synthetic_genome: SyntheticGenome, transcript_id: str) -> None:
+    transcript = synthetic_genome['transcripts'][transcript_id]
+    variants = generate_variants(transcript, density=10, kind='frameshifts')
+
+    def retrieve_all_sequences() -> List[str]:
+        # Reference and alternative sequences of all types, starting from a new (unfetched) region
+        region: TranslatedSeqRegion = translated_seq_region(synthetic_genome, transcript_id)
+        return [region.get_sequence(type='transcript'), region.get_sequence(type='protein'),
+                region.get_alt_sequence(type='transcript', variants=variants).sequence,
+                region.get_alt_sequence(type='protein', variants=variants).sequence]
+
+    # Number of reads from the reference genome (each exon span is expected to be read once)
+    set_timing_enabled(True)
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            with timed_entry(component='benchmark', entry_id=transcript_id) as timings:
+                retrieve_all_sequences()
+    finally:
+        set_timing_enabled(False)
+    assert timings is not None
+    benchmark.extra_info['faidx_reads'] = timings.to_dict()['stages'][STAGE_FAIDX_READ]['calls']
+
+    sequences = benchmark(retrieve_all_sequences)
+
+    assert benchmark.extra_info['faidx_reads'] == len(transcript['exons'])
+    assert sequences[0] == transcript['transcript_seq']
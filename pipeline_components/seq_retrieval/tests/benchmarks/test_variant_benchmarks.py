@@ -0,0 +1,41 @@
+"""
+Benchmarks for variant positioning hot paths
+"""
+
+import random
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+from variant.alignment_embedded_variant import seq_to_alignment_position
+
+
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+
+def gapped_seq_record(seq_length: int, gap_fraction: float, seed: int = 0) -> SeqRecord:
+    """Generate an alignment record of a random protein sequence of `seq_length` residues, with gap blocks inserted."""
+    rng = random.Random(seed)
+    parts = []
+    for residue in rng.choices(AMINO_ACIDS, k=seq_length):
+        if rng.random() < gap_fraction / 5:
+            parts.append('-' * rng.randint(1, 10))
+        parts.append(residue)
+    return SeqRecord(id=f'synthetic_{seq_length}', seq=Seq(''.join(parts)))
+
+
+@pytest.mark.benchmark(group='seq_to_alignment_position')
+@pytest.mark.parametrize('rel_position', [0.1, 0.5, 1.0])
+@pytest.mark.parametrize('seq_length', [500, 5000])
+def test_seq_to_alignment_position(benchmark: BenchmarkFixture, seq_length: int, rel_position: float) -> None:
+    seq_record = gapped_seq_record(seq_length, gap_fraction=0.2)
+    pos = max(1, round(rel_position * seq_length))
+
+    alignment_pos = benchmark(seq_to_alignment_position, seq_record, pos)
+
+    alignment_seq = str(seq_record.seq)
+    assert alignment_seq[alignment_pos - 1] != '-'
+    assert len(alignment_seq[:alignment_pos].replace('-', '')) == pos
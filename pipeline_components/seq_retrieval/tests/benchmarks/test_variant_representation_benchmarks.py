@@ -0,0 +1,104 @@
+"""
+Benchmarks comparing the slotted (embedded) variant representation to a dict-backed one
+
+The dict-backed representation mirrors how embedded variants were represented before they were slotted:
+copying all variant attributes through `__dict__` on initiation and copying through `deepcopy`.
+Next to throughput, the memory used per embedded variant is recorded (`bytes_per_variant` in the benchmark's extra info).
+"""
+
+from copy import deepcopy
+import tracemalloc
+from typing import Any, Callable, Dict, List, Literal
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from variant import SeqEmbeddedVariant, Variant
+from variant.seq_embedded_variant import translate_seq_position
+
+Representation = Literal['slotted', 'dict']
+
+VARIANT_COUNT = 10_000
+
+
+class DictBackedSeqEmbeddedVariant():
+    """Dict-backed embedded variant, for comparison."""
+
+    def __init__(self, variant: Variant, seq_start_pos: int, seq_end_pos: int, embedded_ref_seq_len: int, embedded_alt_seq_len: int):
+        self.__dict__.update(variant.__getstate__())
+        self.seq_start_pos = seq_start_pos
+        self.seq_end_pos = seq_end_pos
+        self.embedded_ref_seq_len = embedded_ref_seq_len
+        self.embedded_alt_seq_len = embedded_alt_seq_len
+
+    def to_translated(self) -> 'DictBackedSeqEmbeddedVariant':
+        translated: DictBackedSeqEmbeddedVariant = deepcopy(self)
+        translated.seq_start_pos = translate_seq_position(self.seq_start_pos)
+        translated.seq_end_pos = translate_seq_position(self.seq_end_pos)
+        translated.embedded_ref_seq_len = translate_seq_position(self.embedded_ref_seq_len)
+        translated.embedded_alt_seq_len = translate_seq_position(self.embedded_alt_seq_len)
+        return translated
+
+
+EMBEDDED_VARIANT_CLASSES: Dict[Representation, Callable[..., Any]] = {
+    'slotted': SeqEmbeddedVariant,
+    'dict': DictBackedSeqEmbeddedVariant
+}
+
+
+def substitution_variants(count: int) -> List[Variant]:
+    """Generate `count` single nucleotide substitutions on a single sequence."""
+    return [Variant(variant_id=f'X:g.{i * 10 + 1}A>C', seq_id='X', start=i * 10 + 1, end=i * 10 + 1,
+                    genomic_ref_seq='A', genomic_alt_seq='C')
+            for i in range(count)]
+
+
+def embed_variants(variants: List[Variant], representation: Representation) -> List[Any]:
+    """Embed all `variants` into a sequence, using the embedded variant class of `representation`."""
+    embedded_variant_class = EMBEDDED_VARIANT_CLASSES[representation]
+    return [embedded_variant_class(variant, seq_start_pos=i * 10 + 1, seq_end_pos=i * 10 + 1, embedded_ref_seq_len=1, embedded_alt_seq_len=1)
+            for i, variant in enumerate(variants)]
+
+
+def embedded_variants_memory(variants: List[Variant], representation: Representation) -> int:
+    """Return the memory (in bytes) allocated for embedding all `variants` using the embedded variant class of `representation`."""
+    tracemalloc.start()
+    try:
+        embedded_variants = embed_variants(variants, representation)
+        memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(embedded_variants) == len(variants)
+    return memory
+
+
+@pytest.fixture(scope='module')
+def variants() -> List[Variant]:
+    return substitution_variants(VARIANT_COUNT)
+
+
+@pytest.mark.benchmark(group='embedded_variant_initiation')
+@pytest.mark.parametrize('representation', ['slotted', 'dict'])
+def test_embedded_variant_initiation(benchmark: BenchmarkFixture, variants: List[Variant], representation: Representation) -> None:
+    benchmark.extra_info['bytes_per_variant'] = embedded_variants_memory(variants, representation) / len(variants)
+
+    embedded_variants = benchmark(embed_variants, variants, representation)
+
+    assert len(embedded_variants) == len(variants)
+
+
+@pytest.mark.benchmark(group='embedded_variant_translation')
+@pytest.mark.parametrize('representation', ['slotted', 'dict'])
+def test_embedded_variant_translation(benchmark: BenchmarkFixture, variants: List[Variant], representation: Representation) -> None:
+    embedded_variants = embed_variants(variants, representation)
+
+    translated_variants = benchmark(lambda: [embedded_variant.to_translated() for embedded_variant in embedded_variants])
+
+    assert translated_variants[-1].seq_start_pos == translate_seq_position(embedded_variants[-1].seq_start_pos)
+
+
+def test_slotted_embedded_variants_memory(variants: List[Variant]) -> None:
+    '''
+    Slotted embedded variants must use less memory than dict-backed ones.
+    '''
+    assert embedded_variants_memory(variants, 'slotted') < embedded_variants_memory(variants, 'dict')
@@ -0,0 +1,32 @@
+"""
+Helpers to measure the import time of the CLI modules (through `python -X importtime`)
+"""
+
+import os.path
+import subprocess
+import sys
+from typing import Dict
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+CLI_MODULES = ['seq_retrieval', 'seq_info_align', 'seq_retrieval_batch']
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import `module` in a fresh interpreter (with `src` as working directory) and report the import time of every module imported.
+
+    Returns:
+        Cumulative import time (in microseconds) by imported module name, in import (completion) order.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SRC_DIR, capture_output=True, text=True, check=True)
+
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
@@ -0,0 +1 @@
+from ..seq_region.fixtures.reference_genomes import *  # noqa: F401, F403
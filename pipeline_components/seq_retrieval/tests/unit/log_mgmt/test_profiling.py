@@ -0,0 +1,138 @@
+"""
+Unit testing for profiling module
+"""
+import os.path
+import pstats
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+from log_mgmt.profiling import MAX_COLLAPSED_STACKS, ProfilingSession, pstats_to_collapsed_stacks
+from ...import_time import SRC_DIR
+
+REALISTIC_PROFILE_SCRIPT = '''
+import sys
+from log_mgmt.profiling import ProfilingSession
+
+with ProfilingSession(name='realistic-profile', output_dir=sys.argv[1], mode='deterministic'):
+    import Bio.AlignIO, requests
+    from seq_region import SeqRegion, TranslatedSeqRegion
+
+    exons = [SeqRegion(seq_id='X', start=start, end=start + 19, strand='+', fasta_file_url=sys.argv[2]) for start in range(1, 320, 40)]
+    print(TranslatedSeqRegion(exon_seq_regions=exons).get_sequence(type='transcript'))
+'''
+"""Profiles (heavy) imports and a transcript sequence retrieval in a fresh interpreter: `script profile_dir fasta_file_url`."""
+
+REALISTIC_PROFILE_TIMEOUT = 60
+REALISTIC_PROFILE_MAX_MEMORY_MIB = 100
+
+
+def busy_child(duration: float) -> None:
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_parent(duration: float) -> None:
+    busy_child(duration)
+
+
+def read_collapsed_stacks(collapsed_file: str) -> dict[str, int]:
+    stacks: dict[str, int] = {}
+    with open(collapsed_file, 'r') as f:
+        for line in f:
+            stack, value = line.rstrip('\n').rsplit(' ', 1)
+            stacks[stack] = int(value)
+    return stacks
+
+
+def test_deterministic_profiling(tmp_path):
+    '''
+    Test that deterministic profiling writes a pstats file and a collapsed-stack file
+    with the (reconstructed) call stacks of the profiled code
+    '''
+    with ProfilingSession(name='test-profile', output_dir=str(tmp_path), mode='deterministic') as session:
+        busy_parent(0.02)
+
+    pstats_file = os.path.join(tmp_path, 'test-profile.pstats')
+    collapsed_file = os.path.join(tmp_path, 'test-profile.collapsed')
+    assert session.artifacts == [pstats_file, collapsed_file]
+
+    stats = pstats.Stats(pstats_file)
+    assert any(function[2] == 'busy_child' for function in stats.stats.keys())  # type: ignore[attr-defined]
+
+    stacks = read_collapsed_stacks(collapsed_file)
+    child_stacks = [stack for stack in stacks.keys() if stack.split(';')[-1].startswith('busy_child ')]
+    assert len(child_stacks) == 1
+    assert child_stacks[0].split(';')[-2].startswith('busy_parent ')
+    assert sum(stacks.values()) >= 15_000
+
+
+@pytest.mark.parametrize('tiny_genome_url', ['ACGTacgtAC' * 32], indirect=True, ids=['320bp'])
+def test_deterministic_profiling_realistic(tmp_path, tiny_genome_url: str) -> None:
+    '''
+    Test that collapsed stacks are derived in bounded time and memory from a realistic profile,
+    including the (exponentially many) call paths through the import machinery
+    '''
+    result = subprocess.run([sys.executable, '-c', REALISTIC_PROFILE_SCRIPT, str(tmp_path), tiny_genome_url],
+                            cwd=SRC_DIR, capture_output=True, text=True, timeout=REALISTIC_PROFILE_TIMEOUT)
+    assert result.returncode == 0, result.stderr
+    assert os.path.getsize(os.path.join(tmp_path, 'realistic-profile.collapsed')) > 0
+
+    stats = pstats.Stats(os.path.join(tmp_path, 'realistic-profile.pstats'))
+    tracemalloc.start()
+    try:
+        stacks = pstats_to_collapsed_stacks(stats)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert 0 < len(stacks) <= MAX_COLLAPSED_STACKS
+    assert peak_memory < REALISTIC_PROFILE_MAX_MEMORY_MIB * 1024 * 1024
+
+    # Capped walks stop early, emitting a subset of the call paths
+    capped_stacks = pstats_to_collapsed_stacks(stats, max_stacks=100)
+    assert len(capped_stacks) <= 100
+    assert set(capped_stacks.keys()) <= set(stacks.keys())
+
+
+def test_sampling_profiling(tmp_path):
+    '''
+    Test that sampling profiling writes a collapsed-stack file with samples of the profiled thread
+    '''
+    with ProfilingSession(name='test-profile', output_dir=str(tmp_path), mode='sampling', sampling_interval=0.001) as session:
+        busy_parent(0.1)
+
+    collapsed_file = os.path.join(tmp_path, 'test-profile.collapsed')
+    assert session.artifacts == [collapsed_file]
+
+    stacks = read_collapsed_stacks(collapsed_file)
+    assert any(stack.split(';')[-1].startswith('busy_child ') and 'busy_parent ' in stack for stack in stacks.keys())
+
+
+def test_memory_profiling(tmp_path):
+    '''
+    Test that memory profiling (without call profiling) writes a peak memory report
+    '''
+    with ProfilingSession(name='test-profile', output_dir=str(tmp_path), mode=None, memory=True) as session:
+        allocated = [bytearray(1024 * 1024) for _ in range(4)]
+        del allocated
+
+    memory_report_file = os.path.join(tmp_path, 'test-profile-memory.txt')
+    assert session.artifacts == [memory_report_file]
+
+    with open(memory_report_file, 'r') as f:
+        peak_line = f.readline()
+    assert peak_line.startswith('Peak traced memory: ')
+    assert float(peak_line.split(': ')[1].split(' ')[0]) >= 4
+
+
+def test_invalid_profile_mode(tmp_path):
+    '''
+    Test that an invalid profile mode is rejected
+    '''
+    with pytest.raises(ValueError):
+        ProfilingSession(name='test-profile', output_dir=str(tmp_path), mode='tracing')  # type: ignore[arg-type]
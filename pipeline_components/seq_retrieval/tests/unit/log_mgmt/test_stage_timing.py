@@ -0,0 +1,76 @@
+"""
+Unit testing for stage_timing module
+"""
+import json
+
+import pytest
+
+from log_mgmt import set_timing_enabled, timed_entry, timing_span
+from log_mgmt.stage_timing import STAGE_FAIDX_READ, STAGE_ORF_SEARCH, TIMING_RECORD_TYPE
+
+
+@pytest.fixture
+def timing_enabled():
+    set_timing_enabled(True)
+    yield
+    set_timing_enabled(False)
+
+
+def test_timing_disabled(capsys):
+    '''
+    Test that no timings are recorded or emitted when timing is disabled
+    '''
+    with timed_entry(component='test', entry_id='entry-1') as timings:
+        with timing_span(STAGE_FAIDX_READ):
+            pass
+
+    assert timings is None
+    assert capsys.readouterr().err == ''
+
+
+def test_span_outside_entry(timing_enabled):  # noqa: U100
+    '''
+    Test that spans entered outside of a timed entry are ignored
+    '''
+    with timing_span(STAGE_FAIDX_READ):
+        pass
+
+
+def test_timed_entry_emits_record(timing_enabled, capsys):  # noqa: U100
+    '''
+    Test that a timed entry accumulates its spans by stage and emits them as a single JSON record
+    '''
+    with timed_entry(component='test', entry_id='entry-1') as timings:
+        for _ in range(3):
+            with timing_span(STAGE_FAIDX_READ):
+                pass
+        with timing_span(STAGE_ORF_SEARCH):
+            pass
+
+    assert timings is not None
+
+    emitted_lines = capsys.readouterr().err.splitlines()
+    assert len(emitted_lines) == 1
+
+    record = json.loads(emitted_lines[0])
+    assert record == timings.to_dict()
+    assert record['record_type'] == TIMING_RECORD_TYPE
+    assert record['component'] == 'test'
+    assert record['entry_id'] == 'entry-1'
+    assert set(record['stages'].keys()) == {STAGE_FAIDX_READ, STAGE_ORF_SEARCH}
+    assert record['stages'][STAGE_FAIDX_READ]['calls'] == 3
+    assert record['stages'][STAGE_ORF_SEARCH]['calls'] == 1
+    assert record['total_seconds'] >= record['stages'][STAGE_FAIDX_READ]['seconds']
+
+
+def test_timed_entry_records_failed_span(timing_enabled, capsys):  # noqa: U100
+    '''
+    Test that spans exited through an exception are recorded and the entry's timings still emitted
+    '''
+    with pytest.raises(ValueError):
+        with timed_entry(component='test', entry_id='entry-1'):
+            with timing_span(STAGE_ORF_SEARCH):
+                raise ValueError('ORF search failed')
+
+    record = json.loads(capsys.readouterr().err)
+    assert record['stages'][STAGE_ORF_SEARCH]['calls'] == 1
@@ -115,3 +115,16 @@ def test_seq_info_initiation_from_dict_alignment_embedded_variants():
     assert seq_info.embedded_variants is not None and len(seq_info.embedded_variants) == 1
     assert isinstance(seq_info.embedded_variants[0], AlignmentEmbeddedVariant)
     assert seq_info.embedded_variants[0].variant_id == 'NC_003284.9:g.5114224C>T'
+
+
+def test_seq_info_initiation_from_dict_timings():
+    '''
+    Test that the SeqInfo class can be initiated from a dictionary with stage timings
+    '''
+    timings = {'record_type': 'pavi_stage_timings', 'component': 'seq_retrieval', 'entry_id': 'entry-1',
+               'total_seconds': 0.5, 'stages': {'faidx_read': {'seconds': 0.1, 'calls': 2}}}
+    seq_info = SeqInfo.from_dict({'sequence': 'MTVGKLMIGLLIPILVATVYAEG', 'timings': timings})
+    assert isinstance(seq_info, SeqInfo)
+    assert seq_info.timings == timings
+
+    assert not hasattr(SeqInfo.from_dict({'sequence': 'MTVGKLMIGLLIPILVATVYAEG'}), 'timings')
@@ -3,3 +3,4 @@ from ..variant.fixtures.variants import *  # noqa: F401, F403
 from .fixtures.seq_regions import *  # noqa: F401, F403
 from .fixtures.multipart_seq_regions import *  # noqa: F401, F403
 from .fixtures.translated_seq_regions import *  # noqa: F401, F403
+from .fixtures.reference_genomes import *  # noqa: F401, F403
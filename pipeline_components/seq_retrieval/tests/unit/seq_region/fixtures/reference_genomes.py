@@ -0,0 +1,21 @@
+"""
+Reference genome fixtures for unit testing
+"""
+
+import pysam
+import pytest
+
+
+@pytest.fixture
+def tiny_genome_url(request: pytest.FixtureRequest, tmp_path) -> str:
+    '''
+    URL of a (faidx-indexed) single-contig genome, with contig X as sequence.
+
+    Parametrize indirectly with the contig sequence to use, e.g.
+    `@pytest.mark.parametrize('tiny_genome_url', ['ACGTacgt'], indirect=True)`.
+    '''
+    contig_seq: str = request.param
+    fasta_file_path = tmp_path / 'genome.fa'
+    fasta_file_path.write_text(f'>X\n{contig_seq}\n')
+    pysam.faidx(str(fasta_file_path))
+    return f'file://{fasta_file_path}'
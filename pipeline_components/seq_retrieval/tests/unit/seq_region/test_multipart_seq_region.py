@@ -69,6 +69,30 @@ def test_rel_position_pos_strand(wb_cds_c42d8_1_1: MultiPartSeqRegion) -> None:
         wb_cds_c42d8_1_1.to_rel_position(5112331)
 
 
+def test_seq_position_neg_strand(wb_cdna_c54h2_5_1: MultiPartSeqRegion) -> None:
+
+    # Convert relative positions back to (genomic) sequence positions
+    assert wb_cdna_c54h2_5_1.to_seq_position(1) == 5780722
+    assert wb_cdna_c54h2_5_1.to_seq_position(100) == 5780565
+    for rel_position in range(1, wb_cdna_c54h2_5_1.seq_length + 1, 37):
+        assert wb_cdna_c54h2_5_1.to_rel_position(wb_cdna_c54h2_5_1.to_seq_position(rel_position)) == rel_position
+
+    # Raise error out of boundaries
+    with pytest.raises(ValueError):
+        wb_cdna_c54h2_5_1.to_seq_position(0)
+    with pytest.raises(ValueError):
+        wb_cdna_c54h2_5_1.to_seq_position(wb_cdna_c54h2_5_1.seq_length + 1)
+
+
+def test_seq_position_pos_strand(wb_cds_c42d8_1_1: MultiPartSeqRegion) -> None:
+
+    # Convert relative positions back to (genomic) sequence positions
+    assert wb_cds_c42d8_1_1.to_seq_position(1) == 5109510
+    assert wb_cds_c42d8_1_1.to_seq_position(508) == 5111135
+    assert wb_cds_c42d8_1_1.to_seq_position(759) == 5112330
+    assert wb_cds_c42d8_1_1.part_offsets[-1] == wb_cds_c42d8_1_1.seq_length == 759
+
+
 def test_sub_region_neg_strand(wb_cdna_c54h2_5_1: MultiPartSeqRegion) -> None:
 
     # Test subregion extraction within a single exon
@@ -107,6 +131,16 @@ def test_sub_region_pos_strand(wb_cdna_c42d8_1_1: MultiPartSeqRegion) -> None:
     assert sub_region.end == 5110636
 
 
+def test_sub_region_shares_sequence(wb_cdna_c42d8_1_1: MultiPartSeqRegion) -> None:
+
+    # Subregions of a fetched region hold the corresponding part of its sequence (no refetching required)
+    wb_cdna_c42d8_1_1.fetch_seq()
+    sub_region = wb_cdna_c42d8_1_1.sub_region(rel_start=150, rel_end=250)
+    assert sub_region.sequence == wb_cdna_c42d8_1_1.get_sequence()[149:250]
+    assert sub_region.part_offsets[-1] == sub_region.seq_length
+    assert len(sub_region.part_offsets) == len(sub_region.ordered_seqRegions) + 1
+
+
 def test_sub_region_w_frame_neg_strand(wb_cds_c54h2_5_1: MultiPartSeqRegion) -> None:
 
     # Test subregion extraction within a single seqRegions (exon)
@@ -0,0 +1,120 @@
+"""
+Unit testing for ReferenceGenome class and related functions
+"""
+
+import logging
+import pytest
+
+from seq_region import get_reference_genome, MultiPartSeqRegion, ReferenceGenome, SeqRegion
+from variant import Variant
+from log_mgmt import get_logger, set_log_level
+
+logger = get_logger(name=__name__)
+set_log_level(logging.DEBUG)
+
+CONTIG_SEQ = 'ACGTACGTACgtacgtacgtACGTACGTAC'
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_reference_genome_lazy_fetch(tiny_genome_url: str) -> None:
+    genome = get_reference_genome(tiny_genome_url)
+
+    assert isinstance(genome, ReferenceGenome)
+    assert get_reference_genome(tiny_genome_url) is genome
+
+    # Files are only fetched on first sequence retrieval
+    seq_region = SeqRegion(seq_id='X', start=9, end=14, strand='+', fasta_file_url=tiny_genome_url)
+    assert seq_region.genome is genome
+    assert genome.is_fetched() is False
+
+    assert seq_region.get_sequence() == 'ACgtac'
+    assert genome.is_fetched() is True
+    assert seq_region.fasta_file_path == genome.fasta_file_path
+
+    # Subregions refer to the same genome
+    assert seq_region.sub_region(rel_start=2, rel_end=3).genome is genome
+
+    genome.close()
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_reference_genome_initiation_errors(tiny_genome_url: str) -> None:
+    with pytest.raises(ValueError):
+        SeqRegion(seq_id='X', start=9, end=14, fasta_file_url=tiny_genome_url, genome=get_reference_genome(tiny_genome_url))
+
+    # Unequal genomes can not be combined in one MultiPartSeqRegion
+    with pytest.raises(ValueError):
+        MultiPartSeqRegion(seq_regions=[SeqRegion(seq_id='X', start=1, end=5, fasta_file_url=tiny_genome_url),
+                                        SeqRegion(seq_id='X', start=11, end=15, fasta_file_url=tiny_genome_url + '.copy')])
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_coordinate_only_seq_region(tiny_genome_url: str) -> None:
+    # Coordinate-only seq regions require no files
+    coordinate_region = SeqRegion(seq_id='X', start=5, end=12)
+    assert coordinate_region.genome is None
+
+    seq_region = SeqRegion(seq_id='X', start=9, end=14, strand='+', fasta_file_url=tiny_genome_url)
+    assert seq_region.overlaps(coordinate_region) is True
+    assert coordinate_region.overlaps(seq_region) is True
+    assert seq_region.overlaps(SeqRegion(seq_id='X', start=15, end=20)) is False
+
+    variant = Variant(variant_id='X:g.11G>T', seq_id='X', start=11, end=11, genomic_ref_seq='G', genomic_alt_seq='T')
+    assert seq_region.calc_variant_overlap(variant)['rel_start'] == 3
+    assert get_reference_genome(tiny_genome_url).is_fetched() is False
+
+    with pytest.raises(ValueError):
+        coordinate_region.fetch_seq()
+    with pytest.raises(ValueError):
+        coordinate_region.fasta_file_path
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_reference_genome_fasta_file_per_thread(tiny_genome_url: str) -> None:
+    '''
+    Opened fasta files are shared within a thread, but not between threads.
+    '''
+    from concurrent.futures import ThreadPoolExecutor
+
+    genome = get_reference_genome(tiny_genome_url)
+    fasta_file = genome.fasta_file()
+    assert genome.fasta_file() is fasta_file
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(genome.fasta_file).result() is not fasta_file
+
+    genome.close()
+    assert genome.fasta_file() is not fasta_file
+    genome.close()
+
+
+def test_reference_genome_fetch_files_per_genome(monkeypatch: pytest.MonkeyPatch) -> None:
+    '''
+    A slow fetch of one genome's files does not block resolving or fetching other genomes.
+    '''
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from seq_region import reference_genome
+
+    slow_url = 'file:///slow/genome.fa'
+    slow_fetch_started = threading.Event()
+    release_slow_fetch = threading.Event()
+
+    def fetch_faidx_files(fasta_file_url: str) -> str:
+        if fasta_file_url == slow_url:
+            slow_fetch_started.set()
+            release_slow_fetch.wait(timeout=10)
+        return fasta_file_url[len('file://'):]
+
+    monkeypatch.setattr(reference_genome, 'fetch_faidx_files', fetch_faidx_files)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        slow_fetch = executor.submit(ReferenceGenome(slow_url).fetch_files)
+        assert slow_fetch_started.wait(timeout=10)
+
+        # Served while the slow fetch is still running
+        assert get_reference_genome('file:///other/genome.fa').fetch_files() == '/other/genome.fa'
+        assert not slow_fetch.done()
+
+        release_slow_fetch.set()
+        assert slow_fetch.result() == '/slow/genome.fa'
@@ -0,0 +1,76 @@
+"""
+Unit testing for SeqMemo class
+"""
+
+import logging
+import pytest
+
+from seq_region import get_reference_genome, SeqRegion, TranslatedSeqRegion
+from seq_region.seq_memo import SeqMemo
+from log_mgmt import get_logger, set_log_level, set_timing_enabled, timed_entry
+from log_mgmt.stage_timing import STAGE_FAIDX_READ
+
+logger = get_logger(name=__name__)
+set_log_level(logging.DEBUG)
+
+CONTIG_SEQ = 'ccgATGAAACCCgggtttcccTTTGGGTAAacgt'
+
+
+@pytest.fixture
+def timing_enabled():
+    set_timing_enabled(True)
+    yield
+    set_timing_enabled(False)
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_seq_memo_merges_spans(tiny_genome_url: str) -> None:
+    '''
+    Overlapping and adjacent spans are merged into single buffer spans.
+    '''
+    seq_memo = SeqMemo(genome=get_reference_genome(tiny_genome_url), seq_id='X', spans=[(15, 20), (3, 8), (1, 5), (9, 10)])
+
+    assert seq_memo.span_starts == [1, 15]
+    assert seq_memo.span_ends == [10, 20]
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_seq_memo_fetch_seq(tiny_genome_url: str, timing_enabled) -> None:  # noqa: U100
+    '''
+    Sequences within a buffer span are sliced from a single read, other sequences are read directly.
+    '''
+    genome = get_reference_genome(tiny_genome_url)
+    seq_memo = SeqMemo(genome=genome, seq_id='X', spans=[(4, 12), (22, 30)])
+
+    with timed_entry(component='test', entry_id='seq-memo') as timings:
+        assert seq_memo.fetch_seq(seq_id='X', start=4, end=12) == CONTIG_SEQ[3:12]
+        assert seq_memo.fetch_seq(seq_id='X', start=7, end=9) == CONTIG_SEQ[6:9]
+        assert seq_memo.fetch_seq(seq_id='X', start=22, end=22) == CONTIG_SEQ[21:22]
+        assert seq_memo.fetch_seq(seq_id='X', start=10, end=15) == CONTIG_SEQ[9:15]
+
+    assert timings is not None
+    assert timings.to_dict()['stages'][STAGE_FAIDX_READ]['calls'] == 3
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_translated_seq_region_seq_memo(tiny_genome_url: str, timing_enabled) -> None:  # noqa: U100
+    '''
+    Exon and CDS regions of a TranslatedSeqRegion share one SeqMemo, reading each exon span once.
+    '''
+    exon_seq_regions = [SeqRegion(seq_id='X', start=1, end=12, strand='+', fasta_file_url=tiny_genome_url),
+                        SeqRegion(seq_id='X', start=22, end=34, strand='+', fasta_file_url=tiny_genome_url)]
+    cds_seq_regions = [SeqRegion(seq_id='X', start=4, end=12, strand='+', frame=0, fasta_file_url=tiny_genome_url),
+                       SeqRegion(seq_id='X', start=22, end=30, strand='+', frame=0, fasta_file_url=tiny_genome_url)]
+
+    with timed_entry(component='test', entry_id='translated-seq-region') as timings:
+        translated_seq_region = TranslatedSeqRegion(exon_seq_regions=exon_seq_regions, cds_seq_regions=cds_seq_regions)
+
+        assert translated_seq_region.get_sequence(type='transcript') == CONTIG_SEQ[0:12] + CONTIG_SEQ[21:34]
+        assert translated_seq_region.get_sequence(type='coding') == CONTIG_SEQ[3:12] + CONTIG_SEQ[21:30]
+        assert translated_seq_region.get_sequence(type='protein') == 'MKPFG'
+
+    assert translated_seq_region.seq_memo is not None
+    assert all(seq_region.seq_memo is translated_seq_region.seq_memo for seq_region in exon_seq_regions + cds_seq_regions)
+
+    assert timings is not None
+    assert timings.to_dict()['stages'][STAGE_FAIDX_READ]['calls'] == 2
@@ -0,0 +1,63 @@
+"""
+Unit testing for soft_mask module (and soft-mask aware sequence storage)
+"""
+
+import logging
+import pytest
+
+from seq_region import MultiPartSeqRegion, SeqRegion
+from seq_region.soft_mask import apply_soft_mask, normalize_sequence, slice_soft_mask
+from log_mgmt import get_logger, set_log_level
+
+logger = get_logger(name=__name__)
+set_log_level(logging.DEBUG)
+
+CONTIG_SEQ = 'ACGTacgtACGTACgtacgtacgtACGTACGTAC'
+
+
+def test_normalize_sequence() -> None:
+    sequence, soft_mask = normalize_sequence('acGTAcgNnn')
+
+    assert sequence == 'ACGTACGNNN'
+    assert soft_mask == [(0, 2), (5, 7), (8, 10)]
+    assert apply_soft_mask(sequence, soft_mask) == 'acGTAcgNnn'
+
+    # Unmasked sequences are not copied
+    unmasked_sequence = 'ACGTACGT'
+    assert normalize_sequence(unmasked_sequence) == (unmasked_sequence, [])
+    assert apply_soft_mask(unmasked_sequence, []) is unmasked_sequence
+
+
+def test_slice_soft_mask() -> None:
+    soft_mask = [(0, 2), (5, 7), (8, 10)]
+
+    assert slice_soft_mask(soft_mask, 1, 6) == [(0, 1), (4, 5)]
+    assert slice_soft_mask(soft_mask, 2, 5) == []
+    assert slice_soft_mask(soft_mask, 6) == [(0, 1), (2, 4)]
+    assert slice_soft_mask([], 3, 5) == []
+
+
+@pytest.mark.parametrize('tiny_genome_url', [CONTIG_SEQ], indirect=True)
+def test_soft_masked_seq_region(tiny_genome_url: str) -> None:
+    '''
+    Sequences are stored normalized, while soft-masked sequences are rendered when requested.
+    '''
+    seq_region = SeqRegion(seq_id='X', start=3, end=16, strand='+', fasta_file_url=tiny_genome_url)
+
+    assert seq_region.get_sequence() == CONTIG_SEQ[2:16]
+    assert seq_region.sequence == CONTIG_SEQ[2:16].upper()
+    assert seq_region.soft_mask == [(2, 6), (12, 14)]
+    assert seq_region.get_sequence(unmasked=True) is seq_region.sequence
+
+    assert seq_region.sub_region(rel_start=4, rel_end=13).get_sequence() == CONTIG_SEQ[5:15]
+
+    neg_strand_region = SeqRegion(seq_id='X', start=3, end=16, strand='-', fasta_file_url=tiny_genome_url)
+    assert neg_strand_region.get_sequence() == 'acGTACGTacgtAC'
+    assert neg_strand_region.soft_mask == [(0, 2), (8, 12)]
+
+    multipart_region = MultiPartSeqRegion(seq_regions=[SeqRegion(seq_id='X', start=1, end=6, strand='+', fasta_file_url=tiny_genome_url),
+                                                       SeqRegion(seq_id='X', start=15, end=26, strand='+', fasta_file_url=tiny_genome_url)])
+
+    assert multipart_region.get_sequence() == CONTIG_SEQ[0:6] + CONTIG_SEQ[14:26]
+    assert multipart_region.get_sequence(unmasked=True) == (CONTIG_SEQ[0:6] + CONTIG_SEQ[14:26]).upper()
+    assert multipart_region.sub_region(rel_start=5, rel_end=10).get_sequence() == CONTIG_SEQ[4:6] + CONTIG_SEQ[14:18]
@@ -0,0 +1,37 @@
+"""
+Import time budget testing for the CLI modules
+
+Heavy third-party modules are imported on the code paths using them only,
+so importing (and starting) a CLI does not pay for what a run does not use.
+"""
+
+import pytest
+
+from ..import_time import CLI_MODULES, import_times
+
+IMPORT_TIME_BUDGET_US = 200_000
+"""Maximum cumulative import time of every CLI module (best of `IMPORT_TIME_ATTEMPTS`)."""
+IMPORT_TIME_ATTEMPTS = 3
+
+LAZY_MODULES = ['Bio', 'jsonpickle', 'numpy', 'pysam', 'requests', 'cProfile', 'pstats', 'tracemalloc']
+"""Modules which must not be imported when merely importing a CLI module."""
+
+
+@pytest.mark.parametrize('module', CLI_MODULES)
+def test_cli_lazy_imports(module: str) -> None:
+    '''
+    Test that importing a CLI module does not import any of the heavy modules only required by specific code paths
+    '''
+    imported_modules = import_times(module).keys()
+
+    assert [name for name in imported_modules if name.split('.')[0] in LAZY_MODULES] == []
+
+
+@pytest.mark.parametrize('module', CLI_MODULES)
+def test_cli_import_time_budget(module: str) -> None:
+    '''
+    Test that importing a CLI module stays within the import time budget
+    '''
+    import_time = min(import_times(module)[module] for _ in range(IMPORT_TIME_ATTEMPTS))
+
+    assert import_time <= IMPORT_TIME_BUDGET_US, f'Importing {module} took {import_time / 1000:.1f}ms'
@@ -2,6 +2,7 @@
 Unit testing for SeqEmbeddedVariant class and related functions
 """
 
+from copy import deepcopy
 import logging
 import pytest
 
@@ -672,3 +673,37 @@ def test_translation_of_indel_insertion_crossing_codons() -> None:
 
     assert translated_indel_deletion.seq_start_pos == 2
     assert translated_indel_deletion.seq_end_pos == 3
+
+
+def test_seq_embedded_variant_replace(wb_variant_yn32_in_C42D8_8a_1_coding_seq) -> None:
+    '''
+    Test the SeqEmbeddedVariant.replace() method returns a modified copy, leaving the original unchanged.
+    '''
+    replaced = wb_variant_yn32_in_C42D8_8a_1_coding_seq.replace(seq_start_pos=10, seq_end_pos=12)
+
+    assert isinstance(replaced, SeqEmbeddedVariant)
+    assert replaced is not wb_variant_yn32_in_C42D8_8a_1_coding_seq
+    assert replaced.seq_start_pos == 10
+    assert replaced.seq_end_pos == 12
+    assert replaced.variant_id == wb_variant_yn32_in_C42D8_8a_1_coding_seq.variant_id
+    assert replaced.embedded_ref_seq_len == wb_variant_yn32_in_C42D8_8a_1_coding_seq.embedded_ref_seq_len
+    assert wb_variant_yn32_in_C42D8_8a_1_coding_seq.seq_start_pos == 1129
+
+    with pytest.raises(TypeError):
+        wb_variant_yn32_in_C42D8_8a_1_coding_seq.replace(alignment_start_pos=10)
+
+
+def test_seq_embedded_variant_state(wb_variant_yn32_in_C42D8_8a_1_coding_seq) -> None:
+    '''
+    Test SeqEmbeddedVariant objects are slotted, and expose all (variant and embedding) attributes as state, in definition order.
+    '''
+    assert not hasattr(wb_variant_yn32_in_C42D8_8a_1_coding_seq, '__dict__')
+
+    state = wb_variant_yn32_in_C42D8_8a_1_coding_seq.__getstate__()
+    assert list(state.keys()) == ['variant_id', 'genomic_seq_id', 'genomic_start_pos', 'genomic_end_pos', 'seq_length',
+                                  'genomic_ref_seq', 'genomic_alt_seq', 'seq_substitution_type',
+                                  'seq_start_pos', 'seq_end_pos', 'embedded_ref_seq_len', 'embedded_alt_seq_len']
+
+    variant_copy = deepcopy(wb_variant_yn32_in_C42D8_8a_1_coding_seq)
+    assert variant_copy is not wb_variant_yn32_in_C42D8_8a_1_coding_seq
+    assert variant_copy.__getstate__() == state